@@ -0,0 +1,140 @@
+# analysis/indicator_cache.py
+"""Content-addressed indicator result cache shared by every analysis path in the process."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from utils.logger import get_logger
+from utils.metrics import record_cache_access
+
+logger = get_logger(__name__)
+
+# Key layout: (kind, symbol, timeframe, periods, count, first_ts, last_ts, last_close, last_volume)
+CacheKey = Tuple[Hashable, ...]
+
+
+def _field(candle: Any, name: str, index: int) -> Any:
+    if isinstance(candle, dict):
+        return candle.get(name)
+    return candle[index]
+
+
+def candle_fingerprint(candles: List[Any]) -> Tuple[Hashable, ...]:
+    """
+    Identify a candle series by its length, time span and latest candle.
+
+    The latest close/volume are included because the last candle may still be
+    forming; once it closes the next fetch ends on a new timestamp.
+    """
+    first, last = candles[0], candles[-1]
+    return (
+        len(candles),
+        str(_field(first, 'timestamp', 0)),
+        str(_field(last, 'timestamp', 0)),
+        str(_field(last, 'close', 4)),
+        str(_field(last, 'volume', 5)),
+    )
+
+
+class IndicatorCache:
+    """
+    LRU cache of indicator results keyed by candle content.
+
+    Keys combine the calculation kind and its period set with the candle
+    fingerprint, so the scanner, analysis worker, signal generator and web API
+    share one result per series. When a symbol/timeframe is known, results for
+    older last-candle timestamps are evicted as soon as a newer candle arrives.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, Any]" = OrderedDict()
+        self._series_keys: Dict[Tuple[str, str], Dict[str, List[CacheKey]]] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'invalidations': 0,
+        }
+
+    def make_key(self, kind: str, candles: List[Any], periods: Tuple[int, ...],
+                 symbol: Optional[str] = None, timeframe: Optional[str] = None) -> CacheKey:
+        return (kind, symbol, timeframe, periods) + candle_fingerprint(candles)
+
+    def get_or_compute(self, kind: str, candles: List[Any], periods: Tuple[int, ...],
+                       compute: Callable[[], Any], symbol: Optional[str] = None,
+                       timeframe: Optional[str] = None) -> Any:
+        """Return the cached result for these candles, computing it once on a miss."""
+        if not candles:
+            return compute()
+
+        key = self.make_key(kind, candles, periods, symbol, timeframe)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                record_cache_access('indicators', True)
+                return self._entries[key]
+
+        self.stats['misses'] += 1
+        record_cache_access('indicators', False)
+        result = compute()
+
+        with self._lock:
+            self._store(key, result, symbol, timeframe)
+        return result
+
+    def _store(self, key: CacheKey, result: Any, symbol: Optional[str], timeframe: Optional[str]):
+        if symbol is not None and timeframe is not None:
+            last_ts = key[6]
+            by_timestamp = self._series_keys.setdefault((symbol, timeframe), {})
+            # A new last candle supersedes every result for the previous one
+            for stale_ts in [ts for ts in by_timestamp if ts != last_ts]:
+                for stale_key in by_timestamp.pop(stale_ts):
+                    if self._entries.pop(stale_key, None) is not None:
+                        self.stats['invalidations'] += 1
+            by_timestamp.setdefault(last_ts, []).append(key)
+
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop cached results for one symbol (or everything)."""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+                self._series_keys.clear()
+                return
+            for series in [s for s in self._series_keys if s[0] == symbol]:
+                for keys in self._series_keys.pop(series).values():
+                    for key in keys:
+                        self._entries.pop(key, None)
+            for key in [k for k in self._entries if k[1] == symbol]:
+                del self._entries[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': len(self._entries),
+            'hit_rate': self.stats['hits'] / lookups * 100 if lookups else 0,
+        }
+
+
+# Global indicator cache instance
+_indicator_cache: Optional[IndicatorCache] = None
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """Get or create global indicator cache instance."""
+    global _indicator_cache
+    if _indicator_cache is None:
+        _indicator_cache = IndicatorCache()
+    return _indicator_cache
@@ -8,8 +8,10 @@ from typing import Dict, List, Optional, Any, Tuple
 from decimal import Decimal
 from datetime import datetime
 
+from analysis.indicator_cache import get_indicator_cache
 from config.trading_config import TradingConfig
 from utils.logger import get_logger
+from utils.tracing import traced
 from utils.validators import Validator, ValidationError
 from utils.formatters import PriceFormatter
 
@@ -46,6 +48,16 @@ class IndicatorCalculator:
                     } for c in candles
                 ]
 
+            return dict(get_indicator_cache().get_or_compute(
+                'scanner_ema', candles, (9, 21, 14), lambda: self._calculate(candles)
+            ))
+            
+        except Exception as e:
+            logger.error(f"Error calculating indicators: {e}")
+            return {}
+    
+    def _calculate(self, candles: List[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+        try:
             df = self.indicators.prepare_dataframe(candles)
             
             # Calculate basic indicators
@@ -228,12 +240,30 @@ class TechnicalIndicators:
             logger.error(f"Error calculating Volume SMA: {e}")
             raise IndicatorError(f"Failed to calculate Volume SMA: {e}")
     
-    def calculate_all_indicators(self, candles: List[Dict[str, Any]]) -> Dict[str, Decimal]:
-        """Calculate all indicators for given candle data."""
+    def _indicator_periods(self) -> Tuple[int, ...]:
+        return (self.config.MM1_PERIOD, self.config.CENTER_PERIOD,
+                self.config.RSI_PERIOD, self.config.VOLUME_SMA_PERIOD)
+    
+    @traced('indicators.calculate_all', root=False)
+    def calculate_all_indicators(self, candles: List[Dict[str, Any]], symbol: Optional[str] = None,
+                                 timeframe: Optional[str] = None) -> Dict[str, Decimal]:
+        """
+        Calculate all indicators for given candle data.
+        
+        Results are memoized per candle series, so repeated calls for the same
+        candles (from any caller) compute once until a new candle arrives.
+        Passing symbol/timeframe lets the cache drop superseded results early.
+        """
+        if not candles:
+            raise IndicatorError("No candle data provided")
+        
+        return dict(get_indicator_cache().get_or_compute(
+            'all', candles, self._indicator_periods(),
+            lambda: self._calculate_all_indicators(candles), symbol, timeframe
+        ))
+    
+    def _calculate_all_indicators(self, candles: List[Dict[str, Any]]) -> Dict[str, Decimal]:
         try:
-            if not candles:
-                raise IndicatorError("No candle data provided")
-            
             results = {}
             
             # Calculate MM1 (Fast EMA)
@@ -273,6 +303,14 @@ class TechnicalIndicators:
     def detect_ma_crossover(self, candles: List[Dict[str, Any]], 
                            min_periods: int = 2) -> Optional[str]:
         """Detect moving average crossover (bullish or bearish)."""
+        if not candles:
+            return None
+        return get_indicator_cache().get_or_compute(
+            'crossover', candles, (self.config.MM1_PERIOD, self.config.CENTER_PERIOD, min_periods),
+            lambda: self._detect_ma_crossover(candles, min_periods)
+        )
+    
+    def _detect_ma_crossover(self, candles: List[Dict[str, Any]], min_periods: int) -> Optional[str]:
         try:
             if len(candles) < max(self.config.MM1_PERIOD, self.config.CENTER_PERIOD) + min_periods:
                 return None
@@ -459,7 +497,7 @@ def calculate_indicators_for_symbol(symbol: str, timeframe: str,
         indicators = get_technical_indicators()
         
         # Calculate all indicators
-        results = indicators.calculate_all_indicators(candles)
+        results = indicators.calculate_all_indicators(candles, symbol, timeframe)
         
         # Get summary with analysis
         summary = indicators.get_indicator_summary(results, timeframe)
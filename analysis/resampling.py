@@ -0,0 +1,195 @@
+# analysis/resampling.py
+"""Build higher-timeframe candles from a lower-timeframe series (e.g. 2h/4h from 1h)."""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Candle duration per timeframe in milliseconds
+TIMEFRAME_MS = {
+    '1m': 60_000,
+    '3m': 180_000,
+    '5m': 300_000,
+    '15m': 900_000,
+    '30m': 1_800_000,
+    '1h': 3_600_000,
+    '2h': 7_200_000,
+    '4h': 14_400_000,
+    '6h': 21_600_000,
+    '8h': 28_800_000,
+    '12h': 43_200_000,
+    '1d': 86_400_000,
+}
+
+# BingX returns at most this many candles per kline request
+MAX_KLINE_LIMIT = 1440
+
+
+class ResamplingError(Exception):
+    """Exception for candle resampling errors."""
+    pass
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """Get the duration of a timeframe in milliseconds."""
+    try:
+        return TIMEFRAME_MS[timeframe]
+    except KeyError:
+        raise ResamplingError(f"Unsupported timeframe: {timeframe}")
+
+
+def can_resample(source_timeframe: str, target_timeframe: str) -> bool:
+    """Check whether target candles can be built from whole source candles."""
+    source_ms = TIMEFRAME_MS.get(source_timeframe)
+    target_ms = TIMEFRAME_MS.get(target_timeframe)
+    if not source_ms or not target_ms:
+        return False
+    return target_ms > source_ms and target_ms % source_ms == 0
+
+
+def source_candles_needed(source_timeframe: str, target_timeframe: str, target_count: int) -> int:
+    """Number of source candles required to build target_count target candles."""
+    ratio = timeframe_to_ms(target_timeframe) // timeframe_to_ms(source_timeframe)
+    # One extra bucket: the oldest one is usually cut off mid-bucket and dropped
+    return (target_count + 1) * ratio
+
+
+def _to_decimal(value: Any) -> Decimal:
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def resample_candles(candles: List[Dict[str, Any]], source_timeframe: str, target_timeframe: str,
+                     include_partial: bool = True, offset_ms: int = 0) -> List[Dict[str, Any]]:
+    """
+    Aggregate source candles into target-timeframe candles.
+
+    Buckets are aligned to the UTC epoch (plus offset_ms), which matches how
+    BingX opens 2h/4h candles at 00:00 UTC. The oldest bucket is dropped when
+    the series starts part-way through it, since its open/high/low would be
+    wrong. The newest bucket is still forming when it has fewer source candles
+    than the ratio; it is kept (flagged 'is_partial') like the exchange's own
+    in-progress candle unless include_partial is False.
+
+    Args:
+        candles: Source candles in BingXClient.fetch_ohlcv format
+        source_timeframe: Timeframe of the source candles, e.g. '1h'
+        target_timeframe: Timeframe to build, e.g. '4h'
+        include_partial: Keep the still-forming newest bucket
+        offset_ms: Bucket alignment offset from the epoch
+
+    Returns:
+        Target candles in the same format, oldest first
+    """
+    if not can_resample(source_timeframe, target_timeframe):
+        raise ResamplingError(f"Cannot build {target_timeframe} candles from {source_timeframe}")
+    if not candles:
+        return []
+
+    source_ms = timeframe_to_ms(source_timeframe)
+    target_ms = timeframe_to_ms(target_timeframe)
+    ratio = target_ms // source_ms
+
+    buckets: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+
+    for candle in sorted(candles, key=lambda c: int(c['timestamp'])):
+        timestamp = int(candle['timestamp'])
+        bucket_start = timestamp - ((timestamp - offset_ms) % target_ms)
+
+        if current is None or bucket_start != current['timestamp']:
+            current = {
+                'timestamp': bucket_start,
+                'open': _to_decimal(candle['open']),
+                'high': _to_decimal(candle['high']),
+                'low': _to_decimal(candle['low']),
+                'close': _to_decimal(candle['close']),
+                'volume': _to_decimal(candle['volume']),
+                '_first_ts': timestamp,
+                '_count': 1,
+            }
+            buckets.append(current)
+            continue
+
+        if timestamp == current['_first_ts']:
+            continue  # duplicate source candle
+        current['high'] = max(current['high'], _to_decimal(candle['high']))
+        current['low'] = min(current['low'], _to_decimal(candle['low']))
+        current['close'] = _to_decimal(candle['close'])
+        current['volume'] += _to_decimal(candle['volume'])
+        current['_count'] += 1
+
+    # Leading bucket is incomplete if the series starts after the bucket opened
+    if buckets and buckets[0]['_first_ts'] != buckets[0]['timestamp']:
+        buckets.pop(0)
+
+    resampled = []
+    for index, bucket in enumerate(buckets):
+        is_partial = index == len(buckets) - 1 and bucket['_count'] < ratio
+        if is_partial and not include_partial:
+            continue
+        resampled.append({
+            'timestamp': bucket['timestamp'],
+            'datetime': datetime.fromtimestamp(bucket['timestamp'] / 1000, tz=timezone.utc).isoformat(),
+            'open': bucket['open'],
+            'high': bucket['high'],
+            'low': bucket['low'],
+            'close': bucket['close'],
+            'volume': bucket['volume'],
+            'is_partial': is_partial,
+        })
+
+    return resampled
+
+
+def verify_resampled_candles(resampled: List[Dict[str, Any]], exchange_candles: List[Dict[str, Any]],
+                             tolerance: Decimal = Decimal('0.0001')) -> Dict[str, Any]:
+    """
+    Compare resampled candles with the exchange's own candles for the same timeframe.
+
+    Completed candles are matched by open timestamp; prices must agree within
+    `tolerance` (relative) and volume within 1%, because exchanges round volume
+    differently per timeframe. Partial candles are not compared.
+
+    Returns:
+        Summary with 'compared', 'mismatches' (list of details), 'max_price_error'
+        and 'matches' (True when there are no mismatches)
+    """
+    exchange_by_ts = {int(c['timestamp']): c for c in exchange_candles}
+    mismatches = []
+    max_price_error = Decimal('0')
+    compared = 0
+
+    for candle in resampled:
+        if candle.get('is_partial'):
+            continue
+        reference = exchange_by_ts.get(int(candle['timestamp']))
+        if reference is None:
+            continue
+        compared += 1
+
+        for field in ('open', 'high', 'low', 'close', 'volume'):
+            expected = _to_decimal(reference[field])
+            actual = _to_decimal(candle[field])
+            error = abs(actual - expected) / expected if expected else abs(actual)
+            limit = Decimal('0.01') if field == 'volume' else tolerance
+            if field != 'volume':
+                max_price_error = max(max_price_error, error)
+            if error > limit:
+                mismatches.append({
+                    'timestamp': candle['timestamp'],
+                    'field': field,
+                    'resampled': actual,
+                    'exchange': expected,
+                    'relative_error': error,
+                })
+
+    return {
+        'compared': compared,
+        'mismatches': mismatches,
+        'max_price_error': max_price_error,
+        'matches': compared > 0 and not mismatches,
+    }
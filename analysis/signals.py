@@ -11,6 +11,7 @@ from config.trading_config import TradingConfig
 from analysis.indicators import get_technical_indicators, IndicatorError
 from analysis.volume import get_volume_analyzer, VolumeAnalysisError
 from utils.logger import get_logger, trading_logger
+from utils.tracing import traced
 from utils.formatters import PriceFormatter
 
 logger = get_logger(__name__)
@@ -71,10 +72,12 @@ class SignalGenerator:
             # Define async function to fetch data
             async def fetch_market_data():
                 try:
-                    # Get candles for different timeframes in parallel
-                    candles_1m_task = client.fetch_ohlcv(symbol, '1m', limit=50)
-                    candles_2h_task = client.fetch_ohlcv(symbol, '2h', limit=50)  
-                    candles_4h_task = client.fetch_ohlcv(symbol, '4h', limit=50)
+                    # Get candles for different timeframes in parallel through the shared hub
+                    from api.market_data_hub import get_market_data_hub
+                    hub = get_market_data_hub()
+                    candles_1m_task = hub.get_candles(symbol, '1m', 50)
+                    candles_2h_task = hub.get_candles(symbol, '2h', 50)
+                    candles_4h_task = hub.get_candles(symbol, '4h', 50)
                     
                     # Execute in parallel for efficiency
                     candles_1m, candles_2h, candles_4h = await asyncio.gather(
@@ -140,14 +143,11 @@ class SignalGenerator:
             
             for tf, candles in timeframes.items():
                 try:
-                    # Calculate MM1 (fast EMA)
-                    mm1 = float(self.indicators.calculate_mm1(candles))
-                    
-                    # Calculate Center (slower EMA) 
-                    center = float(self.indicators.calculate_center(candles))
-                    
-                    # Calculate RSI
-                    rsi = float(self.indicators.calculate_rsi_value(candles))
+                    # MM1 (fast EMA), Center (slower EMA) and RSI from the shared indicator cache
+                    tf_indicators = self.indicators.calculate_all_indicators(candles, symbol, tf)
+                    mm1 = float(tf_indicators['mm1'])
+                    center = float(tf_indicators['center'])
+                    rsi = float(tf_indicators['rsi'])
                     
                     # Get current price
                     current_price = float(candles[-1]['close'])
@@ -541,6 +541,7 @@ class SignalGenerator:
                 'timeframes_analyzed': [],
             }
     
+    @traced('signal.generate_trading_signal')
     def generate_trading_signal(self, symbol: str, 
                                candles_spot: List[Dict[str, Any]],
                                candles_2h: List[Dict[str, Any]], 
@@ -3,12 +3,14 @@
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor
 
 from api.market_data import get_market_data_api
+from api.market_data_hub import get_market_data_hub
 from database.connection import get_session
+from database.write_queue import get_write_queue
 from database.repository import AssetRepository, IndicatorRepository, SignalRepository
 from analysis.indicators import get_technical_indicators
 from analysis.volume import get_volume_analyzer
@@ -16,6 +18,8 @@ from analysis.signals import get_signal_generator, SignalType
 from config.trading_config import TradingConfig
 from utils.logger import get_logger, trading_logger, performance_logger
 from utils.worker_coordinator import get_coordinator
+from scanner.scan_scheduler import get_scan_scheduler
+from utils import metrics
 from api.web_api import manager as connection_manager
 
 # Import test mode functions for aggressive testing
@@ -40,6 +44,7 @@ class AnalysisWorker:
     
     def __init__(self):
         self.market_api = get_market_data_api()
+        self.market_data = get_market_data_hub()
         self.indicators = get_technical_indicators()
         self.volume_analyzer = get_volume_analyzer()
         self.signal_generator = get_signal_generator()
@@ -49,6 +54,13 @@ class AnalysisWorker:
         self.config = TradingConfig()
         self.coordinator = get_coordinator()
         
+        # Hot symbols keep the regular scan cadence, quiet symbols are analysed less often
+        self.scheduler = get_scan_scheduler(
+            'analysis',
+            min_interval=self.config.SCAN_INTERVAL_SECONDS,
+            max_interval=max(self.config.SCAN_INTERVAL_SECONDS, self.config.SCHEDULER_MAX_INTERVAL_SECONDS)
+        )
+        
         self.is_running = False
         self.analysis_tasks = {}
         self.executor = ThreadPoolExecutor(max_workers=self.config.MAX_WORKERS)
@@ -134,23 +146,38 @@ class AnalysisWorker:
                     await asyncio.sleep(60)  # Wait 1 minute before retrying
                     continue
                 
-                logger.info(f"Starting analysis cycle for {len(valid_assets)} assets")
+                # Only analyse assets that are due according to the adaptive scheduler
+                self.scheduler.sync_symbols(asset['symbol'] for asset in valid_assets)
+                due_symbols = set(self.scheduler.get_due_symbols())
+                due_assets = [asset for asset in valid_assets if asset['symbol'] in due_symbols]
+                
+                if due_assets:
+                    logger.info(f"Starting analysis cycle for {len(due_assets)}/{len(valid_assets)} due assets")
+                
+                # Perform analysis for due assets
+                analysis_results = await self._analyze_all_assets(due_assets)
                 
-                # Perform analysis for all assets
-                analysis_results = await self._analyze_all_assets(valid_assets)
+                # Reschedule analysed assets based on signal proximity
+                for result in analysis_results:
+                    if result.get('error'):
+                        self.scheduler.record_failure(result['symbol'])
+                    else:
+                        self.scheduler.record_signal_result(result['symbol'], result.get('signal'))
                 
                 # Process results
                 await self._process_analysis_results(analysis_results)
                 
                 # Calculate cycle time
                 cycle_duration = (datetime.utcnow() - loop_start).total_seconds()
+                metrics.observe_cycle('analysis', cycle_duration)
                 
                 # Log performance
                 performance_logger.execution_time(
                     "analysis_cycle",
                     cycle_duration,
                     {
-                        "assets_analyzed": len(valid_assets),
+                        "assets_analyzed": len(due_assets),
+                        "assets_tracked": len(valid_assets),
                         "successful_analyses": len([r for r in analysis_results if not r.get('error')]),
                         "signals_generated": len([r for r in analysis_results if r.get('signal', {}).get('signal_type') != SignalType.NEUTRAL.value]),
                     }
@@ -167,7 +194,8 @@ class AnalysisWorker:
                         base_interval = int(base_interval * 0.3)
                         logger.info(f"🧪 TEST MODE: Reduced scan interval to {base_interval}s for aggressive testing")
                 
-                sleep_time = max(0, base_interval - cycle_duration)
+                # Sleep until the next asset is due, never longer than the base interval
+                sleep_time = min(self.scheduler.seconds_until_next_due(), max(0, base_interval - cycle_duration))
                 if sleep_time > 0:
                     await asyncio.sleep(sleep_time)
                 
@@ -238,7 +266,7 @@ class AnalysisWorker:
             for timeframe, candles in candles_data.items():
                 if candles:
                     try:
-                        indicators = self.indicators.calculate_all_indicators(candles)
+                        indicators = self.indicators.calculate_all_indicators(candles, symbol, timeframe)
                         indicators_by_timeframe[timeframe] = indicators
                     except Exception as e:
                         logger.warning(f"Error calculating indicators for {symbol} {timeframe}: {e}")
@@ -336,11 +364,7 @@ class AnalysisWorker:
                 else:
                     limit = max(50, self.config.CENTER_PERIOD + 10)  # For MA calculations
                 
-                candles = await self.market_api.get_candles(
-                    symbol=symbol,
-                    timeframe=tf_value,
-                    limit=limit
-                )
+                candles = await self.market_data.get_candles(symbol, tf_value, limit)
                 
                 candles_data[tf_name] = candles
                 
@@ -353,18 +377,18 @@ class AnalysisWorker:
     async def _process_analysis_results(self, results: List[Dict[str, Any]]):
         """Process and persist analysis results."""
         try:
-            with get_session() as session:
-                for result in results:
-                    if result.get('error'):
-                        continue  # Skip failed analyses
-                    
-                    try:
-                        await self._persist_analysis_result(session, result)
-                    except Exception as e:
-                        logger.error(f"Error persisting result for {result.get('symbol', 'unknown')}: {e}")
+            successful_results = [r for r in results if not r.get('error')]
+            
+            # Queued together so the write queue commits the whole cycle in a few transactions
+            outcomes = await asyncio.gather(
+                *(self._persist_analysis_result(result) for result in successful_results),
+                return_exceptions=True
+            )
+            for result, outcome in zip(successful_results, outcomes):
+                if isinstance(outcome, Exception):
+                    logger.error(f"Error persisting result for {result.get('symbol', 'unknown')}: {outcome}")
             
             # Log summary
-            successful_results = [r for r in results if not r.get('error')]
             signals_generated = [r for r in successful_results if r.get('signal', {}).get('signal_type') != SignalType.NEUTRAL.value]
             
             logger.info(f"Analysis cycle complete: {len(successful_results)}/{len(results)} successful, "
@@ -373,37 +397,42 @@ class AnalysisWorker:
         except Exception as e:
             logger.error(f"Error processing analysis results: {e}")
     
-    async def _persist_analysis_result(self, session, result: Dict[str, Any]):
-        """Persist a single analysis result to database."""
-        symbol = result['symbol']
-        asset_id = result['asset_id']
-        timestamp = datetime.fromisoformat(result['timestamp'].replace('Z', '+00:00'))
+    async def _persist_analysis_result(self, result: Dict[str, Any]):
+        """Persist a single analysis result through the write queue, then announce any new signal."""
+        signal_data, is_test_mode, persistence_threshold = self._prepare_signal(result)
+        # The write job may run again if its batch is retried, so it only writes to the database;
+        # statistics, logs and the broadcast happen here, once, after the commit
+        signal_persisted = await get_write_queue().run(
+            self._write_analysis_result, result, signal_data, is_test_mode, persistence_threshold
+        )
+        if not signal_persisted:
+            return
         
-        # Persist indicators for each timeframe
-        indicators_data = result.get('indicators', {})
-        for timeframe, indicators in indicators_data.items():
-            if not indicators:
-                continue
-            
-            try:
-                self.indicator_repo.upsert_indicators(
-                    session,
-                    asset_id=asset_id,
-                    timeframe=timeframe,
-                    timestamp=timestamp,
-                    mm1=indicators.get('mm1'),
-                    center=indicators.get('center'),
-                    rsi=indicators.get('rsi'),
-                    volume_sma=indicators.get('volume_sma'),
-                    additional_data={
-                        'analysis_duration': result.get('analysis_duration_seconds'),
-                        'candles_analyzed': result.get('candles_count', {}).get(timeframe, 0),
-                    }
-                )
-            except Exception as e:
-                logger.warning(f"Error persisting indicators for {symbol} {timeframe}: {e}")
+        symbol = result['symbol']
+        # Update test mode statistics if active
+        if is_test_mode:
+            increment_test_mode_stat('signals_generated')
+            if signal_data.get('test_mode_forced', False):
+                increment_test_mode_stat('signals_forced')
+                logger.warning(f"🧪 TEST MODE: Forced signal statistics updated for {symbol}")
         
-        # Persist signal if significant (with test mode adjustments)
+        # Broadcast the new signal to connected WebSocket clients
+        await connection_manager.broadcast({
+            "type": "new_signal",
+            "payload": {
+                "symbol": symbol,
+                "signal_type": signal_data['signal_type'],
+                "strength": signal_data.get('confidence', 0),
+                "timestamp": signal_data.get('timestamp', datetime.utcnow().isoformat()),
+                "rules_triggered": signal_data.get('rules_triggered', []),
+                "trading_recommendation": signal_data.get('trading_recommendation', {})
+            }
+        })
+        logger.info(f"Broadcasted new signal for {symbol}: {signal_data['signal_type']}")
+    
+    def _prepare_signal(self, result: Dict[str, Any]) -> Tuple[Dict[str, Any], bool, float]:
+        """Apply test mode adjustments; returns (signal data, test mode active, persistence threshold)."""
+        symbol = result['symbol']
         signal_data = result.get('signal', {})
         
         # Adjust persistence threshold based on test mode
@@ -446,9 +475,43 @@ class AnalysisWorker:
             # Boost signal confidence in test mode
             if signal_data.get('confidence', 0) > 0:
                 boosted_confidence = min(0.95, signal_data.get('confidence', 0) + 0.3)
-                signal_data['confidence'] = boosted_confidence
+                signal_data = {**signal_data, 'confidence': boosted_confidence}
                 logger.info(f"🧪 TEST MODE: Boosted signal confidence for {symbol} to {boosted_confidence}")
         
+        return signal_data, is_test_mode, persistence_threshold
+    
+    def _write_analysis_result(self, session, result: Dict[str, Any], signal_data: Dict[str, Any],
+                               is_test_mode: bool, persistence_threshold: float) -> bool:
+        """Write indicators and any significant signal; returns True if a signal was written."""
+        symbol = result['symbol']
+        asset_id = result['asset_id']
+        timestamp = datetime.fromisoformat(result['timestamp'].replace('Z', '+00:00'))
+        
+        # Persist indicators for each timeframe
+        indicators_data = result.get('indicators', {})
+        for timeframe, indicators in indicators_data.items():
+            if not indicators:
+                continue
+            
+            try:
+                self.indicator_repo.upsert_indicators(
+                    session,
+                    asset_id=asset_id,
+                    timeframe=timeframe,
+                    timestamp=timestamp,
+                    mm1=indicators.get('mm1'),
+                    center=indicators.get('center'),
+                    rsi=indicators.get('rsi'),
+                    volume_sma=indicators.get('volume_sma'),
+                    additional_data={
+                        'analysis_duration': result.get('analysis_duration_seconds'),
+                        'candles_analyzed': result.get('candles_count', {}).get(timeframe, 0),
+                    }
+                )
+            except Exception as e:
+                logger.warning(f"Error persisting indicators for {symbol} {timeframe}: {e}")
+        
+        # Persist signal if significant
         if (signal_data.get('signal_type', SignalType.NEUTRAL.value) != SignalType.NEUTRAL.value and
             signal_data.get('confidence', 0) >= persistence_threshold):
             
@@ -474,31 +537,12 @@ class AnalysisWorker:
                         }
                     }
                 )
-                
-                # Broadcast the new signal to connected WebSocket clients
-                signal_to_broadcast = {
-                    "type": "new_signal",
-                    "payload": {
-                        "symbol": symbol,
-                        "signal_type": signal_data['signal_type'],
-                        "strength": signal_data.get('confidence', 0),
-                        "timestamp": signal_data.get('timestamp', datetime.utcnow().isoformat()),
-                        "rules_triggered": signal_data.get('rules_triggered', []),
-                        "trading_recommendation": signal_data.get('trading_recommendation', {})
-                    }
-                }
-                await connection_manager.broadcast(signal_to_broadcast)
-                logger.info(f"Broadcasted new signal for {symbol}: {signal_data['signal_type']}")
-                
-                # Update test mode statistics if active
-                if is_test_mode:
-                    increment_test_mode_stat('signals_generated')
-                    if signal_data.get('test_mode_forced', False):
-                        increment_test_mode_stat('signals_forced')
-                        logger.warning(f"🧪 TEST MODE: Forced signal statistics updated for {symbol}")
-
+                return True
+            
             except Exception as e:
                 logger.warning(f"Error persisting signal for {symbol}: {e}")
+        
+        return False
     
     async def get_worker_status(self) -> Dict[str, Any]:
         """Get current worker status and statistics."""
@@ -509,6 +553,7 @@ class AnalysisWorker:
             'is_running': self.is_running,
             'worker_id': self.worker_id,
             'statistics': self.analysis_stats.copy(),
+            'scheduler': self.scheduler.get_stats(),
             'configuration': {
                 'scan_interval_seconds': self.config.SCAN_INTERVAL_SECONDS,
                 'max_assets_to_scan': self.config.MAX_ASSETS_TO_SCAN,
@@ -550,8 +595,7 @@ class AnalysisWorker:
             
             # Persist result if successful
             if not result.get('error'):
-                with get_session() as session:
-                    await self._persist_analysis_result(session, result)
+                await self._persist_analysis_result(result)
             
             logger.info(f"On-demand analysis completed for {symbol}")
             return result
@@ -2,7 +2,6 @@
 """BingX exchange client using CCXT library."""
 
 import asyncio
-import ccxt
 import logging
 import time
 from collections import defaultdict, deque
@@ -11,11 +10,76 @@ from decimal import Decimal, InvalidOperation
 from datetime import datetime, timezone
 
 from config.settings import Settings
+from api.market_metadata import MarketDiff, get_market_store
 from utils.logger import get_logger
+from utils import metrics, tracing
+from utils.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitOpenError, parse_retry_after
 from utils.validators import Validator, ValidationError
 
 logger = get_logger(__name__)
 
+# ccxt takes ~0.4s to import; it is loaded by _load_ccxt when the exchange is first needed
+ccxt = None
+
+
+def _load_ccxt():
+    """Import ccxt on first use and return the module."""
+    global ccxt
+    if ccxt is None:
+        import ccxt as ccxt_module
+        ccxt = ccxt_module
+    return ccxt
+
+
+# Endpoint classes with their own circuit breaker; ccxt methods not listed are market data
+ENDPOINT_CLASSES = ('market', 'account', 'order')
+_ORDER_ENDPOINT_PREFIXES = ('create_', 'cancel_', 'edit_')
+_ACCOUNT_ENDPOINTS = frozenset({
+    'fetch_balance', 'fetch_order', 'fetch_orders', 'fetch_open_orders', 'fetch_closed_orders',
+    'fetch_my_trades', 'fetch_positions', 'fetch_position', 'set_leverage',
+})
+
+# Longest circuit-breaker pause a retry loop will wait out instead of failing fast
+MAX_BREAKER_WAIT_SECONDS = 30.0
+
+
+def endpoint_class(endpoint: str) -> str:
+    """Circuit breaker class ('market', 'account' or 'order') of a ccxt method name."""
+    if endpoint.startswith(_ORDER_ENDPOINT_PREFIXES):
+        return 'order'
+    if endpoint in _ACCOUNT_ENDPOINTS:
+        return 'account'
+    return 'market'
+
+
+def _safe_decimal(value) -> Optional[Decimal]:
+    """Safely convert value to Decimal"""
+    try:
+        return Decimal(str(value)) if value is not None else None
+    except (TypeError, ValueError, InvalidOperation):
+        return None
+
+
+def _format_ticker(symbol: str, ticker: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a ccxt ticker to the bot's ticker format."""
+    return {
+        'symbol': symbol,
+        'timestamp': ticker.get('timestamp'),
+        'datetime': ticker.get('datetime'),
+        'last': _safe_decimal(ticker.get('last')),
+        'bid': _safe_decimal(ticker.get('bid')),
+        'ask': _safe_decimal(ticker.get('ask')),
+        'volume': _safe_decimal(ticker.get('baseVolume')),
+        'quote_volume': _safe_decimal(ticker.get('quoteVolume')),
+        'quoteVolume': _safe_decimal(ticker.get('quoteVolume')),  # Alternative key for compatibility
+        'change': _safe_decimal(ticker.get('change')),
+        'percentage': _safe_decimal(ticker.get('percentage')),
+        'high': _safe_decimal(ticker.get('high')),
+        'low': _safe_decimal(ticker.get('low')),
+        'open': _safe_decimal(ticker.get('open')),
+        'raw_ticker': ticker  # Keep raw data for debugging
+    }
+
 
 class BingXError(Exception):
     """Base exception for BingX API errors."""
@@ -37,19 +101,37 @@ class RateLimitError(BingXError):
     pass
 
 
+def order_not_placed(error: BaseException) -> bool:
+    """
+    True if a failed order request certainly did not create an order.
+
+    Follows the exception chain: local validation, circuit-breaker and
+    rate-limit rejections, and errors the exchange answered with mean
+    nothing was placed. Timeouts and other network failures are ambiguous
+    (the order may have reached the matching engine) and return False.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, (RateLimitError, ValidationError)):
+            return True
+        if ccxt is not None and isinstance(error, (ccxt.ExchangeError, ccxt.RateLimitExceeded)):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
 class BingXClient:
     """Main BingX exchange client using CCXT."""
     
     def __init__(self):
         self.exchange = None
         self._initialized = False
-        # Circuit breaker for rate limit protection
-        self._circuit_breaker = {
-            'is_open': False,
-            'failure_count': 0,
-            'failure_threshold': 3,
-            'recovery_time': 300,  # 5 minutes
-            'last_failure_time': 0
+        # One circuit breaker per endpoint class, so a failing market data
+        # endpoint cannot block order placement (and vice versa)
+        self._breakers = {
+            endpoint_class: CircuitBreaker(f"bingx_{endpoint_class}", CircuitBreakerConfig())
+            for endpoint_class in ENDPOINT_CLASSES
         }
         # BingX strict rate limits - ULTRA CONSERVATIVE with intelligent batching
         # Market interfaces: 100 requests per 10 seconds per IP = 10 req/s theoretical max
@@ -58,6 +140,7 @@ class BingXClient:
         self._rate_limits = {
             # Market data endpoints - Optimized for better performance
             'fetch_ticker': 5.0,     # 5 per second (50% of BingX limit)
+            'fetch_tickers': 1.0,    # 1 per second (one call covers every market)
             'fetch_ohlcv': 5.0,      # 5 per second (50% of BingX limit)
             'fetch_markets': 2.0,    # 2 per second (minimal usage)
             'fetch_orderbook': 3.0,  # 3 per second (balanced)
@@ -78,6 +161,7 @@ class BingXClient:
         self._request_cache = {}     # Cache recent results
         self._cache_ttl = {
             'fetch_ticker': 3,       # 3 seconds cache for tickers
+            'fetch_tickers': 15,     # 15 seconds cache for the all-markets snapshot
             'fetch_ohlcv': 30,       # 30 seconds cache for OHLCV
             'fetch_markets': 300,    # 5 minutes cache for markets
             'fetch_orderbook': 5,    # 5 seconds cache for orderbook
@@ -93,6 +177,13 @@ class BingXClient:
         self._last_cleanup = time.time()
         self._cleanup_interval = 60  # Cleanup every minute
         
+        # Gauges evaluated lazily on /metrics scrape
+        for breaker in self._breakers.values():
+            metrics.track_gauge(metrics.CIRCUIT_BREAKER_OPEN, breaker.name,
+                                lambda breaker=breaker: 1.0 if breaker.is_open else 0.0)
+        metrics.track_gauge(metrics.CACHE_SIZE, 'client_request_cache', lambda: len(self._request_cache))
+        metrics.track_gauge(metrics.QUEUE_DEPTH, 'client_pending_requests', lambda: len(self._pending_requests))
+        
     async def initialize(self) -> bool:
         """Initialize the CCXT exchange client."""
         try:
@@ -101,7 +192,7 @@ class BingXClient:
                 raise ValueError("BingX API credentials are required")
             
             # Initialize CCXT exchange
-            self.exchange = ccxt.bingx({
+            self.exchange = _load_ccxt().bingx({
                 'apiKey': Settings.BINGX_API_KEY,
                 'secret': Settings.BINGX_SECRET_KEY,
                 'enableRateLimit': True,
@@ -113,12 +204,22 @@ class BingXClient:
                 },
                 'sandbox': Settings.BINGX_TESTNET or Settings.BINGX_SANDBOX,
             })
+            # Market precision is read the way this exchange reports it (decimal places or tick size)
+            get_market_store().precision_mode = self.exchange.precisionMode
             
             # Test connection
             await self._test_connection()
             
             self._initialized = True
             logger.info(f"BingX client initialized successfully (Testnet: {Settings.BINGX_TESTNET})")
+            
+            # Markets from an old snapshot are replaced in the background; keep ccxt in step
+            store = get_market_store()
+            store.add_listener(self._sync_exchange_markets)
+            if store.fetcher is None:
+                store.fetcher = self.fetch_raw_markets
+            if store.is_stale:
+                store.refresh_in_background()
             return True
             
         except Exception as e:
@@ -128,12 +229,21 @@ class BingXClient:
     async def _test_connection(self):
         """Test API connection and credentials."""
         try:
-            # Test public endpoint
-            markets = await self._execute_with_retry(self.exchange.fetch_markets)
-            if not markets:
-                raise BingXError("No markets available")
-            
-            logger.info(f"BingX API connection test successful - found {len(markets)} markets")
+            store = get_market_store()
+            if len(store) or store.load():
+                # Markets come from the snapshot: a light public call is enough to test the connection
+                await self._execute_with_retry(self.exchange.fetch_time)
+                self.exchange.set_markets(store.raw_markets())
+                logger.info(f"BingX API connection test successful - {len(store)} markets from snapshot")
+            else:
+                # First start without a snapshot: the one blocking market download
+                markets = await self._execute_with_retry(self.exchange.fetch_markets)
+                if not markets:
+                    raise BingXError("No markets available")
+                self.exchange.set_markets(markets)
+                store.apply(markets)
+                await asyncio.to_thread(store.save)
+                logger.info(f"BingX API connection test successful - found {len(markets)} markets")
             
             # Test private endpoint (if not sandbox)
             if not (Settings.BINGX_TESTNET or Settings.BINGX_SANDBOX):
@@ -153,6 +263,11 @@ class BingXClient:
         except Exception as e:
             raise BingXError(f"Connection test failed: {e}")
     
+    def _sync_exchange_markets(self, diff: MarketDiff):
+        """Give ccxt the refreshed markets so its own lookups see listings and precision changes."""
+        if self.exchange is not None:
+            self.exchange.set_markets(get_market_store().raw_markets())
+    
     def _check_initialized(self):
         """Check if client is initialized."""
         if not self._initialized:
@@ -178,6 +293,7 @@ class BingXClient:
             
             if wait_time > 0:
                 logger.warning(f"Rate limit approaching for {endpoint}, waiting {wait_time:.2f}s")
+                metrics.observe_rate_limiter_wait('bingx_client', endpoint, wait_time)
                 await asyncio.sleep(wait_time)
                 # Clean up timestamps again after waiting
                 current_time = time.time()
@@ -198,6 +314,7 @@ class BingXClient:
     def _get_cached_result(self, cache_key: str, endpoint: str) -> Optional[Any]:
         """Get cached result if valid."""
         if cache_key not in self._request_cache:
+            metrics.record_cache_access('client_request_cache', False)
             return None
         
         cached_data = self._request_cache[cache_key]
@@ -207,8 +324,10 @@ class BingXClient:
         if current_time - cached_data['timestamp'] > ttl:
             # Cache expired
             del self._request_cache[cache_key]
+            metrics.record_cache_access('client_request_cache', False)
             return None
         
+        metrics.record_cache_access('client_request_cache', True)
         logger.debug(f"Cache HIT for {endpoint}: {cache_key[:8]}")
         return cached_data['result']
     
@@ -265,90 +384,93 @@ class BingXClient:
     
     async def _deduplicated_request(self, func: Callable, endpoint: str, *args, **kwargs) -> Any:
         """Execute request with deduplication, caching, and rate limiting."""
-        cache_key = self._get_cache_key(func.__name__, *args, **kwargs)
+        with tracing.span('bingx.request', endpoint=endpoint) as request_span:
+            cache_key = self._get_cache_key(func.__name__, *args, **kwargs)
         
-        # Check cache first
-        cached_result = self._get_cached_result(cache_key, endpoint)
-        if cached_result is not None:
-            return cached_result
+            # Check cache first
+            cached_result = self._get_cached_result(cache_key, endpoint)
+            if cached_result is not None:
+                request_span.set_attribute('cache', 'hit')
+                return cached_result
         
-        # Check if same request is already pending
-        if cache_key in self._pending_requests:
-            logger.debug(f"Deduplicating request {endpoint}: {cache_key[:8]}")
-            try:
-                return await self._pending_requests[cache_key]
-            except Exception as e:
-                # If awaiting the pending request fails, remove it and retry
-                logger.warning(f"Pending request failed, removing from cache: {e}")
-                self._pending_requests.pop(cache_key, None)
-                # Fall through to create new request
+            # Check if same request is already pending
+            if cache_key in self._pending_requests:
+                logger.debug(f"Deduplicating request {endpoint}: {cache_key[:8]}")
+                request_span.set_attribute('cache', 'dedup')
+                try:
+                    return await self._pending_requests[cache_key]
+                except Exception as e:
+                    # If awaiting the pending request fails, remove it and retry
+                    logger.warning(f"Pending request failed, removing from cache: {e}")
+                    self._pending_requests.pop(cache_key, None)
+                    # Fall through to create new request
+        
+            # Create new request task (not coroutine) to avoid reuse issues
+            request_span.set_attribute('cache', 'miss')
+            async def make_request():
+                try:
+                    # Apply rate limiting before actual request
+                    await self._check_rate_limit(endpoint)
+                    result = await self._execute_with_retry(func, *args, **kwargs)
+                    self._cache_result(cache_key, result)
+                    return result
+                except Exception as e:
+                    logger.error(f"Request failed for {endpoint}: {e}")
+                    raise
+                finally:
+                    # Remove from pending requests
+                    self._pending_requests.pop(cache_key, None)
+        
+            # Create and store the task (not coroutine)
+            import asyncio
+            task = asyncio.create_task(make_request())
+            self._pending_requests[cache_key] = task
         
-        # Create new request task (not coroutine) to avoid reuse issues
-        async def make_request():
             try:
-                # Apply rate limiting before actual request
-                await self._check_rate_limit(endpoint)
-                result = await self._execute_with_retry(func, *args, **kwargs)
-                self._cache_result(cache_key, result)
-                return result
+                return await task
             except Exception as e:
-                logger.error(f"Request failed for {endpoint}: {e}")
-                raise
-            finally:
-                # Remove from pending requests
+                # Clean up on error
                 self._pending_requests.pop(cache_key, None)
-        
-        # Create and store the task (not coroutine)
-        import asyncio
-        task = asyncio.create_task(make_request())
-        self._pending_requests[cache_key] = task
-        
-        try:
-            return await task
-        except Exception as e:
-            # Clean up on error
-            self._pending_requests.pop(cache_key, None)
-            raise
-    
-    def _check_circuit_breaker(self):
-        """Check if circuit breaker should allow requests."""
-        current_time = time.time()
-        cb = self._circuit_breaker
-        
-        # If circuit is open, check if we can try to recover
-        if cb['is_open']:
-            if current_time - cb['last_failure_time'] > cb['recovery_time']:
-                logger.info("Circuit breaker attempting recovery...")
-                cb['is_open'] = False
-                cb['failure_count'] = 0
-            else:
-                remaining = cb['recovery_time'] - (current_time - cb['last_failure_time'])
-                raise RateLimitError(f"Circuit breaker open - retry in {remaining:.0f}s")
-    
-    def _record_success(self):
-        """Record successful request."""
-        if self._circuit_breaker['failure_count'] > 0:
-            self._circuit_breaker['failure_count'] = max(0, self._circuit_breaker['failure_count'] - 1)
+                raise
     
-    def _record_failure(self):
-        """Record failed request."""
-        cb = self._circuit_breaker
-        cb['failure_count'] += 1
-        cb['last_failure_time'] = time.time()
-        
-        if cb['failure_count'] >= cb['failure_threshold']:
-            cb['is_open'] = True
-            logger.warning(f"Circuit breaker opened after {cb['failure_count']} failures")
+    def _get_breaker(self, endpoint: str) -> CircuitBreaker:
+        """Circuit breaker guarding the endpoint's class."""
+        return self._breakers[endpoint_class(endpoint)]
+
+    def _retry_after(self) -> Optional[float]:
+        """Pause requested in the last response's rate-limit headers, if the exchange sent one."""
+        # ccxt stores the headers before raising for the HTTP status
+        return parse_retry_after(getattr(self.exchange, 'last_response_headers', None))
+
+    def _admit(self, breaker: CircuitBreaker) -> bool:
+        """Let a request through the breaker or raise RateLimitError; True if it is a half-open probe."""
+        try:
+            return breaker.before_request()
+        except CircuitOpenError as e:
+            raise RateLimitError(str(e)) from e
 
     async def _execute_with_retry(self, func: Callable, *args, max_retries: int = 5, 
                                  delay_factor: float = 2.0) -> Any:
-        """Execute function with retry logic, exponential backoff, and circuit breaker."""
-        # Check circuit breaker first
-        self._check_circuit_breaker()
+        """Execute function with retry logic, exponential backoff, and per-endpoint-class circuit breaker."""
+        _load_ccxt()  # The except clauses below name ccxt exceptions
         
         last_exception = None
+        endpoint = getattr(func, '__name__', 'unknown')
+        breaker = self._get_breaker(endpoint)
+        backoff_delay = 0.0
+        server_pause = False
         
         for attempt in range(max_retries):
+            if attempt > 0:
+                # A breaker opened by the error rate fails fast; a pause the exchange asked
+                # for (Retry-After) is waited out when it is short enough
+                breaker_wait = breaker.retry_in()
+                if breaker_wait > 0 and (not server_pause or breaker_wait > MAX_BREAKER_WAIT_SECONDS):
+                    raise RateLimitError(f"Circuit breaker '{breaker.name}' open - retry in {breaker_wait:.0f}s")
+                await asyncio.sleep(max(backoff_delay, breaker_wait))
+            is_probe = self._admit(breaker)
+            
+            start = time.perf_counter()
             try:
                 # Check if function is coroutine (async) or regular function
                 result = func(*args)
@@ -356,85 +478,81 @@ class BingXClient:
                     result = await result
                 
                 # Record success and return
-                self._record_success()
+                metrics.observe_api_request(endpoint, time.perf_counter() - start)
+                breaker.record_success()
                 return result
             except ccxt.RateLimitExceeded as e:
-                self._record_failure()  # Record failure for circuit breaker
+                metrics.observe_api_request(endpoint, time.perf_counter() - start, 'rate_limited')
+                metrics.record_rate_limited(endpoint)
+                retry_after = self._retry_after()
+                server_pause = retry_after is not None
+                breaker.record_failure(retry_after)
                 logger.warning(f"Rate limit hit on attempt {attempt + 1}: {e}")
                 if attempt == max_retries - 1:
                     raise RateLimitError(f"Rate limit exceeded after {max_retries} attempts")
-                # Aggressive exponential backoff for rate limits
-                backoff_delay = delay_factor * (3 ** attempt) + (attempt * 5)  # Even more aggressive
+                if retry_after is not None:
+                    # The exchange said how long to wait; the breaker is open for exactly that
+                    backoff_delay = retry_after
+                else:
+                    # Aggressive exponential backoff for rate limits
+                    backoff_delay = delay_factor * (3 ** attempt) + (attempt * 5)
                 logger.info(f"Rate limit backoff: waiting {backoff_delay:.1f}s before retry {attempt + 2}")
-                await asyncio.sleep(backoff_delay)
+                metrics.record_api_retry(endpoint, 'rate_limited')
                 last_exception = e
             except ccxt.NetworkError as e:
+                metrics.observe_api_request(endpoint, time.perf_counter() - start, 'network_error')
+                server_pause = False
+                breaker.record_failure()
                 logger.warning(f"Network error on attempt {attempt + 1}: {e}")
                 if attempt == max_retries - 1:
                     raise BingXError(f"Network error after {max_retries} attempts: {e}")
-                await asyncio.sleep(delay_factor * (2 ** attempt))
+                metrics.record_api_retry(endpoint, 'network_error')
+                backoff_delay = delay_factor * (2 ** attempt)
                 last_exception = e
             except ccxt.ExchangeError as e:
+                metrics.observe_api_request(endpoint, time.perf_counter() - start, 'exchange_error')
+                # The exchange answered, so the endpoint is healthy; the request itself was rejected
+                breaker.record_success()
                 # Don't retry exchange errors - they're usually permanent
                 logger.error(f"Exchange error: {e}")
                 raise BingXError(f"Exchange error: {e}")
             except Exception as e:
+                metrics.observe_api_request(endpoint, time.perf_counter() - start, 'error')
+                server_pause = False
+                breaker.record_failure()
                 logger.error(f"Unexpected error on attempt {attempt + 1}: {e}")
                 if attempt == max_retries - 1:
                     raise BingXError(f"Unexpected error after {max_retries} attempts: {e}")
-                await asyncio.sleep(delay_factor * (2 ** attempt))
+                metrics.record_api_retry(endpoint, 'error')
+                backoff_delay = delay_factor * (2 ** attempt)
                 last_exception = e
+            finally:
+                # A probe that ended without an outcome (e.g. cancelled) hands its slot back;
+                # after a recorded outcome the breaker has left half-open and this is a no-op
+                if is_probe:
+                    breaker.release_probe()
         
         raise last_exception
     
     # Market Data Methods
     
     async def fetch_markets(self) -> List[Dict[str, Any]]:
-        """Fetch all available USDT spot markets."""
+        """Get all active USDT markets (served from the shared market metadata store)."""
         self._check_initialized()
-        await self._check_rate_limit('fetch_markets')
         
         try:
-            markets = await self._execute_with_retry(self.exchange.fetch_markets)
-            
-            # Filter for USDT pairs and convert to standard format
-            usdt_markets = []
-            for market in markets:
-                # Look for USDT pairs
-                symbol = market.get('symbol', '')
-                base_currency = market.get('base', '')
-                quote_currency = market.get('quote', '')
-                
-                # Filter for USDT markets only
-                if quote_currency == 'USDT' and market.get('active', False):
-                    # Ensure symbol is in BTC/USDT format
-                    formatted_symbol = f"{base_currency}/USDT"
-                    
-                    usdt_markets.append({
-                        'symbol': formatted_symbol,
-                        'base': base_currency,
-                        'quote': 'USDT',
-                        'active': market.get('active', False),
-                        'limits': market.get('limits', {
-                            'amount': {'min': 0, 'max': 0},
-                            'cost': {'min': 0, 'max': 0}
-                        }),
-                        'precision': market.get('precision', {
-                            'price': 8,
-                            'amount': 6
-                        }),
-                        'maker_fee': market.get('maker', 0.001),
-                        'taker_fee': market.get('taker', 0.001),
-                        'raw_data': market  # Keep original data for reference
-                    })
-            
-            logger.info(f"Fetched {len(usdt_markets)} USDT markets")
-            return usdt_markets
-            
+            return await get_market_store().get_markets()
         except Exception as e:
             logger.error(f"Error fetching markets: {e}")
             raise MarketDataError(f"Failed to fetch markets: {e}")
     
+    async def fetch_raw_markets(self) -> List[Dict[str, Any]]:
+        """Download all exchange markets in raw ccxt format (used by the market metadata store)."""
+        self._check_initialized()
+        await self._check_rate_limit('fetch_markets')
+        
+        return await self._execute_with_retry(self.exchange.fetch_markets)
+    
     async def fetch_ticker(self, symbol: str) -> Dict[str, Any]:
         """Fetch current market ticker data with caching and deduplication."""
         self._check_initialized()
@@ -448,36 +566,29 @@ class BingXClient:
                 self.exchange.fetch_ticker, 'fetch_ticker', symbol
             )
             
-            # Safe access to ticker data with proper error handling
-            def safe_decimal(value):
-                """Safely convert value to Decimal"""
-                try:
-                    return Decimal(str(value)) if value is not None else None
-                except (TypeError, ValueError, InvalidOperation):
-                    return None
-
-            return {
-                'symbol': symbol,
-                'timestamp': ticker.get('timestamp'),
-                'datetime': ticker.get('datetime'),
-                'last': safe_decimal(ticker.get('last')),
-                'bid': safe_decimal(ticker.get('bid')),
-                'ask': safe_decimal(ticker.get('ask')),
-                'volume': safe_decimal(ticker.get('baseVolume')),
-                'quote_volume': safe_decimal(ticker.get('quoteVolume')),
-                'quoteVolume': safe_decimal(ticker.get('quoteVolume')),  # Alternative key for compatibility
-                'change': safe_decimal(ticker.get('change')),
-                'percentage': safe_decimal(ticker.get('percentage')),
-                'high': safe_decimal(ticker.get('high')),
-                'low': safe_decimal(ticker.get('low')),
-                'open': safe_decimal(ticker.get('open')),
-                'raw_ticker': ticker  # Keep raw data for debugging
-            }
+            return _format_ticker(symbol, ticker)
             
         except Exception as e:
             logger.error(f"Error fetching ticker for {symbol}: {e}")
             raise MarketDataError(f"Failed to fetch ticker for {symbol}: {e}")
     
+    async def fetch_tickers(self) -> Dict[str, Dict[str, Any]]:
+        """Fetch tickers for every USDT market in one request, keyed by BASE/USDT symbol."""
+        self._check_initialized()
+        
+        try:
+            tickers = await self._deduplicated_request(self.exchange.fetch_tickers, 'fetch_tickers')
+        except Exception as e:
+            logger.error(f"Error fetching tickers: {e}")
+            raise MarketDataError(f"Failed to fetch tickers: {e}")
+        
+        formatted = {}
+        for exchange_symbol, ticker in tickers.items():
+            symbol = exchange_symbol.split(':', 1)[0]  # BTC/USDT:USDT -> BTC/USDT
+            if symbol.endswith('/USDT'):
+                formatted[symbol] = _format_ticker(symbol, ticker)
+        return formatted
+    
     async def fetch_ohlcv(self, symbol: str, timeframe: str = '1h', 
                          limit: int = 100, since: Optional[int] = None) -> List[Dict[str, Any]]:
         """Fetch OHLCV candlestick data with caching and deduplication."""
@@ -867,7 +978,7 @@ def get_rate_limit_status() -> Dict[str, Any]:
     current_time = time.time()
     status = {
         "status": "active",
-        "circuit_breaker": client._circuit_breaker.copy(),
+        "circuit_breakers": {name: breaker.get_stats() for name, breaker in client._breakers.items()},
         "cache_stats": {
             "cache_size": len(client._request_cache),
             "pending_requests": len(client._pending_requests),
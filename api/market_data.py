@@ -8,6 +8,7 @@ from decimal import Decimal
 from datetime import datetime, timezone, timedelta
 
 from .client import get_client, MarketDataError
+from .market_metadata import get_market_store
 from utils.logger import get_logger, performance_logger
 from utils.validators import Validator, ValidationError
 from utils.formatters import PriceFormatter
@@ -17,14 +18,33 @@ logger = get_logger(__name__)
 perf_logger = performance_logger
 
 
+def summarize_ticker(symbol: str, ticker: Dict[str, Any]) -> Dict[str, Any]:
+    """Market summary (price, spread, 24h volume and change) from a client ticker."""
+    return {
+        'symbol': symbol,
+        'price': ticker['last'],
+        'bid': ticker['bid'],
+        'ask': ticker['ask'],
+        'spread': ticker['ask'] - ticker['bid'] if ticker['ask'] and ticker['bid'] else None,
+        'spread_percent': ((ticker['ask'] - ticker['bid']) / ticker['last'] * 100) if ticker['ask'] and ticker['bid'] and ticker['last'] else None,
+        'volume_24h': ticker['volume'],
+        'quote_volume_24h': ticker['quote_volume'],
+        'change_24h': ticker['change'],
+        'change_percent_24h': ticker['percentage'],
+        'high_24h': ticker['high'],
+        'low_24h': ticker['low'],
+        'open_24h': ticker['open'],
+        'timestamp': ticker['timestamp'],
+        'datetime': ticker['datetime'],
+    }
+
+
 class MarketDataAPI:
     """Market data API wrapper for BingX exchange."""
     
     def __init__(self):
         self.client = get_client()
-        self._market_cache = {}
-        self._cache_ttl = 300  # 5 minutes
-        self._last_market_fetch = None
+        self.market_store = get_market_store()
         self._initialization_attempted = False
     
     async def _ensure_client_initialized(self):
@@ -52,11 +72,11 @@ class MarketDataAPI:
         try:
             await self._ensure_client_initialized()
             
-            # Get all markets and filter for active USDT pairs
-            markets = await self.client.exchange.fetch_markets()
+            # Filter the shared market metadata for active USDT pairs
+            await self.market_store.get_markets()
             valid_symbols = []
             
-            for market in markets:
+            for market in self.market_store.raw_markets():
                 if (market.get('quote') == 'USDT' and 
                     market.get('active', False) and
                     market.get('type') in ['spot', 'swap']):
@@ -76,79 +96,22 @@ class MarketDataAPI:
             ]
 
     async def get_usdt_markets(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
-        """Get all USDT trading pairs with caching."""
+        """Get all active USDT trading pairs from the shared market metadata store."""
         await self._ensure_client_initialized()
         
-        current_time = datetime.utcnow()
-        
-        # Check cache validity
-        if (not force_refresh and 
-            self._market_cache and 
-            self._last_market_fetch and
-            (current_time - self._last_market_fetch).seconds < self._cache_ttl):
-            logger.debug("Returning cached USDT markets")
-            return self._market_cache
-        
         try:
             start_time = asyncio.get_event_loop().time()
-            markets = await self.client.fetch_markets()
+            markets = await self.market_store.get_markets(force_refresh)
             duration = asyncio.get_event_loop().time() - start_time
             
-            perf_logger.execution_time("fetch_markets", duration)
-            
-            # Filter and enhance market data
-            enhanced_markets = []
-            for market in markets:
-                if market['quote'] == 'USDT' and market['active']:
-                    enhanced_markets.append({
-                        **market,
-                        'min_order_size': self._get_min_order_size(market),
-                        'price_precision': self._get_price_precision(market),
-                        'quantity_precision': self._get_quantity_precision(market),
-                    })
-            
-            # Update cache
-            self._market_cache = enhanced_markets
-            self._last_market_fetch = current_time
-            
-            logger.info(f"Fetched {len(enhanced_markets)} USDT markets")
-            return enhanced_markets
+            perf_logger.execution_time("get_usdt_markets", duration)
+            logger.debug(f"Serving {len(markets)} USDT markets ({self.market_store.age:.0f}s old)")
+            return markets
             
         except Exception as e:
             logger.error(f"Error fetching USDT markets: {e}")
             raise MarketDataError(f"Failed to fetch USDT markets: {e}")
     
-    def _get_min_order_size(self, market: Dict[str, Any]) -> Decimal:
-        """Extract minimum order size from market limits."""
-        try:
-            limits = market.get('limits', {})
-            amount_limits = limits.get('amount', {})
-            cost_limits = limits.get('cost', {})
-            
-            # Use the higher of minimum amount or cost-based minimum
-            min_amount = Decimal(str(amount_limits.get('min', 0)))
-            min_cost = Decimal(str(cost_limits.get('min', 0)))
-            
-            return max(min_amount, min_cost, TradingConfig.MIN_ORDER_SIZE_USDT)
-        except Exception:
-            return TradingConfig.MIN_ORDER_SIZE_USDT
-    
-    def _get_price_precision(self, market: Dict[str, Any]) -> int:
-        """Extract price precision from market data."""
-        try:
-            precision = market.get('precision', {})
-            return int(precision.get('price', 8))
-        except Exception:
-            return 8
-    
-    def _get_quantity_precision(self, market: Dict[str, Any]) -> int:
-        """Extract quantity precision from market data."""
-        try:
-            precision = market.get('precision', {})
-            return int(precision.get('amount', 6))
-        except Exception:
-            return 6
-    
     async def get_current_price(self, symbol: str) -> Decimal:
         """Get current price for a symbol."""
         await self._ensure_client_initialized()
@@ -169,6 +132,19 @@ class MarketDataAPI:
             logger.error(f"Error fetching current price for {symbol}: {e}")
             raise MarketDataError(f"Failed to fetch current price for {symbol}: {e}")
     
+    async def get_ticker(self, symbol: str) -> Dict[str, Any]:
+        """Get the client ticker for a symbol."""
+        await self._ensure_client_initialized()
+        
+        if not Validator.is_valid_symbol(symbol):
+            raise ValidationError(f"Invalid symbol: {symbol}")
+        
+        try:
+            return await self.client.fetch_ticker(symbol)
+        except Exception as e:
+            logger.error(f"Error fetching ticker for {symbol}: {e}")
+            raise MarketDataError(f"Failed to fetch ticker for {symbol}: {e}")
+    
     async def get_market_summary(self, symbol: str) -> Dict[str, Any]:
         """Get comprehensive market summary for a symbol."""
         await self._ensure_client_initialized()
@@ -183,28 +159,29 @@ class MarketDataAPI:
             
             perf_logger.execution_time("fetch_market_summary", duration)
             
-            return {
-                'symbol': symbol,
-                'price': ticker['last'],
-                'bid': ticker['bid'],
-                'ask': ticker['ask'],
-                'spread': ticker['ask'] - ticker['bid'] if ticker['ask'] and ticker['bid'] else None,
-                'spread_percent': ((ticker['ask'] - ticker['bid']) / ticker['last'] * 100) if ticker['ask'] and ticker['bid'] and ticker['last'] else None,
-                'volume_24h': ticker['volume'],
-                'quote_volume_24h': ticker['quote_volume'],
-                'change_24h': ticker['change'],
-                'change_percent_24h': ticker['percentage'],
-                'high_24h': ticker['high'],
-                'low_24h': ticker['low'],
-                'open_24h': ticker['open'],
-                'timestamp': ticker['timestamp'],
-                'datetime': ticker['datetime'],
-            }
+            return summarize_ticker(symbol, ticker)
             
         except Exception as e:
             logger.error(f"Error fetching market summary for {symbol}: {e}")
             raise MarketDataError(f"Failed to fetch market summary for {symbol}: {e}")
     
+    async def get_market_summaries(self) -> Dict[str, Dict[str, Any]]:
+        """Market summaries for every USDT market from one bulk ticker request."""
+        await self._ensure_client_initialized()
+        
+        try:
+            start_time = asyncio.get_event_loop().time()
+            tickers = await self.client.fetch_tickers()
+            duration = asyncio.get_event_loop().time() - start_time
+            
+            perf_logger.execution_time("fetch_market_summaries", duration, {"symbols_count": len(tickers)})
+            
+            return {symbol: summarize_ticker(symbol, ticker) for symbol, ticker in tickers.items()}
+            
+        except Exception as e:
+            logger.error(f"Error fetching market summaries: {e}")
+            raise MarketDataError(f"Failed to fetch market summaries: {e}")
+    
     async def get_candles(self, symbol: str, timeframe: str = '1h', 
                          limit: int = 100, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """Get candlestick data for a symbol."""
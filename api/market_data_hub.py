@@ -0,0 +1,342 @@
+# api/market_data_hub.py
+"""In-process market data hub: one fetch per (symbol, timeframe) freshness window, shared by all consumers."""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from analysis.resampling import (
+    MAX_KLINE_LIMIT, can_resample, resample_candles, source_candles_needed, verify_resampled_candles
+)
+from api.market_data import get_market_data_api
+from config.trading_config import TradingConfig
+from utils.logger import get_logger
+from utils.rate_limiter import get_rate_limiter
+
+logger = get_logger(__name__)
+
+TICKER = 'ticker'
+
+# How long a fetched series is served before it is refetched (seconds)
+DEFAULT_FRESHNESS_SECONDS = {
+    TICKER: 3,
+    '1m': 15,
+    '5m': 30,
+    '15m': 30,
+    '30m': 30,
+    '1h': 30,
+    '2h': 30,
+    '4h': 30,
+    '1d': 60,
+}
+
+
+class MarketDataHubError(Exception):
+    """Exception for market data hub errors."""
+    pass
+
+
+@dataclass
+class MarketDataUpdate:
+    """Update published to subscribers when a series is refreshed."""
+    symbol: str
+    timeframe: str
+    data: Any
+    fetched_at: float
+
+
+@dataclass
+class _Series:
+    """Cached state of one (symbol, timeframe) series."""
+    data: Any = None
+    fetched_at: float = 0.0
+    history: int = 0  # Largest history any consumer asked for
+    fetched_history: int = 0  # History requested by the fetch that produced `data`
+    subscriptions: Set['MarketDataSubscription'] = field(default_factory=set)
+
+
+class MarketDataSubscription:
+    """A consumer's subscription to a series; updates arrive on `queue`."""
+
+    def __init__(self, hub: 'MarketDataHub', symbol: str, timeframe: str, min_history: int, maxsize: int):
+        self.hub = hub
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.min_history = min_history
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def publish(self, update: MarketDataUpdate):
+        """Deliver an update, dropping the oldest one if the consumer is behind."""
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait(update)
+
+    async def get(self) -> MarketDataUpdate:
+        """Wait for the next update."""
+        return await self.queue.get()
+
+    def close(self):
+        """Unsubscribe from the hub."""
+        self.hub.unsubscribe(self)
+
+
+class MarketDataHub:
+    """
+    Owns tickers and candle series for all scanners and workers.
+
+    Each (symbol, timeframe) is fetched at most once per freshness window and
+    with the largest history any consumer needs; smaller requests are served
+    from the tail of the cached series. Concurrent requests for a stale series
+    share one in-flight fetch, so the API request count is independent of how
+    many consumers are running. Subscribers additionally get pushed updates
+    whenever a series they follow is refreshed.
+
+    With a `resample_source` timeframe (e.g. '1h'), candle requests for higher
+    timeframes that are whole multiples of it are built locally from that one
+    series, so 2h and 4h share a single fetch.
+    """
+
+    def __init__(self, freshness: Optional[Dict[str, float]] = None, refresh_interval: float = 1.0,
+                 resample_source: Optional[str] = None):
+        self.market_api = get_market_data_api()
+        self.rate_limiter = get_rate_limiter()
+        self.freshness = {**DEFAULT_FRESHNESS_SECONDS, **(freshness or {})}
+        self.refresh_interval = refresh_interval
+        self.resample_source = resample_source
+
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        # (symbol, timeframe) -> (source fetched_at, source length, resampled candles)
+        self._resampled: Dict[Tuple[str, str], Tuple[float, int, List[Dict[str, Any]]]] = {}
+        # (symbol, timeframe) -> (future, history the fetch requested)
+        self._in_flight: Dict[Tuple[str, str], Tuple[asyncio.Future, int]] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            'requests': 0,
+            'cache_hits': 0,
+            'fetches': 0,
+            'coalesced': 0,
+            'fetch_errors': 0,
+            'updates_published': 0,
+            'resampled': 0,
+        }
+
+    def _get_series(self, key: Tuple[str, str]) -> _Series:
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series()
+        return series
+
+    def _is_fresh(self, key: Tuple[str, str], series: _Series, min_history: int) -> bool:
+        if series.data is None:
+            return False
+        if time.time() - series.fetched_at > self.freshness.get(key[1], 30):
+            return False
+        # Compare with what was requested, not returned: a young listing has fewer candles than asked for
+        return key[1] == TICKER or series.fetched_history >= min_history
+
+    async def _fetch(self, key: Tuple[str, str], history: int) -> Any:
+        symbol, timeframe = key
+        await self.rate_limiter.acquire('market_data')
+        self.stats['fetches'] += 1
+
+        if timeframe == TICKER:
+            return await self.market_api.get_ticker(symbol)
+        return await self.market_api.get_candles(symbol, timeframe, limit=history)
+
+    async def _get(self, symbol: str, timeframe: str, min_history: int = 0) -> Any:
+        key = (symbol, timeframe)
+        series = self._get_series(key)
+        series.history = max(series.history, min_history)
+        self.stats['requests'] += 1
+
+        if self._is_fresh(key, series, min_history):
+            self.stats['cache_hits'] += 1
+            return series.data
+
+        loop = asyncio.get_running_loop()
+        in_flight, in_flight_history = self._in_flight.get(key, (None, 0))
+        # Futures are loop-bound; callers on another loop (e.g. a worker thread) fetch on their own.
+        # A fetch started for less history than this caller needs is not joined either.
+        if (in_flight is not None and in_flight.get_loop() is loop and not in_flight.done()
+                and (key[1] == TICKER or in_flight_history >= min_history)):
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(in_flight)
+
+        future = loop.create_future()
+        history = series.history
+        self._in_flight[key] = (future, history)
+        started_at = time.time()
+        try:
+            data = await self._fetch(key, history)
+            # A concurrent fetch for more history may have finished first; keep its longer series
+            stored = not (series.fetched_at >= started_at and series.fetched_history > history)
+            if stored:
+                series.data = data
+                series.fetched_at = time.time()
+                series.fetched_history = history
+            future.set_result(data)
+        except Exception as e:
+            self.stats['fetch_errors'] += 1
+            future.set_exception(e)
+            # Mark retrieved so an un-awaited failure does not log "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            if self._in_flight.get(key, (None, 0))[0] is future:
+                del self._in_flight[key]
+
+        if stored:
+            self._publish(key, series)
+        return data
+
+    def _publish(self, key: Tuple[str, str], series: _Series):
+        if not series.subscriptions:
+            return
+        update = MarketDataUpdate(symbol=key[0], timeframe=key[1], data=series.data, fetched_at=series.fetched_at)
+        for subscription in list(series.subscriptions):
+            subscription.publish(update)
+            self.stats['updates_published'] += 1
+
+    async def get_candles(self, symbol: str, timeframe: str, min_history: int = 100) -> List[Dict[str, Any]]:
+        """
+        Get the most recent `min_history` candles for a symbol and timeframe.
+
+        Returns the cached series when it is fresh and long enough; otherwise
+        triggers (or joins) a single fetch.
+        """
+        if self._should_resample(timeframe, min_history):
+            candles = await self._get_resampled(symbol, timeframe, min_history)
+        else:
+            candles = await self._get(symbol, timeframe, min_history)
+        return list(candles[-min_history:]) if min_history else list(candles)
+
+    def _should_resample(self, timeframe: str, min_history: int) -> bool:
+        if not self.resample_source or not can_resample(self.resample_source, timeframe):
+            return False
+        # Fall back to a direct fetch when the source series would exceed one kline request
+        return source_candles_needed(self.resample_source, timeframe, min_history or 100) <= MAX_KLINE_LIMIT
+
+    async def _get_resampled(self, symbol: str, timeframe: str, min_history: int) -> List[Dict[str, Any]]:
+        source_history = source_candles_needed(self.resample_source, timeframe, min_history or 100)
+        source = await self._get(symbol, self.resample_source, source_history)
+        fetched_at = self._series[(symbol, self.resample_source)].fetched_at
+
+        cached = self._resampled.get((symbol, timeframe))
+        if cached is not None and cached[0] == fetched_at and cached[1] == len(source):
+            return cached[2]
+
+        candles = resample_candles(source, self.resample_source, timeframe)
+        self._resampled[(symbol, timeframe)] = (fetched_at, len(source), candles)
+        self.stats['resampled'] += 1
+        return candles
+
+    async def get_ticker(self, symbol: str) -> Dict[str, Any]:
+        """Get the current ticker for a symbol."""
+        return await self._get(symbol, TICKER)
+
+    async def verify_resampling(self, symbol: str, timeframe: str, count: int = 50) -> Dict[str, Any]:
+        """Fetch exchange candles for a resampled timeframe and compare them with the local build."""
+        if not self._should_resample(timeframe, count):
+            raise MarketDataHubError(f"{timeframe} is not resampled from {self.resample_source}")
+
+        resampled = await self._get_resampled(symbol, timeframe, count)
+        await self.rate_limiter.acquire('market_data')
+        exchange_candles = await self.market_api.get_candles(symbol, timeframe, limit=count)
+        result = verify_resampled_candles(resampled, exchange_candles)
+
+        if result['matches']:
+            logger.info(f"✅ Resampled {symbol} {timeframe} matches exchange ({result['compared']} candles)")
+        else:
+            logger.warning(f"⚠️ Resampled {symbol} {timeframe} differs from exchange: "
+                           f"{len(result['mismatches'])} mismatches in {result['compared']} candles")
+        return result
+
+    def subscribe(self, symbol: str, timeframe: str, min_history: int = 100,
+                  maxsize: int = 10) -> MarketDataSubscription:
+        """
+        Subscribe to refreshes of a series (timeframe may be 'ticker').
+
+        The hub's background refresh loop is started on first subscription and
+        refetches subscribed series as they go stale.
+        """
+        key = (symbol, timeframe)
+        series = self._get_series(key)
+        series.history = max(series.history, min_history)
+
+        subscription = MarketDataSubscription(self, symbol, timeframe, min_history, maxsize)
+        series.subscriptions.add(subscription)
+        self._ensure_refresh_loop()
+        return subscription
+
+    def unsubscribe(self, subscription: MarketDataSubscription):
+        """Remove a subscription."""
+        series = self._series.get((subscription.symbol, subscription.timeframe))
+        if series is not None:
+            series.subscriptions.discard(subscription)
+
+    def _ensure_refresh_loop(self):
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        try:
+            self._refresh_task = asyncio.get_running_loop().create_task(self._refresh_loop())
+        except RuntimeError:
+            logger.debug("No running event loop; market data refresh loop not started")
+
+    async def _refresh_loop(self):
+        """Refetch stale subscribed series and publish them to subscribers."""
+        while any(series.subscriptions for series in self._series.values()):
+            stale = [
+                key for key, series in self._series.items()
+                if series.subscriptions and not self._is_fresh(key, series, series.history)
+            ]
+            if stale:
+                results = await asyncio.gather(
+                    *(self._get(symbol, timeframe, self._series[(symbol, timeframe)].history)
+                      for symbol, timeframe in stale),
+                    return_exceptions=True
+                )
+                for (symbol, timeframe), result in zip(stale, results):
+                    if isinstance(result, Exception):
+                        logger.warning(f"Market data hub refresh failed for {symbol} {timeframe}: {result}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop cached data for one symbol (or everything)."""
+        for key, series in self._series.items():
+            if symbol is None or key[0] == symbol:
+                series.data = None
+                series.fetched_at = 0.0
+        for key in [k for k in self._resampled if symbol is None or k[0] == symbol]:
+            del self._resampled[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hub statistics."""
+        requests = self.stats['requests']
+        return {
+            **self.stats,
+            'series': len(self._series),
+            'subscriptions': sum(len(s.subscriptions) for s in self._series.values()),
+            'hit_rate': (self.stats['cache_hits'] + self.stats['coalesced']) / requests * 100 if requests else 0,
+        }
+
+
+# Global hub instance
+_market_data_hub: Optional[MarketDataHub] = None
+
+
+def get_market_data_hub() -> MarketDataHub:
+    """Get or create global market data hub instance."""
+    global _market_data_hub
+    if _market_data_hub is None:
+        _market_data_hub = MarketDataHub(
+            resample_source=(TradingConfig.CANDLE_RESAMPLE_SOURCE_TIMEFRAME
+                             if TradingConfig.CANDLE_RESAMPLING_ENABLED else None)
+        )
+    return _market_data_hub
@@ -0,0 +1,378 @@
+# api/market_metadata.py
+"""Exchange market metadata shared by the client, scanners and trading: persisted snapshot plus delta refresh."""
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from decimal import ROUND_DOWN, Decimal, InvalidOperation
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from config.settings import Settings
+from config.trading_config import TradingConfig
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+# ccxt precisionMode values (ccxt.base.decimal_to_precision), kept here so ccxt loads lazily
+DECIMAL_PLACES = 2
+TICK_SIZE = 4
+
+# Fields whose change is reported as a market update (precision, limits, listing state)
+_DIFF_FIELDS = ('active', 'precision', 'limits')
+
+
+class MarketMetadataError(Exception):
+    """Exception for market metadata store errors."""
+    pass
+
+
+@dataclass
+class MarketDiff:
+    """Symbols that appeared, disappeared or changed between two market lists."""
+    listed: List[str] = field(default_factory=list)
+    delisted: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.listed or self.delisted or self.changed)
+
+
+def _decimals(value: Any, default: int, precision_mode: int = DECIMAL_PLACES) -> int:
+    """Decimal places from a ccxt precision value, read according to the exchange's precisionMode."""
+    if value is None:
+        return default
+    try:
+        number = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return default
+    if not number.is_finite():
+        return default
+    if precision_mode == TICK_SIZE:
+        if number <= 0:
+            return default
+        return max(0, -number.normalize().as_tuple().exponent)
+    # DECIMAL_PLACES (and SIGNIFICANT_DIGITS, whose digit count is the closest decimal-places reading)
+    if number < 0 or number != number.to_integral_value():
+        return default
+    return int(number)
+
+
+def _to_decimal(value: Any) -> Decimal:
+    try:
+        return Decimal(str(value)) if value is not None else Decimal('0')
+    except (InvalidOperation, ValueError):
+        return Decimal('0')
+
+
+def normalize_market(market: Dict[str, Any], precision_mode: int = DECIMAL_PLACES) -> Optional[Dict[str, Any]]:
+    """
+    Convert a raw ccxt market to the format used across the bot.
+
+    Returns None for markets not quoted in USDT. The symbol is always
+    BASE/USDT, so spot and perpetual markets of one coin share a key.
+    precision_mode is the exchange's ccxt precisionMode.
+    """
+    base = market.get('base', '')
+    if market.get('quote') != 'USDT' or not base:
+        return None
+
+    limits = market.get('limits') or {'amount': {'min': 0, 'max': 0}, 'cost': {'min': 0, 'max': 0}}
+    precision = market.get('precision') or {'price': 8, 'amount': 6}
+    min_amount = _to_decimal((limits.get('amount') or {}).get('min'))
+    min_cost = _to_decimal((limits.get('cost') or {}).get('min'))
+    return {
+        'symbol': f"{base}/USDT",
+        'base': base,
+        'quote': 'USDT',
+        'type': market.get('type'),
+        'active': bool(market.get('active', False)),
+        'limits': limits,
+        'precision': precision,
+        'maker_fee': market.get('maker', 0.001),
+        'taker_fee': market.get('taker', 0.001),
+        'min_order_size': max(min_amount, min_cost, TradingConfig.MIN_ORDER_SIZE_USDT),
+        'price_precision': _decimals(precision.get('price'), 8, precision_mode),
+        'quantity_precision': _decimals(precision.get('amount'), 6, precision_mode),
+        'raw_data': market,
+    }
+
+
+def diff_markets(old: Dict[str, Dict[str, Any]], new: Dict[str, Dict[str, Any]]) -> MarketDiff:
+    """Compare two symbol indexes; inactive markets count as delisted."""
+    old_active = {symbol for symbol, market in old.items() if market['active']}
+    new_active = {symbol for symbol, market in new.items() if market['active']}
+    changed = [
+        symbol for symbol in sorted(old_active & new_active)
+        if any(old[symbol].get(key) != new[symbol].get(key) for key in _DIFF_FIELDS)
+    ]
+    return MarketDiff(listed=sorted(new_active - old_active), delisted=sorted(old_active - new_active),
+                      changed=changed)
+
+
+class MarketMetadataStore:
+    """
+    Single source of exchange market metadata.
+
+    Holds the raw ccxt markets (so a fresh ccxt exchange can be seeded
+    without load_markets) and a BASE/USDT symbol index for O(1) precision
+    and limit lookups. The last fetched list is persisted to a JSON
+    snapshot, so a restart only needs the file; the exchange is asked again
+    in the background once the snapshot is older than `max_age`. Each
+    refresh is diffed against the previous list and listeners are told
+    about listings, delistings and changed precision or limits.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_age: float = 3600,
+                 fetcher: Optional[Callable[[], Awaitable[List[Dict[str, Any]]]]] = None,
+                 precision_mode: int = DECIMAL_PLACES):
+        self.path = Path(path) if path is not None else None
+        self.max_age = max_age
+        self.fetcher = fetcher
+        self.precision_mode = precision_mode  # ccxt precisionMode of the exchange the markets come from
+        self.updated_at = 0.0
+        self._raw: List[Dict[str, Any]] = []
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._active: List[Dict[str, Any]] = []
+        self._listeners: List[Callable[[MarketDiff], Any]] = []
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.last_diff = MarketDiff()
+        self.stats = {
+            'snapshot_loads': 0,
+            'refreshes': 0,
+            'refresh_errors': 0,
+            'listed': 0,
+            'delisted': 0,
+            'changed': 0,
+        }
+
+    # Lookups (synchronous, O(1) per symbol)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, symbol: str) -> bool:
+        return self.get(symbol) is not None
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Market for 'BTC/USDT' (a ccxt swap symbol like 'BTC/USDT:USDT' also works)."""
+        market = self._index.get(symbol)
+        if market is None and ':' in symbol:
+            market = self._index.get(symbol.split(':', 1)[0])
+        return market
+
+    def markets(self, active_only: bool = True) -> List[Dict[str, Any]]:
+        """USDT markets in symbol order."""
+        return self._active if active_only else list(self._index.values())
+
+    def raw_markets(self) -> List[Dict[str, Any]]:
+        """Raw ccxt markets, as needed by exchange.set_markets."""
+        return self._raw
+
+    @property
+    def age(self) -> float:
+        """Seconds since the markets were fetched from the exchange."""
+        return time.time() - self.updated_at if self.updated_at else float('inf')
+
+    @property
+    def is_stale(self) -> bool:
+        return self.age >= self.max_age
+
+    def round_quantity(self, symbol: str, quantity: Decimal) -> Optional[Decimal]:
+        """Round a quantity down to the market's amount precision; None for unknown symbols."""
+        market = self.get(symbol)
+        if market is None:
+            return None
+        return quantity.quantize(Decimal(1).scaleb(-market['quantity_precision']), rounding=ROUND_DOWN)
+
+    def min_notional(self, symbol: str, price: Decimal) -> Decimal:
+        """Smallest order value (USDT) the exchange accepts at `price`; 0 when unknown."""
+        market = self.get(symbol)
+        if market is None:
+            return Decimal('0')
+        limits = market['limits']
+        min_amount = _to_decimal((limits.get('amount') or {}).get('min'))
+        min_cost = _to_decimal((limits.get('cost') or {}).get('min'))
+        return max(min_cost, min_amount * price)
+
+    # Loading and refreshing
+
+    def add_listener(self, callback: Callable[[MarketDiff], Any]):
+        """Call `callback(diff)` after every refresh that changed something."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[MarketDiff], Any]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def apply(self, raw_markets: List[Dict[str, Any]], updated_at: Optional[float] = None) -> MarketDiff:
+        """Replace the markets with a freshly fetched list and report what changed."""
+        index = {}
+        for raw in raw_markets:
+            market = normalize_market(raw, self.precision_mode)
+            if market is None:
+                continue
+            existing = index.get(market['symbol'])
+            # Spot and swap share BASE/USDT; the bot trades perpetuals, so an active swap wins
+            if existing is None or (market['active'], market['type'] == 'swap') > \
+                    (existing['active'], existing['type'] == 'swap'):
+                index[market['symbol']] = market
+
+        diff = diff_markets(self._index, index) if self._index else MarketDiff()
+        self._raw = list(raw_markets)
+        self._index = dict(sorted(index.items()))
+        self._active = [market for market in self._index.values() if market['active']]
+        self.updated_at = updated_at if updated_at is not None else time.time()
+        return diff
+
+    def load(self) -> bool:
+        """Load the persisted snapshot; returns False if there is none or it is unreadable."""
+        if self.path is None or not self.path.exists():
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            if snapshot.get('version') != SNAPSHOT_VERSION:
+                logger.warning(f"Ignoring market snapshot {self.path}: unsupported version {snapshot.get('version')}")
+                return False
+            self.precision_mode = snapshot.get('precision_mode', self.precision_mode)
+            self.apply(snapshot['markets'], updated_at=snapshot['updated_at'])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Could not load market snapshot {self.path}: {e}")
+            return False
+        self.stats['snapshot_loads'] += 1
+        logger.info(f"📦 Loaded {len(self)} USDT markets from snapshot ({self.age:.0f}s old)")
+        return True
+
+    def save(self):
+        """Write the snapshot atomically (temporary file, then rename)."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': SNAPSHOT_VERSION, 'updated_at': self.updated_at,
+                       'precision_mode': self.precision_mode, 'markets': self._raw},
+                      f, separators=(',', ':'), default=str)
+        os.replace(tmp_path, self.path)
+
+    async def refresh(self) -> MarketDiff:
+        """Fetch all markets from the exchange, persist them and notify listeners of changes."""
+        fetcher = self.fetcher
+        if fetcher is None:
+            # Set by the first client that initializes; fall back to the global client
+            from api.client import get_client
+            fetcher = get_client().fetch_raw_markets
+
+        try:
+            raw_markets = await fetcher()
+        except Exception as e:
+            self.stats['refresh_errors'] += 1
+            raise MarketMetadataError(f"Market refresh failed: {e}")
+        if not raw_markets:
+            self.stats['refresh_errors'] += 1
+            raise MarketMetadataError("Exchange returned no markets")
+
+        diff = self.apply(raw_markets)
+        self.stats['refreshes'] += 1
+        try:
+            await asyncio.to_thread(self.save)
+        except OSError as e:
+            logger.warning(f"Could not write market snapshot {self.path}: {e}")
+
+        if diff:
+            self.last_diff = diff
+            self.stats['listed'] += len(diff.listed)
+            self.stats['delisted'] += len(diff.delisted)
+            self.stats['changed'] += len(diff.changed)
+            logger.info(f"🔄 Markets updated: {len(diff.listed)} listed {diff.listed[:10]}, "
+                        f"{len(diff.delisted)} delisted {diff.delisted[:10]}, {len(diff.changed)} changed")
+            for callback in list(self._listeners):
+                try:
+                    result = callback(diff)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    logger.error(f"Market listener failed: {e}")
+        return diff
+
+    async def _refresh_shared(self) -> MarketDiff:
+        # Concurrent callers wait for one exchange request instead of each making their own
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.refresh())
+        return await asyncio.shield(self._refresh_task)
+
+    def refresh_in_background(self) -> asyncio.Task:
+        """Start a refresh without waiting for it (at most one runs at a time)."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.refresh())
+            self._refresh_task.add_done_callback(self._log_background_failure)
+        return self._refresh_task
+
+    @staticmethod
+    def _log_background_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background market refresh failed: {task.exception()}")
+
+    async def get_markets(self, force_refresh: bool = False, active_only: bool = True) -> List[Dict[str, Any]]:
+        """
+        USDT markets, fetching only when there is nothing to serve.
+
+        Stale data is returned immediately while a background refresh runs;
+        `force_refresh` waits for fresh data.
+        """
+        if not self._index and not force_refresh:
+            self.load()
+        if force_refresh or not self._index:
+            await self._refresh_shared()
+        elif self.is_stale:
+            self.refresh_in_background()
+        return self.markets(active_only)
+
+    async def run_refresh_loop(self, is_ready: Callable[[], bool] = lambda: True):
+        """Refresh whenever the data gets stale (for the background task registry)."""
+        while True:
+            try:
+                await asyncio.sleep(max(1.0, min(self.max_age - self.age, self.max_age)))
+                if is_ready() and self.is_stale:
+                    await self._refresh_shared()
+            except asyncio.CancelledError:
+                break
+            except MarketMetadataError as e:
+                logger.warning(f"{e} - retrying in 60s")
+                await asyncio.sleep(60)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot age, market counts and refresh counters."""
+        return {
+            **self.stats,
+            'markets': len(self._index),
+            'active_markets': len(self._active),
+            'age_seconds': round(self.age, 1) if self.updated_at else None,
+            'snapshot': str(self.path) if self.path else None,
+            'last_diff': {
+                'listed': self.last_diff.listed[:20],
+                'delisted': self.last_diff.delisted[:20],
+                'changed': self.last_diff.changed[:20],
+            },
+        }
+
+
+# Global store instance
+_market_store: Optional[MarketMetadataStore] = None
+
+
+def get_market_store() -> MarketMetadataStore:
+    """Get the global market metadata store (snapshot path and refresh age from Settings)."""
+    global _market_store
+    if _market_store is None:
+        path = Path(Settings.MARKET_SNAPSHOT_FILE)
+        if not path.is_absolute():
+            path = Settings.BASE_DIR / path
+        _market_store = MarketMetadataStore(path, max_age=Settings.MARKET_REFRESH_SECONDS)
+    return _market_store
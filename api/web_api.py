@@ -6,13 +6,13 @@ Provides REST endpoints and WebSocket connections for the frontend
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends
 from contextlib import asynccontextmanager
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from typing import List, Dict, Any, Optional
 import asyncio
 import json
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from utils.datetime_utils import utc_now, safe_datetime_subtract
 from pathlib import Path
@@ -24,13 +24,15 @@ from database.repository import (
 )
 from sqlalchemy.orm import Session
 from utils.logger import get_logger
+from utils.background_tasks import BackgroundTaskRegistry
+from api.market_metadata import get_market_store
 from config.settings import get_settings
 from config.trading_config import TradingConfig
 
 logger = get_logger(__name__)
 settings = get_settings()
 
-# Initialize BingX client
+# Initialize BingX client (cheap: ccxt is only imported when the exchange is first used)
 bingx_client = None
 try:
     from api.client import get_client
@@ -81,6 +83,9 @@ database_ready = False
 real_time_broadcasting_enabled = False
 scanner_worker = None
 
+# Long-running tasks started by startup_event and cancelled by shutdown_event
+background_tasks = BackgroundTaskRegistry()
+
 async def initialize_signal_broadcasting():
     """Initialize real-time signal broadcasting system - DISABLED for performance."""
     global real_time_broadcasting_enabled, scanner_worker
@@ -244,21 +249,17 @@ async def get_realtime_status():
 async def startup_event():
     """Initialize database on startup with optimized performance."""
     global startup_complete, database_ready
-    import asyncio
     import random
     
     try:
         logger.info("FastAPI server starting - health check will be available immediately")
         
-        # Start database initialization in background (non-blocking)
-        asyncio.create_task(initialize_database_background())
+        # Start database initialization and background tasks (non-blocking)
+        background_tasks.start_all()
         
         # Initialize real-time signal broadcasting
         await initialize_signal_broadcasting()
         
-        # Start background tasks immediately (they handle their own initialization)
-        asyncio.create_task(start_background_tasks_delayed())
-        
         startup_complete = True
         logger.info("FastAPI startup completed - health check ready")
     
@@ -266,6 +267,7 @@ async def startup_event():
         logger.warning(f"Startup event error: {e} - server will continue without some features")
         startup_complete = True
 
+@background_tasks.task('database_init')
 async def initialize_database_background():
     """Initialize database in background to avoid blocking startup."""
     global database_ready
@@ -307,15 +309,6 @@ async def initialize_database_background():
     except Exception as e:
         logger.warning(f"Background database initialization failed: {e} - running without database")
 
-async def start_background_tasks_delayed():
-    """Start background tasks with delay to allow database initialization."""
-    try:
-        # Wait a bit for database to be ready, but don't block startup
-        await asyncio.sleep(1.0)
-        await start_background_tasks()
-    except Exception as e:
-        logger.warning(f"Background tasks startup failed: {e}")
-
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -805,6 +798,38 @@ def get_position_repo():
 
 # Note: Root endpoint is now handled by StaticFiles mount above
 
+# Prometheus metrics
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Expose Prometheus metrics (API latency, caches, rate limits, DB, cycles, queues)."""
+    from utils.metrics import render_metrics
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+# Tracing: span latency percentiles and recent sampled spans
+@app.get("/api/traces")
+async def get_traces(name: Optional[str] = None, limit: int = 100):
+    """Get tracer stats (p50/p95/p99 per span) and the most recent finished spans."""
+    from utils.tracing import get_tracer
+    tracer = get_tracer()
+    return {
+        "stats": tracer.get_stats(),
+        "spans": [s.to_dict() for s in tracer.ring_buffer.get_spans(name=name, limit=min(limit, 1000))],
+    }
+
+# Equity curve (downsampled for charting)
+@app.get("/api/risk/equity-curve")
+async def get_equity_curve(hours: int = 24, points: int = 500):
+    """Get the persisted equity curve for the last `hours`, downsampled to about `points` points."""
+    from trading.equity_curve import get_equity_curve_history
+    try:
+        start_time = datetime.now(timezone.utc) - timedelta(hours=max(hours, 1))
+        curve = await asyncio.to_thread(get_equity_curve_history, start_time, None, min(max(points, 10), 5000))
+        return {"hours": hours, "points": curve}
+    except Exception as e:
+        logger.error(f"Error getting equity curve: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Health check
 @app.get("/health")
 async def health_check():
@@ -889,7 +914,9 @@ async def readiness_check():
             "startup_complete": startup_complete,
             "database_ready": database_ready,
             "api_responsive": True
-        }
+        },
+        "background_tasks": background_tasks.get_stats(),
+        "market_metadata": get_market_store().get_stats()
     }
 
 @app.get("/api/test-db")
@@ -1586,13 +1613,13 @@ async def get_active_signals(
     """Get unprocessed signals"""
     try:
         # Get pending signals (recent signals that may be unprocessed)
-        signals = repo.get_pending_signals(db, limit=50)
+        signals = repo.get_pending_signal_rows(db, limit=50)
         return {
             "success": True,
             "signals": [
                 {
                     "id": str(signal.id),
-                    "symbol": signal.asset.symbol if signal.asset else "UNKNOWN",
+                    "symbol": signal.symbol or "UNKNOWN",
                     "signal_type": signal.signal_type,
                     "strength": float(signal.strength) if signal.strength else None,
                     "timestamp": signal.timestamp.isoformat() if signal.timestamp else None,
@@ -1618,7 +1645,7 @@ async def get_trades(
 ):
     """Get trade history"""
     try:
-        trades = repo.get_trades(
+        trades = repo.get_trade_rows(
             db,
             symbol=symbol,
             status=status,
@@ -1628,7 +1655,7 @@ async def get_trades(
             "trades": [
                 {
                     "id": str(t.id),
-                    "symbol": t.asset.symbol if t.asset else "UNKNOWN",
+                    "symbol": t.symbol or "UNKNOWN",
                     "side": t.side,
                     "amount": float(t.quantity) if t.quantity else 0,
                     "price": float(t.entry_price) if t.entry_price else 0,
@@ -1655,7 +1682,7 @@ async def get_trading_trades(
     try:
         logger.info(f"Trading trades requested - symbol: {symbol}, status: {status}, limit: {limit}")
         
-        trades = repo.get_trades(
+        trades = repo.get_trade_rows(
             db,
             symbol=symbol,
             status=status,
@@ -1675,7 +1702,7 @@ async def get_trading_trades(
             
             trade_data = {
                 "id": str(trade.id),
-                "symbol": trade.asset.symbol if trade.asset else "UNKNOWN",
+                "symbol": trade.symbol or "UNKNOWN",
                 "side": trade.side,
                 "amount": float(trade.quantity) if trade.quantity else 0,
                 "entry_price": float(trade.entry_price) if trade.entry_price else 0,
@@ -2999,7 +3026,7 @@ async def get_active_positions(
         logger.info("Fetching active trading positions")
         
         # Get open trades from database
-        open_trades = trade_repo.get_open_trades(db)
+        open_trades = trade_repo.get_open_trade_rows(db)
         
         positions = []
         for trade in open_trades:
@@ -3264,7 +3291,7 @@ async def get_trading_summary(
         today_trades = trade_repo.get_trades_today(db)
         
         # Get all open positions  
-        open_positions = trade_repo.get_open_trades(db)
+        open_positions = trade_repo.get_open_trade_rows(db)
         
         # Calculate total unrealized P&L
         total_unrealized_pnl = 0
@@ -3748,11 +3775,9 @@ async def _get_comprehensive_trading_snapshot():
             trade_repo = TradeRepository()
             signal_repo = SignalRepository()
             
-            # Get active trades
-            open_trades = trade_repo.get_open_trades(db)
-            
-            # Get recent signals (last 24 hours)
-            recent_signals = signal_repo.get_recent_signals(db, hours=24, limit=20)
+            # Get active trades and recent signals (last 24 hours) as rows with symbols
+            open_trades = trade_repo.get_open_trade_rows(db)
+            recent_signals = signal_repo.get_recent_signal_rows(db, hours=24, limit=20)
             
             # Get trading cache data
             trading_cache = get_trading_cache()
@@ -3773,7 +3798,7 @@ async def _get_comprehensive_trading_snapshot():
                     
                     positions_data.append({
                         "id": str(trade.id),
-                        "symbol": trade.asset.symbol if trade.asset else "UNKNOWN",
+                        "symbol": trade.symbol or "UNKNOWN",
                         "side": trade.side,
                         "entry_price": float(trade.entry_price),
                         "current_price": current_price,
@@ -3805,7 +3830,7 @@ async def _get_comprehensive_trading_snapshot():
                     "recent_signals": [
                         {
                             "id": str(signal.id),
-                            "symbol": signal.asset.symbol if signal.asset else "UNKNOWN",
+                            "symbol": signal.symbol or "UNKNOWN",
                             "signal_type": signal.signal_type,
                             "strength": float(signal.strength) if signal.strength else 0.0,
                             "timestamp": signal.timestamp.isoformat() if signal.timestamp else None,
@@ -4076,7 +4101,7 @@ async def websocket_endpoint(websocket: WebSocket):
                         from database.connection import get_session
                         with get_session() as db:
                             trade_repo = TradeRepository()
-                            open_trades = trade_repo.get_open_trades(db)
+                            open_trades = trade_repo.get_open_trade_rows(db)
                             
                             positions_update = {
                                 "type": "positions_update",
@@ -4085,10 +4110,10 @@ async def websocket_endpoint(websocket: WebSocket):
                                     "positions": [
                                         {
                                             "id": str(trade.id),
-                                            "symbol": trade.asset.symbol if trade.asset else "UNKNOWN",
+                                            "symbol": trade.symbol or "UNKNOWN",
                                             "side": trade.side,
                                             "entry_price": float(trade.entry_price),
-                                            "current_price": await _get_current_price(trade.asset.symbol if trade.asset else "UNKNOWN"),
+                                            "current_price": await _get_current_price(trade.symbol or "UNKNOWN"),
                                             "quantity": float(trade.quantity),
                                             "entry_time": trade.entry_time.isoformat() if trade.entry_time else None
                                         }
@@ -4502,6 +4527,7 @@ async def broadcast_scanner_status():
             # Continue running even if there's an error
             continue
 
+@background_tasks.task('websocket_heartbeat', delay=1.0)
 async def websocket_heartbeat_task():
     """Background task to maintain WebSocket connections with heartbeat."""
     logger.info("Starting WebSocket heartbeat task")
@@ -4522,6 +4548,15 @@ async def websocket_heartbeat_task():
             # Continue running even if there's an error
             continue
 
+@background_tasks.task('market_metadata_refresh', delay=5.0)
+async def market_metadata_refresh_task():
+    """Background task to keep the shared market metadata snapshot fresh."""
+    store = get_market_store()
+    if not len(store):
+        store.load()
+    await store.run_refresh_loop(is_ready=lambda: bingx_client is not None and bingx_client._initialized)
+
+@background_tasks.task('websocket_cleanup', delay=1.0)
 async def websocket_cleanup_task():
     """Background task to cleanup stale WebSocket connections."""
     logger.info("Starting WebSocket cleanup task")
@@ -4626,19 +4661,10 @@ async def start_continuous_scanner():
     except Exception as e:
         logger.error(f"❌ Failed to start continuous scanner: {e}")
 
-# Start background task - merge with main startup event
-async def start_background_tasks():
-    """Start background tasks - MINIMAL MODE for performance"""
-    # DISABLED: All heavy background tasks to prevent server overload
-    logger.info("Background tasks disabled for performance optimization")
-    # Only keep essential WebSocket heartbeat and cleanup
-    asyncio.create_task(websocket_heartbeat_task())
-    asyncio.create_task(websocket_cleanup_task())
-    logger.info("Background tasks started: WebSocket heartbeat only (performance mode)")
-
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("FastAPI server shutting down")
+    await background_tasks.stop_all()
 
 # Helper functions for validation table
 def _calculate_risk_level(market_summary: dict) -> str:
@@ -0,0 +1,42 @@
+# backtesting/__init__.py
+"""
+Vectorized backtests of the signal rules over stored candle history.
+
+Usage:
+    python -m backtesting                               # all symbols in market_data
+    python -m backtesting --symbols BTC/USDT,ETH/USDT --days 365 --workers 8
+    python -m backtesting.sweep space.json --checkpoint sweep.jsonl   # parameter sweep
+"""
+
+from .data import BacktestDataError, CandleMatrix, load_candle_matrix, load_market_data
+from .engine import (
+    BacktestError,
+    BacktestParams,
+    BacktestResult,
+    BacktestTrade,
+    compute_signals,
+    run_backtest,
+    simulate_entries,
+    simulate_trade,
+)
+from .sweep import SweepError, SweepResult, grid_combinations, random_combinations, run_sweep
+
+__all__ = [
+    'BacktestDataError',
+    'BacktestError',
+    'BacktestParams',
+    'BacktestResult',
+    'BacktestTrade',
+    'CandleMatrix',
+    'compute_signals',
+    'load_candle_matrix',
+    'load_market_data',
+    'run_backtest',
+    'simulate_entries',
+    'simulate_trade',
+    'SweepError',
+    'SweepResult',
+    'grid_combinations',
+    'random_combinations',
+    'run_sweep',
+]
@@ -0,0 +1,189 @@
+# backtesting/data.py
+"""Candle history as symbol x time arrays, loaded from market_data with a local NPZ cache."""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from analysis.resampling import timeframe_to_ms
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_DIR = Path(__file__).parent / 'cache'
+
+FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class BacktestDataError(Exception):
+    """Exception for backtest data loading errors."""
+    pass
+
+
+@dataclass
+class CandleMatrix:
+    """
+    OHLCV for many symbols on one regular time grid.
+
+    Each price field is a float64 array of shape (symbols, bars); bars missing
+    for a symbol (not listed yet, gaps) are NaN. `timestamps` holds the candle
+    open time in milliseconds for every column.
+    """
+    timeframe: str
+    symbols: List[str]
+    timestamps: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @property
+    def shape(self):
+        return self.close.shape
+
+    @property
+    def close_times(self) -> np.ndarray:
+        """Candle close time in milliseconds for every column."""
+        return self.timestamps + timeframe_to_ms(self.timeframe)
+
+    @classmethod
+    def from_candles(cls, timeframe: str, candles_by_symbol: Dict[str, Sequence[Any]]) -> 'CandleMatrix':
+        """
+        Build a matrix from candles per symbol.
+
+        Candles may be BingXClient.fetch_ohlcv dicts or [timestamp, o, h, l, c, v] rows.
+        """
+        step = timeframe_to_ms(timeframe)
+        symbols = sorted(candles_by_symbol)
+        parsed = {symbol: _candles_to_array(candles_by_symbol[symbol]) for symbol in symbols}
+
+        non_empty = [rows for rows in parsed.values() if len(rows)]
+        if not non_empty:
+            timestamps = np.empty(0, dtype=np.int64)
+        else:
+            start = min(int(rows[0, 0]) for rows in non_empty)
+            end = max(int(rows[-1, 0]) for rows in non_empty)
+            start -= start % step
+            timestamps = np.arange(start, end + step, step, dtype=np.int64)
+
+        values = np.full((len(FIELDS), len(symbols), len(timestamps)), np.nan)
+        for row, symbol in enumerate(symbols):
+            rows = parsed[symbol]
+            if not len(rows):
+                continue
+            columns = (rows[:, 0].astype(np.int64) - timestamps[0]) // step
+            for field_index in range(len(FIELDS)):
+                values[field_index, row, columns] = rows[:, field_index + 1]
+
+        return cls(timeframe, symbols, timestamps, *values)
+
+    def select(self, symbols: Iterable[str]) -> 'CandleMatrix':
+        """Sub-matrix for the given symbols on the same time grid; unknown symbols get all-NaN rows."""
+        symbols = list(symbols)
+        index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        rows = np.array([index.get(s, -1) for s in symbols], dtype=np.int64)
+        values = []
+        for field in FIELDS:
+            array = getattr(self, field)
+            selected = array[np.clip(rows, 0, None)] if len(self.symbols) else \
+                np.full((len(symbols), len(self.timestamps)), np.nan)
+            selected[rows < 0] = np.nan
+            values.append(selected)
+        return CandleMatrix(self.timeframe, symbols, self.timestamps, *values)
+
+    def save(self, path: Path):
+        """Write the matrix to an .npz file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, timeframe=np.array(self.timeframe), symbols=np.array(self.symbols, dtype=str),
+                 timestamps=self.timestamps, **{field: getattr(self, field) for field in FIELDS})
+
+    @classmethod
+    def load(cls, path: Path) -> 'CandleMatrix':
+        """Read a matrix written by save()."""
+        with np.load(Path(path)) as data:
+            return cls(str(data['timeframe']), [str(s) for s in data['symbols']], data['timestamps'],
+                       *(data[field] for field in FIELDS))
+
+
+def _candles_to_array(candles: Sequence[Any]) -> np.ndarray:
+    if not candles:
+        return np.empty((0, 6))
+    if isinstance(candles[0], dict):
+        rows = [[float(c['timestamp'])] + [float(c[f]) for f in FIELDS] for c in candles]
+    else:
+        rows = [[float(v) for v in c[:6]] for c in candles]
+    array = np.array(rows, dtype=np.float64)
+    return array[np.argsort(array[:, 0], kind='stable')]
+
+
+def _to_ms(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+def matrix_from_rows(timeframe: str, rows: Sequence[Sequence[Any]],
+                     symbols: Optional[List[str]] = None) -> CandleMatrix:
+    """Build a matrix from (symbol, timestamp, open, high, low, close, volume) rows."""
+    candles_by_symbol: Dict[str, List[List[float]]] = {symbol: [] for symbol in symbols or []}
+    for symbol, timestamp, *ohlcv in rows:
+        candles_by_symbol.setdefault(symbol, []).append([_to_ms(timestamp)] + [float(v) for v in ohlcv])
+    return CandleMatrix.from_candles(timeframe, candles_by_symbol)
+
+
+def load_market_data(timeframe: str, symbols: Optional[List[str]] = None,
+                     start_time: Optional[datetime] = None,
+                     end_time: Optional[datetime] = None) -> CandleMatrix:
+    """Load stored candles for one timeframe from the market_data table."""
+    from database.connection import get_session
+    from database.repository import MarketDataRepository
+
+    with get_session() as session:
+        rows = MarketDataRepository().get_ohlcv_rows(session, timeframe, symbols, start_time, end_time)
+
+    matrix = matrix_from_rows(timeframe, rows, symbols)
+    logger.info(f"📥 Loaded {len(rows)} {timeframe} candles for {len(matrix.symbols)} symbols from market_data")
+    return matrix
+
+
+def cache_path(timeframe: str, symbols: Optional[List[str]] = None,
+               start_time: Optional[datetime] = None, end_time: Optional[datetime] = None,
+               cache_dir: Path = CACHE_DIR) -> Path:
+    """Cache file for a market_data selection."""
+    key = '|'.join([
+        timeframe,
+        ','.join(sorted(symbols)) if symbols else '*',
+        start_time.isoformat() if start_time else '',
+        end_time.isoformat() if end_time else '',
+    ])
+    return Path(cache_dir) / f"{timeframe}_{hashlib.sha1(key.encode()).hexdigest()[:12]}.npz"
+
+
+def load_candle_matrix(timeframe: str, symbols: Optional[List[str]] = None,
+                       start_time: Optional[datetime] = None, end_time: Optional[datetime] = None,
+                       use_cache: bool = True, refresh: bool = False,
+                       cache_dir: Path = CACHE_DIR) -> CandleMatrix:
+    """
+    Load a candle matrix, reading the NPZ cache when present.
+
+    The first load of a selection goes to the database and writes the cache;
+    later runs (e.g. parameter changes) read the arrays straight from disk.
+    """
+    path = cache_path(timeframe, symbols, start_time, end_time, cache_dir)
+    if use_cache and not refresh and path.exists():
+        matrix = CandleMatrix.load(path)
+        logger.info(f"📦 Loaded {timeframe} candle matrix {matrix.shape} from cache {path.name}")
+        return matrix
+
+    matrix = load_market_data(timeframe, symbols, start_time, end_time)
+    if not matrix.symbols:
+        raise BacktestDataError(f"No {timeframe} candles in market_data for the selection")
+    if use_cache:
+        matrix.save(path)
+    return matrix
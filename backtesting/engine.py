@@ -0,0 +1,448 @@
+# backtesting/engine.py
+"""Vectorized backtest of the three signal rules with trailing-stop and take-profit exits."""
+
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config.trading_config import TradingConfig
+from utils.logger import get_logger
+
+from .data import CandleMatrix
+from .vectorized import (
+    RuleSignals, align_columns, crossover, evaluate_rules, rule_names, take_columns,
+    timeframe_indicators, volume_ratio,
+)
+
+logger = get_logger(__name__)
+
+# Bars searched for a trade's exit per pass; grows 4x for trades still open
+_EXIT_WINDOW = 32
+
+
+class BacktestError(Exception):
+    """Exception for backtest errors."""
+    pass
+
+
+@dataclass(frozen=True)
+class BacktestParams:
+    """Strategy parameters for a backtest run; defaults mirror TradingConfig."""
+    mm1_period: int = TradingConfig.MM1_PERIOD
+    center_period: int = TradingConfig.CENTER_PERIOD
+    rsi_period: int = TradingConfig.RSI_PERIOD
+    rsi_min: float = float(TradingConfig.RSI_MIN)
+    rsi_max: float = float(TradingConfig.RSI_MAX)
+    ma_distance_2h: float = float(TradingConfig.MA_DISTANCE_2H_PERCENT)
+    ma_distance_4h: float = float(TradingConfig.MA_DISTANCE_4H_PERCENT)
+    volume_spike_threshold: float = float(TradingConfig.VOLUME_SPIKE_THRESHOLD)
+    volume_lookback: int = TradingConfig.VOLUME_SPIKE_LOOKBACK
+    initial_stop_loss: float = float(TradingConfig.INITIAL_STOP_LOSS_PERCENT)
+    # (trigger, stop) profit fractions, ascending by trigger
+    trailing_levels: Tuple[Tuple[float, float], ...] = tuple(
+        (float(level.trigger), float(level.stop)) for level in TradingConfig.TRAILING_STOP_LEVELS
+    )
+    # (profit fraction, share of the position closed)
+    take_profit_levels: Tuple[Tuple[float, float], ...] = tuple(
+        (float(level['percentage']), level['size_percent'] / 100) for level in TradingConfig.TAKE_PROFIT_LEVELS
+    )
+    min_confidence: float = 0.5  # Signals below this are not saved/traded live
+    allow_short: bool = True
+    fee_rate: float = 0.001      # Per side, on traded notional
+    position_size: float = float(TradingConfig.MAX_POSITION_SIZE_PERCENT) / 100
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class BacktestTrade:
+    """One simulated trade; return_pct is net of fees, as a fraction of entry notional."""
+    symbol: str
+    side: str
+    entry_time: int   # ms, open of the entry bar
+    exit_time: int    # ms, open of the exit bar
+    entry_price: float
+    exit_price: float  # size-weighted average over partial exits
+    return_pct: float
+    exit_reason: str
+    rules: Tuple[str, ...]
+    confidence: float
+    bars_held: int
+
+
+@dataclass
+class BacktestResult:
+    """Trades and summary statistics of a backtest run."""
+    params: BacktestParams
+    trades: List[BacktestTrade] = field(default_factory=list)
+    symbols: int = 0
+    bars: int = 0
+    signals: int = 0
+    elapsed: float = 0.0
+
+    def equity_curve(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(exit times, equity) with each trade sized at params.position_size of a starting equity of 1."""
+        returns = np.array([t.return_pct for t in self.trades])
+        exit_times = np.array([t.exit_time for t in self.trades], dtype=np.int64)
+        return equity_curve(returns, exit_times, self.params.position_size)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Summary statistics of the run."""
+        exit_reasons: Dict[str, int] = {}
+        for trade in self.trades:
+            exit_reasons[trade.exit_reason] = exit_reasons.get(trade.exit_reason, 0) + 1
+
+        return {
+            'symbols': self.symbols,
+            'bars': self.bars,
+            'signals': self.signals,
+            **summarize_returns(
+                np.array([t.return_pct for t in self.trades]),
+                np.array([t.exit_time for t in self.trades], dtype=np.int64),
+                self.params.position_size,
+            ),
+            'exit_reasons': exit_reasons,
+            'elapsed_seconds': self.elapsed,
+        }
+
+
+def equity_curve(returns: np.ndarray, exit_times: np.ndarray, position_size: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (exit times, equity) for trades sized at position_size of a starting equity of 1.
+
+    Trades closing on the same bar are booked together, so the curve (and
+    the drawdown measured on it) does not depend on the order of trades.
+    """
+    order = np.argsort(exit_times, kind='stable')
+    times = exit_times[order]
+    equity = 1 + np.cumsum(returns[order] * position_size)
+    last_of_time = np.append(times[1:] != times[:-1], True)[:len(times)]
+    return times[last_of_time], equity[last_of_time]
+
+
+def summarize_returns(returns: np.ndarray, exit_times: np.ndarray, position_size: float) -> Dict[str, Any]:
+    """Trade count, win rate, profit factor, total return and max drawdown of per-trade net returns."""
+    wins = returns[returns > 0]
+    losses = returns[returns <= 0]
+    _, equity = equity_curve(returns, exit_times, position_size)
+    equity = np.concatenate(([1.0], equity))
+    peaks = np.maximum.accumulate(equity)
+
+    if losses.sum() < 0:
+        profit_factor = float(wins.sum() / -losses.sum())
+    else:
+        profit_factor = float('inf') if len(wins) else 0.0
+
+    return {
+        'total_trades': int(len(returns)),
+        'winning_trades': int(len(wins)),
+        'losing_trades': int(len(losses)),
+        'win_rate': float(len(wins) / len(returns) * 100) if len(returns) else 0.0,
+        'avg_return': float(returns.mean()) if len(returns) else 0.0,
+        'profit_factor': profit_factor,
+        'total_return': float(equity[-1] - 1),
+        'max_drawdown': float(((peaks - equity) / peaks).max()),
+    }
+
+
+def _exit_arrays(params: BacktestParams):
+    trailing = sorted(params.trailing_levels)
+    triggers = np.array([t for t, _ in trailing])
+    stops = np.array([s for _, s in trailing])
+    take_profits = sorted(params.take_profit_levels)
+    tp_returns = np.array([p for p, _ in take_profits])
+    # Shares beyond 100% of the position are ignored
+    tp_cumulative = np.minimum(np.cumsum([s for _, s in take_profits]), 1.0)
+    tp_shares = np.diff(np.concatenate(([0.0], tp_cumulative)))
+    return triggers, stops, tp_returns, tp_shares
+
+
+EXIT_REASONS = ('TAKE_PROFIT', 'STOP_LOSS', 'TRAILING_STOP', 'END_OF_DATA')
+
+
+def _simulate_window(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                     rows: np.ndarray, entries: np.ndarray, sides: np.ndarray, params: BacktestParams,
+                     exit_arrays, window: int):
+    """Exit search for a batch of entries over the next `window` bars; see simulate_entries."""
+    triggers, stops, tp_returns, tp_shares = exit_arrays
+    n = close.shape[1]
+    batch = np.arange(len(entries))
+    columns = entries[:, None] + np.arange(window)
+    inside = columns < n
+    columns = np.minimum(columns, n - 1)
+    cells = (rows[:, None], columns)
+    entry_price = open_[rows, entries][:, None]
+    side = sides[:, None]
+
+    # Side-adjusted excursions: best (favourable), worst (adverse) and open, as returns
+    fav = side * (np.where(side > 0, high[cells], low[cells]) / entry_price - 1)
+    adv = side * (np.where(side > 0, low[cells], high[cells]) / entry_price - 1)
+    opens = side * (open_[cells] / entry_price - 1)
+    fav[~inside | np.isnan(fav)] = -np.inf
+    adv[~inside | np.isnan(adv)] = np.inf
+
+    best = np.maximum.accumulate(fav, axis=1)
+    best_before = np.concatenate([np.full((len(entries), 1), -np.inf), best[:, :-1]], axis=1)
+    level = np.searchsorted(triggers, best_before, side='right') - 1
+    trailing = stops[np.clip(level, 0, None)] if len(stops) else np.full(level.shape, -np.inf)
+    locked = np.maximum(np.where(level >= 0, trailing, -np.inf), -params.initial_stop_loss)
+
+    hits = adv <= locked
+    has_stop = hits.any(axis=1)
+    stop_bar = np.where(has_stop, hits.argmax(axis=1), window)
+    stop_at = np.minimum(stop_bar, window - 1)
+
+    reached = best[:, :, None] >= tp_returns[None, None, :]
+    tp_bar = np.where(reached.any(axis=1), reached.argmax(axis=1), window)
+    filled = tp_bar < stop_bar[:, None]  # stop first within a bar
+    filled_share = (filled * tp_shares).sum(axis=1)
+    full_tp = filled_share >= 1 - 1e-9
+    tp_exit_bar = np.where(filled, tp_bar, -1).max(axis=1, initial=-1)
+
+    closes = close[cells]
+    valid_close = inside & ~np.isnan(closes)
+    last_bar = window - 1 - valid_close[:, ::-1].argmax(axis=1)
+    end_return = np.where(valid_close.any(axis=1), sides * (closes[batch, last_bar] / entry_price[:, 0] - 1), 0.0)
+    stop_return = np.minimum(opens[batch, stop_at], locked[batch, stop_at])
+    resolved = full_tp | has_stop | (entries + window >= n)
+
+    exit_bar = np.where(full_tp, tp_exit_bar, np.where(has_stop, stop_bar, last_bar))
+    exit_return = np.where(full_tp, 0.0, np.where(has_stop, stop_return, end_return))
+    remaining = np.where(full_tp, 0.0, 1 - filled_share)
+    reason = np.where(full_tp, 0, np.where(has_stop, np.where(locked[batch, stop_at] < 0, 1, 2), 3))
+
+    gross = (filled * tp_returns * tp_shares).sum(axis=1) + remaining * exit_return
+    notional_out = (filled * tp_shares * (1 + tp_returns)).sum(axis=1) + remaining * (1 + exit_return)
+    net = gross - params.fee_rate * (1 + notional_out)
+    return resolved, entries + exit_bar, gross, net, reason
+
+
+def simulate_entries(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                     rows: np.ndarray, entries: np.ndarray, sides: np.ndarray, params: BacktestParams):
+    """
+    Simulate a batch of positions, each entered at the open of bar entries[i] of symbol rows[i].
+
+    Price arrays are (symbols, bars). Works in return space (side-adjusted),
+    so longs and shorts share the same arrays: the best excursion so far
+    picks the TRAILING_STOP_LEVELS stop that applies from the next bar,
+    take-profit levels fill when the best excursion reaches them, and a bar
+    whose worst excursion crosses the stop exits at the stop (or at the open
+    on a gap). Within a bar the stop is checked before take-profits, which is
+    the conservative ordering. Positions still open at the end of the search
+    window are retried with a 4x larger window.
+
+    Returns:
+        (exit bar index, gross return, net return, exit reason code) arrays;
+        reason codes index EXIT_REASONS
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    entries = np.asarray(entries, dtype=np.int64)
+    sides = np.asarray(sides, dtype=np.float64)
+    exit_arrays = _exit_arrays(params)
+
+    exit_index = np.zeros(len(entries), dtype=np.int64)
+    gross = np.zeros(len(entries))
+    net = np.zeros(len(entries))
+    reason = np.zeros(len(entries), dtype=np.int8)
+
+    pending = np.arange(len(entries))
+    window = _EXIT_WINDOW
+    while len(pending):
+        resolved, *results = _simulate_window(open_, high, low, close, rows[pending], entries[pending],
+                                              sides[pending], params, exit_arrays, window)
+        done = pending[resolved]
+        for target, values in zip((exit_index, gross, net, reason), results):
+            target[done] = values[resolved]
+        pending = pending[~resolved]
+        window *= 4
+
+    return exit_index, gross, net, reason
+
+
+def simulate_trade(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                   entry: int, side: int, params: BacktestParams) -> Tuple[int, float, float, str]:
+    """Simulate one position on 1-D price arrays; returns (exit bar index, gross return, net return, exit reason)."""
+    exit_index, gross, net, reason = simulate_entries(
+        open_[None], high[None], low[None], close[None], [0], [entry], [side], params
+    )
+    return int(exit_index[0]), float(gross[0]), float(net[0]), EXIT_REASONS[reason[0]]
+
+
+def tradable_mask(direction: np.ndarray, confidence: np.ndarray, open_: np.ndarray,
+                  min_confidence, allow_short: bool) -> np.ndarray:
+    """Bars whose signal would open a position at the next bar's open (broadcasts over leading axes)."""
+    tradable = (direction != 0) & (confidence >= min_confidence)
+    if not allow_short:
+        tradable &= direction > 0
+    tradable[..., -1] = False  # no next bar to enter on
+    tradable[..., :-1] &= ~np.isnan(open_[..., 1:])
+    return tradable
+
+
+def walk_positions(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                   tradable: np.ndarray, direction: np.ndarray, params: BacktestParams,
+                   price_rows: Optional[np.ndarray] = None):
+    """
+    Take positions on independent lanes: enter at the next bar's open when flat, hold until exit.
+
+    tradable/direction are (lanes, bars); price_rows maps each lane to its
+    row in the price arrays (default: lane i trades row i), which lets
+    several signal sets share one copy of the prices. All lanes advance in
+    lockstep: each pass takes the next tradable signal of every flat lane
+    and simulates those positions as one batch, so only signals that are
+    actually traded get simulated. A new position can open on the bar after
+    the previous one exited.
+
+    Returns:
+        (lanes, signal bars, sides, exit index, gross, net, reason) arrays, or None without trades
+    """
+    lanes, bars = tradable.shape
+    price_rows = np.arange(lanes) if price_rows is None else price_rows
+
+    # next_signal[lane, c]: first tradable bar at or after column c (bars when none)
+    next_signal = np.where(tradable, np.arange(bars, dtype=np.int32), np.int32(bars))
+    next_signal = np.minimum.accumulate(next_signal[:, ::-1], axis=1)[:, ::-1]
+    next_signal = np.concatenate([next_signal, np.full((lanes, 1), bars, dtype=np.int32)], axis=1)
+
+    free_from = np.zeros(lanes, dtype=np.int64)
+    active = np.arange(lanes)
+    batches = []
+    while len(active):
+        signal_bars = next_signal[active, free_from[active]].astype(np.int64)
+        active, signal_bars = active[signal_bars < bars], signal_bars[signal_bars < bars]
+        if not len(active):
+            break
+        sides = direction[active, signal_bars]
+        exit_index, gross, net, reason = simulate_entries(
+            open_, high, low, close, price_rows[active], signal_bars + 1, sides, params
+        )
+        batches.append((active, signal_bars, sides, exit_index, gross, net, reason))
+        free_from[active] = exit_index
+
+    if not batches:
+        return None
+    return tuple(np.concatenate(parts) for parts in zip(*batches))
+
+
+def simulate_positions(matrix: CandleMatrix, signals: RuleSignals, params: BacktestParams) -> List[BacktestTrade]:
+    """Trade every symbol's signals (one position per symbol at a time, see walk_positions)."""
+    tradable = tradable_mask(signals.direction, signals.confidence, matrix.open,
+                             params.min_confidence, params.allow_short)
+    walked = walk_positions(matrix.open, matrix.high, matrix.low, matrix.close,
+                            tradable, signals.direction, params)
+    if walked is None:
+        return []
+
+    rows, signal_bars, sides, exit_index, gross, net, reason = walked
+    order = np.lexsort((signal_bars, rows))
+    rows, signal_bars, sides, exit_index, gross, net, reason = (
+        a[order] for a in (rows, signal_bars, sides, exit_index, gross, net, reason)
+    )
+    entries = signal_bars + 1
+    entry_prices = matrix.open[rows, entries]
+    names = [tuple(rule_names(bits)) for bits in range(8)]
+
+    # Plain Python values: per-element numpy scalar access is much slower
+    columns = zip(
+        rows.tolist(), sides.tolist(), matrix.timestamps[entries].tolist(),
+        matrix.timestamps[exit_index].tolist(), entry_prices.tolist(),
+        (entry_prices * (1 + sides * gross)).tolist(), net.tolist(), reason.tolist(),
+        signals.rules[rows, signal_bars].tolist(), signals.confidence[rows, signal_bars].tolist(),
+        (exit_index - entries + 1).tolist(),
+    )
+    return [
+        BacktestTrade(matrix.symbols[row], 'BUY' if side > 0 else 'SELL', entry_time, exit_time,
+                      entry_price, exit_price, net_return, EXIT_REASONS[code], names[bits], conf, held)
+        for (row, side, entry_time, exit_time, entry_price, exit_price, net_return, code,
+             bits, conf, held) in columns
+    ]
+
+
+def compute_signals(matrix_2h: CandleMatrix, matrix_4h: CandleMatrix, params: BacktestParams) -> RuleSignals:
+    """Evaluate the rules for every symbol and closed 2h bar."""
+    if matrix_4h.symbols != matrix_2h.symbols:
+        matrix_4h = matrix_4h.select(matrix_2h.symbols)
+
+    ind_2h = timeframe_indicators(matrix_2h.close, params.mm1_period, params.center_period, params.rsi_period)
+    ind_4h = timeframe_indicators(matrix_4h.close, params.mm1_period, params.center_period, params.rsi_period)
+
+    # A 4h bar is visible from the 2h bar that closes with it; its crossover counts once
+    index, fresh = align_columns(matrix_4h.close_times, matrix_2h.close_times)
+    cross_4h = take_columns(crossover(ind_4h.mm1, ind_4h.center), index, fill=0)
+    cross_4h = np.where(fresh, cross_4h, 0).astype(np.int8)
+
+    ratio = volume_ratio(matrix_2h.volume, params.volume_lookback)
+    return evaluate_rules(ind_2h, ind_4h.take(index), cross_4h, ratio, params)
+
+
+def backtest_chunk(matrix_2h: CandleMatrix, matrix_4h: CandleMatrix,
+                   params: BacktestParams) -> Tuple[List[BacktestTrade], int]:
+    """Backtest a group of symbols in-process; returns (trades, signal count)."""
+    signals = compute_signals(matrix_2h, matrix_4h, params)
+    return simulate_positions(matrix_2h, signals, params), int(np.count_nonzero(signals.direction))
+
+
+def run_backtest(matrix_2h: CandleMatrix, matrix_4h: CandleMatrix, params: Optional[BacktestParams] = None,
+                 workers: Optional[int] = None, chunk_size: Optional[int] = None) -> BacktestResult:
+    """
+    Backtest the signal rules over all symbols in the matrices.
+
+    Symbols are split into chunks that run in a process pool (workers=1 runs
+    in-process). Each symbol holds at most one position at a time; the
+    portfolio-wide MAX_CONCURRENT_TRADES cap is not applied, so results
+    measure the rules and exits rather than slot allocation.
+
+    Args:
+        matrix_2h: 2h candles; signals are evaluated at each 2h close
+        matrix_4h: 4h candles for the same symbols
+        params: Strategy parameters (default: current TradingConfig)
+        workers: Worker processes (default: CPU count)
+        chunk_size: Symbols per task (default: spread evenly over workers)
+    """
+    params = params or BacktestParams()
+    if matrix_2h.timeframe != '2h' or matrix_4h.timeframe != '4h':
+        raise BacktestError(f"Expected 2h and 4h matrices, got {matrix_2h.timeframe} and {matrix_4h.timeframe}")
+
+    started = time.perf_counter()
+    symbols = matrix_2h.symbols
+    workers = max(1, min(workers or os.cpu_count() or 1, len(symbols) or 1))
+    chunk_size = chunk_size or max(1, math.ceil(len(symbols) / workers))
+    chunks = [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+
+    trades: List[BacktestTrade] = []
+    signal_count = 0
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            chunk_trades, chunk_signals = backtest_chunk(matrix_2h.select(chunk), matrix_4h.select(chunk), params)
+            trades.extend(chunk_trades)
+            signal_count += chunk_signals
+    else:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [
+                pool.submit(backtest_chunk, matrix_2h.select(chunk), matrix_4h.select(chunk), params)
+                for chunk in chunks
+            ]
+            for future in futures:
+                chunk_trades, chunk_signals = future.result()
+                trades.extend(chunk_trades)
+                signal_count += chunk_signals
+
+    result = BacktestResult(
+        params=params,
+        trades=trades,
+        symbols=len(symbols),
+        bars=int(matrix_2h.shape[1]) if symbols else 0,
+        signals=signal_count,
+        elapsed=time.perf_counter() - started,
+    )
+    logger.info(f"📊 Backtest: {len(symbols)} symbols x {result.bars} bars, {len(trades)} trades "
+                f"in {result.elapsed:.2f}s ({workers} workers)")
+    return result
@@ -0,0 +1,483 @@
+# backtesting/sweep.py
+"""Grid/random parameter sweeps over the signal rules with shared indicator precomputation."""
+
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.logger import get_logger
+
+from .data import CandleMatrix
+from .engine import BacktestParams, summarize_returns, tradable_mask, walk_positions
+from .vectorized import (
+    TimeframeIndicators, align_columns, bars_available, crossover, ema, evaluate_rules, rsi,
+    take_columns, volume_ratio,
+)
+
+logger = get_logger(__name__)
+
+# Parameters a sweep may vary; exits and sizing stay fixed at the base params
+SWEEPABLE_PARAMS = (
+    'mm1_period', 'center_period', 'rsi_period', 'volume_lookback',
+    'rsi_min', 'rsi_max', 'ma_distance_2h', 'ma_distance_4h', 'volume_spike_threshold', 'min_confidence',
+)
+# Parameters that change the indicator series; combinations sharing them are evaluated together
+_SERIES_PARAMS = ('mm1_period', 'center_period', 'rsi_period', 'volume_lookback')
+_THRESHOLD_PARAMS = ('rsi_min', 'rsi_max', 'ma_distance_2h', 'ma_distance_4h', 'volume_spike_threshold',
+                     'min_confidence')
+
+# Upper bound on (combinations x symbols x bars) cells evaluated in one broadcast
+MAX_BATCH_CELLS = 20_000_000
+
+RANK_METRICS = ('return_over_drawdown', 'total_return', 'max_drawdown', 'profit_factor', 'win_rate')
+
+
+class SweepError(Exception):
+    """Exception for parameter sweep errors."""
+    pass
+
+
+def _check_space(space: Dict[str, Any]):
+    unknown = [name for name in space if name not in SWEEPABLE_PARAMS]
+    if unknown:
+        raise SweepError(f"Cannot sweep {unknown}; sweepable parameters: {list(SWEEPABLE_PARAMS)}")
+
+
+def _is_valid(combo: Dict[str, Any], base: BacktestParams) -> bool:
+    params = {**base.to_dict(), **combo}
+    return params['rsi_min'] < params['rsi_max'] and params['mm1_period'] < params['center_period']
+
+
+def grid_combinations(space: Dict[str, Sequence[Any]], base: Optional[BacktestParams] = None) -> List[Dict[str, Any]]:
+    """
+    Every combination of the listed values.
+
+    Combinations with RSI_MIN >= RSI_MAX or MM1 >= CENTER are skipped.
+    """
+    _check_space(space)
+    base = base or BacktestParams()
+    names = sorted(space)
+    combos = [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+    return [combo for combo in combos if _is_valid(combo, base)]
+
+
+def random_combinations(space: Dict[str, Any], count: int, seed: int = 0,
+                        base: Optional[BacktestParams] = None) -> List[Dict[str, Any]]:
+    """
+    `count` distinct random combinations.
+
+    A list/tuple of values is sampled uniformly; a {'min': .., 'max': ..}
+    range samples integers for int bounds and floats otherwise (rounded to
+    `round` decimals when given, default 4).
+    """
+    _check_space(space)
+    base = base or BacktestParams()
+    rng = random.Random(seed)
+    names = sorted(space)
+
+    def sample(spec):
+        if isinstance(spec, dict):
+            low, high = spec['min'], spec['max']
+            if isinstance(low, int) and isinstance(high, int):
+                return rng.randint(low, high)
+            return round(rng.uniform(low, high), spec.get('round', 4))
+        return rng.choice(list(spec))
+
+    combos: Dict[str, Dict[str, Any]] = {}
+    attempts = 0
+    while len(combos) < count and attempts < count * 50:
+        attempts += 1
+        combo = {name: sample(space[name]) for name in names}
+        if _is_valid(combo, base):
+            combos.setdefault(combo_key(combo), combo)
+    if len(combos) < count:
+        logger.warning(f"Random sweep produced {len(combos)} distinct valid combinations (asked for {count})")
+    return list(combos.values())
+
+
+def combo_key(combo: Dict[str, Any]) -> str:
+    """Stable identifier of a combination (used for checkpoints)."""
+    return json.dumps(combo, sort_keys=True)
+
+
+class PrecomputedSeries:
+    """
+    Indicator arrays for one candle data set, shared by every combination.
+
+    EMAs for each period, RSI for each RSI period and the volume ratio for
+    each lookback are computed once per timeframe; the 4h arrays are aligned
+    to the 2h grid once. Combinations then only compare thresholds against
+    these arrays.
+    """
+
+    def __init__(self, matrix_2h: CandleMatrix, matrix_4h: CandleMatrix):
+        if matrix_4h.symbols != matrix_2h.symbols:
+            matrix_4h = matrix_4h.select(matrix_2h.symbols)
+        self.matrix_2h = matrix_2h
+        self.matrix_4h = matrix_4h
+        self.index_4h, self.fresh_4h = align_columns(matrix_4h.close_times, matrix_2h.close_times)
+        self.bars_2h = bars_available(matrix_2h.close)
+        self.bars_4h = take_columns(bars_available(matrix_4h.close), self.index_4h, fill=0)
+        self._ema: Dict[Tuple[str, int], np.ndarray] = {}
+        self._rsi: Dict[Tuple[str, int], np.ndarray] = {}
+        self._ratio: Dict[int, np.ndarray] = {}
+        self._cross_4h: Dict[Tuple[int, int], np.ndarray] = {}
+
+    def prepare(self, combos: Iterable[Dict[str, Any]], base: BacktestParams):
+        """Compute every series the combinations need up front."""
+        for combo in combos:
+            params = {**base.to_dict(), **combo}
+            for timeframe in ('2h', '4h'):
+                self._get_ema(timeframe, params['mm1_period'])
+                self._get_ema(timeframe, params['center_period'])
+                self._get_rsi(timeframe, params['rsi_period'])
+            self.volume_ratio(params['volume_lookback'])
+
+    def _get_ema(self, timeframe: str, period: int) -> np.ndarray:
+        key = (timeframe, period)
+        if key not in self._ema:
+            matrix = self.matrix_2h if timeframe == '2h' else self.matrix_4h
+            self._ema[key] = ema(matrix.close, period)
+        return self._ema[key]
+
+    def _get_rsi(self, timeframe: str, period: int) -> np.ndarray:
+        key = (timeframe, period)
+        if key not in self._rsi:
+            matrix = self.matrix_2h if timeframe == '2h' else self.matrix_4h
+            self._rsi[key] = rsi(matrix.close, period)
+        return self._rsi[key]
+
+    def volume_ratio(self, lookback: int) -> np.ndarray:
+        if lookback not in self._ratio:
+            self._ratio[lookback] = volume_ratio(self.matrix_2h.volume, lookback)
+        return self._ratio[lookback]
+
+    def indicators(self, mm1_period: int, center_period: int,
+                   rsi_period: int) -> Tuple[TimeframeIndicators, TimeframeIndicators, np.ndarray]:
+        """(2h indicators, 4h indicators on the 2h grid, fresh 4h crossovers) for one period set."""
+        ind_2h = TimeframeIndicators(self._get_ema('2h', mm1_period), self._get_ema('2h', center_period),
+                                     self._get_rsi('2h', rsi_period), self.bars_2h)
+        mm1_4h = self._get_ema('4h', mm1_period)
+        center_4h = self._get_ema('4h', center_period)
+        ind_4h = TimeframeIndicators(take_columns(mm1_4h, self.index_4h), take_columns(center_4h, self.index_4h),
+                                     take_columns(self._get_rsi('4h', rsi_period), self.index_4h), self.bars_4h)
+
+        key = (mm1_period, center_period)
+        if key not in self._cross_4h:
+            cross = take_columns(crossover(mm1_4h, center_4h), self.index_4h, fill=0)
+            self._cross_4h[key] = np.where(self.fresh_4h, cross, 0).astype(np.int8)
+        return ind_2h, ind_4h, self._cross_4h[key]
+
+
+def evaluate_combinations(series: PrecomputedSeries, combos: List[Dict[str, Any]],
+                          base: BacktestParams, max_batch_cells: int = MAX_BATCH_CELLS) -> List[Dict[str, Any]]:
+    """
+    Backtest combinations that share one PrecomputedSeries.
+
+    Combinations with the same periods are evaluated in batches: their
+    thresholds are broadcast as a (K, 1, 1) axis over the (symbols, bars)
+    indicator arrays, and the K x symbols signal lanes are walked together.
+
+    Returns:
+        Summary statistics per combination, in input order
+    """
+    matrix = series.matrix_2h
+    symbols, bars = matrix.shape
+    batch_size = max(1, max_batch_cells // max(1, symbols * bars))
+    results: List[Optional[Dict[str, Any]]] = [None] * len(combos)
+
+    groups: Dict[Tuple, List[int]] = {}
+    for position, combo in enumerate(combos):
+        params = {**base.to_dict(), **combo}
+        groups.setdefault(tuple(params[name] for name in _SERIES_PARAMS), []).append(position)
+
+    for (mm1_period, center_period, rsi_period, volume_lookback), positions in groups.items():
+        ind_2h, ind_4h, cross_4h = series.indicators(mm1_period, center_period, rsi_period)
+        ratio = series.volume_ratio(volume_lookback)
+
+        for start in range(0, len(positions), batch_size):
+            batch = positions[start:start + batch_size]
+            batch_params = [replace(base, **combos[i]) for i in batch]
+            thresholds = SimpleNamespace(
+                mm1_period=mm1_period, center_period=center_period, volume_lookback=volume_lookback,
+                **{name: np.array([getattr(p, name) for p in batch_params]).reshape(-1, 1, 1)
+                   for name in _THRESHOLD_PARAMS},
+            )
+
+            signals = evaluate_rules(ind_2h, ind_4h, cross_4h, ratio, thresholds)
+            direction = np.broadcast_to(signals.direction, (len(batch), symbols, bars))
+            confidence = np.broadcast_to(signals.confidence, (len(batch), symbols, bars))
+            tradable = tradable_mask(direction, confidence, matrix.open, thresholds.min_confidence, base.allow_short)
+
+            walked = walk_positions(
+                matrix.open, matrix.high, matrix.low, matrix.close,
+                tradable.reshape(-1, bars), np.ascontiguousarray(direction).reshape(-1, bars), base,
+                price_rows=np.tile(np.arange(symbols), len(batch)),
+            )
+            if walked is None:
+                lanes, net, exit_times = np.empty(0, dtype=np.int64), np.empty(0), np.empty(0, dtype=np.int64)
+            else:
+                lanes, _, _, exit_index, _, net, _ = walked
+                exit_times = matrix.timestamps[exit_index]
+
+            combo_of_lane = lanes // symbols
+            for k, position in enumerate(batch):
+                mask = combo_of_lane == k
+                stats = summarize_returns(net[mask], exit_times[mask], base.position_size)
+                stats['signals'] = int(np.count_nonzero(direction[k]))
+                stats['return_over_drawdown'] = _return_over_drawdown(stats)
+                results[position] = stats
+
+    return results
+
+
+def _return_over_drawdown(stats: Dict[str, Any]) -> float:
+    return stats['total_return'] / max(stats['max_drawdown'], 1e-6)
+
+
+class SweepCheckpoint:
+    """
+    Append-only JSONL record of finished combinations.
+
+    The first line describes the data set and base parameters; resuming
+    against different data raises instead of mixing incomparable results.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def load(self, metadata: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Finished results by combo key; writes the header for a new file."""
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open('w') as f:
+                f.write(json.dumps({'metadata': metadata}, sort_keys=True) + '\n')
+            return {}
+
+        done: Dict[str, Dict[str, Any]] = {}
+        with self.path.open() as f:
+            header = json.loads(f.readline())
+            if json.dumps(header.get('metadata'), sort_keys=True) != json.dumps(metadata, sort_keys=True):
+                raise SweepError(f"Checkpoint {self.path} was written for different data or base parameters")
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # partial line from an interrupted write
+                done[combo_key(record['params'])] = record
+        return done
+
+    def append(self, records: List[Dict[str, Any]]):
+        with self.path.open('a') as f:
+            for record in records:
+                f.write(json.dumps(record, sort_keys=True) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+
+@dataclass
+class SweepResult:
+    """Results of a parameter sweep: one {'params', 'stats'} record per combination."""
+    base: BacktestParams
+    records: List[Dict[str, Any]] = field(default_factory=list)
+    evaluated: int = 0
+    resumed: int = 0
+    elapsed: float = 0.0
+
+    def ranked(self, sort_by: str = 'return_over_drawdown', max_drawdown: Optional[float] = None,
+               min_trades: int = 1) -> List[Dict[str, Any]]:
+        """
+        Records best first.
+
+        Args:
+            sort_by: One of RANK_METRICS; max_drawdown ranks ascending, the rest descending
+            max_drawdown: Drop combinations whose drawdown exceeds this fraction
+            min_trades: Drop combinations with fewer trades
+        """
+        if sort_by not in RANK_METRICS:
+            raise SweepError(f"Unknown ranking metric {sort_by}; use one of {list(RANK_METRICS)}")
+        records = [
+            r for r in self.records
+            if r['stats']['total_trades'] >= min_trades
+            and (max_drawdown is None or r['stats']['max_drawdown'] <= max_drawdown)
+        ]
+        if sort_by == 'max_drawdown':
+            key = lambda r: (r['stats']['max_drawdown'], -r['stats']['total_return'])
+        else:
+            key = lambda r: (-r['stats'][sort_by], r['stats']['max_drawdown'])
+        return sorted(records, key=key)
+
+    def best(self, **kwargs) -> Optional[BacktestParams]:
+        """Base parameters with the top-ranked combination applied."""
+        ranked = self.ranked(**kwargs)
+        return replace(self.base, **ranked[0]['params']) if ranked else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'combinations': len(self.records),
+            'evaluated': self.evaluated,
+            'resumed': self.resumed,
+            'elapsed_seconds': self.elapsed,
+        }
+
+
+# Per-process series for pool workers, built once by _init_worker
+_worker_series: Optional[PrecomputedSeries] = None
+_worker_base: Optional[BacktestParams] = None
+
+
+def _init_worker(matrix_2h: CandleMatrix, matrix_4h: CandleMatrix, base: BacktestParams,
+                 combos: List[Dict[str, Any]]):
+    global _worker_series, _worker_base
+    _worker_base = base
+    _worker_series = PrecomputedSeries(matrix_2h, matrix_4h)
+    _worker_series.prepare(combos, base)
+
+
+def _evaluate_task(combos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    stats = evaluate_combinations(_worker_series, combos, _worker_base)
+    return [{'params': combo, 'stats': s} for combo, s in zip(combos, stats)]
+
+
+def _metadata(matrix_2h: CandleMatrix, base: BacktestParams) -> Dict[str, Any]:
+    return json.loads(json.dumps({
+        'symbols': len(matrix_2h.symbols),
+        'symbols_hash': combo_key(matrix_2h.symbols),
+        'bars': int(matrix_2h.shape[1]),
+        'first_timestamp': int(matrix_2h.timestamps[0]) if len(matrix_2h.timestamps) else None,
+        'last_timestamp': int(matrix_2h.timestamps[-1]) if len(matrix_2h.timestamps) else None,
+        'base': {k: v for k, v in base.to_dict().items() if k not in SWEEPABLE_PARAMS},
+    }))
+
+
+def run_sweep(matrix_2h: CandleMatrix, matrix_4h: CandleMatrix, combos: List[Dict[str, Any]],
+              base: Optional[BacktestParams] = None, workers: Optional[int] = None,
+              checkpoint_path: Optional[Path] = None, task_size: Optional[int] = None) -> SweepResult:
+    """
+    Backtest every combination and collect summary statistics.
+
+    Combinations are split into tasks across a process pool; each worker
+    precomputes the indicator series once and evaluates its tasks against
+    them (workers=1 runs in-process). With a checkpoint path, finished
+    combinations are appended as tasks complete and skipped on the next run,
+    so an interrupted sweep resumes where it stopped.
+
+    Args:
+        matrix_2h: 2h candles; signals are evaluated at each 2h close
+        matrix_4h: 4h candles for the same symbols
+        combos: Parameter overrides, e.g. from grid_combinations/random_combinations
+        base: Parameters not being swept (default: current TradingConfig)
+        workers: Worker processes (default: CPU count)
+        checkpoint_path: JSONL file for resumable progress
+        task_size: Combinations per task (default: a few tasks per worker)
+    """
+    base = base or BacktestParams()
+    for combo in combos:
+        _check_space(combo)
+    started = time.perf_counter()
+
+    checkpoint = SweepCheckpoint(checkpoint_path) if checkpoint_path else None
+    done = checkpoint.load(_metadata(matrix_2h, base)) if checkpoint else {}
+    records = [done[combo_key(c)] for c in combos if combo_key(c) in done]
+    pending = [c for c in combos if combo_key(c) not in done]
+    if done:
+        logger.info(f"♻️ Resuming sweep: {len(records)} of {len(combos)} combinations already done")
+
+    # Keep combinations with the same periods together so tasks share series and batches
+    pending.sort(key=lambda c: tuple(str(c.get(name, '')) for name in _SERIES_PARAMS))
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pending) or 1))
+    task_size = task_size or max(1, math.ceil(len(pending) / (workers * 4)))
+    tasks = [pending[i:i + task_size] for i in range(0, len(pending), task_size)]
+
+    def collect(task_records: List[Dict[str, Any]]):
+        records.extend(task_records)
+        if checkpoint:
+            checkpoint.append(task_records)
+        logger.info(f"🔬 Sweep progress: {len(records)}/{len(combos)} combinations")
+
+    if workers == 1 or len(tasks) <= 1:
+        if tasks:
+            _init_worker(matrix_2h, matrix_4h, base, pending)
+            for task in tasks:
+                collect(_evaluate_task(task))
+    else:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(matrix_2h, matrix_4h, base, pending)) as pool:
+            futures = [pool.submit(_evaluate_task, task) for task in tasks]
+            for future in as_completed(futures):
+                collect(future.result())
+
+    result = SweepResult(base=base, records=records, evaluated=len(pending), resumed=len(done),
+                         elapsed=time.perf_counter() - started)
+    logger.info(f"🏁 Sweep finished: {len(pending)} combinations evaluated in {result.elapsed:.1f}s "
+                f"({workers} workers, {len(done)} resumed)")
+    return result
+
+
+def main() -> int:
+    import argparse
+    from datetime import datetime, timedelta, timezone
+
+    from .data import BacktestDataError, load_candle_matrix
+
+    parser = argparse.ArgumentParser(description="Sweep signal rule parameters over stored candles")
+    parser.add_argument('space', type=Path,
+                        help="JSON file mapping parameter names to value lists (or {min, max} ranges)")
+    parser.add_argument('--random', type=int, help="Sample this many random combinations instead of the full grid")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--symbols', help="Comma-separated symbols (default: all in market_data)")
+    parser.add_argument('--days', type=int, default=365, help="History to test (default: %(default)s)")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--checkpoint', type=Path, help="Resumable results file (JSONL)")
+    parser.add_argument('--sort-by', default='return_over_drawdown', choices=RANK_METRICS)
+    parser.add_argument('--max-drawdown', type=float, help="Ignore combinations with a larger drawdown")
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    from database.connection import init_database
+    init_database()
+
+    space = json.loads(args.space.read_text())
+    try:
+        combos = (random_combinations(space, args.random, args.seed) if args.random
+                  else grid_combinations(space))
+    except SweepError as e:
+        print(f"❌ {e}")
+        return 1
+
+    symbols = [s.strip() for s in args.symbols.split(',')] if args.symbols else None
+    start_time = (datetime.now(timezone.utc) - timedelta(days=args.days)).replace(minute=0, second=0, microsecond=0)
+    try:
+        matrix_2h = load_candle_matrix('2h', symbols, start_time)
+        matrix_4h = load_candle_matrix('4h', symbols, start_time - timedelta(days=10))
+    except BacktestDataError as e:
+        print(f"❌ {e}")
+        return 1
+
+    result = run_sweep(matrix_2h, matrix_4h, combos, workers=args.workers, checkpoint_path=args.checkpoint)
+
+    print("🔬 BingX Trading Bot - Parameter Sweep")
+    print("=" * 72)
+    print(f"Combinations: {len(result.records)} ({result.resumed} resumed)  Elapsed: {result.elapsed:.1f}s")
+    for rank, record in enumerate(result.ranked(args.sort_by, args.max_drawdown)[:args.top], 1):
+        stats = record['stats']
+        print(f"{rank:3}. return {stats['total_return']:8.2%}  drawdown {stats['max_drawdown']:7.2%}  "
+              f"trades {stats['total_trades']:6}  win {stats['win_rate']:5.1f}%  {record['params']}")
+    return 0
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
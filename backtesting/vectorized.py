@@ -0,0 +1,248 @@
+# backtesting/vectorized.py
+"""Array implementations of the indicators and signal rules in analysis/signals.py."""
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Rule bits in RuleSignals.rules
+RULE_CROSSOVER = 1   # Rule 1: MA_CROSSOVER_RSI
+RULE_DISTANCE = 2    # Rule 2: MA_DISTANCE
+RULE_VOLUME = 4      # Rule 3: VOLUME_SPIKE
+
+RULE_NAMES = {
+    RULE_CROSSOVER: 'MA_CROSSOVER_RSI',
+    RULE_DISTANCE: 'MA_DISTANCE',
+    RULE_VOLUME: 'VOLUME_SPIKE',
+}
+
+_EPS = np.finfo(float).eps
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    EMA along the time axis of a (symbols, bars) array.
+
+    Uses the same pandas ewm(span=period, adjust=False) as TechnicalIndicators,
+    run column-wise over all symbols at once: each row is seeded at its first
+    value and NaN bars carry the previous value forward.
+    """
+    return pd.DataFrame(values.T).ewm(span=period, adjust=False).mean().to_numpy().T
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean along the time axis; NaN unless the whole window is present (pandas min_periods=window)."""
+    valid = ~np.isnan(values)
+    zero = np.zeros((values.shape[0], 1))
+    sums = np.concatenate([zero, np.cumsum(np.where(valid, values, 0.0), axis=1)], axis=1)
+    counts = np.concatenate([zero, np.cumsum(valid, axis=1)], axis=1)
+
+    out = np.full(values.shape, np.nan)
+    if window <= values.shape[1]:
+        window_sums = sums[:, window:] - sums[:, :-window]
+        window_counts = counts[:, window:] - counts[:, :-window]
+        out[:, window - 1:] = np.where(window_counts == window, window_sums / window, np.nan)
+    return out
+
+
+def rsi(close: np.ndarray, period: int) -> np.ndarray:
+    """RSI with simple rolling averages, matching TechnicalIndicators.calculate_rsi."""
+    valid = ~np.isnan(close)
+    delta = np.diff(close, axis=1, prepend=np.nan)
+    with np.errstate(invalid='ignore'):
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = np.where(delta < 0, -delta, 0.0)
+    gain[~valid] = np.nan
+    loss[~valid] = np.nan
+
+    avg_gain = rolling_mean(gain, period)
+    avg_loss = rolling_mean(loss, period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rs = avg_gain / np.where(avg_loss == 0, _EPS, avg_loss)
+        values = 100 - 100 / (1 + rs)
+    return np.clip(np.where(np.isnan(values), 50.0, values), 0, 100)
+
+
+def bars_available(close: np.ndarray) -> np.ndarray:
+    """Number of candles a live fetch ending at each bar would have returned (0 where the bar is missing)."""
+    valid = ~np.isnan(close)
+    return np.where(valid, np.cumsum(valid, axis=1), 0)
+
+
+def crossover(mm1: np.ndarray, center: np.ndarray) -> np.ndarray:
+    """+1 on a bullish MM1/CENTER cross, -1 on a bearish cross (vs the previous bar), 0 otherwise."""
+    prev_mm1 = np.roll(mm1, 1, axis=1)
+    prev_center = np.roll(center, 1, axis=1)
+    with np.errstate(invalid='ignore'):
+        bullish = (prev_mm1 <= prev_center) & (mm1 > center)
+        bearish = (prev_mm1 >= prev_center) & (mm1 < center)
+    result = bullish.astype(np.int8) - bearish.astype(np.int8)
+    result[:, 0] = 0
+    return result
+
+
+def ma_distance(mm1: np.ndarray, center: np.ndarray) -> np.ndarray:
+    """|MM1 - CENTER| / CENTER."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.abs(mm1 - center) / center
+
+
+def volume_ratio(volume: np.ndarray, lookback: int) -> np.ndarray:
+    """Current volume over the mean of the last `lookback` bars (current bar included)."""
+    average = rolling_mean(volume, lookback)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(average > 0, volume / average, 0.0)
+
+
+def align_columns(source_close_times: np.ndarray, target_close_times: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Map each target bar to the latest source bar closed by then.
+
+    Returns (index, fresh): index is -1 before the first source close; fresh
+    is True where the source bar closed exactly at the target bar's close,
+    i.e. the first target bar that can see it.
+    """
+    index = np.searchsorted(source_close_times, target_close_times, side='right') - 1
+    clipped = np.clip(index, 0, max(len(source_close_times) - 1, 0))
+    fresh = (index >= 0) & (source_close_times[clipped] == target_close_times) if len(source_close_times) \
+        else np.zeros(len(target_close_times), dtype=bool)
+    return index, fresh
+
+
+def take_columns(values: np.ndarray, index: np.ndarray, fill=np.nan) -> np.ndarray:
+    """values[:, index] with `fill` where index is -1."""
+    if values.shape[1] == 0:
+        return np.full((values.shape[0], len(index)), fill, dtype=np.result_type(values, type(fill)))
+    out = values[:, np.clip(index, 0, None)]
+    if (index < 0).any():
+        out = out.astype(np.result_type(out, type(fill)))
+        out[:, index < 0] = fill
+    return out
+
+
+@dataclass
+class TimeframeIndicators:
+    """MM1, CENTER, RSI and candle counts for one timeframe."""
+    mm1: np.ndarray
+    center: np.ndarray
+    rsi: np.ndarray
+    bars: np.ndarray
+
+    def take(self, index: np.ndarray) -> 'TimeframeIndicators':
+        """Re-index onto another timeframe's columns (see align_columns)."""
+        return TimeframeIndicators(
+            take_columns(self.mm1, index), take_columns(self.center, index),
+            take_columns(self.rsi, index), take_columns(self.bars, index, fill=0),
+        )
+
+
+def timeframe_indicators(close: np.ndarray, mm1_period: int, center_period: int, rsi_period: int,
+                         ema_cache: Dict[int, np.ndarray] = None) -> TimeframeIndicators:
+    """Indicators for one timeframe; `ema_cache` lets callers share EMAs across period sets."""
+    ema_cache = ema_cache if ema_cache is not None else {}
+    for period in (mm1_period, center_period):
+        if period not in ema_cache:
+            ema_cache[period] = ema(close, period)
+    return TimeframeIndicators(ema_cache[mm1_period], ema_cache[center_period],
+                               rsi(close, rsi_period), bars_available(close))
+
+
+@dataclass
+class RuleSignals:
+    """
+    Combined rule output per (symbol, bar) on the 2h grid.
+
+    direction is +1 (BUY/STRONG_BUY), -1 (SELL/STRONG_SELL) or 0; confidence
+    is the overall confidence from SignalGenerator.generate_trading_signal;
+    rules is a bitmask of RULE_* that agreed with the chosen direction.
+    """
+    direction: np.ndarray
+    confidence: np.ndarray
+    rules: np.ndarray
+
+
+def _rule_1(ind: TimeframeIndicators, cross: np.ndarray, min_bars: int,
+            rsi_min: float, rsi_max: float) -> np.ndarray:
+    rsi_valid = (ind.rsi >= rsi_min) & (ind.rsi <= rsi_max)
+    return np.where((ind.bars >= min_bars) & rsi_valid, cross, 0).astype(np.int8)
+
+
+def _rule_2(ind: TimeframeIndicators, min_bars: int, threshold: float) -> np.ndarray:
+    with np.errstate(invalid='ignore'):
+        significant = (ind.bars >= min_bars) & (ma_distance(ind.mm1, ind.center) >= threshold)
+        direction = np.where(ind.mm1 > ind.center, 1, -1)
+    return np.where(significant, direction, 0).astype(np.int8)
+
+
+def evaluate_rules(ind_2h: TimeframeIndicators, ind_4h: TimeframeIndicators, cross_4h: np.ndarray,
+                   ratio: np.ndarray, params) -> RuleSignals:
+    """
+    Evaluate rules 1-3 and combine them like SignalGenerator.generate_trading_signal.
+
+    ind_4h and cross_4h must already be aligned to the 2h columns; cross_4h
+    should only be non-zero on the 2h bar where the crossing 4h bar closed.
+    `params` is a BacktestParams (or anything with the same fields). The
+    threshold fields may be arrays shaped (K, 1, 1) to evaluate K threshold
+    sets at once; periods and volume_lookback must be scalars.
+    """
+    slow = max(params.mm1_period, params.center_period)
+
+    # Rule 1: crossover with RSI confirmation, 4h preferred
+    r1_2h = _rule_1(ind_2h, crossover(ind_2h.mm1, ind_2h.center), slow + 2, params.rsi_min, params.rsi_max)
+    r1_4h = _rule_1(ind_4h, cross_4h, slow + 2, params.rsi_min, params.rsi_max)
+    r1_dir = np.where(r1_4h != 0, r1_4h, r1_2h)
+    r1_conf = np.where(r1_4h != 0, 0.7, np.where(r1_2h != 0, 0.6, 0.0))
+
+    # Rule 2: MA distance, 4h preferred
+    r2_2h = _rule_2(ind_2h, slow, params.ma_distance_2h)
+    r2_4h = _rule_2(ind_4h, slow, params.ma_distance_4h)
+    r2_dir = np.where(r2_4h != 0, r2_4h, r2_2h)
+    r2_conf = np.where(r2_4h != 0, 0.6, np.where(r2_2h != 0, 0.5, 0.0))
+
+    # Rule 3: volume spike in the direction of the 2h MAs
+    with np.errstate(invalid='ignore'):
+        spike = (ind_2h.bars >= max(slow, params.volume_lookback)) & (ratio >= params.volume_spike_threshold)
+        r3_dir = np.where(spike, np.where(ind_2h.mm1 > ind_2h.center, 1, -1), 0).astype(np.int8)
+    r3_conf = np.where(spike, np.minimum(ratio, 5.0) / 5.0, 0.0)
+
+    return combine_rules(((r1_dir, r1_conf, RULE_CROSSOVER),
+                          (r2_dir, r2_conf, RULE_DISTANCE),
+                          (r3_dir, r3_conf, RULE_VOLUME)))
+
+
+def combine_rules(rules) -> RuleSignals:
+    """Merge (direction, confidence, bit) rule arrays into an overall signal (shapes broadcast)."""
+    shape = np.broadcast_shapes(*(a.shape for direction, confidence, _ in rules for a in (direction, confidence)))
+    buy_count = np.zeros(shape)
+    sell_count = np.zeros(shape)
+    buy_sum = np.zeros(shape)
+    sell_sum = np.zeros(shape)
+    buy_bits = np.zeros(shape, dtype=np.uint8)
+    sell_bits = np.zeros(shape, dtype=np.uint8)
+
+    for direction, confidence, bit in rules:
+        is_buy = direction > 0
+        is_sell = direction < 0
+        buy_count += is_buy
+        sell_count += is_sell
+        buy_sum += np.where(is_buy, confidence, 0.0)
+        sell_sum += np.where(is_sell, confidence, 0.0)
+        buy_bits |= np.where(is_buy, bit, 0).astype(np.uint8)
+        sell_bits |= np.where(is_sell, bit, 0).astype(np.uint8)
+
+    # Conflicting rules: one side must be 20% stronger
+    buy_wins = (buy_count > 0) & ((sell_count == 0) | (buy_sum > sell_sum * 1.2))
+    sell_wins = (sell_count > 0) & ((buy_count == 0) | (sell_sum > buy_sum * 1.2))
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        confidence = np.where(buy_wins, buy_sum / buy_count, np.where(sell_wins, sell_sum / sell_count, 0.0))
+    direction = buy_wins.astype(np.int8) - sell_wins.astype(np.int8)
+    bits = np.where(buy_wins, buy_bits, np.where(sell_wins, sell_bits, 0)).astype(np.uint8)
+    return RuleSignals(direction, confidence, bits)
+
+
+def rule_names(bits: int):
+    """Rule names for a RuleSignals.rules bitmask."""
+    return [name for bit, name in RULE_NAMES.items() if bits & bit]
@@ -0,0 +1,29 @@
+# benchmarks/__init__.py
+"""
+Reproducible benchmark suite for analysis, cache, rate limiter, database and WebSocket paths.
+
+Usage:
+    python -m benchmarks                          # run all, save benchmarks/results/<commit>.json
+    python -m benchmarks --filter analysis        # run a subset
+    python -m benchmarks --baseline benchmarks/results/abc1234.json --threshold 0.25
+"""
+
+from .core import (
+    BenchmarkError,
+    BenchmarkResult,
+    benchmark,
+    compare_results,
+    load_results,
+    run_benchmarks,
+    save_results,
+)
+
+__all__ = [
+    'BenchmarkError',
+    'BenchmarkResult',
+    'benchmark',
+    'compare_results',
+    'load_results',
+    'run_benchmarks',
+    'save_results',
+]
@@ -0,0 +1,84 @@
+# benchmarks/__main__.py
+"""Command line entry point for the benchmark suite."""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.core import (
+    DEFAULT_REGRESSION_THRESHOLD, BenchmarkError, compare_results, load_benchmarks,
+    load_results, run_benchmarks, save_results,
+)
+
+
+def _format_time(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:8.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:8.2f} ms"
+    return f"{seconds:8.2f} s "
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="BingX trading bot benchmark suite")
+    parser.add_argument('--filter', help="Only run benchmarks whose name contains this text")
+    parser.add_argument('--rounds', type=int, help="Override the number of rounds per benchmark")
+    parser.add_argument('--output', type=Path, help="Results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--no-save', action='store_true', help="Do not write a results file")
+    parser.add_argument('--baseline', type=Path, help="Results file to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Allowed relative slowdown of the median (default: %(default)s)")
+    parser.add_argument('--list', action='store_true', help="List benchmarks and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, case in sorted(load_benchmarks().items()):
+            print(f"{case.group:14} {name}")
+        return 0
+
+    print("⏱️  BingX Trading Bot - Benchmarks")
+    print("=" * 72)
+    print(f"{'benchmark':44} {'median':>12} {'p95':>12}")
+
+    def progress(result):
+        print(f"{result.name:44} {_format_time(result.median):>12} {_format_time(result.p95):>12}")
+
+    results = run_benchmarks(name_filter=args.filter, rounds=args.rounds, progress=progress)
+    if not results:
+        print("❌ No benchmarks matched")
+        return 1
+
+    if not args.no_save:
+        print(f"\n💾 Results saved to {save_results(results, args.output)}")
+
+    if not args.baseline:
+        return 0
+
+    try:
+        baseline = load_results(args.baseline)
+    except BenchmarkError as e:
+        print(f"❌ {e}")
+        return 1
+
+    current = {name: result.to_dict() for name, result in results.items()}
+    comparisons = compare_results(current, baseline, args.threshold)
+
+    print(f"\n📊 Comparison with {args.baseline} (threshold {args.threshold:.0%})")
+    for entry in comparisons:
+        marker = "❌" if entry['regression'] else "✅"
+        print(f"{marker} {entry['name']:44} {entry['change']:+7.1%}")
+
+    regressions = [entry for entry in comparisons if entry['regression']]
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark(s) regressed beyond {args.threshold:.0%}")
+        return 1
+
+    print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+# benchmarks/bench_analysis.py
+"""Benchmarks for indicator calculation, volume analysis and signal generation."""
+
+from analysis.indicator_cache import get_indicator_cache
+from analysis.indicators import get_technical_indicators
+from analysis.signals import get_signal_generator
+from analysis.volume import get_volume_analyzer
+from benchmarks.core import benchmark
+from benchmarks.fixtures import FIXTURE_SYMBOL, load_candles
+
+
+def _candles():
+    return {
+        'spot': load_candles('spot'),
+        '2h': load_candles('2h'),
+        '4h': load_candles('4h'),
+    }
+
+
+@benchmark('analysis.calculate_all_indicators', group='analysis', setup=_candles)
+def bench_calculate_all_indicators(candles):
+    get_indicator_cache().invalidate()  # measure the computation, not the memoized lookup
+    get_technical_indicators().calculate_all_indicators(candles['2h'])
+
+
+@benchmark('analysis.calculate_all_indicators_cached', group='analysis', setup=_candles)
+def bench_calculate_all_indicators_cached(candles):
+    get_technical_indicators().calculate_all_indicators(candles['2h'], FIXTURE_SYMBOL, '2h')
+
+
+@benchmark('analysis.comprehensive_volume_analysis', group='analysis', setup=_candles)
+def bench_comprehensive_volume_analysis(candles):
+    get_volume_analyzer().comprehensive_volume_analysis(candles['spot'], FIXTURE_SYMBOL, 'spot')
+
+
+@benchmark('analysis.generate_trading_signal', group='analysis', setup=_candles)
+def bench_generate_trading_signal(candles):
+    get_indicator_cache().invalidate()
+    get_signal_generator().generate_trading_signal(
+        FIXTURE_SYMBOL, candles['spot'], candles['2h'], candles['4h']
+    )
@@ -0,0 +1,30 @@
+# benchmarks/bench_backtest.py
+"""Benchmarks for the vectorized backtester."""
+
+import random
+
+from analysis.resampling import resample_candles
+from backtesting.data import CandleMatrix
+from backtesting.engine import BacktestParams, backtest_chunk
+from benchmarks.core import benchmark
+from benchmarks.fixtures import FIXTURE_SEED, _random_walk
+
+BACKTEST_SYMBOLS = 50
+BACKTEST_BARS_2H = 4380  # one year of 2h candles
+
+
+def _matrices():
+    rng = random.Random(FIXTURE_SEED)
+    columns = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+    candles_2h = {
+        f"BENCH{i}/USDT": [dict(zip(columns, row)) for row in _random_walk(rng, BACKTEST_BARS_2H, 7_200_000, 100.0)]
+        for i in range(BACKTEST_SYMBOLS)
+    }
+    candles_4h = {symbol: resample_candles(candles, '2h', '4h', include_partial=False)
+                  for symbol, candles in candles_2h.items()}
+    return CandleMatrix.from_candles('2h', candles_2h), CandleMatrix.from_candles('4h', candles_4h)
+
+
+@benchmark('backtest.one_year_50_symbols', group='backtest', rounds=3, iterations=1, setup=_matrices)
+def bench_backtest_one_year(matrices):
+    backtest_chunk(*matrices, BacktestParams())
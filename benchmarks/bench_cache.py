@@ -0,0 +1,59 @@
+# benchmarks/bench_cache.py
+"""Benchmarks for SmartCache get/set/eviction paths."""
+
+from benchmarks.core import benchmark
+from utils.shared_cache import InMemoryCacheBackend, InMemoryCacheServer
+from utils.smart_cache import SmartCache
+
+KEYS = [f"SYM{i}/USDT" for i in range(1000)]
+PAYLOAD = {'last': 42000.5, 'bid': 42000.0, 'ask': 42001.0, 'volume': 1234.5}
+
+
+def _warm_cache():
+    cache = SmartCache(max_size=len(KEYS) * 2)
+    for key in KEYS:
+        cache.set('ticker', key, PAYLOAD)
+    return cache
+
+
+@benchmark('cache.get_hit', group='cache', setup=_warm_cache)
+def bench_get_hit(cache):
+    for key in KEYS[:100]:
+        cache.get('ticker', key)
+
+
+@benchmark('cache.get_miss', group='cache', setup=_warm_cache)
+def bench_get_miss(cache):
+    for key in KEYS[:100]:
+        cache.get('candles', key)
+
+
+@benchmark('cache.set', group='cache', setup=_warm_cache)
+def bench_set(cache):
+    for key in KEYS[:100]:
+        cache.set('ticker', key, PAYLOAD)
+
+
+@benchmark('cache.set_with_eviction', group='cache',
+           setup=lambda: SmartCache(max_size=100))
+def bench_set_with_eviction(cache):
+    # Cache is full after the first round, so every set evicts an LRU entry
+    for key in KEYS[:200]:
+        cache.set('ticker', key, PAYLOAD)
+
+
+def _shared_tier_only():
+    """A second process: everything is in the shared tier, nothing is local yet."""
+    server = InMemoryCacheServer()
+    writer = SmartCache(shared=InMemoryCacheBackend(server))
+    for key in KEYS[:100]:
+        writer.set('ticker', key, PAYLOAD)
+    return SmartCache(max_size=len(KEYS) * 2, shared=InMemoryCacheBackend(server))
+
+
+@benchmark('cache.get_shared_hit', group='cache', setup=_shared_tier_only)
+def bench_get_shared_hit(cache):
+    # Local tier emptied each round: every get decodes from the shared tier and stores locally
+    cache.cache.clear()
+    for key in KEYS[:100]:
+        cache.get('ticker', key)
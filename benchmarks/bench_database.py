@@ -0,0 +1,115 @@
+# benchmarks/bench_database.py
+"""Benchmarks for repository bulk writes on an in-memory SQLite database."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.core import benchmark
+from benchmarks.fixtures import FIXTURE_SYMBOL, load_candles
+from database.models import Asset, Base
+from database.repository import OptimizedMarketDataRepository
+
+
+def _sqlite_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+
+    asset = Asset(symbol=FIXTURE_SYMBOL, base_currency='BENCH', quote_currency='USDT')
+    session.add(asset)
+    session.commit()
+
+    rows = [
+        {
+            'asset_id': asset.id,
+            'timeframe': '2h',
+            'timestamp': datetime.fromtimestamp(c['timestamp'] / 1000, tz=timezone.utc),
+            'open': c['open'], 'high': c['high'], 'low': c['low'],
+            'close': c['close'], 'volume': c['volume'],
+        }
+        for c in load_candles('2h')
+    ]
+    return session, OptimizedMarketDataRepository(), rows
+
+
+@benchmark('database.market_data_batch_insert_300', group='database', rounds=10, setup=_sqlite_session)
+def bench_market_data_batch_insert(state):
+    session, repo, rows = state
+    repo.batch_insert(session, rows)
+    session.rollback()
+
+
+@benchmark('database.market_data_upsert_candle_50', group='database', rounds=10, setup=_sqlite_session)
+def bench_market_data_upsert_candle(state):
+    session, repo, rows = state
+    for row in rows[:50]:
+        repo.upsert_candle(session, row['asset_id'], row['timeframe'], row['timestamp'],
+                           row['open'], row['high'], row['low'], row['close'], row['volume'])
+    session.rollback()
+
+
+# Commit throughput on a file database: default engine vs the tuned profile vs the write queue
+_COMMIT_ROWS = 50
+
+
+def _file_database(profile: bool):
+    import itertools
+    import tempfile
+    from pathlib import Path
+    from database.connection import create_sqlite_engine
+
+    url = f"sqlite:///{Path(tempfile.mkdtemp(prefix='bench_sqlite_')) / 'bench.db'}"
+    engine = create_sqlite_engine(url) if profile else create_engine(url)
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        asset = Asset(symbol=FIXTURE_SYMBOL, base_currency='BENCH', quote_currency='USDT')
+        session.add(asset)
+        session.commit()
+        asset_id = asset.id
+    writer = create_sqlite_engine(url, writer=True) if profile else engine
+    return engine, writer, asset_id, itertools.count()
+
+
+def _signal_row(asset_id, n):
+    from database.models import Signal
+    return Signal(asset_id=asset_id, timestamp=datetime.fromtimestamp(n * 60, tz=timezone.utc),
+                  signal_type='BUY', strength=50, rules_triggered=['bench'])
+
+
+def _commit_each(engine, asset_id, counter):
+    Session = sessionmaker(bind=engine)
+    for _ in range(_COMMIT_ROWS):
+        with Session() as session:
+            session.add(_signal_row(asset_id, next(counter)))
+            session.commit()
+
+
+@benchmark('database.sqlite_commit_each_default_50', group='database', rounds=5,
+           setup=lambda: _file_database(profile=False))
+def bench_sqlite_commit_each_default(state):
+    engine, _, asset_id, counter = state
+    _commit_each(engine, asset_id, counter)
+
+
+@benchmark('database.sqlite_commit_each_wal_50', group='database', rounds=5,
+           setup=lambda: _file_database(profile=True))
+def bench_sqlite_commit_each_wal(state):
+    _, writer, asset_id, counter = state
+    _commit_each(writer, asset_id, counter)
+
+
+def _write_queue_database():
+    from database.write_queue import DatabaseWriteQueue
+    engine, writer, asset_id, counter = _file_database(profile=True)
+    return DatabaseWriteQueue(sessionmaker(bind=writer, expire_on_commit=False)), asset_id, counter
+
+
+@benchmark('database.sqlite_write_queue_50', group='database', rounds=5, setup=_write_queue_database)
+def bench_sqlite_write_queue(state):
+    write_queue, asset_id, counter = state
+    futures = [write_queue.submit(lambda session, n: session.add(_signal_row(asset_id, n)), next(counter))
+               for _ in range(_COMMIT_ROWS)]
+    for future in futures:
+        future.result()
@@ -0,0 +1,34 @@
+# benchmarks/bench_rate_limiter.py
+"""Benchmarks for IntelligentRateLimiter bookkeeping (excluding the intentional sleep)."""
+
+import time
+
+from benchmarks.core import benchmark
+from utils.rate_limiter import IntelligentRateLimiter
+
+
+def _busy_limiter():
+    limiter = IntelligentRateLimiter()
+    now = time.time()
+    # Fill the market_data window just below its effective limit
+    for i in range(80):
+        limiter.request_history['market_data'].append(now - i * 0.1)
+    return limiter
+
+
+@benchmark('rate_limiter.calculate_wait_time', group='rate_limiter', setup=_busy_limiter)
+def bench_calculate_wait_time(limiter):
+    limiter._calculate_wait_time('market_data')
+
+
+@benchmark('rate_limiter.record_success', group='rate_limiter', setup=IntelligentRateLimiter)
+def bench_record_success(limiter):
+    limiter.record_success('market_data')
+
+
+@benchmark('rate_limiter.acquire_account', group='rate_limiter', rounds=5, iterations=20,
+           setup=IntelligentRateLimiter)
+async def bench_acquire_account(limiter):
+    # Real acquire() including its pacing sleep (~11ms per request for account endpoints)
+    await limiter.acquire('account')
+    limiter.request_history['account'].clear()
@@ -0,0 +1,67 @@
+# benchmarks/bench_startup.py
+"""Cold-start benchmark: `python -X importtime` profile of api.web_api against a budget."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Tuple
+
+from benchmarks.core import BenchmarkError, benchmark
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Cumulative import time allowed for the web API module (milliseconds)
+WEB_API_IMPORT_BUDGET_MS = 2000
+
+# Modules that must not be imported until first use; each costs hundreds of ms on a cold start
+DEFERRED_MODULES = ('ccxt', 'pandas', 'numpy', 'analysis', 'scanner', 'trading')
+
+
+def profile_import(module: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Import `module` in a fresh interpreter with -X importtime.
+
+    Returns {module name: (self us, cumulative us)} for every module the
+    import loaded, parsed from the interpreter's importtime report.
+    """
+    env = dict(os.environ, PYTHONPATH=str(PROJECT_ROOT), PYTHONDONTWRITEBYTECODE='1')
+    env.setdefault('BINGX_API_KEY', 'benchmark')
+    env.setdefault('BINGX_SECRET_KEY', 'benchmark')
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=120)
+    if proc.returncode != 0:
+        raise BenchmarkError(f"import {module} failed: {proc.stderr.strip().splitlines()[-1:]}")
+
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def import_time_ms(profile: Dict[str, Tuple[int, int]], module: str) -> float:
+    """Cumulative import time of `module` and its parent packages."""
+    parts = module.split('.')
+    names = ['.'.join(parts[:i]) for i in range(1, len(parts) + 1)]
+    return sum(profile[name][1] for name in names if name in profile) / 1000
+
+
+def check_import_budget(module: str, budget_ms: float, deferred=DEFERRED_MODULES) -> float:
+    """Profile `module`; raise BenchmarkError if it loads a deferred module or exceeds the budget."""
+    profile = profile_import(module)
+    loaded = sorted({name for name in profile if name.split('.')[0] in deferred})
+    if loaded:
+        raise BenchmarkError(f"import {module} loads deferred modules: {', '.join(loaded)}")
+    elapsed = import_time_ms(profile, module)
+    if elapsed > budget_ms:
+        raise BenchmarkError(f"import {module} took {elapsed:.0f}ms (budget {budget_ms}ms)")
+    return elapsed
+
+
+@benchmark('startup.import_web_api', group='startup', rounds=3, iterations=1)
+def bench_import_web_api():
+    # Fresh interpreter per round, so the module cache never hides a cold-start regression
+    check_import_budget('api.web_api', WEB_API_IMPORT_BUDGET_MS)
@@ -0,0 +1,61 @@
+# benchmarks/bench_websocket.py
+"""Benchmarks for WebSocket broadcast fan-out to N in-process clients."""
+
+from datetime import timezone, datetime
+
+from benchmarks.core import benchmark
+
+CLIENT_COUNTS = (5, 50, 200)
+
+
+class _ConnectedState:
+    value = 1  # WebSocketState.CONNECTED
+
+
+class BenchWebSocket:
+    """Minimal in-process WebSocket endpoint that accepts and counts messages."""
+
+    client_state = _ConnectedState()
+
+    def __init__(self):
+        self.messages_received = 0
+
+    async def send_text(self, message: str):
+        self.messages_received += 1
+
+
+def _manager_with_clients(count: int):
+    from api.web_api import ConnectionManager
+
+    manager = ConnectionManager()
+    manager.max_connections = max(manager.max_connections, count)
+    now = datetime.now(timezone.utc)
+    for _ in range(count):
+        websocket = BenchWebSocket()
+        manager.active_connections.append(websocket)
+        manager.connection_metadata[websocket] = {
+            'id': f"bench_{id(websocket)}",
+            'last_activity': now,
+            'bytes_sent': 0,
+            'subscriptions': set(),
+        }
+    return manager
+
+
+SIGNAL_MESSAGE = {
+    'type': 'trading_signal',
+    'data': {'symbol': 'BENCH/USDT', 'signal_type': 'BUY', 'confidence': 0.82, 'price': 42000.5},
+}
+
+
+def _register(count: int):
+    @benchmark(f'websocket.broadcast_{count}_clients', group='websocket',
+               setup=lambda: _manager_with_clients(count))
+    async def bench_broadcast(manager):
+        await manager.broadcast(dict(SIGNAL_MESSAGE), channel='signals')
+
+    return bench_broadcast
+
+
+for _count in CLIENT_COUNTS:
+    _register(_count)
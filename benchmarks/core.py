@@ -0,0 +1,246 @@
+# benchmarks/core.py
+"""Benchmark registry, timing harness and cross-commit result comparison."""
+
+import asyncio
+import importlib
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+BENCHMARK_MODULES = [
+    'benchmarks.bench_analysis',
+    'benchmarks.bench_cache',
+    'benchmarks.bench_rate_limiter',
+    'benchmarks.bench_database',
+    'benchmarks.bench_websocket',
+    'benchmarks.bench_backtest',
+    'benchmarks.bench_logging',
+    'benchmarks.bench_startup',
+]
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+# Default allowed slowdown of the median before a benchmark counts as a regression
+DEFAULT_REGRESSION_THRESHOLD = 0.25
+
+
+class BenchmarkError(Exception):
+    """Exception for benchmark harness errors."""
+    pass
+
+
+@dataclass
+class BenchmarkCase:
+    """A registered benchmark."""
+    name: str
+    group: str
+    func: Callable
+    setup: Optional[Callable] = None
+    rounds: int = 20
+    iterations: Optional[int] = None  # None = calibrate so a round takes ~min_round_time
+
+    @property
+    def is_async(self) -> bool:
+        return asyncio.iscoroutinefunction(self.func)
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing statistics for one benchmark (seconds per call)."""
+    name: str
+    group: str
+    rounds: int
+    iterations: int
+    min: float
+    median: float
+    mean: float
+    p95: float
+    stddev: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+_registry: Dict[str, BenchmarkCase] = {}
+
+
+def benchmark(name: str, group: str, rounds: int = 20, iterations: Optional[int] = None,
+              setup: Optional[Callable] = None):
+    """
+    Register a benchmark function.
+
+    The function may be sync or async. If `setup` is given it is called once
+    (outside timing) and its return value is passed to the benchmark function.
+    """
+    def decorator(func: Callable):
+        if name in _registry:
+            raise BenchmarkError(f"Duplicate benchmark name: {name}")
+        _registry[name] = BenchmarkCase(name=name, group=group, func=func, setup=setup,
+                                        rounds=rounds, iterations=iterations)
+        return func
+    return decorator
+
+
+def load_benchmarks() -> Dict[str, BenchmarkCase]:
+    """Import all benchmark modules and return the registry."""
+    for module in BENCHMARK_MODULES:
+        importlib.import_module(module)
+    return _registry
+
+
+def _summarize(case: BenchmarkCase, timings: List[float], iterations: int) -> BenchmarkResult:
+    ordered = sorted(timings)
+    return BenchmarkResult(
+        name=case.name,
+        group=case.group,
+        rounds=len(timings),
+        iterations=iterations,
+        min=ordered[0],
+        median=statistics.median(ordered),
+        mean=statistics.fmean(ordered),
+        p95=ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+        stddev=statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+    )
+
+
+def _call_duration(call: Callable, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call()
+    return time.perf_counter() - start
+
+
+def _calibrate(call: Callable, min_round_time: float, max_iterations: int = 10000) -> int:
+    """Find an iteration count so one round lasts at least min_round_time."""
+    iterations = 1
+    while iterations < max_iterations:
+        if _call_duration(call, iterations) >= min_round_time:
+            break
+        iterations *= 2
+    return min(iterations, max_iterations)
+
+
+def _run_sync(case: BenchmarkCase, rounds: int, min_round_time: float) -> BenchmarkResult:
+    state = case.setup() if case.setup else None
+    call = (lambda: case.func(state)) if case.setup else case.func
+
+    call()  # warmup
+    iterations = case.iterations or _calibrate(call, min_round_time)
+    timings = [_call_duration(call, iterations) / iterations for _ in range(rounds)]
+    return _summarize(case, timings, iterations)
+
+
+async def _run_async(case: BenchmarkCase, rounds: int, min_round_time: float) -> BenchmarkResult:
+    state = case.setup() if case.setup else None
+    call = (lambda: case.func(state)) if case.setup else case.func
+
+    async def timed(iterations: int) -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await call()
+        return time.perf_counter() - start
+
+    await call()  # warmup
+    iterations = case.iterations
+    if iterations is None:
+        iterations = 1
+        while iterations < 10000 and await timed(iterations) < min_round_time:
+            iterations *= 2
+
+    timings = [await timed(iterations) / iterations for _ in range(rounds)]
+    return _summarize(case, timings, iterations)
+
+
+def run_benchmark(case: BenchmarkCase, rounds: Optional[int] = None,
+                  min_round_time: float = 0.01) -> BenchmarkResult:
+    """Run a single benchmark case."""
+    rounds = rounds or case.rounds
+    if case.is_async:
+        return asyncio.run(_run_async(case, rounds, min_round_time))
+    return _run_sync(case, rounds, min_round_time)
+
+
+def run_benchmarks(name_filter: Optional[str] = None, rounds: Optional[int] = None,
+                   progress: Optional[Callable[[BenchmarkResult], None]] = None) -> Dict[str, BenchmarkResult]:
+    """Run all registered benchmarks whose name contains name_filter."""
+    results = {}
+    for name, case in sorted(load_benchmarks().items()):
+        if name_filter and name_filter not in name:
+            continue
+        result = run_benchmark(case, rounds=rounds)
+        results[name] = result
+        if progress:
+            progress(result)
+    return results
+
+
+def get_environment() -> Dict[str, Any]:
+    """Describe the environment so results from different commits can be compared."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=10
+        ).stdout.strip() or 'unknown'
+    except (OSError, subprocess.SubprocessError):
+        commit = 'unknown'
+
+    return {
+        'commit': commit,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+    }
+
+
+def save_results(results: Dict[str, BenchmarkResult], path: Optional[Path] = None) -> Path:
+    """Write results as JSON (default: benchmarks/results/<commit>.json)."""
+    environment = get_environment()
+    if path is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = RESULTS_DIR / f"{environment['commit']}.json"
+
+    payload = {
+        'environment': environment,
+        'results': {name: result.to_dict() for name, result in results.items()},
+    }
+    Path(path).write_text(json.dumps(payload, indent=2))
+    return Path(path)
+
+
+def load_results(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Load the results section of a saved benchmark file."""
+    try:
+        return json.loads(Path(path).read_text())['results']
+    except (OSError, KeyError, ValueError) as e:
+        raise BenchmarkError(f"Cannot load benchmark results from {path}: {e}")
+
+
+def compare_results(current: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+                    threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Compare median timings against a baseline.
+
+    Returns:
+        One entry per benchmark present in both runs, with 'change' (relative
+        median change) and 'regression' (change above threshold).
+    """
+    comparisons = []
+    for name in sorted(set(current) & set(baseline)):
+        base_median = baseline[name]['median']
+        cur_median = current[name]['median']
+        change = (cur_median - base_median) / base_median if base_median > 0 else 0.0
+        comparisons.append({
+            'name': name,
+            'baseline_median': base_median,
+            'current_median': cur_median,
+            'change': change,
+            'regression': change > threshold,
+        })
+    return comparisons
@@ -0,0 +1,96 @@
+# benchmarks/fixtures.py
+"""Recorded candle fixtures for benchmarks (regenerate with `python -m benchmarks.fixtures`)."""
+
+import json
+import random
+from decimal import Decimal
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List
+
+FIXTURE_PATH = Path(__file__).parent / 'fixtures' / 'candles_bench_usdt.json'
+
+# Candle interval per timeframe in milliseconds
+TIMEFRAME_MS = {
+    'spot': 60_000,
+    '2h': 7_200_000,
+    '4h': 14_400_000,
+}
+
+FIXTURE_SYMBOL = 'BENCH/USDT'
+FIXTURE_CANDLES = 300
+FIXTURE_SEED = 20240101
+FIXTURE_END_MS = 1_704_067_200_000  # 2024-01-01T00:00:00Z
+
+
+def _random_walk(rng: random.Random, count: int, interval_ms: int, start_price: float) -> List[List[float]]:
+    """Generate [timestamp, open, high, low, close, volume] rows with trends and volume spikes."""
+    rows = []
+    price = start_price
+    drift = 0.0
+    start_ms = FIXTURE_END_MS - count * interval_ms
+
+    for i in range(count):
+        # Alternate trending regimes so MA crossovers and RSI extremes occur
+        if i % 60 == 0:
+            drift = rng.uniform(-0.004, 0.004)
+        open_price = price
+        close_price = max(0.01, open_price * (1 + drift + rng.gauss(0, 0.008)))
+        high = max(open_price, close_price) * (1 + abs(rng.gauss(0, 0.003)))
+        low = min(open_price, close_price) * (1 - abs(rng.gauss(0, 0.003)))
+        volume = rng.lognormvariate(10, 0.4) * (3.0 if rng.random() < 0.05 else 1.0)
+
+        rows.append([start_ms + i * interval_ms, round(open_price, 6), round(high, 6),
+                     round(low, 6), round(close_price, 6), round(volume, 4)])
+        price = close_price
+
+    return rows
+
+
+def record_fixture(path: Path = FIXTURE_PATH) -> Path:
+    """(Re)generate the fixture file deterministically."""
+    rng = random.Random(FIXTURE_SEED)
+    payload = {
+        'symbol': FIXTURE_SYMBOL,
+        'seed': FIXTURE_SEED,
+        'columns': ['timestamp', 'open', 'high', 'low', 'close', 'volume'],
+        'timeframes': {
+            timeframe: _random_walk(rng, FIXTURE_CANDLES, interval_ms, 42000.0)
+            for timeframe, interval_ms in TIMEFRAME_MS.items()
+        },
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, separators=(',', ':')))
+    return path
+
+
+@lru_cache(maxsize=None)
+def _load_raw() -> Dict[str, Any]:
+    return json.loads(FIXTURE_PATH.read_text())
+
+
+def load_candles(timeframe: str, limit: int = FIXTURE_CANDLES) -> List[Dict[str, Any]]:
+    """
+    Load fixture candles in the format returned by BingXClient.fetch_ohlcv.
+
+    Args:
+        timeframe: 'spot', '2h' or '4h'
+        limit: Number of most recent candles to return
+    """
+    raw = _load_raw()
+    rows = raw['timeframes'][timeframe][-limit:]
+    return [
+        {
+            'timestamp': int(row[0]),
+            'open': Decimal(str(row[1])),
+            'high': Decimal(str(row[2])),
+            'low': Decimal(str(row[3])),
+            'close': Decimal(str(row[4])),
+            'volume': Decimal(str(row[5])),
+        }
+        for row in rows
+    ]
+
+
+if __name__ == "__main__":
+    print(f"📼 Recorded fixture: {record_fixture()}")
@@ -31,6 +31,10 @@ class Settings:
     BINGX_TESTNET: bool = os.getenv("BINGX_TESTNET", "False").lower() == "true"
     BINGX_SANDBOX: bool = os.getenv("BINGX_SANDBOX", "False").lower() == "true"
     
+    # Market Metadata Snapshot (precision, limits and listings shared by client, scanners and trading)
+    MARKET_SNAPSHOT_FILE: str = os.getenv("MARKET_SNAPSHOT_FILE", "data/market_snapshot.json")
+    MARKET_REFRESH_SECONDS: int = int(os.getenv("MARKET_REFRESH_SECONDS", "3600"))  # Older snapshots are refreshed in the background
+    
     # Database Configuration
     DATABASE_URL: Optional[str] = os.getenv("DATABASE_URL")
     DB_HOST: str = os.getenv("DB_HOST", "localhost")
@@ -42,6 +46,32 @@ class Settings:
     DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
     DB_ECHO: bool = os.getenv("DB_ECHO", "False").lower() == "true"
     
+    # SQLite Profile (local/VST runs without DATABASE_URL)
+    SQLITE_WAL_ENABLED: bool = os.getenv("SQLITE_WAL_ENABLED", "True").lower() == "true"
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "10000"))  # Wait for the write lock
+    SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))  # Page cache per connection
+    SQLITE_MMAP_SIZE_MB: int = int(os.getenv("SQLITE_MMAP_SIZE_MB", "256"))
+    SQLITE_POOL_SIZE: int = int(os.getenv("SQLITE_POOL_SIZE", "8"))  # Concurrent readers
+    
+    # Database Write Queue (single writer, group commit)
+    DB_WRITE_BATCH_SIZE: int = int(os.getenv("DB_WRITE_BATCH_SIZE", "200"))  # Jobs per commit
+    DB_WRITE_BATCH_DELAY_MS: float = float(os.getenv("DB_WRITE_BATCH_DELAY_MS", "5"))  # Wait for more jobs
+    
+    # Signal Bus (analysis -> trading delivery)
+    SIGNAL_CLAIM_LEASE_SECONDS: int = int(os.getenv("SIGNAL_CLAIM_LEASE_SECONDS", "120"))  # Unfinished claims are redelivered after this
+    SIGNAL_FALLBACK_POLL_SECONDS: float = float(os.getenv("SIGNAL_FALLBACK_POLL_SECONDS", "30"))  # Safety net when no notification arrives
+    SIGNAL_CLAIM_BATCH: int = int(os.getenv("SIGNAL_CLAIM_BATCH", "10"))
+    SIGNAL_CONSUMERS: int = int(os.getenv("SIGNAL_CONSUMERS", "1"))  # Consumer tasks per trading worker
+    SIGNAL_MAX_AGE_SECONDS: int = int(os.getenv("SIGNAL_MAX_AGE_SECONDS", "300"))  # Older unprocessed signals are rejected as stale, never traded
+    
+    # Time-series Retention (days; 0 keeps rows forever)
+    MARKET_DATA_RETENTION_DAYS: int = int(os.getenv("MARKET_DATA_RETENTION_DAYS", "400"))  # Backtests use a year
+    INDICATOR_RETENTION_DAYS: int = int(os.getenv("INDICATOR_RETENTION_DAYS", "30"))  # Older rows become daily rollups
+    INDICATOR_ROLLUP_RETENTION_DAYS: int = int(os.getenv("INDICATOR_ROLLUP_RETENTION_DAYS", "730"))
+    SIGNAL_RETENTION_DAYS: int = int(os.getenv("SIGNAL_RETENTION_DAYS", "180"))
+    DB_PARTITION_DAYS: int = int(os.getenv("DB_PARTITION_DAYS", "7"))  # PostgreSQL range partition width
+    DB_PARTITIONS_AHEAD: int = int(os.getenv("DB_PARTITIONS_AHEAD", "4"))  # Future partitions kept ready
+    
     # Redis Configuration (Optional)
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     REDIS_ENABLED: bool = os.getenv("REDIS_ENABLED", "False").lower() == "true"
@@ -52,12 +82,21 @@ class Settings:
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     LOG_MAX_BYTES: int = int(os.getenv("LOG_MAX_BYTES", "10485760"))  # 10MB
     LOG_BACKUP_COUNT: int = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    LOG_QUEUE_ENABLED: bool = os.getenv("LOG_QUEUE_ENABLED", "True").lower() == "true"  # Write logs on a background thread
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))  # Records beyond this are dropped, never block
+    LOG_SAMPLE_RATES: str = os.getenv("LOG_SAMPLE_RATES", "scanner=20")  # logger=records/s per log statement (below WARNING)
     
     # Performance Configuration
     MAX_WORKERS: int = int(os.getenv("MAX_WORKERS", "4"))
     ENABLE_PROFILING: bool = os.getenv("ENABLE_PROFILING", "False").lower() == "true"
     REQUEST_TIMEOUT: int = int(os.getenv("REQUEST_TIMEOUT", "30"))
     
+    # Tracing Configuration
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "True").lower() == "true"
+    TRACING_SAMPLE_RATE: float = float(os.getenv("TRACING_SAMPLE_RATE", "0.01"))  # Fraction of new traces recorded
+    TRACING_BUFFER_SIZE: int = int(os.getenv("TRACING_BUFFER_SIZE", "2048"))  # Finished spans kept in memory
+    TRACING_OTLP_FILE: str = os.getenv("TRACING_OTLP_FILE", "")  # e.g. logs/traces.otlp.jsonl
+    
     # Security Configuration
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")
     JWT_ALGORITHM: str = "HS256"
@@ -109,11 +148,43 @@ class Settings:
         if cls.REQUEST_TIMEOUT < 1:
             errors.append("REQUEST_TIMEOUT must be at least 1 second")
         
+        if not 0 <= cls.TRACING_SAMPLE_RATE <= 1:
+            errors.append("TRACING_SAMPLE_RATE must be between 0 and 1")
+        
+        for name in ('MARKET_DATA_RETENTION_DAYS', 'INDICATOR_RETENTION_DAYS',
+                     'INDICATOR_ROLLUP_RETENTION_DAYS', 'SIGNAL_RETENTION_DAYS'):
+            if getattr(cls, name) < 0:
+                errors.append(f"{name} must be 0 (keep forever) or a positive number of days")
+        
+        if cls.DB_PARTITION_DAYS < 1:
+            errors.append("DB_PARTITION_DAYS must be at least 1")
+        
+        if cls.SQLITE_POOL_SIZE < 1:
+            errors.append("SQLITE_POOL_SIZE must be at least 1")
+        
+        if cls.DB_WRITE_BATCH_SIZE < 1:
+            errors.append("DB_WRITE_BATCH_SIZE must be at least 1")
+        
+        if cls.MARKET_REFRESH_SECONDS < 60:
+            errors.append("MARKET_REFRESH_SECONDS must be at least 60")
+        
+        if cls.SIGNAL_CLAIM_LEASE_SECONDS < 1:
+            errors.append("SIGNAL_CLAIM_LEASE_SECONDS must be at least 1")
+        
+        if cls.SIGNAL_MAX_AGE_SECONDS < 1:
+            errors.append("SIGNAL_MAX_AGE_SECONDS must be at least 1")
+        
+        if cls.SIGNAL_CLAIM_BATCH < 1 or cls.SIGNAL_CONSUMERS < 1:
+            errors.append("SIGNAL_CLAIM_BATCH and SIGNAL_CONSUMERS must be at least 1")
+        
         # Validate log level
         valid_log_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
         if cls.LOG_LEVEL.upper() not in valid_log_levels:
             errors.append(f"LOG_LEVEL must be one of: {valid_log_levels}")
         
+        if cls.LOG_QUEUE_SIZE < 1:
+            errors.append("LOG_QUEUE_SIZE must be at least 1")
+        
         return errors
     
     @classmethod
@@ -181,8 +252,17 @@ class Settings:
         root_logger = logging.getLogger()
         root_logger.setLevel(numeric_level)
         root_logger.handlers.clear()  # Clear existing handlers
-        root_logger.addHandler(console_handler)
-        root_logger.addHandler(file_handler)
+        if cls.LOG_QUEUE_ENABLED:
+            # Callers only enqueue; formatting and file/console I/O happen on a writer thread
+            from utils.log_queue import LogSampler, install_queue_logging, parse_sample_rates
+            install_queue_logging(
+                root_logger, [console_handler, file_handler],
+                sampler=LogSampler(parse_sample_rates(cls.LOG_SAMPLE_RATES)),
+                maxsize=cls.LOG_QUEUE_SIZE
+            )
+        else:
+            root_logger.addHandler(console_handler)
+            root_logger.addHandler(file_handler)
         
         # Reduce noise from external libraries
         logging.getLogger("httpx").setLevel(logging.WARNING)
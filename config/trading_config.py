@@ -28,6 +28,10 @@ class TradingConfig:
     MAX_DAILY_LOSS_PERCENT: Decimal = Decimal(os.getenv("MAX_DAILY_LOSS_PERCENT", "5.0"))  # 5%
     MAX_DRAWDOWN_PERCENT: Decimal = Decimal(os.getenv("MAX_DRAWDOWN_PERCENT", "10.0"))  # 10%
     
+    # Equity Curve (drawdown tracking)
+    EQUITY_SAMPLE_INTERVAL_SECONDS: int = int(os.getenv("EQUITY_SAMPLE_INTERVAL_SECONDS", "60"))  # Unrealized samples
+    EQUITY_CURVE_MEMORY_POINTS: int = int(os.getenv("EQUITY_CURVE_MEMORY_POINTS", "2880"))  # ~2 days at 60s
+    
     # Trailing Stop Configuration
     TRAILING_STOP_LEVELS: List[TrailingStopLevel] = [
         TrailingStopLevel(trigger=Decimal("0.015"), stop=Decimal("0.0")),    # 1.5% → Breakeven
@@ -70,13 +74,32 @@ class TradingConfig:
     SCAN_INTERVAL_SECONDS: int = int(os.getenv("SCAN_INTERVAL", "60"))  # Alias for consistency
     MIN_VOLUME_24H_USDT: Decimal = Decimal(os.getenv("MIN_VOLUME_24H_USDT", "1000"))  # Lower threshold for VST
     MAX_ASSETS_TO_SCAN: int = int(os.getenv("MAX_ASSETS_TO_SCAN", "1500"))  # Support up to 1500 assets
-    
+
+    # Adaptive Scan Scheduler
+    SCHEDULER_MIN_INTERVAL_SECONDS: int = int(os.getenv("SCHEDULER_MIN_INTERVAL_SECONDS", "5"))  # Symbols about to signal
+    SCHEDULER_MAX_INTERVAL_SECONDS: int = int(os.getenv("SCHEDULER_MAX_INTERVAL_SECONDS", "300"))  # Quiet symbols
+    SCHEDULER_RSI_PROXIMITY: Decimal = Decimal(os.getenv("SCHEDULER_RSI_PROXIMITY", "5"))  # RSI points from 35/73 bounds
+    SCHEDULER_MAX_SYMBOLS_PER_CYCLE: int = int(os.getenv("SCHEDULER_MAX_SYMBOLS_PER_CYCLE", "50"))
+
     # Worker Configuration
     MAX_WORKERS: int = int(os.getenv("MAX_WORKERS", "4"))  # Number of parallel workers
+
+    # Sharded Scanner (multi-process, consistent-hash symbol partitions)
+    SCANNER_SHARDING_ENABLED: bool = os.getenv("SCANNER_SHARDING_ENABLED", "false").lower() == "true"
+    SCANNER_SHARD_PROCESSES: int = int(os.getenv("SCANNER_SHARD_PROCESSES", str(MAX_WORKERS)))
+    SCANNER_SHARD_HEARTBEAT_SECONDS: int = int(os.getenv("SCANNER_SHARD_HEARTBEAT_SECONDS", "10"))
+    SCANNER_SHARD_TTL_SECONDS: int = int(os.getenv("SCANNER_SHARD_TTL_SECONDS", "30"))  # Members dropped after this
+
+    # Asset Validation (off: accept every listed symbol except bad formats and the blacklist)
+    STRICT_ASSET_VALIDATION: bool = os.getenv("STRICT_ASSET_VALIDATION", "false").lower() == "true"  # Volume/spread/depth criteria
     
     # Timeframes Configuration
     ANALYSIS_TIMEFRAMES: List[str] = os.getenv("ANALYSIS_TIMEFRAMES", "2h,4h").split(",")
     SPOT_TIMEFRAME: str = os.getenv("SPOT_TIMEFRAME", "1m")
+
+    # Candle Resampling (build analysis timeframes from one lower-timeframe series instead of fetching each)
+    CANDLE_RESAMPLING_ENABLED: bool = os.getenv("CANDLE_RESAMPLING_ENABLED", "false").lower() == "true"
+    CANDLE_RESAMPLE_SOURCE_TIMEFRAME: str = os.getenv("CANDLE_RESAMPLE_SOURCE_TIMEFRAME", "1h")
     
     # Signal Strength Weights
     RULE_WEIGHTS: Dict[str, Decimal] = {
@@ -99,6 +122,13 @@ class TradingConfig:
     ORDER_RETRY_ATTEMPTS: int = int(os.getenv("ORDER_RETRY_ATTEMPTS", "3"))
     ORDER_RETRY_DELAY: float = float(os.getenv("ORDER_RETRY_DELAY", "1.0"))
     
+    # Local balance ledger: seconds between fetch_balance reconciliations
+    BALANCE_RECONCILE_SECONDS: int = int(os.getenv("BALANCE_RECONCILE_SECONDS", "60"))
+    BALANCE_RESERVATION_TTL_SECONDS: int = int(os.getenv("BALANCE_RESERVATION_TTL_SECONDS", "120"))  # Unclaimed reservations expire
+    
+    # Emergency liquidation: close orders submitted at once (BingX allows 15 orders per 10s in the client)
+    EMERGENCY_CLOSE_CONCURRENCY: int = int(os.getenv("EMERGENCY_CLOSE_CONCURRENCY", "10"))
+    
     # Slippage Protection
     MAX_SLIPPAGE_PERCENT: Decimal = Decimal(os.getenv("MAX_SLIPPAGE_PERCENT", "0.5"))  # 0.5%
     
@@ -214,7 +244,33 @@ class TradingConfig:
         
         if cls.RSI_PERIOD < 1:
             errors.append("RSI_PERIOD must be at least 1")
-        
+
+        # Validate scheduler intervals
+        if cls.SCHEDULER_MIN_INTERVAL_SECONDS < 1:
+            errors.append("SCHEDULER_MIN_INTERVAL_SECONDS must be at least 1")
+
+        if cls.SCHEDULER_MAX_INTERVAL_SECONDS < cls.SCHEDULER_MIN_INTERVAL_SECONDS:
+            errors.append("SCHEDULER_MAX_INTERVAL_SECONDS must be >= SCHEDULER_MIN_INTERVAL_SECONDS")
+
+        # Validate sharded scanner settings
+        if cls.EQUITY_SAMPLE_INTERVAL_SECONDS < 1:
+            errors.append("EQUITY_SAMPLE_INTERVAL_SECONDS must be at least 1")
+
+        if cls.BALANCE_RECONCILE_SECONDS < 1:
+            errors.append("BALANCE_RECONCILE_SECONDS must be at least 1")
+
+        if cls.BALANCE_RESERVATION_TTL_SECONDS < 1:
+            errors.append("BALANCE_RESERVATION_TTL_SECONDS must be at least 1")
+
+        if cls.EMERGENCY_CLOSE_CONCURRENCY < 1:
+            errors.append("EMERGENCY_CLOSE_CONCURRENCY must be at least 1")
+
+        if cls.SCANNER_SHARD_PROCESSES < 1:
+            errors.append("SCANNER_SHARD_PROCESSES must be at least 1")
+
+        if cls.SCANNER_SHARD_TTL_SECONDS <= cls.SCANNER_SHARD_HEARTBEAT_SECONDS:
+            errors.append("SCANNER_SHARD_TTL_SECONDS must be greater than SCANNER_SHARD_HEARTBEAT_SECONDS")
+
         # Validate trailing stop levels are in ascending order
         for i, level in enumerate(cls.TRAILING_STOP_LEVELS[1:], 1):
             prev_level = cls.TRAILING_STOP_LEVELS[i-1]
@@ -227,6 +283,14 @@ class TradingConfig:
         for tf in cls.ANALYSIS_TIMEFRAMES:
             if tf not in valid_timeframes:
                 errors.append(f"Invalid timeframe: {tf}. Valid options: {valid_timeframes}")
+
+        if cls.CANDLE_RESAMPLING_ENABLED:
+            from analysis.resampling import can_resample
+            for tf in cls.ANALYSIS_TIMEFRAMES:
+                if not can_resample(cls.CANDLE_RESAMPLE_SOURCE_TIMEFRAME, tf):
+                    errors.append(
+                        f"Cannot resample {tf} from CANDLE_RESAMPLE_SOURCE_TIMEFRAME={cls.CANDLE_RESAMPLE_SOURCE_TIMEFRAME}"
+                    )
         
         return errors
     
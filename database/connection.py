@@ -5,22 +5,88 @@ import os
 import logging
 from typing import Optional, Dict, Any
 from contextlib import contextmanager
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, event, MetaData
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
 from sqlalchemy.exc import SQLAlchemyError
 
 from .models import Base
+from utils.metrics import install_db_metrics
+from utils.tracing import install_db_tracing
 
 logger = logging.getLogger(__name__)
 
 
+def is_memory_sqlite(database_url: str) -> bool:
+    """True for private in-memory SQLite URLs (each connection would see its own database)."""
+    return database_url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in database_url
+
+
+def create_sqlite_engine(database_url: str, writer: bool = False):
+    """
+    Create a SQLite engine with the high-concurrency profile.
+    
+    File databases use WAL so readers never block the writer, synchronous=NORMAL
+    (fsync at checkpoints rather than on every commit), a larger page cache,
+    memory-mapped reads and a busy timeout instead of immediate "database is
+    locked" errors. Reader engines pool several connections. The writer engine
+    holds one connection and starts every transaction with BEGIN IMMEDIATE, so
+    the write lock is taken up front; savepoints work there because pysqlite's
+    own transaction handling is switched off.
+    """
+    from config.settings import Settings
+    
+    echo = os.getenv("DB_ECHO", "false").lower() == "true"
+    if is_memory_sqlite(database_url):
+        return create_engine(database_url, echo=echo, future=True)
+    
+    pool_size = 1 if writer else Settings.SQLITE_POOL_SIZE
+    engine = create_engine(
+        database_url,
+        poolclass=QueuePool,
+        pool_size=pool_size,
+        max_overflow=0 if writer else pool_size,
+        pool_timeout=max(30, Settings.SQLITE_BUSY_TIMEOUT_MS / 1000),
+        connect_args={
+            "check_same_thread": False,  # Pooled connections move between threads
+            "timeout": Settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        },
+        echo=echo,
+        future=True,
+    )
+    
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        if writer:
+            dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            if Settings.SQLITE_WAL_ENABLED:
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={int(Settings.SQLITE_BUSY_TIMEOUT_MS)}")
+            cursor.execute(f"PRAGMA cache_size=-{int(Settings.SQLITE_CACHE_SIZE_KB)}")
+            cursor.execute(f"PRAGMA mmap_size={int(Settings.SQLITE_MMAP_SIZE_MB) * 1024 * 1024}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+        finally:
+            cursor.close()
+    
+    if writer:
+        @event.listens_for(engine, "begin")
+        def _begin_immediate(conn):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+    
+    return engine
+
+
 class DatabaseManager:
     """Manages database connections and sessions."""
     
     def __init__(self):
         self.engine = None
         self.SessionLocal = None
+        self.writer_engine = None  # Dedicated SQLite writer connection (None: writes use engine)
+        self.WriterSessionLocal = None
         self._initialized = False
         self.is_sqlite = False
     
@@ -47,12 +113,10 @@ class DatabaseManager:
             
             # Create engine with appropriate configuration
             if self.is_sqlite:
-                # SQLite configuration (simple, no pooling needed)
-                self.engine = create_engine(
-                    database_url,
-                    echo=os.getenv("DB_ECHO", "false").lower() == "true",
-                    future=True
-                )
+                # Pooled concurrent readers plus one writer connection for the write queue
+                self.engine = create_sqlite_engine(database_url)
+                if not is_memory_sqlite(database_url):
+                    self.writer_engine = create_sqlite_engine(database_url, writer=True)
             else:
                 # PostgreSQL configuration optimized for high-frequency trading operations
                 # Detect if running on Render or other cloud platforms
@@ -117,6 +181,19 @@ class DatabaseManager:
                 }
             )
             
+            self.WriterSessionLocal = sessionmaker(
+                bind=self.writer_engine or self.engine,
+                autocommit=False,
+                autoflush=False,
+                expire_on_commit=False,
+                class_=Session,
+            )
+            
+            # Record statement execution times for /metrics
+            for engine in filter(None, (self.engine, self.writer_engine)):
+                install_db_metrics(engine)
+                install_db_tracing(engine)
+            
             # Test connection
             with self.engine.connect() as conn:
                 from sqlalchemy import text
@@ -157,6 +234,14 @@ class DatabaseManager:
                         Base.metadata.create_all(bind=conn)
                 
                 logger.info("Database tables created successfully")
+                
+                # Partitioned time-series tables need partitions before the first insert
+                if not self.is_sqlite:
+                    try:
+                        from .retention import RetentionManager
+                        RetentionManager(self.engine).ensure_partitions()
+                    except Exception as e:
+                        logger.warning(f"Could not create time partitions: {e}")
                 return True
                 
             except OperationalError as e:
@@ -332,6 +417,12 @@ class DatabaseManager:
             raise RuntimeError("Database not initialized")
         return self.SessionLocal
     
+    def get_writer_session_factory(self) -> sessionmaker:
+        """Session factory bound to the writer connection (used by the write queue)."""
+        if not self._initialized:
+            raise RuntimeError("Database not initialized")
+        return self.WriterSessionLocal
+    
     def health_check(self) -> bool:
         """Check database connection health with detailed diagnostics."""
         try:
@@ -371,6 +462,10 @@ class DatabaseManager:
     
     def close(self):
         """Close database connections."""
+        from .write_queue import shutdown_write_queue
+        shutdown_write_queue()
+        if self.writer_engine:
+            self.writer_engine.dispose()
         if self.engine:
             self.engine.dispose()
             logger.info("Database connections closed")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Database migration adding the claim columns used by signal consumers
+(claimed_by, claimed_at, rejection_reason) to the signals table.
+
+On the first run, signals that already exist are marked processed
+(rejection_reason 'stale') so consumers do not trade historical signals.
+
+Safe to run more than once; columns that already exist are left alone.
+Works on PostgreSQL and SQLite.
+"""
+
+import sys
+import os
+
+from sqlalchemy import inspect, text
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from database.connection import db_manager
+from utils.logger import get_logger
+
+logger = get_logger("migration")
+
+SIGNAL_CLAIM_COLUMNS = {
+    'claimed_by': 'VARCHAR(64)',
+    'claimed_at': 'TIMESTAMP WITH TIME ZONE',
+    'rejection_reason': 'VARCHAR(255)',
+}
+
+
+class AddSignalClaimsMigration:
+    """Migration to add signal claim columns."""
+
+    def run_migration(self) -> bool:
+        """Execute the migration."""
+        if not db_manager.initialize():
+            logger.error("Database not available")
+            return False
+
+        engine = db_manager.engine
+        existing = {column['name'] for column in inspect(engine).get_columns('signals')}
+        first_run = 'claimed_by' not in existing
+
+        with engine.begin() as conn:
+            for name, column_type in SIGNAL_CLAIM_COLUMNS.items():
+                if name in existing:
+                    logger.info(f"signals.{name} already exists")
+                    continue
+                if db_manager.is_sqlite:
+                    column_type = column_type.replace(' WITH TIME ZONE', '')
+                conn.execute(text(f"ALTER TABLE signals ADD COLUMN {name} {column_type}"))
+                logger.info(f"✅ Added signals.{name}")
+
+            if first_run:
+                # Nothing marked signals processed before claims existed; without this the
+                # consumers would replay the whole retention window of old signals as orders
+                done = 'true' if not db_manager.is_sqlite else '1'
+                result = conn.execute(text(
+                    f"UPDATE signals SET is_processed = {done}, rejection_reason = 'stale' "
+                    f"WHERE is_processed IS NULL OR is_processed <> {done}"
+                ))
+                logger.info(f"✅ Marked {result.rowcount} existing signals processed")
+
+            # Claimable signals are found by this filter on every wakeup
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_signals_unclaimed ON signals (timestamp) WHERE is_processed = false"
+                if not db_manager.is_sqlite else
+                "CREATE INDEX IF NOT EXISTS idx_signals_unclaimed ON signals (timestamp) WHERE is_processed = 0"
+            ))
+
+        return True
+
+
+def main():
+    """Run the migration."""
+    migration = AddSignalClaimsMigration()
+    if migration.run_migration():
+        logger.info("Migration completed successfully")
+        return 0
+    logger.error("Migration failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
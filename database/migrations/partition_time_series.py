@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Database migration converting market_data, indicators and signals into
+PostgreSQL tables range partitioned by timestamp.
+
+Each table is renamed aside, recreated as a partitioned table from the
+models (primary key (id, timestamp)), given its partitions and refilled
+with the rows still inside the retention window. Tables that are already
+partitioned are skipped. SQLite databases need no migration.
+
+Run during a maintenance window: the copy holds locks on the tables.
+"""
+
+import sys
+import os
+
+from sqlalchemy import text
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from database.connection import db_manager
+from database.models import IndicatorRollup
+from database.retention import TIME_SERIES_TABLES, RetentionManager
+from utils.logger import get_logger
+
+logger = get_logger("migration")
+
+
+class PartitionTimeSeriesMigration:
+    """Migration to partition the time-series tables by timestamp."""
+
+    def run_migration(self) -> bool:
+        """Execute the migration."""
+        if not db_manager.initialize():
+            logger.error("Database not available")
+            return False
+        if db_manager.is_sqlite:
+            logger.info("SQLite database - nothing to partition")
+            return True
+
+        engine = db_manager.engine
+        manager = RetentionManager(engine)
+        IndicatorRollup.__table__.create(bind=engine, checkfirst=True)
+
+        for table_name, table in TIME_SERIES_TABLES.items():
+            with engine.begin() as conn:
+                if manager.is_partitioned(conn, table_name):
+                    logger.info(f"{table_name} is already partitioned")
+                    continue
+
+                legacy = f"{table_name}_legacy"
+                logger.info(f"Partitioning {table_name}...")
+                conn.execute(text(f"ALTER TABLE {table_name} RENAME TO {legacy}"))
+
+                # Index and constraint names are schema-wide; move them aside too
+                indexes = conn.execute(text(
+                    "SELECT indexname FROM pg_indexes WHERE tablename = :table"
+                ), {'table': legacy}).scalars().all()
+                for index in indexes:
+                    conn.execute(text(f"ALTER INDEX {index} RENAME TO {index}_legacy"))
+
+                table.create(bind=conn)
+
+            manager.ensure_partitions()
+
+            with engine.begin() as conn:
+                columns = ', '.join(f'"{column.name}"' for column in table.columns)
+                cutoff = manager.policy.cutoff(table_name, _now())
+                where = "WHERE timestamp >= :cutoff" if cutoff else ""
+                copied = conn.execute(
+                    text(f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM {legacy} {where}"),
+                    {'cutoff': cutoff} if cutoff else {},
+                ).rowcount
+                if table_name == 'indicators' and cutoff:
+                    manager.rollup_indicators(conn, cutoff, source=_legacy_table(legacy))
+                conn.execute(text(f"DROP TABLE {legacy}"))
+                logger.info(f"✅ {table_name}: {copied} rows copied into partitions")
+
+        return True
+
+
+def _now():
+    from datetime import datetime, timezone
+    return datetime.now(timezone.utc)
+
+
+def _legacy_table(name: str):
+    """Indicators column set bound to the renamed legacy table."""
+    from sqlalchemy import MetaData
+    return TIME_SERIES_TABLES['indicators'].to_metadata(MetaData(), name=name)
+
+
+def main():
+    """Run the migration."""
+    migration = PartitionTimeSeriesMigration()
+    if migration.run_migration():
+        logger.info("Migration completed successfully")
+        return 0
+    logger.error("Migration failed")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,7 @@ from decimal import Decimal
 from typing import Optional, Dict, Any, List
 from sqlalchemy import (
     Column, String, Boolean, DateTime, JSON, Numeric, Integer,
-    Text, ForeignKey, CheckConstraint, UniqueConstraint, Index
+    Text, ForeignKey, CheckConstraint, UniqueConstraint, Index, text
 )
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import relationship, validates
@@ -39,6 +39,11 @@ def get_uuid():
 
 Base = declarative_base()
 
+# Time-series tables are range partitioned by timestamp on PostgreSQL (ignored by
+# SQLite); the partition key has to be part of the primary key there.
+# database/retention.py creates and drops the partitions.
+TIME_PARTITIONED = {'postgresql_partition_by': 'RANGE (timestamp)'}
+
 
 class Asset(Base):
     """Model for trading assets (cryptocurrency pairs)."""
@@ -66,6 +71,7 @@ class Asset(Base):
     # Relationships
     market_data = relationship("MarketData", back_populates="asset", cascade="all, delete-orphan")
     indicators = relationship("Indicator", back_populates="asset", cascade="all, delete-orphan")
+    indicator_rollups = relationship("IndicatorRollup", back_populates="asset", cascade="all, delete-orphan")
     trades = relationship("Trade", back_populates="asset", cascade="all, delete-orphan")
     signals = relationship("Signal", back_populates="asset", cascade="all, delete-orphan")
     
@@ -91,7 +97,7 @@ class MarketData(Base):
     asset_id = Column(UUIDType, ForeignKey('assets.id'), nullable=False)
     
     # Market data
-    timestamp = Column(DateTime(timezone=True), nullable=False)
+    timestamp = Column(DateTime(timezone=True), primary_key=True, nullable=False)
     timeframe = Column(String(10), nullable=False)  # '1h', '2h', '4h', etc.
     open = Column(Numeric(20, 8), nullable=False)
     high = Column(Numeric(20, 8), nullable=False)
@@ -109,6 +115,7 @@ class MarketData(Base):
     __table_args__ = (
         UniqueConstraint('asset_id', 'timestamp', 'timeframe', name='uq_market_data_asset_time_tf'),
         Index('idx_market_data_asset_time', 'asset_id', 'timestamp'),
+        TIME_PARTITIONED,
     )
     
     def __repr__(self):
@@ -134,7 +141,7 @@ class Indicator(Base):
     asset_id = Column(UUIDType, ForeignKey('assets.id'), nullable=False)
     
     # Indicator data
-    timestamp = Column(DateTime(timezone=True), nullable=False)
+    timestamp = Column(DateTime(timezone=True), primary_key=True, nullable=False)
     timeframe = Column(String(10), nullable=False)
     mm1 = Column(Numeric(20, 8))  # Fast EMA (9 periods)
     center = Column(Numeric(20, 8))  # Slow EMA (21 periods)
@@ -152,6 +159,7 @@ class Indicator(Base):
     __table_args__ = (
         UniqueConstraint('asset_id', 'timestamp', 'timeframe', name='uq_indicators_asset_time_tf'),
         Index('idx_indicators_asset_time', 'asset_id', 'timestamp'),
+        TIME_PARTITIONED,
     )
     
     def __repr__(self):
@@ -164,6 +172,40 @@ class Indicator(Base):
         return rsi
 
 
+class IndicatorRollup(Base):
+    """Model for daily downsampled indicators kept after raw indicator rows expire."""
+    
+    __tablename__ = 'indicator_rollups'
+    
+    # Primary key (integer keeps the time series compact)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    
+    # Foreign key
+    asset_id = Column(UUIDType, ForeignKey('assets.id'), nullable=False)
+    
+    # Bucket data (averages over the raw rows of the bucket)
+    bucket = Column(DateTime(timezone=True), nullable=False)  # Start of the UTC day
+    timeframe = Column(String(10), nullable=False)
+    mm1 = Column(Numeric(20, 8))
+    center = Column(Numeric(20, 8))
+    rsi = Column(Numeric(5, 2))
+    rsi_min = Column(Numeric(5, 2))
+    rsi_max = Column(Numeric(5, 2))
+    volume_sma = Column(Numeric(30, 8))
+    samples = Column(Integer, nullable=False)
+    
+    # Relationships
+    asset = relationship("Asset", back_populates="indicator_rollups")
+    
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint('asset_id', 'bucket', 'timeframe', name='uq_indicator_rollups_asset_bucket_tf'),
+    )
+    
+    def __repr__(self):
+        return f"<IndicatorRollup(asset={self.asset_id}, bucket={self.bucket}, tf={self.timeframe}, samples={self.samples})>"
+
+
 class Trade(Base):
     """Model for trading operations."""
     
@@ -305,13 +347,18 @@ class Signal(Base):
     trade_id = Column(UUIDType, ForeignKey('trades.id'))
     
     # Signal data
-    timestamp = Column(DateTime(timezone=True), nullable=False)
+    timestamp = Column(DateTime(timezone=True), primary_key=True, nullable=False)
     signal_type = Column(String(10), nullable=False)  # 'BUY' or 'SELL'
     strength = Column(Numeric(5, 2))  # Signal strength 0-100
     rules_triggered = Column(JSONType)  # Which rules triggered the signal (stored as JSON array)
     indicators_snapshot = Column(JSONType)  # Snapshot of indicators at signal time
     is_processed = Column(Boolean, default=False, index=True) # New field to track if signal has been processed
     
+    # Delivery to trading consumers (claim lease for at-least-once processing)
+    claimed_by = Column(String(64))
+    claimed_at = Column(DateTime(timezone=True))
+    rejection_reason = Column(String(255))
+    
     # Timestamp
     created_at = Column(DateTime(timezone=True), server_default=func.current_timestamp())
     
@@ -323,6 +370,9 @@ class Signal(Base):
     __table_args__ = (
         CheckConstraint("signal_type IN ('BUY', 'SELL')", name='ck_signal_type'),
         Index('idx_signals_asset_time', 'asset_id', 'timestamp'),
+        Index('idx_signals_unclaimed', 'timestamp', postgresql_where=text('is_processed = false'),
+              sqlite_where=text('is_processed = 0')),
+        TIME_PARTITIONED,
     )
     
     def __repr__(self):
@@ -335,6 +385,35 @@ class Signal(Base):
         return signal_type
 
 
+class EquitySnapshot(Base):
+    """Model for equity curve points (realized P&L events and periodic unrealized samples)."""
+    
+    __tablename__ = 'equity_snapshots'
+    
+    # Primary key (integer keeps the time series compact)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    
+    # Point data
+    timestamp = Column(DateTime(timezone=True), nullable=False)
+    kind = Column(String(10), nullable=False)  # 'REALIZED' or 'SAMPLE'
+    equity = Column(Numeric(20, 8), nullable=False)
+    realized_pnl = Column(Numeric(20, 8), nullable=False)  # Cumulative since the curve started
+    unrealized_pnl = Column(Numeric(20, 8), nullable=False)
+    
+    # Running state so a restart resumes in O(1)
+    peak_equity = Column(Numeric(20, 8), nullable=False)
+    max_drawdown = Column(Numeric(10, 6), nullable=False)  # Fraction of peak
+    
+    # Constraints
+    __table_args__ = (
+        CheckConstraint("kind IN ('REALIZED', 'SAMPLE')", name='ck_equity_snapshot_kind'),
+        Index('idx_equity_snapshots_timestamp', 'timestamp'),
+    )
+    
+    def __repr__(self):
+        return f"<EquitySnapshot(time={self.timestamp}, equity={self.equity}, kind={self.kind})>"
+
+
 class SystemConfig(Base):
     """Model for system configuration key-value pairs."""
     
@@ -0,0 +1,91 @@
+# database/projections.py
+"""Lightweight read-only row projections joined with the asset symbol (no ORM identity tracking)."""
+
+from dataclasses import dataclass, fields
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Tuple
+
+from .models import Asset, Signal, Trade
+
+
+@dataclass(slots=True, frozen=True)
+class TradeRow:
+    """Trade columns plus asset symbol."""
+    id: Any
+    asset_id: Any
+    symbol: Optional[str]
+    side: str
+    entry_price: Decimal
+    quantity: Decimal
+    stop_loss: Optional[Decimal]
+    take_profit: Optional[Decimal]
+    status: str
+    entry_reason: Optional[str]
+    entry_time: Optional[datetime]
+    exit_time: Optional[datetime]
+    exit_price: Optional[Decimal]
+    exit_reason: Optional[str]
+    pnl: Optional[Decimal]
+    pnl_percentage: Optional[Decimal]
+    fees: Optional[Decimal]
+    created_at: Optional[datetime]
+
+    def calculate_pnl(self, current_price: Optional[Decimal] = None) -> Decimal:
+        """Calculate current P&L for the trade (same rules as Trade.calculate_pnl)."""
+        if self.status == 'CLOSED' and self.exit_price:
+            price_diff = self.exit_price - self.entry_price
+        elif current_price:
+            price_diff = current_price - self.entry_price
+        else:
+            return Decimal('0')
+
+        if self.side == 'SELL':
+            price_diff = -price_diff
+
+        return price_diff * self.quantity
+
+
+@dataclass(slots=True, frozen=True)
+class SignalRow:
+    """Signal columns plus asset symbol."""
+    id: Any
+    asset_id: Any
+    trade_id: Any
+    symbol: Optional[str]
+    timestamp: datetime
+    signal_type: str
+    strength: Optional[Decimal]
+    rules_triggered: Any
+    indicators_snapshot: Any
+    is_processed: Optional[bool]
+    created_at: Optional[datetime]
+
+
+def _columns(row_class, model) -> Tuple[Any, ...]:
+    return tuple(
+        Asset.symbol.label('symbol') if f.name == 'symbol' else getattr(model, f.name)
+        for f in fields(row_class)
+    )
+
+
+TRADE_ROW_COLUMNS = _columns(TradeRow, Trade)
+SIGNAL_ROW_COLUMNS = _columns(SignalRow, Signal)
+
+
+def trade_rows_query(session):
+    """Base query selecting TradeRow columns with the asset symbol in one join."""
+    return session.query(*TRADE_ROW_COLUMNS).outerjoin(Asset, Trade.asset_id == Asset.id)
+
+
+def signal_rows_query(session):
+    """Base query selecting SignalRow columns with the asset symbol in one join."""
+    return session.query(*SIGNAL_ROW_COLUMNS).outerjoin(Asset, Signal.asset_id == Asset.id)
+
+
+def to_trade_rows(rows) -> List[TradeRow]:
+    return [TradeRow(*row) for row in rows]
+
+
+def to_signal_rows(rows) -> List[SignalRow]:
+    return [SignalRow(*row) for row in rows]
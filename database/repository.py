@@ -2,15 +2,19 @@
 """Repository pattern implementation for database operations."""
 
 import logging
-from typing import List, Optional, Dict, Any, Tuple
-from datetime import datetime, timedelta
+from typing import List, Optional, Dict, Any, Tuple, Collection, Set
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, and_, or_, func, String
 from sqlalchemy.exc import SQLAlchemyError
 
-from .models import Asset, MarketData, Indicator, Trade, Order, Signal, SystemConfig
+from .models import Asset, MarketData, Indicator, Trade, Order, Signal, SystemConfig, EquitySnapshot
 from .connection import get_session
+from .signal_bus import get_signal_bus
+from .projections import (
+    TradeRow, SignalRow, trade_rows_query, signal_rows_query, to_trade_rows, to_signal_rows
+)
 
 logger = logging.getLogger(__name__)
 
@@ -324,7 +328,31 @@ class MarketDataRepository(BaseRepository):
         except SQLAlchemyError as e:
             logger.error(f"Error getting market data range: {e}")
             return []
-    
+
+    def get_ohlcv_rows(self, session: Session, timeframe: str, symbols: Optional[List[str]] = None,
+                       start_time: Optional[datetime] = None,
+                       end_time: Optional[datetime] = None) -> List[Tuple]:
+        """
+        Get (symbol, timestamp, open, high, low, close, volume) tuples for many assets in one query.
+
+        Rows are ordered by symbol then timestamp; no ORM objects are built.
+        """
+        try:
+            query = (session.query(Asset.symbol, MarketData.timestamp, MarketData.open, MarketData.high,
+                                   MarketData.low, MarketData.close, MarketData.volume)
+                     .join(Asset, MarketData.asset_id == Asset.id)
+                     .filter(MarketData.timeframe == timeframe))
+            if symbols:
+                query = query.filter(Asset.symbol.in_(symbols))
+            if start_time:
+                query = query.filter(MarketData.timestamp >= start_time)
+            if end_time:
+                query = query.filter(MarketData.timestamp <= end_time)
+            return query.order_by(Asset.symbol, MarketData.timestamp).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting OHLCV rows: {e}")
+            return []
+
     def upsert_candle(self, session: Session, asset_id: str, timeframe: str, timestamp: datetime,
                      open_price: Decimal, high: Decimal, low: Decimal, close: Decimal, volume: Decimal) -> Optional[MarketData]:
         """Insert or update market data candle."""
@@ -518,6 +546,34 @@ class TradeRepository(BaseRepository):
             logger.error(f"Error getting open positions: {e}")
             return []
     
+    def get_open_trade_rows(self, session: Session, asset_id: str = None) -> List[TradeRow]:
+        """Get open trades as read-only rows with the asset symbol (single query)."""
+        try:
+            query = trade_rows_query(session).filter(Trade.status == 'OPEN')
+            if asset_id:
+                query = query.filter(Trade.asset_id == asset_id)
+            return to_trade_rows(query.order_by(desc(Trade.entry_time)))
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting open trade rows: {e}")
+            return []
+    
+    def get_trade_rows(self, session: Session, symbol: str = None, status: str = None,
+                       limit: int = 50) -> List[TradeRow]:
+        """Get trades as read-only rows with the asset symbol, filtered like get_trades."""
+        try:
+            query = trade_rows_query(session)
+            if symbol:
+                query = query.filter(Asset.symbol == symbol.upper())
+            if status:
+                query = query.filter(Trade.status == status.upper())
+            query = query.order_by(desc(Trade.entry_time))
+            if limit:
+                query = query.limit(limit)
+            return to_trade_rows(query)
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting trade rows: {e}")
+            return []
+    
     def get_recent_trades(self, session: Session, days: int = 30, asset_id: str = None) -> List[Trade]:
         """Get recent trades within specified days."""
         try:
@@ -584,49 +640,156 @@ class TradeRepository(BaseRepository):
             logger.error(f"Error getting trade count: {e}")
             return 0
     
+    @staticmethod
+    def _pnl_aggregates(pnl):
+        """Aggregate columns over a P&L column: counts, win/loss sums and extremes."""
+        return (
+            func.count().label('total_trades'),
+            func.count().filter(pnl > 0).label('winning_trades'),
+            func.count().filter(pnl < 0).label('losing_trades'),
+            func.coalesce(func.sum(pnl), 0).label('total_pnl'),
+            func.coalesce(func.sum(pnl).filter(pnl > 0), 0).label('gross_profit'),
+            func.coalesce(func.sum(pnl).filter(pnl < 0), 0).label('gross_loss'),
+            func.max(pnl).filter(pnl > 0).label('max_win'),
+            func.min(pnl).filter(pnl < 0).label('max_loss'),
+        )
+    
+    @staticmethod
+    def _aggregate_row_to_dict(row) -> Dict[str, Any]:
+        return {
+            'total_trades': row.total_trades or 0,
+            'winning_trades': row.winning_trades or 0,
+            'losing_trades': row.losing_trades or 0,
+            'total_pnl': Decimal(str(row.total_pnl or 0)),
+            'gross_profit': Decimal(str(row.gross_profit or 0)),
+            'gross_loss': Decimal(str(row.gross_loss or 0)),
+            'max_win': Decimal(str(row.max_win)) if row.max_win is not None else None,
+            'max_loss': Decimal(str(row.max_loss)) if row.max_loss is not None else None,
+        }
+    
     def get_performance_stats(self, session: Session, asset_id: str = None, days: int = 30) -> Dict[str, Any]:
-        """Get trading performance statistics."""
+        """Get trading performance statistics (single aggregate query)."""
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=days)
-            query = session.query(Trade).filter(
+            query = session.query(*self._pnl_aggregates(Trade.pnl)).filter(
                 and_(Trade.status == 'CLOSED', Trade.entry_time >= cutoff_date)
             )
             if asset_id:
                 query = query.filter(Trade.asset_id == asset_id)
             
-            trades = query.all()
-            
-            if not trades:
-                return {
-                    'total_trades': 0,
-                    'winning_trades': 0,
-                    'losing_trades': 0,
-                    'win_rate': 0,
-                    'total_pnl': 0,
-                    'avg_pnl': 0,
-                    'max_win': 0,
-                    'max_loss': 0
-                }
-            
-            winning_trades = [t for t in trades if t.pnl and t.pnl > 0]
-            losing_trades = [t for t in trades if t.pnl and t.pnl < 0]
-            
-            total_pnl = sum(t.pnl for t in trades if t.pnl)
+            stats = self._aggregate_row_to_dict(query.one())
+            total_trades = stats['total_trades']
             
             return {
-                'total_trades': len(trades),
-                'winning_trades': len(winning_trades),
-                'losing_trades': len(losing_trades),
-                'win_rate': len(winning_trades) / len(trades) * 100 if trades else 0,
-                'total_pnl': float(total_pnl),
-                'avg_pnl': float(total_pnl / len(trades)) if trades else 0,
-                'max_win': float(max(t.pnl for t in winning_trades)) if winning_trades else 0,
-                'max_loss': float(min(t.pnl for t in losing_trades)) if losing_trades else 0
+                'total_trades': total_trades,
+                'winning_trades': stats['winning_trades'],
+                'losing_trades': stats['losing_trades'],
+                'win_rate': stats['winning_trades'] / total_trades * 100 if total_trades else 0,
+                'total_pnl': float(stats['total_pnl']),
+                'avg_pnl': float(stats['total_pnl'] / total_trades) if total_trades else 0,
+                'max_win': float(stats['max_win'] or 0),
+                'max_loss': float(stats['max_loss'] or 0)
             }
         except SQLAlchemyError as e:
             logger.error(f"Error getting performance stats: {e}")
             return {}
     
+    def get_recent_closed_pnl_stats(self, session: Session, limit: int = 100) -> Dict[str, Any]:
+        """Aggregate P&L statistics over the most recent `limit` closed trades."""
+        try:
+            recent = (
+                session.query(Trade.pnl.label('pnl'))
+                .filter(Trade.status == 'CLOSED')
+                .order_by(desc(Trade.exit_time))
+                .limit(limit)
+                .subquery()
+            )
+            return self._aggregate_row_to_dict(session.query(*self._pnl_aggregates(recent.c.pnl)).one())
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting recent closed trade stats: {e}")
+            return {}
+    
+    def get_pnl_between(self, session: Session, start_time: datetime, end_time: Optional[datetime] = None,
+                        asset_id: str = None) -> Decimal:
+        """Sum recorded P&L of trades entered in [start_time, end_time]."""
+        try:
+            query = session.query(func.coalesce(func.sum(Trade.pnl), 0)).filter(Trade.entry_time >= start_time)
+            if end_time is not None:
+                query = query.filter(Trade.entry_time <= end_time)
+            if asset_id:
+                query = query.filter(Trade.asset_id == asset_id)
+            return Decimal(str(query.scalar() or 0))
+        except SQLAlchemyError as e:
+            logger.error(f"Error summing P&L since {start_time}: {e}")
+            return Decimal('0')
+    
+    def get_closed_pnl_by_period(self, session: Session, periods: Dict[str, datetime]) -> Dict[str, Decimal]:
+        """
+        Realized P&L of closed trades for several periods in one query.
+        
+        Args:
+            periods: Label -> start time (trades entered at or after it are included)
+        """
+        if not periods:
+            return {}
+        try:
+            columns = [
+                func.coalesce(func.sum(Trade.pnl).filter(Trade.entry_time >= start), 0).label(label)
+                for label, start in periods.items()
+            ]
+            row = (
+                session.query(*columns)
+                .filter(and_(Trade.status == 'CLOSED', Trade.entry_time >= min(periods.values())))
+                .one()
+            )
+            return {label: Decimal(str(row._mapping[label] or 0)) for label in periods}
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting period P&L: {e}")
+            return {label: Decimal('0') for label in periods}
+    
+    def get_realized_since(self, session: Session, watermark: Optional[datetime],
+                           seen_ids: Collection[str] = ()) -> Tuple[Decimal, int, Optional[datetime], Set[str]]:
+        """
+        Realized P&L of trades closed at or after `watermark` (only new closes are scanned).
+        
+        Trades closed at the watermark itself are included unless their id is in
+        `seen_ids`, so a close committed with the same exit_time after the last
+        scan is not skipped.
+        
+        Returns:
+            (pnl sum, trade count, latest exit_time or None, ids of the trades closed at that time)
+        """
+        try:
+            query = (
+                session.query(Trade.id, Trade.pnl, Trade.exit_time)
+                .filter(and_(Trade.status == 'CLOSED', Trade.exit_time.isnot(None)))
+            )
+            if watermark is not None:
+                query = query.filter(Trade.exit_time >= watermark)
+            seen = {str(trade_id) for trade_id in seen_ids}
+            pnl, count, latest, latest_ids = Decimal('0'), 0, None, set()
+            for trade_id, trade_pnl, exit_time in query.order_by(Trade.exit_time):
+                trade_id = str(trade_id)
+                if exit_time != latest:
+                    latest, latest_ids = exit_time, set()
+                latest_ids.add(trade_id)
+                if trade_id not in seen:
+                    pnl += Decimal(str(trade_pnl or 0))
+                    count += 1
+            return pnl, count, latest, latest_ids
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting realized P&L since {watermark}: {e}")
+            return Decimal('0'), 0, None, set()
+    
+    def get_ids_closed_at(self, session: Session, exit_time: datetime) -> Set[str]:
+        """Ids of the closed trades whose exit_time equals `exit_time`."""
+        try:
+            rows = session.query(Trade.id).filter(and_(Trade.status == 'CLOSED', Trade.exit_time == exit_time))
+            return {str(trade_id) for trade_id, in rows}
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting trades closed at {exit_time}: {e}")
+            return set()
+    
     def update_trade(self, session: Session, trade_id: str, update_data: Dict[str, Any]) -> Optional[Trade]:
         """Update trade with new data."""
         try:
@@ -786,7 +949,7 @@ class SignalRepository(BaseRepository):
                      rules_triggered: List[str], indicators_snapshot: Dict, trade_id: str = None) -> Optional[Signal]:
         """Create new trading signal."""
         try:
-            return self.create(
+            signal = self.create(
                 session,
                 asset_id=asset_id,
                 timestamp=datetime.utcnow(),
@@ -796,6 +959,10 @@ class SignalRepository(BaseRepository):
                 indicators_snapshot=self._convert_decimals_to_float(indicators_snapshot),
                 trade_id=trade_id
             )
+            if signal is not None:
+                # Wake trading consumers once this transaction commits
+                get_signal_bus().publish(session)
+            return signal
         except SQLAlchemyError as e:
             logger.error(f"Error creating signal: {e}")
             return None
@@ -815,6 +982,26 @@ class SignalRepository(BaseRepository):
             logger.error(f"Error getting recent signals: {e}")
             return []
     
+    def get_recent_signal_rows(self, session: Session, hours: int = 24, limit: int = None) -> List[SignalRow]:
+        """Get recent signals as read-only rows with the asset symbol (single query)."""
+        try:
+            cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+            query = signal_rows_query(session).filter(Signal.timestamp >= cutoff_time).order_by(desc(Signal.timestamp))
+            if limit is not None:
+                query = query.limit(limit)
+            return to_signal_rows(query)
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting recent signal rows: {e}")
+            return []
+    
+    def get_pending_signal_rows(self, session: Session, limit: int = 50) -> List[SignalRow]:
+        """Row-projection variant of get_pending_signals."""
+        try:
+            return to_signal_rows(signal_rows_query(session).order_by(desc(Signal.timestamp)).limit(limit))
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting pending signal rows: {e}")
+            return []
+    
     def get_pending_signals(self, session: Session, limit: int = 50) -> List[Signal]:
         """Get pending signals that haven't been processed."""
         try:
@@ -828,6 +1015,81 @@ class SignalRepository(BaseRepository):
             logger.error(f"Error getting pending signals: {e}")
             return []
 
+    def claim_pending_signals(self, session: Session, consumer_id: str, limit: int = 10,
+                              lease_seconds: int = 120, max_age_seconds: Optional[int] = None) -> List[SignalRow]:
+        """
+        Claim unprocessed signals for one consumer, oldest first.
+        
+        Signals older than max_age_seconds are never delivered: trading on
+        them would place orders at prices long gone, so they are marked
+        rejected as stale instead.
+        
+        Rows locked by another consumer are skipped (FOR UPDATE SKIP LOCKED on
+        PostgreSQL) and a claim is only taken if the row is still unclaimed when
+        it is updated, so concurrent consumers never get the same signal. Claims
+        not finished within lease_seconds become claimable again, which gives
+        at-least-once delivery if a consumer dies mid-signal. The caller commits.
+        """
+        try:
+            now = datetime.now(timezone.utc)
+            unprocessed = or_(Signal.is_processed.is_(False), Signal.is_processed.is_(None))
+            claimable = and_(
+                unprocessed,
+                or_(Signal.claimed_at.is_(None), Signal.claimed_at < now - timedelta(seconds=lease_seconds)),
+            )
+            if max_age_seconds is not None:
+                cutoff = now - timedelta(seconds=max_age_seconds)
+                stale = (session.query(Signal)
+                         .filter(unprocessed, Signal.timestamp < cutoff)
+                         .update({Signal.is_processed: True, Signal.rejection_reason: 'stale'},
+                                 synchronize_session=False))
+                if stale:
+                    logger.warning(f"Rejected {stale} stale signals older than {max_age_seconds}s")
+                claimable = and_(claimable, Signal.timestamp >= cutoff)
+            candidates = to_signal_rows(
+                signal_rows_query(session)
+                .filter(claimable)
+                .order_by(Signal.timestamp)
+                .limit(limit)
+                .with_for_update(of=Signal, skip_locked=True)
+            )
+            
+            claimed = []
+            for row in candidates:
+                updated = (session.query(Signal)
+                           .filter(Signal.id == row.id, Signal.timestamp == row.timestamp, claimable)
+                           .update({Signal.claimed_by: consumer_id, Signal.claimed_at: now},
+                                   synchronize_session=False))
+                if updated:
+                    claimed.append(row)
+            return claimed
+        except SQLAlchemyError as e:
+            logger.error(f"Error claiming pending signals: {e}")
+            session.rollback()
+            return []
+    
+    def mark_signal_processed(self, session: Session, signal_id: str, trade_id: Optional[str] = None) -> bool:
+        """Mark a signal as processed, linking the trade it opened."""
+        try:
+            return bool(session.query(Signal).filter(Signal.id == signal_id).update(
+                {Signal.is_processed: True, Signal.trade_id: trade_id}, synchronize_session=False
+            ))
+        except SQLAlchemyError as e:
+            logger.error(f"Error marking signal {signal_id} processed: {e}")
+            session.rollback()
+            return False
+    
+    def mark_signal_rejected(self, session: Session, signal_id: str, reason: str) -> bool:
+        """Mark a signal as processed without a trade, recording why."""
+        try:
+            return bool(session.query(Signal).filter(Signal.id == signal_id).update(
+                {Signal.is_processed: True, Signal.rejection_reason: reason[:255]}, synchronize_session=False
+            ))
+        except SQLAlchemyError as e:
+            logger.error(f"Error marking signal {signal_id} rejected: {e}")
+            session.rollback()
+            return False
+    
     def get_active_signals_count(self, session: Session) -> int:
         """Get count of unprocessed signals."""
         try:
@@ -954,6 +1216,27 @@ class SystemConfigRepository(BaseRepository):
         except SQLAlchemyError as e:
             logger.error(f"Error setting config {key}: {e}")
             return None
+    
+    def get_configs_by_prefix(self, session: Session, prefix: str) -> Dict[str, Any]:
+        """Get all configuration values whose key starts with prefix."""
+        try:
+            configs = session.query(SystemConfig).filter(
+                SystemConfig.key.like(f"{prefix.lower()}%")
+            ).all()
+            return {config.key: config.value for config in configs}
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting configs with prefix {prefix}: {e}")
+            return {}
+    
+    def delete_config(self, session: Session, key: str) -> bool:
+        """Delete configuration value by key."""
+        try:
+            deleted = session.query(SystemConfig).filter(SystemConfig.key == key.lower()).delete()
+            session.flush()
+            return deleted > 0
+        except SQLAlchemyError as e:
+            logger.error(f"Error deleting config {key}: {e}")
+            return False
 
 
 class BatchOperationMixin:
@@ -1140,4 +1423,47 @@ class OptimizedIndicatorRepository(IndicatorRepository, BatchOperationMixin):
         except Exception as e:
             logger.error(f"Error in bulk indicator insert: {e}")
             session.rollback()
-            return 0
\ No newline at end of file
+            return 0
+
+
+class EquitySnapshotRepository(BaseRepository):
+    """Repository for equity curve points."""
+    
+    def __init__(self):
+        super().__init__(EquitySnapshot)
+    
+    def add_snapshot(self, session: Session, **data) -> Optional[EquitySnapshot]:
+        """Append an equity point."""
+        try:
+            snapshot = EquitySnapshot(**data)
+            session.add(snapshot)
+            session.flush()
+            return snapshot
+        except SQLAlchemyError as e:
+            logger.error(f"Error adding equity snapshot: {e}")
+            return None
+    
+    def get_latest(self, session: Session, kind: Optional[str] = None) -> Optional[EquitySnapshot]:
+        """Get the most recent equity point (optionally of one kind)."""
+        try:
+            query = session.query(EquitySnapshot)
+            if kind:
+                query = query.filter(EquitySnapshot.kind == kind)
+            return query.order_by(desc(EquitySnapshot.timestamp), desc(EquitySnapshot.id)).first()
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting latest equity snapshot: {e}")
+            return None
+    
+    def get_points(self, session: Session, start_time: Optional[datetime] = None,
+                   end_time: Optional[datetime] = None) -> List[Tuple[datetime, Decimal]]:
+        """Get (timestamp, equity) tuples in time order without loading ORM objects."""
+        try:
+            query = session.query(EquitySnapshot.timestamp, EquitySnapshot.equity)
+            if start_time is not None:
+                query = query.filter(EquitySnapshot.timestamp >= start_time)
+            if end_time is not None:
+                query = query.filter(EquitySnapshot.timestamp <= end_time)
+            return [tuple(row) for row in query.order_by(EquitySnapshot.timestamp, EquitySnapshot.id)]
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting equity points: {e}")
+            return []
@@ -0,0 +1,356 @@
+# database/retention.py
+"""Time partitions and retention for market_data, indicators and signals."""
+
+import logging
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from .models import Asset, Indicator, IndicatorRollup, MarketData, Signal
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Tables partitioned by timestamp on PostgreSQL (see TIME_PARTITIONED in models)
+TIME_SERIES_TABLES = {
+    'market_data': MarketData.__table__,
+    'indicators': Indicator.__table__,
+    'signals': Signal.__table__,
+}
+
+# Assets per transaction when deleting from unpartitioned tables
+DELETE_ASSET_BATCH = 50
+
+_BOUND_PATTERN = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+class RetentionError(Exception):
+    """Exception for partition and retention maintenance errors."""
+    pass
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Days of history kept per table (0 keeps rows forever) and the partition layout."""
+    market_data_days: int
+    indicator_days: int
+    indicator_rollup_days: int
+    signal_days: int
+    partition_days: int = 7
+    partitions_ahead: int = 4
+
+    @classmethod
+    def from_settings(cls) -> 'RetentionPolicy':
+        from config.settings import Settings
+        return cls(
+            market_data_days=Settings.MARKET_DATA_RETENTION_DAYS,
+            indicator_days=Settings.INDICATOR_RETENTION_DAYS,
+            indicator_rollup_days=Settings.INDICATOR_ROLLUP_RETENTION_DAYS,
+            signal_days=Settings.SIGNAL_RETENTION_DAYS,
+            partition_days=Settings.DB_PARTITION_DAYS,
+            partitions_ahead=Settings.DB_PARTITIONS_AHEAD,
+        )
+
+    def retention_days(self, table: str) -> int:
+        return {
+            'market_data': self.market_data_days,
+            'indicators': self.indicator_days,
+            'indicator_rollups': self.indicator_rollup_days,
+            'signals': self.signal_days,
+        }[table]
+
+    def cutoff(self, table: str, now: datetime) -> Optional[datetime]:
+        """Start of the UTC day before which rows of `table` expire (None: keep forever)."""
+        days = self.retention_days(table)
+        if days <= 0:
+            return None
+        return _start_of_day(now - timedelta(days=days))
+
+
+def _start_of_day(moment: datetime) -> datetime:
+    moment = moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def partition_start(moment: datetime, partition_days: int) -> datetime:
+    """Lower bound of the partition containing `moment` (partitions are aligned to the Unix epoch)."""
+    days = (_start_of_day(moment) - EPOCH).days
+    return EPOCH + timedelta(days=days - days % partition_days)
+
+
+def partition_name(table: str, start: datetime) -> str:
+    return f"{table}_p{start:%Y%m%d}"
+
+
+def planned_partitions(table: str, policy: RetentionPolicy, now: datetime) -> List[Tuple[str, datetime, datetime]]:
+    """
+    Partitions that should exist for `table`: (name, start, end) from the
+    retention cutoff (or the current partition when rows are kept forever)
+    up to `partitions_ahead` partitions past now.
+    """
+    step = timedelta(days=policy.partition_days)
+    cutoff = policy.cutoff(table, now)
+    start = partition_start(cutoff or now, policy.partition_days)
+    last = partition_start(now, policy.partition_days) + step * policy.partitions_ahead
+
+    partitions = []
+    while start <= last:
+        partitions.append((partition_name(table, start), start, start + step))
+        start += step
+    return partitions
+
+
+def partition_ddl(table: str, name: str, start: datetime, end: datetime) -> str:
+    return (f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start:%Y-%m-%d %H:%M:%S}+00') TO ('{end:%Y-%m-%d %H:%M:%S}+00')")
+
+
+def default_partition_ddl(table: str) -> str:
+    """Catch-all partition for rows outside the planned ranges (e.g. old backfills)."""
+    return f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"
+
+
+def _parse_bound(value: str) -> datetime:
+    """Partition bound as printed by pg_get_expr, e.g. '2026-10-12 00:00:00+00'."""
+    moment = datetime.fromisoformat(value)
+    return moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+class RetentionManager:
+    """
+    Keeps the time-series tables bounded.
+
+    On PostgreSQL with partitioned tables, expired data is removed by
+    dropping whole partitions (plus one bulk delete from the default
+    partition). SQLite and unpartitioned PostgreSQL tables fall back to
+    range deletes per asset on the (asset_id, timestamp) indexes. Indicator
+    rows are folded into daily indicator_rollups rows before they go.
+    """
+
+    def __init__(self, engine: Engine, policy: Optional[RetentionPolicy] = None):
+        self.engine = engine
+        self.policy = policy or RetentionPolicy.from_settings()
+        self.is_postgres = engine.dialect.name == 'postgresql'
+        self.stats = {
+            'runs': 0,
+            'partitions_created': 0,
+            'partitions_dropped': 0,
+            'rows_deleted': 0,
+            'rollup_rows': 0,
+            'last_run': None,
+            'last_duration_seconds': 0.0,
+        }
+
+    # Partition management (PostgreSQL)
+
+    def is_partitioned(self, conn: Connection, table: str) -> bool:
+        if not self.is_postgres:
+            return False
+        return conn.execute(text(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = :table"
+        ), {'table': table}).first() is not None
+
+    def list_partitions(self, conn: Connection, table: str) -> List[Tuple[str, datetime, datetime]]:
+        """Range partitions of `table` as (name, start, end); the default partition is not listed."""
+        rows = conn.execute(text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table"
+        ), {'table': table}).all()
+
+        partitions = []
+        for name, bound in rows:
+            match = _BOUND_PATTERN.search(bound or '')
+            if match:
+                partitions.append((name, _parse_bound(match.group(1)), _parse_bound(match.group(2))))
+        return sorted(partitions, key=lambda p: p[1])
+
+    def ensure_partitions(self, now: Optional[datetime] = None) -> int:
+        """Create missing partitions for the retention window and the next few intervals."""
+        if not self.is_postgres:
+            return 0
+        now = now or datetime.now(timezone.utc)
+        created = 0
+
+        with self.engine.begin() as conn:
+            for table in TIME_SERIES_TABLES:
+                if not self.is_partitioned(conn, table):
+                    continue
+                conn.execute(text(default_partition_ddl(table)))
+                existing = self.list_partitions(conn, table)
+
+                for name, start, end in planned_partitions(table, self.policy, now):
+                    if any(start < e and s < end for _, s, e in existing):
+                        continue  # already covered (possibly by a different partition width)
+                    try:
+                        with conn.begin_nested():
+                            conn.execute(text(partition_ddl(table, name, start, end)))
+                        created += 1
+                    except SQLAlchemyError as e:
+                        # The default partition already holds rows of this range
+                        logger.warning(f"Could not create partition {name}: {e}")
+
+        if created:
+            logger.info(f"🗂️ Created {created} time partitions")
+        self.stats['partitions_created'] += created
+        return created
+
+    # Rollups
+
+    def rollup_indicators(self, conn: Connection, before: datetime, source=None) -> int:
+        """Fold indicator rows older than `before` into daily indicator_rollups rows."""
+        source = source if source is not None else Indicator.__table__
+        rollups = IndicatorRollup.__table__
+        ts = source.c.timestamp
+
+        if self.is_postgres:
+            bucket = func.timezone('UTC', func.date_trunc('day', func.timezone('UTC', ts)))
+        else:
+            # Same text layout SQLAlchemy stores DateTime values in, so bucket comparisons stay exact
+            bucket = func.strftime('%Y-%m-%d 00:00:00.000000', ts)
+
+        query = (
+            select(
+                source.c.asset_id, bucket, source.c.timeframe,
+                func.avg(source.c.mm1), func.avg(source.c.center), func.avg(source.c.rsi),
+                func.min(source.c.rsi), func.max(source.c.rsi), func.avg(source.c.volume_sma),
+                func.count(),
+            )
+            .where(ts < before)
+            .group_by(source.c.asset_id, bucket, source.c.timeframe)
+        )
+        columns = ['asset_id', 'bucket', 'timeframe', 'mm1', 'center', 'rsi', 'rsi_min', 'rsi_max',
+                   'volume_sma', 'samples']
+
+        if self.is_postgres:
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(rollups).from_select(columns, query).on_conflict_do_nothing(
+            index_elements=['asset_id', 'bucket', 'timeframe']
+        )
+        inserted = max(conn.execute(stmt).rowcount or 0, 0)
+        self.stats['rollup_rows'] += inserted
+        return inserted
+
+    # Expiry
+
+    def _drop_partitions(self, conn: Connection, table: str, cutoff: datetime) -> Tuple[int, int]:
+        """Drop partitions entirely below `cutoff` and bulk delete expired default-partition rows."""
+        dropped = 0
+        for name, _, end in self.list_partitions(conn, table):
+            if end <= cutoff:
+                conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                dropped += 1
+
+        deleted = conn.execute(
+            text(f"DELETE FROM {table}_default WHERE timestamp < :cutoff"), {'cutoff': cutoff}
+        ).rowcount or 0
+        return dropped, deleted
+
+    def _delete_by_asset(self, table, cutoff: datetime) -> int:
+        """Range delete per asset so each statement walks the (asset_id, timestamp) index."""
+        with self.engine.connect() as conn:
+            asset_ids = conn.execute(select(Asset.__table__.c.id)).scalars().all()
+
+        deleted = 0
+        for i in range(0, len(asset_ids), DELETE_ASSET_BATCH):
+            with self.engine.begin() as conn:
+                for asset_id in asset_ids[i:i + DELETE_ASSET_BATCH]:
+                    result = conn.execute(
+                        delete(table).where(table.c.asset_id == asset_id, table.c.timestamp < cutoff)
+                    )
+                    deleted += max(result.rowcount or 0, 0)
+        return deleted
+
+    def purge_table(self, table: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Remove expired rows of one time-series table (rolling indicators up first)."""
+        now = now or datetime.now(timezone.utc)
+        cutoff = self.policy.cutoff(table, now)
+        result = {'cutoff': cutoff.isoformat() if cutoff else None, 'partitions_dropped': 0,
+                  'rows_deleted': 0, 'rollup_rows': 0}
+        if cutoff is None:
+            return result
+
+        with self.engine.begin() as conn:
+            partitioned = self.is_partitioned(conn, table)
+            if partitioned:
+                # Only whole partitions go; the rest expires with the next one
+                cutoff = partition_start(cutoff, self.policy.partition_days)
+                result['cutoff'] = cutoff.isoformat()
+            if table == 'indicators':
+                result['rollup_rows'] = self.rollup_indicators(conn, cutoff)
+            if partitioned:
+                result['partitions_dropped'], result['rows_deleted'] = self._drop_partitions(conn, table, cutoff)
+
+        if not partitioned:
+            result['rows_deleted'] = self._delete_by_asset(TIME_SERIES_TABLES[table], cutoff)
+
+        self.stats['partitions_dropped'] += result['partitions_dropped']
+        self.stats['rows_deleted'] += result['rows_deleted']
+        if result['partitions_dropped'] or result['rows_deleted']:
+            logger.info(f"🧹 {table}: dropped {result['partitions_dropped']} partitions, "
+                        f"deleted {result['rows_deleted']} rows older than {cutoff:%Y-%m-%d}")
+        return result
+
+    def purge_rollups(self, now: Optional[datetime] = None) -> int:
+        cutoff = self.policy.cutoff('indicator_rollups', now or datetime.now(timezone.utc))
+        if cutoff is None:
+            return 0
+        rollups = IndicatorRollup.__table__
+        with self.engine.begin() as conn:
+            deleted = max(conn.execute(delete(rollups).where(rollups.c.bucket < cutoff)).rowcount or 0, 0)
+        self.stats['rows_deleted'] += deleted
+        return deleted
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Create upcoming partitions, then expire every time-series table."""
+        now = now or datetime.now(timezone.utc)
+        started = time.perf_counter()
+
+        report: Dict[str, Any] = {'partitions_created': self.ensure_partitions(now)}
+        for table in TIME_SERIES_TABLES:
+            report[table] = self.purge_table(table, now)
+        report['indicator_rollups'] = {'rows_deleted': self.purge_rollups(now)}
+
+        self.stats['runs'] += 1
+        self.stats['last_run'] = now.isoformat()
+        self.stats['last_duration_seconds'] = time.perf_counter() - started
+        return report
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self.stats, policy={
+            'market_data_days': self.policy.market_data_days,
+            'indicator_days': self.policy.indicator_days,
+            'indicator_rollup_days': self.policy.indicator_rollup_days,
+            'signal_days': self.policy.signal_days,
+            'partition_days': self.policy.partition_days,
+        })
+
+
+# Global retention manager instance
+_retention_manager: Optional[RetentionManager] = None
+
+
+def get_retention_manager() -> RetentionManager:
+    """Retention manager bound to the application database engine."""
+    global _retention_manager
+    if _retention_manager is None:
+        from .connection import db_manager
+        if not db_manager._initialized and not db_manager.initialize():
+            raise RetentionError("Database not available for retention maintenance")
+        _retention_manager = RetentionManager(db_manager.engine)
+    return _retention_manager
+
+
+def run_retention() -> Dict[str, Any]:
+    """Run one retention pass against the application database."""
+    return get_retention_manager().run()
@@ -0,0 +1,181 @@
+# database/signal_bus.py
+"""Push delivery of new signals: the signals table is the durable log, notifications wake consumers."""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+SIGNAL_CHANNEL = 'trading_signals'
+
+
+class SignalBusError(Exception):
+    """Exception for signal bus errors."""
+    pass
+
+
+class SignalSubscription:
+    """A consumer's wakeup flag; notifications that arrive while it is busy are not lost."""
+
+    def __init__(self, bus: 'SignalBus'):
+        self.bus = bus
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+
+    def wake(self):
+        """Set the flag from any thread."""
+        try:
+            self._loop.call_soon_threadsafe(self._event.set)
+        except RuntimeError:
+            pass  # Event loop already closed
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a notification; False if the timeout elapsed first."""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+            woken = True
+        except asyncio.TimeoutError:
+            woken = False
+        self._event.clear()
+        return woken
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class SignalBus:
+    """
+    Wakes signal consumers as soon as a new signal is committed.
+
+    Publishers call publish(session) in the transaction that inserts the
+    signal. When that transaction commits, subscribers in this process are
+    woken directly and, on PostgreSQL, a NOTIFY (only delivered on commit)
+    wakes consumers in other processes listening via start(). Notifications
+    carry no data: consumers claim rows with
+    SignalRepository.claim_pending_signals, so the table stays the source of
+    truth and a lost notification only delays a signal until the consumer's
+    fallback poll.
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self._origin = str(os.getpid())
+        self._subscriptions: Set[SignalSubscription] = set()
+        self._lock = threading.Lock()
+        self._listener = None  # (raw connection, DBAPI connection, loop)
+        self.stats = {
+            'published': 0,
+            'local_notifications': 0,
+            'remote_notifications': 0,
+        }
+
+    def subscribe(self) -> SignalSubscription:
+        """Register a consumer running on the current event loop."""
+        subscription = SignalSubscription(self)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: SignalSubscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, session: Session):
+        """Announce a signal inserted in the session's current transaction."""
+        if session.get_bind().dialect.name == 'postgresql':
+            session.execute(text("SELECT pg_notify(:channel, :origin)"),
+                            {'channel': SIGNAL_CHANNEL, 'origin': self._origin})
+        event.listen(session, 'after_commit', self._after_commit, once=True)
+        self.stats['published'] += 1
+
+    def _after_commit(self, session: Session):
+        self.stats['local_notifications'] += 1
+        self.wake_all()
+
+    def wake_all(self):
+        """Wake every subscriber (thread-safe)."""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.wake()
+
+    @property
+    def is_listening(self) -> bool:
+        return self._listener is not None
+
+    async def start(self, engine=None):
+        """Listen for signals published by other processes (PostgreSQL only)."""
+        engine = engine or self.engine
+        if engine is None:
+            from .connection import db_manager
+            engine = db_manager.engine
+        if self._listener or engine is None or engine.dialect.name != 'postgresql':
+            return
+        self.engine = engine
+
+        raw = engine.raw_connection()
+        try:
+            connection = raw.driver_connection
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {SIGNAL_CHANNEL}")
+            loop = asyncio.get_running_loop()
+            loop.add_reader(connection.fileno(), self._on_notify, connection)
+        except Exception as e:
+            raw.invalidate()
+            raise SignalBusError(f"Could not listen on {SIGNAL_CHANNEL}: {e}")
+
+        self._listener = (raw, connection, loop)
+        logger.info(f"📡 Listening for signals on channel {SIGNAL_CHANNEL}")
+
+    def _on_notify(self, connection):
+        try:
+            connection.poll()
+        except Exception as e:
+            logger.warning(f"Signal listener connection lost ({e}); consumers fall back to polling")
+            self._close_listener()
+            return
+        remote = [n for n in connection.notifies if n.payload != self._origin]
+        connection.notifies.clear()
+        if remote:
+            self.stats['remote_notifications'] += len(remote)
+            self.wake_all()
+
+    def _close_listener(self):
+        listener, self._listener = self._listener, None
+        if listener is None:
+            return
+        raw, connection, loop = listener
+        try:
+            loop.remove_reader(connection.fileno())
+        except Exception:
+            pass
+        # The connection carries LISTEN state and autocommit; never return it to the pool
+        raw.invalidate()
+
+    async def stop(self):
+        """Stop listening for remote notifications."""
+        self._close_listener()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            subscribers = len(self._subscriptions)
+        return dict(self.stats, subscribers=subscribers, listening=self.is_listening)
+
+
+# Global signal bus instance
+_signal_bus: Optional[SignalBus] = None
+
+
+def get_signal_bus() -> SignalBus:
+    """Get global signal bus instance."""
+    global _signal_bus
+    if _signal_bus is None:
+        _signal_bus = SignalBus()
+    return _signal_bus
@@ -0,0 +1,245 @@
+# database/write_queue.py
+"""Single-writer queue that group-commits database writes from all components."""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session, sessionmaker
+
+logger = logging.getLogger(__name__)
+
+
+class WriteQueueError(Exception):
+    """Exception for write queue errors."""
+    pass
+
+
+@dataclass
+class _WriteJob:
+    func: Callable[..., Any]
+    args: tuple
+    kwargs: dict
+    future: Future = field(default_factory=Future)
+
+
+_STOP = object()
+
+
+class DatabaseWriteQueue:
+    """
+    Runs write jobs on one thread and commits them in batches.
+
+    A job is a callable taking a Session as its first argument. Jobs queued
+    while a batch is being written are drained into the next batch (up to
+    max_batch) and committed together, so many small writes share one
+    transaction, one flush and one fsync. If any job of a batch fails, the
+    batch is rolled back and run again with each job in its own SAVEPOINT,
+    so a failing job only fails its own future and the rest still commit.
+    """
+
+    def __init__(self, session_factory: sessionmaker, max_batch: int = 200, max_delay: float = 0.005):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.stats = {
+            'jobs': 0,
+            'failed_jobs': 0,
+            'batches': 0,
+            'retried_batches': 0,
+            'max_batch_size': 0,
+            'write_seconds': 0.0,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            if self.is_running:
+                return
+            self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+            self._thread.start()
+        logger.info("✍️ Database write queue started")
+
+    def stop(self, timeout: float = 10.0):
+        """Write everything already queued, then stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Database write queue did not drain within the timeout")
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """Queue func(session, *args, **kwargs); the future resolves after its batch commits."""
+        if not self.is_running:
+            self.start()
+        job = _WriteJob(func, args, kwargs)
+        self._queue.put(job)
+        return job.future
+
+    def execute(self, func: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Queue a write and block until it is committed."""
+        return self.submit(func, *args, **kwargs).result(timeout)
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Queue a write and await its commit without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def _next_batch(self) -> Optional[List[_WriteJob]]:
+        first = self._queue.get()
+        if first is _STOP:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)  # stop after this batch
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+            started = time.perf_counter()
+            try:
+                self._write_batch(batch, isolate=False)
+            except Exception:
+                self.stats['retried_batches'] += 1
+                try:
+                    self._write_batch(batch, isolate=True)
+                except Exception as e:
+                    # The commit itself failed: retry each job alone so one bad write cannot sink the rest
+                    logger.warning(f"Write batch of {len(batch)} failed ({e}), retrying jobs individually")
+                    for job in batch:
+                        if not job.future.done():
+                            try:
+                                self._write_batch([job], isolate=True)
+                            except Exception as job_error:
+                                self._fail(job, job_error)
+            self.stats['write_seconds'] += time.perf_counter() - started
+
+        # Anything queued after stop() was requested
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                self._fail(item, WriteQueueError("Write queue stopped"))
+
+    def _write_batch(self, batch: List[_WriteJob], isolate: bool):
+        """
+        Run jobs in one transaction and commit once.
+
+        Without isolation any job error aborts the whole batch (nothing is
+        committed and no future is resolved); with isolation every job runs
+        in a savepoint and failures are reported per job.
+        """
+        results: Dict[int, Any] = {}
+        session: Session = self.session_factory()
+        try:
+            if isolate:
+                self._run_isolated(session, batch, results)
+            else:
+                outer = session.begin()
+                for job in batch:
+                    results[id(job)] = job.func(session, *job.args, **job.kwargs)
+                    if session.get_transaction() is not outer:
+                        raise WriteQueueError("Write job rolled back the batch transaction")
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+        committed = 0
+        for job in batch:
+            if not job.future.done():
+                job.future.set_result(results.get(id(job)))
+                committed += 1
+        self.stats['jobs'] += committed
+        self.stats['batches'] += 1
+        self.stats['max_batch_size'] = max(self.stats['max_batch_size'], len(batch))
+
+    def _run_isolated(self, session: Session, batch: List[_WriteJob], results: Dict[int, Any]):
+        pending = list(batch)
+        while pending:
+            outer = session.get_transaction() or session.begin()
+            rerun = None
+            for index, job in enumerate(pending):
+                if job.future.done():
+                    continue
+                try:
+                    with session.begin_nested():
+                        results[id(job)] = job.func(session, *job.args, **job.kwargs)
+                except Exception as e:
+                    self._fail(job, e)
+                if session.get_transaction() is not outer:
+                    # The job rolled back the whole transaction (e.g. session.rollback() in a
+                    # repository error path); earlier jobs lost their writes and run again
+                    rerun = [j for j in pending[:index] if not j.future.done()]
+                    pending = rerun + pending[index + 1:]
+                    break
+            if rerun is None:
+                pending = []
+
+    def _fail(self, job: _WriteJob, error: Exception):
+        if not job.future.done():
+            job.future.set_exception(error)
+            self.stats['failed_jobs'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        batches = self.stats['batches']
+        return dict(
+            self.stats,
+            running=self.is_running,
+            queue_depth=self._queue.qsize(),
+            avg_batch_size=self.stats['jobs'] / batches if batches else 0.0,
+        )
+
+
+# Global write queue instance
+_write_queue: Optional[DatabaseWriteQueue] = None
+_write_queue_lock = threading.Lock()
+
+
+def get_write_queue() -> DatabaseWriteQueue:
+    """Write queue bound to the application database (writer connection on SQLite)."""
+    global _write_queue
+    with _write_queue_lock:
+        if _write_queue is None:
+            from config.settings import Settings
+            from .connection import db_manager
+            _write_queue = DatabaseWriteQueue(
+                db_manager.get_writer_session_factory(),
+                max_batch=Settings.DB_WRITE_BATCH_SIZE,
+                max_delay=Settings.DB_WRITE_BATCH_DELAY_MS / 1000,
+            )
+        return _write_queue
+
+
+def shutdown_write_queue():
+    """Drain and stop the global write queue (if it was started)."""
+    global _write_queue
+    with _write_queue_lock:
+        write_queue, _write_queue = _write_queue, None
+    if write_queue is not None:
+        write_queue.stop()
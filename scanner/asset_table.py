@@ -10,6 +10,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 
 from api.market_data import get_market_data_api, MarketDataError
+from api.market_data_hub import get_market_data_hub
 from analysis.indicators import get_technical_indicators, IndicatorError
 from scanner.validator import get_asset_validator
 from config.trading_config import TradingConfig
@@ -30,7 +31,7 @@ class ValidationStatus(Enum):
     ERROR = "ERROR"
 
 
-@dataclass
+@dataclass(slots=True)
 class AssetMetrics:
     """Complete asset metrics for validation table."""
     
@@ -271,10 +272,9 @@ class AssetValidationTable:
                         logger.warning(f"Failed to get candles for {metrics.symbol} {timeframe}: {candles if isinstance(candles, Exception) else 'No data'}")
                         continue
                     
-                    # Calculate indicators (can be cached separately)
-                    indicators = await self.cache.get_or_fetch(
-                        'indicators', f"{metrics.symbol}_{timeframe}",
-                        lambda: self.technical_indicators.calculate_all_indicators(candles)
+                    # Indicators are memoized per candle series by the shared indicator cache
+                    indicators = self.technical_indicators.calculate_all_indicators(
+                        candles, metrics.symbol, timeframe
                     )
                     
                     # Store by timeframe
@@ -587,9 +587,8 @@ class AssetValidationTable:
         return await self.market_api.get_volume_analysis(symbol, timeframe, periods)
     
     async def _fetch_candles_with_rate_limit(self, symbol: str, timeframe: str, limit: int) -> List[Dict[str, Any]]:
-        """Fetch candles with rate limiting."""
-        await self.rate_limiter.acquire('market_data')
-        return await self.market_api.get_candles(symbol, timeframe, limit)
+        """Fetch candles through the shared market data hub (rate limited per actual fetch)."""
+        return await get_market_data_hub().get_candles(symbol, timeframe, limit)
     
     async def generate_validation_table(self, symbols: List[str], 
                                       max_concurrent: int = 20) -> List[AssetMetrics]:
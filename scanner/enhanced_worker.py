@@ -20,14 +20,18 @@ from scanner.parallel_scanner import get_parallel_scanner
 from analysis.indicators import IndicatorCalculator
 from database.connection import init_database, get_session
 from database.repository import AssetRepository, IndicatorRepository, SignalRepository
-from api.client import get_client, initialize_client
+from api.client import initialize_client
+from api.market_data_hub import get_market_data_hub
 from config.trading_config import TradingConfig
 from utils.logger import get_logger
 from utils.rate_limiter import get_rate_limiter
 from utils.smart_cache import get_smart_cache
+from utils import metrics
+from utils.tracing import traced
 from trading.symbol_selector import get_symbol_selector
 from trading.trading_cache import get_trading_cache
 from analysis.signals import get_signal_generator
+from scanner.scan_scheduler import get_scan_scheduler
 
 logger = get_logger(__name__)
 
@@ -35,10 +39,12 @@ logger = get_logger(__name__)
 class EnhancedScannerWorker:
     """Enhanced worker with real-time signal streaming and continuous processing."""
     
-    def __init__(self, use_parallel: bool = True):
+    def __init__(self, use_parallel: bool = True, shard=None, trading_symbols=None):
         self.config = TradingConfig()
         self.running = False
         self.use_parallel = use_parallel
+        self.shard = shard  # Optional ShardMembership restricting this worker to a symbol partition
+        self.trading_symbols = trading_symbols  # Universe selected by a sharding supervisor, if any
         
         # Initialize components
         self.initial_scanner = InitialScanner()
@@ -49,14 +55,17 @@ class EnhancedScannerWorker:
         self.signal_repo = SignalRepository()
         self.rate_limiter = get_rate_limiter()
         self.cache = get_smart_cache()
+        self.market_data = get_market_data_hub()  # Shared ticker/candle fetches across all consumers
         
         # Trading-specific components
         self.symbol_selector = get_symbol_selector()
         self.trading_cache = get_trading_cache()
         self.signal_generator = get_signal_generator()
+        self.scheduler = get_scan_scheduler('enhanced_scanner')
         
         # Real-time signal streaming
         self.signal_queue = asyncio.Queue(maxsize=1000)  # Signal queue for real-time processing
+        metrics.track_gauge(metrics.QUEUE_DEPTH, 'scanner_signals', self.signal_queue.qsize)
         self.processed_symbols = set()  # Track which symbols we've processed
         self.signal_callbacks = []  # Callbacks for when signals are generated
         self.continuous_mode = True  # Enable continuous processing
@@ -73,7 +82,9 @@ class EnhancedScannerWorker:
             'best_scan_time': float('inf'),
             'worst_scan_time': 0,
             'valid_symbols_count': 0,
-            'processing_rate': 0  # symbols per second
+            'processing_rate': 0,  # symbols per second
+            'max_staleness_seconds': 0,  # oldest scan among scheduled symbols
+            'owned_symbols_count': 0  # symbols in this worker's shard partition
         }
         
     async def initialize(self):
@@ -102,9 +113,13 @@ class EnhancedScannerWorker:
     async def _ensure_trading_symbols(self):
         """Ensure we have ALL valid trading symbols selected."""
         try:
-            # Always get fresh symbols for real-time processing
-            logger.info("🎯 Selecting ALL valid symbols for real-time trading...")
-            selected_symbols = await self.symbol_selector.select_trading_symbols(force_refresh=True)
+            if self.trading_symbols is not None:
+                # Sharded: the supervisor selected the universe once for all shards
+                selected_symbols = self.trading_symbols
+            else:
+                # Always get fresh symbols for real-time processing
+                logger.info("🎯 Selecting ALL valid symbols for real-time trading...")
+                selected_symbols = await self.symbol_selector.select_trading_symbols(force_refresh=True)
             
             if selected_symbols:
                 # Update cache with ALL valid symbols
@@ -159,29 +174,59 @@ class EnhancedScannerWorker:
         except Exception as e:
             logger.error(f"Error broadcasting signal: {e}")
     
+    async def _get_owned_trading_symbols(self) -> List[str]:
+        """Get trading symbols, restricted to this worker's shard partition when sharded."""
+        trading_symbols = await self.trading_cache.get_trading_symbols()
+        if self.shard is None:
+            return trading_symbols
+        
+        # Heartbeat and rebalance (DB access) off the event loop
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, self.shard.refresh):
+            logger.info(f"🔀 Shard {self.shard.shard_id} partition changed, members: {self.shard.ring.nodes}")
+        
+        owned_symbols = self.shard.filter_symbols(trading_symbols)
+        self.scan_metrics['owned_symbols_count'] = len(owned_symbols)
+        return owned_symbols
+    
     async def start_continuous_processing(self):
-        """Start continuous symbol processing for real-time signals."""
+        """Start continuous symbol processing for real-time signals.
+
+        Symbols are dispatched by the adaptive scan scheduler: symbols close to a
+        signal (or with an open position) are scanned every few seconds while quiet
+        symbols are revisited at a slower cadence.
+        """
         logger.info("🚀 Starting continuous real-time signal processing...")
         
         while self.running:
             try:
-                # Get all valid trading symbols
-                trading_symbols = await self.trading_cache.get_trading_symbols()
+                # Get all valid trading symbols owned by this worker
+                trading_symbols = await self._get_owned_trading_symbols()
                 if not trading_symbols:
                     logger.warning("No trading symbols available for processing")
                     await asyncio.sleep(5)
                     continue
                 
-                # Process symbols continuously in batches
+                self.scheduler.sync_symbols(trading_symbols)
+                due_symbols = self.scheduler.get_due_symbols(
+                    limit=self.config.SCHEDULER_MAX_SYMBOLS_PER_CYCLE
+                )
+                
+                if not due_symbols:
+                    # Nothing due yet - sleep until the next symbol is due (re-check at least every 2s)
+                    await asyncio.sleep(max(0.1, min(self.scheduler.seconds_until_next_due(), 2)))
+                    continue
+                
+                # Process due symbols in batches
                 batch_size = 10
                 start_time = time.time()
                 processed_count = 0
                 
-                for i in range(0, len(trading_symbols), batch_size):
+                for i in range(0, len(due_symbols), batch_size):
                     if not self.running:
                         break
                         
-                    batch = trading_symbols[i:i + batch_size]
+                    batch = due_symbols[i:i + batch_size]
                     
                     # Process batch concurrently
                     batch_tasks = [
@@ -196,6 +241,7 @@ class EnhancedScannerWorker:
                         if isinstance(result, Exception):
                             logger.debug(f"Error processing {batch[j]}: {result}")
                             self.scan_metrics['errors'] += 1
+                            self.scheduler.record_failure(batch[j])
                         elif result:
                             # Signal generated, broadcast it
                             await self._broadcast_signal(result)
@@ -207,6 +253,7 @@ class EnhancedScannerWorker:
                 
                 # Update performance metrics
                 cycle_time = time.time() - start_time
+                metrics.observe_cycle('scanner_continuous', cycle_time)
                 if cycle_time > 0:
                     self.scan_metrics['processing_rate'] = processed_count / cycle_time
                 
@@ -216,47 +263,37 @@ class EnhancedScannerWorker:
                     if time_diff > 0:
                         self.scan_metrics['signals_per_minute'] = (self.scan_metrics['signals_generated'] * 60) / time_diff
                 
-                logger.info(f"📊 Processed {processed_count} symbols in {cycle_time:.2f}s "
-                          f"({self.scan_metrics['processing_rate']:.1f} symbols/s)")
+                scheduler_stats = self.scheduler.get_stats()
+                self.scan_metrics['max_staleness_seconds'] = scheduler_stats['max_staleness_seconds']
                 
-                # Wait before next cycle (shorter for real-time)
-                await asyncio.sleep(2)  # 2 second cycles for real-time
+                logger.info(f"📊 Processed {processed_count}/{len(trading_symbols)} due symbols in {cycle_time:.2f}s "
+                          f"({self.scan_metrics['processing_rate']:.1f} symbols/s, "
+                          f"max staleness {scheduler_stats['max_staleness_seconds']:.0f}s)")
                 
             except Exception as e:
                 logger.error(f"Error in continuous processing: {e}")
                 await asyncio.sleep(5)  # Wait before retry
     
+    @traced('scan.process_symbol')
     async def _process_symbol_for_signals(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Process a single symbol and generate trading signals in real-time."""
         try:
-            client = get_client()
-            
-            # Fetch market data with caching
-            ticker = await self.cache.get_or_fetch(
-                'ticker', symbol,
-                lambda: self._fetch_ticker_with_rate_limit(client, symbol)
-            )
+            # Fetch market data through the shared hub
+            ticker = await self.market_data.get_ticker(symbol)
             
             if not ticker:
+                self.scheduler.record_failure(symbol)
                 return None
             
             # Get OHLCV data for multiple timeframes
-            ohlcv_spot = await self.cache.get_or_fetch(
-                'candles', f"{symbol}_1m_50",
-                lambda: self._fetch_ohlcv_with_rate_limit(client, symbol, '1m', 50)
-            )
-            
-            ohlcv_2h = await self.cache.get_or_fetch(
-                'candles', f"{symbol}_2h_100",
-                lambda: self._fetch_ohlcv_with_rate_limit(client, symbol, '2h', 100)
-            )
-            
-            ohlcv_4h = await self.cache.get_or_fetch(
-                'candles', f"{symbol}_4h_100", 
-                lambda: self._fetch_ohlcv_with_rate_limit(client, symbol, '4h', 100)
+            ohlcv_spot, ohlcv_2h, ohlcv_4h = await asyncio.gather(
+                self.market_data.get_candles(symbol, '1m', 50),
+                self.market_data.get_candles(symbol, '2h', 100),
+                self.market_data.get_candles(symbol, '4h', 100),
             )
             
             if not all([ohlcv_spot, ohlcv_2h, ohlcv_4h]):
+                self.scheduler.record_failure(symbol)
                 return None
             
             # Generate comprehensive trading signal
@@ -267,6 +304,13 @@ class EnhancedScannerWorker:
                 candles_4h=ohlcv_4h
             )
             
+            # Reschedule the symbol based on how close it is to a signal
+            symbol_data = await self.trading_cache.get_symbol_data(symbol)
+            self.scheduler.record_signal_result(
+                symbol, signal_result,
+                position_open=symbol_data.position_open if symbol_data else None
+            )
+            
             # Only return signals that meet quality threshold
             if (signal_result and 
                 signal_result.get('signal_type') != 'NEUTRAL' and
@@ -291,6 +335,7 @@ class EnhancedScannerWorker:
             
         except Exception as e:
             logger.debug(f"Error processing symbol {symbol} for signals: {e}")
+            self.scheduler.record_failure(symbol)
             return None
     
     async def _convert_symbols_to_assets(self, trading_symbols: List[str], session):
@@ -322,12 +367,12 @@ class EnhancedScannerWorker:
             logger.info(f"🔄 Starting {'parallel' if self.use_parallel else 'regular'} scan cycle...")
             
             # Get trading symbols from cache
-            trading_symbols = await self.trading_cache.get_trading_symbols()
+            trading_symbols = await self._get_owned_trading_symbols()
             if not trading_symbols:
                 logger.warning("No trading symbols found for scanning")
                 # Try to select symbols if cache is empty
                 await self._ensure_trading_symbols()
-                trading_symbols = await self.trading_cache.get_trading_symbols()
+                trading_symbols = await self._get_owned_trading_symbols()
                 if not trading_symbols:
                     logger.error("Failed to select trading symbols")
                     return
@@ -362,6 +407,7 @@ class EnhancedScannerWorker:
                 
                 # Update scan metrics
                 cycle_time = time.time() - cycle_start
+                metrics.observe_cycle('scanner_full', cycle_time)
                 self.scan_metrics['total_scans'] += 1
                 self.scan_metrics['total_scan_time'] += cycle_time
                 self.scan_metrics['avg_scan_time'] = (
@@ -487,24 +533,13 @@ class EnhancedScannerWorker:
     async def _process_single_trading_symbol_optimized(self, symbol: str, session):
         """Process a single trading symbol with caching and rate limiting."""
         try:
-            client = get_client()
-            
-            # Use cached data when possible
-            ticker = await self.cache.get_or_fetch(
-                'ticker', symbol,
-                lambda: self._fetch_ticker_with_rate_limit(client, symbol)
-            )
+            # Use shared market data when possible
+            ticker = await self.market_data.get_ticker(symbol)
             
             # Get OHLCV data with caching
-            ohlcv_2h = await self.cache.get_or_fetch(
-                'candles', f"{symbol}_2h_100",
-                lambda: self._fetch_ohlcv_with_rate_limit(client, symbol, '2h', 100)
-            )
+            ohlcv_2h = await self.market_data.get_candles(symbol, '2h', 100)
             
-            ohlcv_4h = await self.cache.get_or_fetch(
-                'candles', f"{symbol}_4h_100", 
-                lambda: self._fetch_ohlcv_with_rate_limit(client, symbol, '4h', 100)
-            )
+            ohlcv_4h = await self.market_data.get_candles(symbol, '4h', 100)
             
             if not ohlcv_2h or not ohlcv_4h:
                 return None
@@ -574,24 +609,12 @@ class EnhancedScannerWorker:
     async def _process_single_asset_optimized(self, asset, session):
         """Process a single asset with caching and rate limiting."""
         try:
-            client = get_client()
+            # Use shared market data when possible
+            ticker = await self.market_data.get_ticker(asset.symbol)
             
-            # Use cached data when possible
-            ticker = await self.cache.get_or_fetch(
-                'ticker', asset.symbol,
-                lambda: self._fetch_ticker_with_rate_limit(client, asset.symbol)
-            )
-            
-            # Get OHLCV data with caching
-            ohlcv_2h = await self.cache.get_or_fetch(
-                'candles', f"{asset.symbol}_2h_100",
-                lambda: self._fetch_ohlcv_with_rate_limit(client, asset.symbol, '2h', 100)
-            )
-            
-            ohlcv_4h = await self.cache.get_or_fetch(
-                'candles', f"{asset.symbol}_4h_100", 
-                lambda: self._fetch_ohlcv_with_rate_limit(client, asset.symbol, '4h', 100)
-            )
+            # Get OHLCV data from the market data hub
+            ohlcv_2h = await self.market_data.get_candles(asset.symbol, '2h', 100)
+            ohlcv_4h = await self.market_data.get_candles(asset.symbol, '4h', 100)
             
             if not ohlcv_2h or not ohlcv_4h:
                 return None
@@ -626,16 +649,6 @@ class EnhancedScannerWorker:
             logger.error(f"Error in optimized processing for {asset.symbol}: {e}")
             return None
     
-    async def _fetch_ticker_with_rate_limit(self, client, symbol):
-        """Fetch ticker with rate limiting."""
-        await self.rate_limiter.acquire('market_data')
-        return await client.fetch_ticker(symbol)
-    
-    async def _fetch_ohlcv_with_rate_limit(self, client, symbol, timeframe, limit):
-        """Fetch OHLCV data with rate limiting."""
-        await self.rate_limiter.acquire('market_data')
-        return await client.fetch_ohlcv(symbol, timeframe, limit)
-    
     async def _store_indicators(self, session, asset, indicators, timeframe):
         """Store calculated indicators in database."""
         try:
@@ -837,6 +850,8 @@ class EnhancedScannerWorker:
             ├─ Signals generated: {self.scan_metrics['signals_generated']}
             ├─ Signals/minute: {self.scan_metrics['signals_per_minute']:.1f}
             ├─ Processing rate: {self.scan_metrics['processing_rate']:.1f} symbols/s
+            ├─ Max staleness: {self.scan_metrics['max_staleness_seconds']:.0f}s
+            ├─ Shard: {self.shard.shard_id + f" ({self.scan_metrics['owned_symbols_count']} symbols)" if self.shard else 'unsharded'}
             ├─ Error rate: {self.scan_metrics['errors']} errors
             └─ Last signal: {self.scan_metrics['last_signal_time'].strftime('%H:%M:%S') if self.scan_metrics['last_signal_time'] else 'None'}
             """)
@@ -864,6 +879,13 @@ async def main():
     signal.signal(signal.SIGTERM, signal_handler)
     
     try:
+        # Sharded mode: run N scanner processes, each owning a consistent-hash partition
+        if TradingConfig.SCANNER_SHARDING_ENABLED:
+            from scanner.sharding import ShardedScannerSupervisor
+            worker = ShardedScannerSupervisor()
+            await worker.run()
+            return
+        
         # Check if parallel mode is requested
         use_parallel = os.getenv("USE_PARALLEL_SCANNER", "true").lower() == "true"
         
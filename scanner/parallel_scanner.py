@@ -11,6 +11,7 @@ from concurrent.futures import ThreadPoolExecutor
 
 from api.market_data import get_market_data_api
 from api.client import get_client
+from api.market_data_hub import get_market_data_hub
 from database.connection import get_session
 from database.repository import AssetRepository, IndicatorRepository, SignalRepository
 from analysis.indicators import IndicatorCalculator
@@ -43,6 +44,7 @@ class ParallelScanner:
         self.indicator_calc = IndicatorCalculator()
         self.rate_limiter = get_rate_limiter()
         self.cache = get_smart_cache()
+        self.market_data = get_market_data_hub()
         
         # Performance tracking
         self.performance_stats = defaultdict(lambda: {
@@ -262,29 +264,12 @@ class ParallelScanner:
                 return None
     
     async def _fetch_ticker_cached(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """Fetch ticker with intelligent caching."""
-        return await self.cache.get_or_fetch(
-            'ticker', symbol,
-            lambda: self._fetch_ticker_with_rate_limit(symbol)
-        )
+        """Fetch ticker through the shared market data hub."""
+        return await self.market_data.get_ticker(symbol)
     
     async def _fetch_candles_cached(self, symbol: str, timeframe: str, limit: int) -> Optional[List]:
-        """Fetch candles with intelligent caching."""
-        cache_key = f"{symbol}_{timeframe}_{limit}"
-        return await self.cache.get_or_fetch(
-            'candles', cache_key,
-            lambda: self._fetch_ohlcv_with_rate_limit(symbol, timeframe, limit)
-        )
-    
-    async def _fetch_ticker_with_rate_limit(self, symbol: str):
-        """Fetch ticker with rate limiting."""
-        await self.rate_limiter.acquire('market_data')
-        return await self.client.fetch_ticker(symbol)
-    
-    async def _fetch_ohlcv_with_rate_limit(self, symbol: str, timeframe: str, limit: int):
-        """Fetch OHLCV data with rate limiting."""
-        await self.rate_limiter.acquire('market_data')
-        return await self.client.fetch_ohlcv(symbol, timeframe, limit)
+        """Fetch candles through the shared market data hub."""
+        return await self.market_data.get_candles(symbol, timeframe, limit)
     
     def _check_signals_optimized(self, asset: Any, ticker: Dict[str, Any],
                                 indicators_2h: Dict[str, Any], 
@@ -0,0 +1,316 @@
+# scanner/scan_scheduler.py
+"""Adaptive per-symbol scan scheduler that prioritises symbols close to a signal."""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config.trading_config import TradingConfig
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Priority given to symbols that have never been scanned (scanned immediately)
+DEFAULT_PRIORITY = 0.5
+
+# Relative weight of each factor in the combined priority score
+FACTOR_WEIGHTS: Dict[str, float] = {
+    'ma_proximity': 0.4,
+    'rsi_proximity': 0.25,
+    'volume': 0.35,
+}
+
+
+@dataclass
+class ScheduledSymbol:
+    """Scheduling state for a single symbol."""
+    symbol: str
+    priority: float = DEFAULT_PRIORITY
+    interval: float = 0.0
+    next_due: float = 0.0
+    last_scanned: Optional[float] = None
+    scan_count: int = 0
+    position_open: bool = False
+    factors: Dict[str, float] = field(default_factory=dict)
+
+    def staleness(self, now: float) -> Optional[float]:
+        """Seconds since the symbol was last scanned (None if never scanned)."""
+        if self.last_scanned is None:
+            return None
+        return now - self.last_scanned
+
+    def overdue(self, now: float) -> float:
+        """Seconds the symbol is past its due time (0 if not yet due)."""
+        return max(0.0, now - self.next_due)
+
+
+class AdaptiveScanScheduler:
+    """
+    Assigns each symbol a next-due time based on how likely it is to produce a signal:
+    - distance of MM1 from Center (close to a crossover or to the Rule 2 threshold)
+    - RSI near the RSI_MIN/RSI_MAX bounds
+    - recent volume ratio against the spike threshold
+    - whether the symbol has an open position (always scanned at the fastest cadence)
+
+    High priority symbols are rescheduled at SCHEDULER_MIN_INTERVAL_SECONDS, quiet
+    symbols drift towards SCHEDULER_MAX_INTERVAL_SECONDS.
+    """
+
+    def __init__(self, name: str = 'default',
+                 min_interval: Optional[float] = None,
+                 max_interval: Optional[float] = None):
+        self.name = name
+        self.config = TradingConfig
+        self.min_interval = float(min_interval if min_interval is not None
+                                  else self.config.SCHEDULER_MIN_INTERVAL_SECONDS)
+        self.max_interval = float(max_interval if max_interval is not None
+                                  else self.config.SCHEDULER_MAX_INTERVAL_SECONDS)
+        if self.max_interval < self.min_interval:
+            self.max_interval = self.min_interval
+
+        self._entries: Dict[str, ScheduledSymbol] = {}
+
+        self.stats = {
+            'scans_recorded': 0,
+            'due_requests': 0,
+            'symbols_dispatched': 0,
+            'symbols_deferred': 0,
+        }
+
+        logger.info(f"Adaptive scan scheduler '{name}' initialized "
+                    f"(interval {self.min_interval:.0f}s-{self.max_interval:.0f}s)")
+
+    def sync_symbols(self, symbols: Iterable[str], now: Optional[float] = None):
+        """Track new symbols (due immediately) and drop symbols no longer selected."""
+        now = time.time() if now is None else now
+        wanted = set(symbols)
+
+        for symbol in list(self._entries):
+            if symbol not in wanted:
+                del self._entries[symbol]
+
+        for symbol in wanted:
+            if symbol not in self._entries:
+                self._entries[symbol] = ScheduledSymbol(symbol=symbol, next_due=now)
+
+    def get_due_symbols(self, limit: Optional[int] = None, now: Optional[float] = None) -> List[str]:
+        """Get symbols whose next-due time has passed, most urgent first."""
+        now = time.time() if now is None else now
+        due = [entry for entry in self._entries.values() if entry.next_due <= now]
+
+        # Urgency grows with priority and with how long (relative to its interval) the symbol
+        # has been waiting, so quiet symbols cannot be starved when the cycle is limited
+        due.sort(key=lambda e: (-(e.priority + e.overdue(now) / max(e.interval, self.min_interval)),
+                                e.next_due))
+
+        if limit is not None and len(due) > limit:
+            self.stats['symbols_deferred'] += len(due) - limit
+            due = due[:limit]
+
+        self.stats['due_requests'] += 1
+        self.stats['symbols_dispatched'] += len(due)
+        return [entry.symbol for entry in due]
+
+    def seconds_until_next_due(self, now: Optional[float] = None) -> float:
+        """Seconds until the next symbol becomes due (max_interval if nothing is tracked)."""
+        if not self._entries:
+            return self.max_interval
+        now = time.time() if now is None else now
+        next_due = min(entry.next_due for entry in self._entries.values())
+        return max(0.0, next_due - now)
+
+    def calculate_priority(self, mm1: Optional[float] = None, center: Optional[float] = None,
+                           rsi: Optional[float] = None, volume_ratio: Optional[float] = None,
+                           position_open: bool = False) -> Tuple[float, Dict[str, float]]:
+        """
+        Calculate a 0-1 priority score from the latest indicator readings.
+
+        Returns:
+            Tuple of (priority, per-factor scores)
+        """
+        factors: Dict[str, float] = {}
+
+        # MA proximity: close to a crossover (distance ~0) or to the Rule 2 distance threshold
+        if mm1 is not None and center:
+            distance = abs(float(mm1) - float(center)) / abs(float(center))
+            threshold = float(self.config.MA_DISTANCE_2H_PERCENT) or 0.02
+            crossover_score = max(0.0, 1.0 - distance / threshold)
+            threshold_score = max(0.0, 1.0 - abs(distance - threshold) / threshold)
+            factors['ma_proximity'] = max(crossover_score, threshold_score)
+
+        # RSI proximity to the Rule 1 bounds
+        if rsi is not None:
+            band = float(self.config.SCHEDULER_RSI_PROXIMITY) or 1.0
+            rsi = float(rsi)
+            nearest_bound = min(abs(rsi - float(self.config.RSI_MIN)), abs(rsi - float(self.config.RSI_MAX)))
+            factors['rsi_proximity'] = max(0.0, 1.0 - nearest_bound / band)
+
+        # Volume ratio relative to the spike threshold
+        if volume_ratio is not None:
+            spike_threshold = float(self.config.VOLUME_SPIKE_THRESHOLD)
+            span = max(spike_threshold - 1.0, 0.1)
+            factors['volume'] = min(1.0, max(0.0, (float(volume_ratio) - 1.0) / span))
+
+        if position_open:
+            factors['position_open'] = 1.0
+            return 1.0, factors
+
+        if not factors:
+            return DEFAULT_PRIORITY, factors
+
+        weight_total = sum(FACTOR_WEIGHTS[name] for name in factors)
+        priority = sum(FACTOR_WEIGHTS[name] * score for name, score in factors.items()) / weight_total
+        return min(1.0, max(0.0, priority)), factors
+
+    def record_scan(self, symbol: str, mm1: Optional[float] = None, center: Optional[float] = None,
+                    rsi: Optional[float] = None, volume_ratio: Optional[float] = None,
+                    position_open: Optional[bool] = None, now: Optional[float] = None) -> float:
+        """
+        Record a completed scan and reschedule the symbol.
+
+        Returns:
+            Interval in seconds until the symbol is due again
+        """
+        now = time.time() if now is None else now
+        entry = self._entries.get(symbol)
+        if entry is None:
+            entry = ScheduledSymbol(symbol=symbol)
+            self._entries[symbol] = entry
+
+        if position_open is not None:
+            entry.position_open = position_open
+
+        priority, factors = self.calculate_priority(mm1, center, rsi, volume_ratio, entry.position_open)
+
+        entry.priority = priority
+        entry.factors = factors
+        entry.interval = self.max_interval - priority * (self.max_interval - self.min_interval)
+        entry.last_scanned = now
+        entry.next_due = now + entry.interval
+        entry.scan_count += 1
+
+        self.stats['scans_recorded'] += 1
+        return entry.interval
+
+    def record_signal_result(self, symbol: str, signal_result: Optional[Dict[str, Any]],
+                             position_open: Optional[bool] = None, now: Optional[float] = None) -> float:
+        """Reschedule a symbol using the output of SignalGenerator.generate_trading_signal."""
+        mm1, center, rsi, volume_ratio = extract_signal_observation(signal_result)
+        return self.record_scan(symbol, mm1, center, rsi, volume_ratio, position_open, now)
+
+    def record_failure(self, symbol: str, now: Optional[float] = None):
+        """Back off a symbol whose scan failed without discarding its last priority."""
+        now = time.time() if now is None else now
+        entry = self._entries.get(symbol)
+        if entry is None:
+            return
+        entry.next_due = now + max(entry.interval, self.min_interval)
+
+    def set_position_open(self, symbol: str, is_open: bool, now: Optional[float] = None):
+        """Mark a symbol as having an open position; open positions are due at once."""
+        now = time.time() if now is None else now
+        entry = self._entries.get(symbol)
+        if entry is None:
+            entry = ScheduledSymbol(symbol=symbol, next_due=now)
+            self._entries[symbol] = entry
+
+        entry.position_open = is_open
+        if is_open:
+            entry.priority = 1.0
+            entry.next_due = min(entry.next_due, now)
+
+    def get_staleness(self, symbol: Optional[str] = None, now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Get per-symbol staleness metrics (all symbols or a single one)."""
+        now = time.time() if now is None else now
+        entries = self._entries.values()
+        if symbol is not None:
+            entries = [self._entries[symbol]] if symbol in self._entries else []
+
+        return {
+            entry.symbol: {
+                'priority': round(entry.priority, 3),
+                'interval_seconds': round(entry.interval, 1),
+                'staleness_seconds': (round(entry.staleness(now), 1)
+                                      if entry.last_scanned is not None else None),
+                'overdue_seconds': round(entry.overdue(now), 1),
+                'scan_count': entry.scan_count,
+                'position_open': entry.position_open,
+                'factors': {name: round(score, 3) for name, score in entry.factors.items()},
+            }
+            for entry in entries
+        }
+
+    def get_stats(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Get scheduler summary statistics."""
+        now = time.time() if now is None else now
+        entries = list(self._entries.values())
+        scanned = [e.staleness(now) for e in entries if e.last_scanned is not None]
+        overdue = [e.overdue(now) for e in entries]
+
+        return {
+            'name': self.name,
+            'tracked_symbols': len(entries),
+            'never_scanned': len(entries) - len(scanned),
+            'due_now': sum(1 for e in entries if e.next_due <= now),
+            'open_positions': sum(1 for e in entries if e.position_open),
+            'avg_priority': round(sum(e.priority for e in entries) / len(entries), 3) if entries else 0,
+            'avg_staleness_seconds': round(sum(scanned) / len(scanned), 1) if scanned else 0,
+            'max_staleness_seconds': round(max(scanned), 1) if scanned else 0,
+            'max_overdue_seconds': round(max(overdue), 1) if overdue else 0,
+            'min_interval_seconds': self.min_interval,
+            'max_interval_seconds': self.max_interval,
+            **self.stats,
+        }
+
+
+def extract_signal_observation(signal_result: Optional[Dict[str, Any]]) -> Tuple[Optional[float], ...]:
+    """Extract (mm1, center, rsi, volume_ratio) from a generate_trading_signal result."""
+    if not signal_result:
+        return None, None, None, None
+
+    rules = signal_result.get('rules_analysis') or {}
+
+    indicators = {}
+    crossover_details = (rules.get('rule_1_crossover') or {}).get('details') or {}
+    for timeframe in ('2h', '4h'):
+        tf_indicators = (crossover_details.get(timeframe) or {}).get('indicators')
+        if tf_indicators:
+            indicators = tf_indicators
+            break
+
+    volume_details = ((rules.get('rule_3_volume') or {}).get('details') or {}).get('volume_analysis') or {}
+    volume_ratio = volume_details.get('volume_ratio')
+
+    return (
+        _to_float(indicators.get('mm1')),
+        _to_float(indicators.get('center')),
+        _to_float(indicators.get('rsi')),
+        _to_float(volume_ratio),
+    )
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Convert Decimal/str/number to float, None on failure."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Global scheduler instances (one per worker)
+_schedulers: Dict[str, AdaptiveScanScheduler] = {}
+
+
+def get_scan_scheduler(name: str = 'default', min_interval: Optional[float] = None,
+                       max_interval: Optional[float] = None) -> AdaptiveScanScheduler:
+    """Get or create a named global scan scheduler instance (intervals apply on creation)."""
+    if name not in _schedulers:
+        _schedulers[name] = AdaptiveScanScheduler(name, min_interval, max_interval)
+    return _schedulers[name]
+
+
+def get_all_scheduler_stats() -> Dict[str, Dict[str, Any]]:
+    """Get summary statistics for every registered scheduler."""
+    return {name: scheduler.get_stats() for name, scheduler in _schedulers.items()}
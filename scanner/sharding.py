@@ -0,0 +1,434 @@
+# scanner/sharding.py
+"""Multi-process sharded scanning: consistent-hash symbol partitions, DB membership and signal aggregation."""
+
+import asyncio
+import bisect
+import hashlib
+import multiprocessing
+import os
+import queue
+import signal
+import socket
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from config.trading_config import TradingConfig
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# SystemConfig key prefix used for shard membership records
+MEMBER_KEY_PREFIX = "scanner_shard:"
+
+
+class ShardingError(Exception):
+    """Exception for sharded scanner errors."""
+    pass
+
+
+class ConsistentHashRing:
+    """Consistent hash ring with virtual nodes for stable symbol partitioning."""
+
+    def __init__(self, nodes: Optional[Iterable[str]] = None, replicas: int = 100):
+        self.replicas = replicas
+        self._ring: Dict[int, str] = {}
+        self._sorted_keys: List[int] = []
+        self._nodes: set = set()
+
+        for node in nodes or []:
+            self.add_node(node)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int(hashlib.md5(key.encode('utf-8')).hexdigest()[:16], 16)
+
+    @property
+    def nodes(self) -> List[str]:
+        return sorted(self._nodes)
+
+    def add_node(self, node: str):
+        """Add a node and its virtual replicas to the ring."""
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for i in range(self.replicas):
+            point = self._hash(f"{node}#{i}")
+            self._ring[point] = node
+            bisect.insort(self._sorted_keys, point)
+
+    def remove_node(self, node: str):
+        """Remove a node and its virtual replicas from the ring."""
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        for i in range(self.replicas):
+            point = self._hash(f"{node}#{i}")
+            if self._ring.pop(point, None) is not None:
+                index = bisect.bisect_left(self._sorted_keys, point)
+                if index < len(self._sorted_keys) and self._sorted_keys[index] == point:
+                    self._sorted_keys.pop(index)
+
+    def get_node(self, key: str) -> Optional[str]:
+        """Get the node owning a key."""
+        if not self._sorted_keys:
+            return None
+        index = bisect.bisect(self._sorted_keys, self._hash(key)) % len(self._sorted_keys)
+        return self._ring[self._sorted_keys[index]]
+
+    def partition(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        """Split keys into per-node partitions."""
+        partitions: Dict[str, List[str]] = {node: [] for node in self._nodes}
+        for key in keys:
+            node = self.get_node(key)
+            if node is not None:
+                partitions[node].append(key)
+        return partitions
+
+
+class ShardMembership:
+    """
+    Shard membership for one scanner process.
+
+    Each member heartbeats a `scanner_shard:<id>` row in the system_config table;
+    members whose heartbeat is older than the TTL are dropped from the ring, so
+    symbols are rebalanced automatically when a process starts, stops or dies.
+    When the database is unavailable the static member list (the shards started
+    by the local supervisor) is used instead. For the first TTL after start the
+    static members stay in the ring alongside the live ones, so siblings that
+    have not heartbeated yet keep their partitions instead of being claimed.
+    """
+
+    def __init__(self, shard_id: str, static_members: Optional[List[str]] = None,
+                 heartbeat_interval: Optional[int] = None, member_ttl: Optional[int] = None):
+        # system_config keys are stored lowercase
+        self.shard_id = shard_id.lower()
+        self.static_members = [member.lower() for member in (static_members or [shard_id])]
+        self.heartbeat_interval = heartbeat_interval or TradingConfig.SCANNER_SHARD_HEARTBEAT_SECONDS
+        self.member_ttl = member_ttl or TradingConfig.SCANNER_SHARD_TTL_SECONDS
+
+        self.ring = ConsistentHashRing(self.static_members)
+        self._last_heartbeat = 0.0
+        self._started_at = time.time()
+
+        self.stats = {
+            'heartbeats': 0,
+            'heartbeat_failures': 0,
+            'rebalances': 0,
+            'owned_symbols': 0,
+            'total_symbols': 0,
+        }
+
+    def _member_key(self) -> str:
+        return f"{MEMBER_KEY_PREFIX}{self.shard_id}"
+
+    def heartbeat(self) -> bool:
+        """Write this member's heartbeat to the database."""
+        from database.connection import get_session
+        from database.repository import SystemConfigRepository
+
+        try:
+            with get_session() as session:
+                SystemConfigRepository().set_config(
+                    session, self._member_key(),
+                    {'heartbeat': time.time(), 'pid': os.getpid(), 'host': socket.gethostname()},
+                    description="Sharded scanner membership"
+                )
+            self.stats['heartbeats'] += 1
+            return True
+        except Exception as e:
+            self.stats['heartbeat_failures'] += 1
+            logger.warning(f"Shard {self.shard_id} heartbeat failed: {e}")
+            return False
+
+    def get_live_members(self) -> List[str]:
+        """Get members with a heartbeat newer than the TTL (static members on DB failure or during startup)."""
+        from database.connection import get_session
+        from database.repository import SystemConfigRepository
+
+        try:
+            with get_session() as session:
+                records = SystemConfigRepository().get_configs_by_prefix(session, MEMBER_KEY_PREFIX)
+        except Exception as e:
+            logger.warning(f"Shard membership lookup failed, using static members: {e}")
+            return list(self.static_members)
+
+        cutoff = time.time() - self.member_ttl
+        members = [
+            key[len(MEMBER_KEY_PREFIX):] for key, value in records.items()
+            if isinstance(value, dict) and value.get('heartbeat', 0) >= cutoff
+        ]
+        if self.shard_id not in members:
+            members.append(self.shard_id)
+        if time.time() - self._started_at < self.member_ttl:
+            # Sibling shards may not have written their first heartbeat yet
+            members = set(members) | set(self.static_members)
+        return sorted(members)
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Heartbeat and rebuild the ring if membership changed.
+
+        Returns:
+            True if the partition map changed
+        """
+        now = time.time()
+        if not force and now - self._last_heartbeat < self.heartbeat_interval:
+            return False
+        self._last_heartbeat = now
+
+        self.heartbeat()
+        members = self.get_live_members()
+        if members == self.ring.nodes:
+            return False
+
+        logger.info(f"🔀 Shard {self.shard_id} rebalancing: {len(self.ring.nodes)} → {len(members)} members")
+        self.ring = ConsistentHashRing(members)
+        self.stats['rebalances'] += 1
+        return True
+
+    def owns(self, symbol: str) -> bool:
+        """Check if this shard owns a symbol."""
+        return self.ring.get_node(symbol) == self.shard_id
+
+    def filter_symbols(self, symbols: Iterable[str]) -> List[str]:
+        """Keep only the symbols owned by this shard."""
+        symbols = list(symbols)
+        owned = [symbol for symbol in symbols if self.owns(symbol)]
+        self.stats['owned_symbols'] = len(owned)
+        self.stats['total_symbols'] = len(symbols)
+        return owned
+
+    def leave(self):
+        """Remove this member's heartbeat so peers rebalance immediately."""
+        from database.connection import get_session
+        from database.repository import SystemConfigRepository
+
+        try:
+            with get_session() as session:
+                SystemConfigRepository().delete_config(session, self._member_key())
+        except Exception as e:
+            logger.warning(f"Shard {self.shard_id} failed to leave cleanly: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get membership statistics."""
+        return {
+            'shard_id': self.shard_id,
+            'members': self.ring.nodes,
+            **self.stats,
+        }
+
+
+class SignalAggregator:
+    """Collects signals published by shard processes and fans them out to callbacks."""
+
+    def __init__(self, signal_queue, dedup_window_seconds: int = 60):
+        self.signal_queue = signal_queue
+        self.dedup_window_seconds = dedup_window_seconds
+        self.callbacks: List[Callable] = []
+        self.recent_signals: List[Dict[str, Any]] = []
+        self._last_seen: Dict[tuple, float] = {}
+        self._running = False
+
+        self.stats = {
+            'signals_received': 0,
+            'signals_published': 0,
+            'duplicates_dropped': 0,
+            'signals_by_shard': {},
+        }
+
+    def add_callback(self, callback: Callable):
+        """Register a callback (sync or async) for aggregated signals."""
+        self.callbacks.append(callback)
+
+    def _is_duplicate(self, signal: Dict[str, Any]) -> bool:
+        key = (signal.get('symbol'), signal.get('signal_type'))
+        now = time.time()
+        last = self._last_seen.get(key)
+        self._last_seen[key] = now
+        return last is not None and now - last < self.dedup_window_seconds
+
+    async def handle_signal(self, signal: Dict[str, Any]):
+        """Process a single signal from a shard."""
+        self.stats['signals_received'] += 1
+        shard_id = signal.get('shard_id', 'unknown')
+        self.stats['signals_by_shard'][shard_id] = self.stats['signals_by_shard'].get(shard_id, 0) + 1
+
+        if self._is_duplicate(signal):
+            self.stats['duplicates_dropped'] += 1
+            return
+
+        self.recent_signals.append(signal)
+        if len(self.recent_signals) > 500:
+            self.recent_signals = self.recent_signals[-250:]
+
+        self.stats['signals_published'] += 1
+        logger.info(f"🎯 Aggregated signal from shard {shard_id}: {signal.get('symbol')} "
+                    f"{signal.get('signal_type')} (confidence: {signal.get('confidence', 0):.1%})")
+
+        for callback in self.callbacks:
+            try:
+                if asyncio.iscoroutinefunction(callback):
+                    await callback(signal)
+                else:
+                    callback(signal)
+            except Exception as e:
+                logger.error(f"Error in aggregated signal callback: {e}")
+
+    async def run(self):
+        """Drain the shared signal queue until stopped."""
+        self._running = True
+        loop = asyncio.get_running_loop()
+
+        while self._running:
+            try:
+                signal = await loop.run_in_executor(None, self.signal_queue.get, True, 1.0)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            await self.handle_signal(signal)
+
+    def stop(self):
+        """Stop draining the queue."""
+        self._running = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get aggregator statistics."""
+        return {**self.stats, 'recent_signals': len(self.recent_signals)}
+
+
+def _run_shard_process(shard_id: str, static_members: List[str], signal_queue,
+                       trading_symbols: Optional[List[Any]] = None):
+    """Process entry point for a single scanner shard."""
+    shard = ShardMembership(shard_id, static_members=static_members)
+
+    def on_sigterm(signum, frame):
+        # The supervisor stops shards with terminate(); leave first so peers rebalance at once
+        shard.leave()
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, on_sigterm)
+    asyncio.run(_shard_main(shard, signal_queue, trading_symbols))
+
+
+async def _shard_main(shard: ShardMembership, signal_queue, trading_symbols: Optional[List[Any]] = None):
+    """Run an EnhancedScannerWorker restricted to this shard's partition."""
+    from scanner.enhanced_worker import EnhancedScannerWorker
+
+    shard_id = shard.shard_id
+    worker = EnhancedScannerWorker(use_parallel=False, shard=shard, trading_symbols=trading_symbols)
+
+    def publish(signal_data: Dict[str, Any]):
+        try:
+            signal_queue.put_nowait({**signal_data, 'shard_id': shard_id})
+        except queue.Full:
+            logger.warning(f"Shard {shard_id}: aggregator queue full, dropping signal")
+
+    worker.add_signal_callback(publish)
+
+    try:
+        if not await worker.initialize():
+            raise ShardingError(f"Shard {shard_id} failed to initialize")
+        await worker.run()
+    finally:
+        shard.leave()
+
+
+class ShardedScannerSupervisor:
+    """
+    Starts N scanner shard processes and aggregates their signals.
+
+    The trading symbol universe is selected once here and handed to every
+    shard, so N shards do not make N selection passes against the exchange.
+    Aggregated signals go to the callbacks registered with add_signal_callback,
+    the same sink an unsharded EnhancedScannerWorker broadcasts to.
+    """
+
+    def __init__(self, num_shards: Optional[int] = None, shard_prefix: Optional[str] = None):
+        self.num_shards = num_shards or TradingConfig.SCANNER_SHARD_PROCESSES
+        prefix = shard_prefix or f"{socket.gethostname()}-{os.getpid()}"
+        self.shard_ids = [f"{prefix}-{i}" for i in range(self.num_shards)]
+
+        self._context = multiprocessing.get_context('spawn')
+        self.signal_queue = self._context.Queue(maxsize=10000)
+        self.aggregator = SignalAggregator(self.signal_queue)
+        self.trading_symbols: Optional[List[Any]] = None  # Universe shared by all shards
+        self.processes: Dict[str, multiprocessing.Process] = {}
+        self.running = False
+
+    def add_signal_callback(self, callback: Callable):
+        """Add a callback function to be called with each aggregated signal."""
+        self.aggregator.add_callback(callback)
+
+    async def select_trading_symbols(self) -> Optional[List[Any]]:
+        """Select the trading symbol universe once for all shards (None: shards select their own)."""
+        from api.client import initialize_client
+        from database.connection import init_database
+        from trading.symbol_selector import get_symbol_selector
+
+        try:
+            if not init_database() or not await initialize_client():
+                raise ShardingError("database or API client unavailable")
+            symbols = await get_symbol_selector().select_trading_symbols(force_refresh=True)
+        except Exception as e:
+            logger.warning(f"Supervisor symbol selection failed, shards will select their own: {e}")
+            return None
+        logger.info(f"🎯 Selected {len(symbols)} trading symbols for {self.num_shards} shards")
+        return symbols or None
+
+    def _start_shard(self, shard_id: str):
+        process = self._context.Process(
+            target=_run_shard_process,
+            args=(shard_id, self.shard_ids, self.signal_queue, self.trading_symbols),
+            name=f"scanner-shard-{shard_id}",
+            daemon=True,
+        )
+        process.start()
+        self.processes[shard_id] = process
+        logger.info(f"🚀 Started scanner shard {shard_id} (pid {process.pid})")
+
+    async def run(self):
+        """Start all shards, restart dead ones and aggregate their signals."""
+        self.running = True
+        logger.info(f"⚡ Starting sharded scanner with {self.num_shards} processes")
+
+        self.trading_symbols = await self.select_trading_symbols()
+        for shard_id in self.shard_ids:
+            self._start_shard(shard_id)
+
+        aggregator_task = asyncio.create_task(self.aggregator.run())
+        try:
+            while self.running:
+                for shard_id, process in list(self.processes.items()):
+                    if not process.is_alive():
+                        logger.warning(f"Scanner shard {shard_id} exited (code {process.exitcode}), restarting")
+                        self._start_shard(shard_id)
+                await asyncio.sleep(5)
+        finally:
+            self.aggregator.stop()
+            await asyncio.gather(aggregator_task, return_exceptions=True)
+            self.shutdown()
+
+    def stop(self):
+        """Request shutdown."""
+        self.running = False
+
+    def shutdown(self):
+        """Terminate all shard processes."""
+        for shard_id, process in self.processes.items():
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes.values():
+            process.join(timeout=10)
+        logger.info("🛑 Sharded scanner stopped")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get supervisor status."""
+        return {
+            'num_shards': self.num_shards,
+            'shards': {
+                shard_id: {'pid': process.pid, 'alive': process.is_alive()}
+                for shard_id, process in self.processes.items()
+            },
+            'aggregator': self.aggregator.get_stats(),
+        }
@@ -13,7 +13,7 @@ from utils.logger import get_logger
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class SymbolData:
     """Container for symbol market data and metadata."""
     symbol: str
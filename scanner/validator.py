@@ -1,12 +1,17 @@
 # scanner/validator.py
 """Asset validation logic for trading eligibility."""
 
+import asyncio
 import logging
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
 from typing import Dict, List, Optional, Any, Tuple
 from decimal import Decimal
 from datetime import datetime, timezone
 
 from api.market_data import get_market_data_api, MarketDataError
+from api.market_metadata import get_market_store
 from config.trading_config import TradingConfig
 from utils.logger import get_logger
 from utils.validators import Validator, ValidationError
@@ -22,6 +27,7 @@ class ValidationCriteria:
     MIN_PRICE_USDT = Decimal('0.0001')   # Minimum price to avoid micro-cap coins
     MAX_PRICE_USDT = Decimal('100000')   # Maximum price for reasonable position sizing
     MIN_TRADES_24H = 1000  # Minimum number of trades for liquidity
+    MIN_ORDERBOOK_DEPTH_USDT = Decimal('1000')  # Quoted value required on each side of the book (top 20 levels)
     
     # Priority symbols (always validate first)
     PRIORITY_SYMBOLS = [
@@ -35,91 +41,230 @@ class ValidationCriteria:
     ]
 
 
+@dataclass
+class FunnelStage:
+    """Counters and timing for one stage of the validation funnel."""
+    name: str
+    checked: int = 0
+    passed: int = 0
+    requests: int = 0  # Market data calls made by this stage (the client may answer from cache)
+    seconds: float = 0.0
+
+
 class AssetValidator:
-    """Validates assets for trading eligibility based on various criteria."""
+    """
+    Validates assets for trading eligibility based on various criteria.
+    
+    Validation is a funnel, cheapest stage first, and a symbol only reaches
+    a stage if it passed the ones before:
+    
+    1. screening: symbol format, blacklist and listing (market metadata, no requests)
+    2. market_snapshot: price, 24h volume, spread and volatility from one
+       bulk ticker request shared by all symbols
+    3. deep_checks: hourly candles and order book depth, two requests per survivor
     
-    def __init__(self):
+    The trading criteria of stages 2 and 3 only apply in strict mode
+    (TradingConfig.STRICT_ASSET_VALIDATION). By default every symbol that
+    passes screening is accepted, with its snapshot kept as validation data.
+    """
+    
+    STAGES = ('screening', 'market_snapshot', 'deep_checks')
+    
+    def __init__(self, strict: Optional[bool] = None):
         self.market_api = get_market_data_api()
+        self.market_store = get_market_store()
         self.criteria = ValidationCriteria()
+        self.strict = TradingConfig.STRICT_ASSET_VALIDATION if strict is None else strict
+        self.stage_stats: Dict[str, FunnelStage] = {name: FunnelStage(name) for name in self.STAGES}
         
     async def validate_asset(self, symbol: str) -> Dict[str, Any]:
         """Validate a single asset against all criteria."""
-        validation_start = datetime.utcnow()
+        results = await self._run_funnel([symbol], max_concurrent=1)
+        return results[symbol]
+    
+    async def _run_funnel(self, symbols: List[str], max_concurrent: int) -> Dict[str, Dict[str, Any]]:
+        """Run symbols through the three stages; returns a result for every symbol."""
+        started = {symbol: datetime.utcnow() for symbol in symbols}
+        results: Dict[str, Dict[str, Any]] = {}
         
-        try:
-            # Basic format validation
-            if not Validator.is_valid_symbol(symbol):
-                return self._create_validation_result(
-                    symbol, False, "Invalid symbol format", {}, validation_start
+        def reject(symbol: str, reason: str, data: Dict[str, Any]):
+            results[symbol] = self._create_validation_result(symbol, False, reason, data, started[symbol])
+        
+        # Stage 1: format, blacklist and listing checks (no exchange requests)
+        with self._stage('screening', len(symbols)) as stage:
+            survivors = []
+            for symbol in symbols:
+                reason = self._screen_symbol(symbol)
+                if reason:
+                    reject(symbol, reason, {'funnel_stage': 'screening'})
+                else:
+                    survivors.append(symbol)
+            stage.passed += len(survivors)
+        
+        # Stage 2: cheap filters off one bulk ticker snapshot
+        summaries: Dict[str, Dict[str, Any]] = {}
+        checks: Dict[str, Dict[str, bool]] = {}
+        with self._stage('market_snapshot', len(survivors)) as stage:
+            if survivors:
+                summaries = await self._get_summaries(survivors, stage)
+            passed = []
+            for symbol in survivors:
+                if symbol not in summaries:
+                    reject(symbol, "Symbol not available on exchange", {'funnel_stage': 'market_snapshot'})
+                    continue
+                summary = summaries[symbol]
+                if not self.strict:
+                    checks[symbol] = {'basic_format': True}
+                elif summary is None:
+                    # Ticker temporarily unavailable: leave the decision to the deep checks
+                    checks[symbol] = {}
+                else:
+                    checks[symbol] = self._run_snapshot_checks(summary)
+                if all(checks[symbol].values()):
+                    passed.append(symbol)
+                else:
+                    reject(symbol, self._failure_reason(checks[symbol]),
+                           self._validation_data('market_snapshot', summary, None, checks[symbol]))
+            survivors = passed
+            stage.passed += len(survivors)
+        
+        if not self.strict:
+            for symbol in survivors:
+                results[symbol] = self._create_validation_result(
+                    symbol, True, None,
+                    self._validation_data('passed', summaries[symbol], None, checks[symbol]), started[symbol]
                 )
+            return results
+        
+        # Stage 3: candle and order book checks for the survivors only
+        with self._stage('deep_checks', len(survivors)) as stage:
+            semaphore = asyncio.Semaphore(max(1, max_concurrent))
             
-            # Check blacklist
-            if symbol in self.criteria.BLACKLISTED_SYMBOLS:
-                return self._create_validation_result(
-                    symbol, False, "Symbol is blacklisted", {}, validation_start
+            async def deep_check(symbol: str):
+                async with semaphore:
+                    try:
+                        volume_analysis, deep_results = await self._run_deep_checks(symbol, summaries[symbol], stage)
+                    except Exception as e:
+                        logger.error(f"Unexpected error validating {symbol}: {e}")
+                        reject(symbol, f"Validation error: {str(e)}", {'funnel_stage': 'deep_checks'})
+                        return
+                all_checks = {**checks[symbol], **deep_results}
+                is_valid = all(all_checks.values())
+                if is_valid:
+                    stage.passed += 1
+                results[symbol] = self._create_validation_result(
+                    symbol, is_valid, None if is_valid else self._failure_reason(all_checks),
+                    self._validation_data('passed' if is_valid else 'deep_checks', summaries[symbol],
+                                          volume_analysis, all_checks),
+                    started[symbol]
                 )
             
-            # Get market data for validation (relaxed mode for testnet)
-            market_summary = None
-            volume_analysis = None
-            
+            await asyncio.gather(*(deep_check(symbol) for symbol in survivors))
+        
+        return results
+    
+    @contextmanager
+    def _stage(self, name: str, count: int):
+        stage = self.stage_stats[name]
+        stage.checked += count
+        start = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            stage.seconds += time.perf_counter() - start
+    
+    def _screen_symbol(self, symbol: str) -> Optional[str]:
+        """Stage 1: reason to reject the symbol without asking the exchange, or None."""
+        if not Validator.is_valid_symbol(symbol):
+            return "Invalid symbol format"
+        if symbol in self.criteria.BLACKLISTED_SYMBOLS:
+            return "Symbol is blacklisted"
+        if len(self.market_store):
+            market = self.market_store.get(symbol)
+            if market is None or not market['active']:
+                return "Symbol not available on exchange"
+        return None
+    
+    async def _get_summaries(self, symbols: List[str], stage: FunnelStage) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Market summaries from the bulk ticker snapshot (per-symbol requests if that fails).
+        
+        Unlisted symbols are left out; a symbol whose ticker failed for another
+        reason maps to None and is validated without it.
+        """
+        try:
+            stage.requests += 1
+            return await self.market_api.get_market_summaries()
+        except MarketDataError as e:
+            logger.warning(f"Bulk ticker snapshot unavailable, fetching {len(symbols)} tickers one by one: {e}")
+        
+        summaries = {}
+        for symbol in symbols:
             try:
-                market_summary = await self.market_api.get_market_summary(symbol)
+                stage.requests += 1
+                summaries[symbol] = await self.market_api.get_market_summary(symbol)
             except MarketDataError as e:
                 error_msg = str(e).lower()
                 if "does not have market" in error_msg or "symbol not found" in error_msg:
-                    return self._create_validation_result(
-                        symbol, False, "Symbol not available on exchange", {}, validation_start
-                    )
-                # For other market data errors, continue with basic validation
+                    continue
                 logger.warning(f"Market data unavailable for {symbol}: {e}")
-            
-            try:
-                volume_analysis = await self.market_api.get_volume_analysis(symbol, '1h', 24)
-            except MarketDataError as e:
-                # Volume analysis is optional - continue without it
-                logger.debug(f"Volume analysis unavailable for {symbol}: {e}")
-            except Exception as e:
-                logger.debug(f"Volume analysis failed for {symbol}: {e}")
-            
-            # Run all validation checks
-            validation_results = await self._run_validation_checks(symbol, market_summary, volume_analysis)
-            
-            # Determine overall validity
-            is_valid = all(validation_results.values())
-            
-            # Create detailed reason if invalid
-            reason = None
-            if not is_valid:
-                failed_checks = [check for check, passed in validation_results.items() if not passed]
-                reason = f"Failed checks: {', '.join(failed_checks)}"
-            
-            validation_data = {
-                'market_summary': market_summary,
-                'volume_analysis': volume_analysis,
-                'validation_checks': validation_results,
-                'criteria_used': self._get_criteria_summary(),
-            }
-            
-            return self._create_validation_result(
-                symbol, is_valid, reason, validation_data, validation_start
-            )
-            
-        except Exception as e:
-            logger.error(f"Unexpected error validating {symbol}: {e}")
-            return self._create_validation_result(
-                symbol, False, f"Validation error: {str(e)}", {}, validation_start
-            )
+                summaries[symbol] = None
+        return summaries
+    
+    def _run_snapshot_checks(self, market_summary: Dict[str, Any]) -> Dict[str, bool]:
+        """Stage 2 checks: everything that only needs the 24h ticker."""
+        checks = {
+            'has_value': self._check_has_value(market_summary),
+            'recent_trading': self._check_recent_trading(market_summary),
+            'volume_24h': self._check_volume(market_summary),
+            'price_range': self._check_price_range(market_summary),
+            'volatility': self._check_volatility(market_summary),
+        }
+        # Bulk tickers may come without bid/ask; the spread is then taken from the order book in stage 3
+        if market_summary.get('spread_percent') is not None:
+            checks['spread'] = self._check_spread(market_summary)
+        return checks
     
-    async def _run_validation_checks(self, symbol: str, market_summary: Dict[str, Any], 
-                                   volume_analysis: Dict[str, Any]) -> Dict[str, bool]:
-        """Run ultra-simplified validation checks - accept almost all assets for now."""
+    async def _run_deep_checks(self, symbol: str, market_summary: Optional[Dict[str, Any]],
+                               stage: FunnelStage) -> Tuple[Optional[Dict[str, Any]], Dict[str, bool]]:
+        """Stage 3 checks: candle volume consistency and order book depth/spread."""
+        stage.requests += 2
+        volume_analysis, orderbook = await asyncio.gather(
+            self.market_api.get_volume_analysis(symbol, '1h', 24),
+            self.market_api.get_orderbook(symbol, depth=20),
+            return_exceptions=True
+        )
+        
         checks = {}
+        if isinstance(volume_analysis, Exception):
+            # Volume analysis is optional - continue without it
+            logger.debug(f"Volume analysis unavailable for {symbol}: {volume_analysis}")
+            volume_analysis = None
+        else:
+            checks['volume_consistency'] = self._check_volume_consistency(volume_analysis)
         
-        # ÚNICA REGRA: Não está na blacklist (já foi verificado antes)
-        checks['basic_format'] = True  # Always pass for now
+        if isinstance(orderbook, Exception):
+            logger.debug(f"Order book unavailable for {symbol}: {orderbook}")
+        else:
+            checks['liquidity'] = await self._check_liquidity(symbol, orderbook)
+            if not market_summary or market_summary.get('spread_percent') is None:
+                checks['spread'] = self._check_spread(orderbook)
         
-        return checks
+        return volume_analysis, checks
+    
+    def _failure_reason(self, checks: Dict[str, bool]) -> str:
+        failed_checks = [check for check, passed in checks.items() if not passed]
+        return f"Failed checks: {', '.join(failed_checks)}"
+    
+    def _validation_data(self, funnel_stage: str, market_summary: Optional[Dict[str, Any]],
+                         volume_analysis: Optional[Dict[str, Any]], checks: Dict[str, bool]) -> Dict[str, Any]:
+        return {
+            'market_summary': market_summary,
+            'volume_analysis': volume_analysis,
+            'validation_checks': checks,
+            'criteria_used': self._get_criteria_summary(),
+            'funnel_stage': funnel_stage,
+        }
     
     def _check_has_value(self, market_summary: Dict[str, Any]) -> bool:
         """Verifica se o ativo tem valor (preço > 0)."""
@@ -146,20 +291,18 @@ class AssetValidator:
         except Exception:
             return True  # Default to valid on error
     
-    def _check_volume(self, market_summary: Dict[str, Any], 
-                     volume_analysis: Dict[str, Any]) -> bool:
-        """Check if asset has sufficient trading volume."""
+    def _check_volume(self, market_summary: Dict[str, Any]) -> bool:
+        """Check if asset has sufficient 24h trading volume."""
         try:
             quote_volume_24h = market_summary.get('quote_volume_24h')
-            if not quote_volume_24h or quote_volume_24h < self.criteria.MIN_VOLUME_24H_USDT:
-                return False
-            
-            # Also check average volume consistency
-            avg_volume = volume_analysis.get('average_volume', 0)
-            if avg_volume <= 0:
-                return False
-            
-            return True
+            return bool(quote_volume_24h) and quote_volume_24h >= self.criteria.MIN_VOLUME_24H_USDT
+        except Exception:
+            return False
+    
+    def _check_volume_consistency(self, volume_analysis: Dict[str, Any]) -> bool:
+        """Check that the hourly candles show trading (not a single burst in 24h)."""
+        try:
+            return volume_analysis.get('average_volume', 0) > 0
         except Exception:
             return False
     
@@ -175,7 +318,7 @@ class AssetValidator:
             return False
     
     def _check_spread(self, market_summary: Dict[str, Any]) -> bool:
-        """Check if bid-ask spread is acceptable."""
+        """Check if bid-ask spread is acceptable (ticker summary or order book)."""
         try:
             spread_percent = market_summary.get('spread_percent')
             if spread_percent is None:
@@ -185,17 +328,12 @@ class AssetValidator:
         except Exception:
             return False
     
-    async def _check_liquidity(self, symbol: str, market_summary: Dict[str, Any]) -> bool:
-        """Check order book liquidity."""
+    async def _check_liquidity(self, symbol: str, orderbook: Dict[str, Any]) -> bool:
+        """Check order book liquidity: quoted value on both sides within the fetched depth."""
         try:
-            # For now, use volume as proxy for liquidity
-            # Could be enhanced with order book depth analysis
-            volume_24h = market_summary.get('volume_24h')
-            if not volume_24h:
-                return False
-            
-            # Simple heuristic: volume should be at least 1000 base units
-            return volume_24h >= 1000
+            bid_depth = sum(Decimal(str(price)) * Decimal(str(amount)) for price, amount in orderbook['bids'])
+            ask_depth = sum(Decimal(str(price)) * Decimal(str(amount)) for price, amount in orderbook['asks'])
+            return min(bid_depth, ask_depth) >= self.criteria.MIN_ORDERBOOK_DEPTH_USDT
         except Exception:
             return False
     
@@ -246,66 +384,30 @@ class AssetValidator:
     def _get_criteria_summary(self) -> Dict[str, Any]:
         """Get summary of validation criteria used."""
         return {
+            'strict': self.strict,
             'min_volume_24h_usdt': float(self.criteria.MIN_VOLUME_24H_USDT),
             'max_spread_percent': float(self.criteria.MAX_SPREAD_PERCENT),
             'min_price_usdt': float(self.criteria.MIN_PRICE_USDT),
             'max_price_usdt': float(self.criteria.MAX_PRICE_USDT),
             'min_trades_24h': self.criteria.MIN_TRADES_24H,
+            'min_orderbook_depth_usdt': float(self.criteria.MIN_ORDERBOOK_DEPTH_USDT),
             'priority_symbols': self.criteria.PRIORITY_SYMBOLS,
             'blacklisted_symbols': self.criteria.BLACKLISTED_SYMBOLS,
         }
     
     async def validate_multiple_assets(self, symbols: List[str], 
                                      max_concurrent: int = 10) -> Dict[str, Dict[str, Any]]:
-        """Validate multiple assets concurrently."""
-        import asyncio
-        
+        """Validate multiple assets through the funnel (max_concurrent bounds the deep checks)."""
         # Sort symbols to prioritize important ones
         priority_symbols = [s for s in symbols if s in self.criteria.PRIORITY_SYMBOLS]
         other_symbols = [s for s in symbols if s not in self.criteria.PRIORITY_SYMBOLS]
-        sorted_symbols = priority_symbols + other_symbols
+        sorted_symbols = list(dict.fromkeys(priority_symbols + other_symbols))
         
         logger.info(f"Starting validation of {len(sorted_symbols)} assets ({len(priority_symbols)} priority)")
         
-        # Process in batches to avoid overwhelming the API
-        results = {}
-        
-        for i in range(0, len(sorted_symbols), max_concurrent):
-            batch = sorted_symbols[i:i + max_concurrent]
-            
-            try:
-                # Create tasks for concurrent validation
-                tasks = [self.validate_asset(symbol) for symbol in batch]
-                batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                # Process results
-                for j, result in enumerate(batch_results):
-                    symbol = batch[j]
-                    if isinstance(result, Exception):
-                        logger.error(f"Error validating {symbol}: {result}")
-                        results[symbol] = self._create_validation_result(
-                            symbol, False, f"Validation exception: {str(result)}", 
-                            {}, datetime.utcnow()
-                        )
-                    else:
-                        results[symbol] = result
-                
-                logger.info(f"Completed batch {i//max_concurrent + 1}: {len(batch)} assets")
-                
-                # Small delay between batches to be respectful to API
-                if i + max_concurrent < len(sorted_symbols):
-                    await asyncio.sleep(1)
-                    
-            except Exception as e:
-                logger.error(f"Error processing batch starting at index {i}: {e}")
-                
-                # Create error results for failed batch
-                for symbol in batch:
-                    if symbol not in results:
-                        results[symbol] = self._create_validation_result(
-                            symbol, False, f"Batch processing error: {str(e)}", 
-                            {}, datetime.utcnow()
-                        )
+        requests_before = sum(stage.requests for stage in self.stage_stats.values())
+        results = await self._run_funnel(sorted_symbols, max_concurrent)
+        requests_used = sum(stage.requests for stage in self.stage_stats.values()) - requests_before
         
         # Summary statistics
         total_assets = len(results)
@@ -313,10 +415,17 @@ class AssetValidator:
         priority_valid = len([r for r in results.values() if r['is_valid'] and r['priority']])
         
         logger.info(f"Validation complete: {valid_assets}/{total_assets} valid "
-                   f"({priority_valid} priority assets valid)")
+                   f"({priority_valid} priority assets valid, {requests_used} exchange requests)")
         
         return results
     
+    def get_funnel_stats(self) -> Dict[str, Any]:
+        """Per-stage counters and timing since the validator was created."""
+        return {
+            'stages': {name: asdict(stage) for name, stage in self.stage_stats.items()},
+            'requests': sum(stage.requests for stage in self.stage_stats.values()),
+        }
+    
     def get_validation_summary(self, validation_results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         """Generate summary statistics from validation results."""
         if not validation_results:
@@ -353,6 +462,7 @@ class AssetValidator:
             'common_failure_reasons': common_failures,
             'validation_coverage': 100.0,  # Assuming all requested assets were processed
             'criteria_summary': self._get_criteria_summary(),
+            'funnel': self.get_funnel_stats(),
         }
 
 
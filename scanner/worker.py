@@ -19,6 +19,7 @@ from analysis.indicators import IndicatorCalculator
 from database.connection import init_database, get_session
 from database.repository import AssetRepository, IndicatorRepository, SignalRepository
 from api.client import get_client, initialize_client
+from api.market_data_hub import get_market_data_hub
 from config.trading_config import TradingConfig
 from utils.logger import get_logger
 from utils.rate_limiter import get_rate_limiter
@@ -40,6 +41,7 @@ class ScannerWorker:
         self.signal_repo = SignalRepository()
         self.rate_limiter = get_rate_limiter()
         self.cache = get_smart_cache()
+        self.market_data = get_market_data_hub()
         self.coordinator = get_coordinator()
         self.worker_id = f"scanner_worker_{id(self)}"
         
@@ -174,16 +176,12 @@ class ScannerWorker:
             return None
     
     async def _fetch_ticker_with_rate_limit(self, client, symbol):
-        """Fetch ticker with rate limiting and coordination."""
-        await self.coordinator.request_api_permission(self.worker_id, 'market_data')
-        await self.rate_limiter.acquire('market_data')
-        return await client.fetch_ticker(symbol)
+        """Fetch ticker through the shared market data hub (rate limited per actual fetch)."""
+        return await self.market_data.get_ticker(symbol)
     
     async def _fetch_ohlcv_with_rate_limit(self, client, symbol, timeframe, limit):
-        """Fetch OHLCV data with rate limiting and coordination."""
-        await self.coordinator.request_api_permission(self.worker_id, 'market_data')
-        await self.rate_limiter.acquire('market_data')
-        return await client.fetch_ohlcv(symbol, timeframe, limit)
+        """Fetch OHLCV data through the shared market data hub (rate limited per actual fetch)."""
+        return await self.market_data.get_candles(symbol, timeframe, limit)
     
     async def _store_indicators(self, session, asset, indicators, timeframe):
         """Store calculated indicators in database."""
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Test script for the vectorized backtester.
+"""
+
+import random
+import sys
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from analysis.indicators import TechnicalIndicators
+from analysis.resampling import resample_candles
+from analysis.signals import SignalGenerator
+from analysis.volume import get_volume_analyzer
+from backtesting import BacktestParams, CandleMatrix, compute_signals, run_backtest, simulate_trade
+from backtesting.data import matrix_from_rows
+from backtesting.engine import EXIT_REASONS, simulate_entries
+from backtesting.vectorized import ema, rsi
+from benchmarks.fixtures import _random_walk, load_candles
+from database.models import Asset, Base, MarketData
+from database.repository import MarketDataRepository
+
+NO_FEES = BacktestParams(fee_rate=0.0)
+
+
+def _fixture_matrices():
+    candles_2h = load_candles('2h')
+    candles_4h = resample_candles(candles_2h, '2h', '4h', include_partial=False)
+    return (candles_2h, candles_4h,
+            CandleMatrix.from_candles('2h', {'BENCH/USDT': candles_2h}),
+            CandleMatrix.from_candles('4h', {'BENCH/USDT': candles_4h}))
+
+
+def _path(bars):
+    """1-D open/high/low/close arrays from (open, high, low, close) tuples."""
+    return tuple(np.array(column, dtype=float) for column in zip(*bars))
+
+
+def _reference_trade(open_, high, low, close, entry, side, params):
+    """Bar-by-bar reference for one position (stop checked before take-profits)."""
+    entry_price = open_[entry]
+    locked = -params.initial_stop_loss
+    best = -np.inf
+    remaining, gross = 1.0, 0.0
+    filled = [False] * len(params.take_profit_levels)
+
+    for k in range(entry, len(close)):
+        fav = side * ((high if side > 0 else low)[k] / entry_price - 1)
+        adv = side * ((low if side > 0 else high)[k] / entry_price - 1)
+        if adv <= locked:
+            exit_return = min(side * (open_[k] / entry_price - 1), locked)
+            return k, gross + remaining * exit_return, 'STOP_LOSS' if locked < 0 else 'TRAILING_STOP'
+        best = max(best, fav)
+        for i, (target, share) in enumerate(params.take_profit_levels):
+            if not filled[i] and best >= target:
+                filled[i] = True
+                gross += share * target
+                remaining -= share
+        if remaining <= 1e-9:
+            return k, gross, 'TAKE_PROFIT'
+        stops = [stop for trigger, stop in params.trailing_levels if trigger <= best]
+        locked = max([locked] + stops)
+
+    last = len(close) - 1
+    return last, gross + remaining * side * (close[last] / entry_price - 1), 'END_OF_DATA'
+
+
+def test_vectorized_indicators_match_technical_indicators():
+    """Array EMA/RSI equal the pandas implementations used live."""
+    candles_2h, _, matrix_2h, _ = _fixture_matrices()
+    indicators = TechnicalIndicators()
+    closes = pd.Series([float(c['close']) for c in candles_2h])
+
+    assert np.allclose(ema(matrix_2h.close, 9)[0], indicators.calculate_ema(closes, 9).values)
+    assert np.allclose(ema(matrix_2h.close, 21)[0], indicators.calculate_ema(closes, 21).values)
+    assert np.allclose(rsi(matrix_2h.close, 14)[0], indicators.calculate_rsi(closes, 14).values)
+
+
+def test_rule_signals_match_signal_generator():
+    """At every 4h close, the vectorized signal equals SignalGenerator.generate_trading_signal."""
+    candles_2h, candles_4h, matrix_2h, matrix_4h = _fixture_matrices()
+    signals = compute_signals(matrix_2h, matrix_4h, BacktestParams())
+    generator = SignalGenerator()
+    # The backtest evaluates rule 3, which the live generator only runs once it has an analyzer
+    generator.volume_analyzer = get_volume_analyzer()
+    directions = {'BUY': 1, 'STRONG_BUY': 1, 'SELL': -1, 'STRONG_SELL': -1, 'NEUTRAL': 0}
+
+    compared = triggered = 0
+    for t in range(30, len(candles_2h)):
+        close_time = candles_2h[t]['timestamp'] + 7_200_000
+        if close_time % 14_400_000:
+            continue  # 4h candle still forming; the backtest only uses closed candles
+        history_2h = candles_2h[:t + 1]
+        history_4h = [c for c in candles_4h if c['timestamp'] + 14_400_000 <= close_time]
+        # Rule 3 is evaluated on 2h volume in the backtest
+        live = generator.generate_trading_signal('BENCH/USDT', history_2h, history_2h, history_4h)
+
+        assert directions[live['signal_type']] == signals.direction[0, t], t
+        assert abs(live['confidence'] - signals.confidence[0, t]) < 1e-3, t
+        compared += 1
+        triggered += signals.direction[0, t] != 0
+
+    assert compared > 100
+    assert triggered > 20
+
+
+def test_initial_stop_loss():
+    """A long exits at the initial stop; a gap through the stop fills at the open."""
+    open_, high, low, close = _path([(100, 101, 99.5, 100.5), (100.5, 100.8, 97, 97.5)])
+    assert simulate_trade(open_, high, low, close, 0, 1, NO_FEES) == (1, -0.02, -0.02, 'STOP_LOSS')
+
+    open_, high, low, close = _path([(100, 101, 99.5, 100.5), (96, 96.5, 95, 95.5)])
+    exit_index, gross, _, reason = simulate_trade(open_, high, low, close, 0, 1, NO_FEES)
+    assert (exit_index, reason) == (1, 'STOP_LOSS')
+    assert abs(gross - (-0.04)) < 1e-12
+
+
+def test_trailing_stop_and_partial_take_profit():
+    """Reaching +3.5% takes the first 25% at +3% and locks +1.5% on the rest."""
+    open_, high, low, close = _path([
+        (100, 103.5, 99.9, 103),
+        (103, 103.2, 101, 101.2),
+    ])
+    exit_index, gross, _, reason = simulate_trade(open_, high, low, close, 0, 1, NO_FEES)
+    assert (exit_index, reason) == (1, 'TRAILING_STOP')
+    assert abs(gross - (0.25 * 0.03 + 0.75 * 0.015)) < 1e-12
+
+
+def test_short_positions_mirror_longs():
+    """Shorts use highs for stops and lows for profit."""
+    open_, high, low, close = _path([(100, 100.5, 99, 99.5), (99.5, 102.5, 99, 102)])
+    assert simulate_trade(open_, high, low, close, 0, -1, NO_FEES)[1:] == (-0.02, -0.02, 'STOP_LOSS')
+
+    open_, high, low, close = _path([(100, 100.2, 87, 88)])
+    exit_index, gross, _, reason = simulate_trade(open_, high, low, close, 0, -1, NO_FEES)
+    assert reason == 'TAKE_PROFIT'
+    assert abs(gross - 0.25 * (0.03 + 0.05 + 0.08 + 0.12)) < 1e-12
+
+
+def test_fees_are_charged_on_both_sides():
+    """Net return subtracts fees on entry and exit notional."""
+    open_, high, low, close = _path([(100, 101, 99.5, 100.5), (100.5, 100.8, 97, 97.5)])
+    params = BacktestParams(fee_rate=0.001)
+    _, gross, net, _ = simulate_trade(open_, high, low, close, 0, 1, params)
+    assert abs(net - (gross - 0.001 * (1 + 0.98))) < 1e-12
+
+
+def test_batch_simulation_matches_reference():
+    """Batched exits equal a bar-by-bar simulation for every entry and side."""
+    _, _, matrix_2h, _ = _fixture_matrices()
+    open_, high, low, close = (getattr(matrix_2h, f)[0] for f in ('open', 'high', 'low', 'close'))
+    entries = np.repeat(np.arange(0, len(close)), 2)
+    sides = np.tile([1, -1], len(close))
+
+    exit_index, gross, _, reason = simulate_entries(
+        matrix_2h.open, matrix_2h.high, matrix_2h.low, matrix_2h.close,
+        np.zeros(len(entries), dtype=int), entries, sides, NO_FEES,
+    )
+    for i, (entry, side) in enumerate(zip(entries, sides)):
+        expected = _reference_trade(open_, high, low, close, entry, side, NO_FEES)
+        assert (exit_index[i], EXIT_REASONS[reason[i]]) == (expected[0], expected[2]), (entry, side)
+        assert abs(gross[i] - expected[1]) < 1e-12, (entry, side)
+
+
+def _synthetic_matrices(symbol_count):
+    rng = random.Random(7)
+    candles_2h = {}
+    for i in range(symbol_count):
+        rows = _random_walk(rng, 600, 7_200_000, 100.0 + i)
+        candles_2h[f"S{i}/USDT"] = [dict(zip(('timestamp', 'open', 'high', 'low', 'close', 'volume'), row))
+                                    for row in rows]
+    candles_4h = {symbol: resample_candles(candles, '2h', '4h', include_partial=False)
+                  for symbol, candles in candles_2h.items()}
+    return CandleMatrix.from_candles('2h', candles_2h), CandleMatrix.from_candles('4h', candles_4h)
+
+
+def test_run_backtest_one_position_per_symbol():
+    """Trades of a symbol never overlap and each enters after its signal bar."""
+    matrix_2h, matrix_4h = _synthetic_matrices(6)
+    result = run_backtest(matrix_2h, matrix_4h, workers=1)
+    stats = result.get_stats()
+
+    assert stats['total_trades'] == len(result.trades) > 0
+    assert stats['symbols'] == 6
+    assert sum(stats['exit_reasons'].values()) == stats['total_trades']
+    assert 0 <= stats['max_drawdown'] < 1
+
+    last_exit = {}
+    for trade in result.trades:
+        assert trade.entry_time >= last_exit.get(trade.symbol, 0)
+        assert trade.exit_time >= trade.entry_time
+        assert trade.rules
+        last_exit[trade.symbol] = trade.exit_time
+
+
+def test_process_pool_matches_in_process():
+    """Splitting symbols across worker processes gives the same trades."""
+    matrix_2h, matrix_4h = _synthetic_matrices(4)
+    serial = run_backtest(matrix_2h, matrix_4h, workers=1)
+    parallel = run_backtest(matrix_2h, matrix_4h, workers=2)
+
+    key = lambda t: (t.symbol, t.entry_time)
+    assert sorted(serial.trades, key=key) == sorted(parallel.trades, key=key)
+
+
+def test_candle_matrix_from_market_data_rows_and_cache(tmp_path):
+    """Stored candles become a NaN-padded matrix that round-trips through the NPZ cache."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp() * 1000
+    for symbol, first_bar in (('AAA/USDT', 0), ('BBB/USDT', 2)):
+        asset = Asset(symbol=symbol, base_currency=symbol[:3], quote_currency='USDT')
+        session.add(asset)
+        session.flush()
+        for bar in range(first_bar, 5):
+            price = Decimal(100 + bar)
+            session.add(MarketData(
+                asset_id=asset.id, timeframe='2h',
+                timestamp=datetime.fromtimestamp((start + bar * 7_200_000) / 1000, tz=timezone.utc),
+                open=price, high=price + 1, low=price - 1, close=price, volume=Decimal('10'),
+            ))
+    session.commit()
+
+    rows = MarketDataRepository().get_ohlcv_rows(session, '2h')
+    matrix = matrix_from_rows('2h', rows)
+    assert matrix.symbols == ['AAA/USDT', 'BBB/USDT']
+    assert matrix.shape == (2, 5)
+    assert np.isnan(matrix.close[1, :2]).all() and matrix.close[1, 2] == 102
+
+    path = tmp_path / 'matrix.npz'
+    matrix.save(path)
+    loaded = CandleMatrix.load(path)
+    assert loaded.symbols == matrix.symbols and loaded.timeframe == '2h'
+    assert np.array_equal(loaded.close, matrix.close, equal_nan=True)
+
+    selected = loaded.select(['BBB/USDT', 'CCC/USDT'])
+    assert selected.symbols == ['BBB/USDT', 'CCC/USDT']
+    assert np.isnan(selected.close[1]).all()
+
+
+def main():
+    """Main test function."""
+    import tempfile
+
+    print("🤖 BingX Trading Bot - Backtester Test")
+    print("=" * 50)
+
+    tests = [
+        test_vectorized_indicators_match_technical_indicators,
+        test_rule_signals_match_signal_generator,
+        test_initial_stop_loss,
+        test_trailing_stop_and_partial_take_profit,
+        test_short_positions_mirror_longs,
+        test_fees_are_charged_on_both_sides,
+        test_batch_simulation_matches_reference,
+        test_run_backtest_one_position_per_symbol,
+        test_process_pool_matches_in_process,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            test_candle_matrix_from_market_data_rows_and_cache(Path(tmp))
+            print("✅ test_candle_matrix_from_market_data_rows_and_cache")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ test_candle_matrix_from_market_data_rows_and_cache: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
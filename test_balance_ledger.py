@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test script for the optimistic local balance ledger.
+"""
+
+import asyncio
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from trading.balance_ledger import BalanceLedger, get_balance_ledger
+from trading.engine import TradingEngine
+from trading.order_manager import OrderManager, OrderType, OrderStatus
+
+
+class FakeClient:
+    """fetch_balance double that counts calls and can be slowed down."""
+
+    def __init__(self, free='1000', delay=0.01):
+        self.free = Decimal(free)
+        self.delay = delay
+        self.calls = 0
+
+    async def fetch_balance(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {'USDT': {'free': self.free, 'used': Decimal('0'), 'total': self.free}}
+
+
+class FakeOrderRepo:
+    async def update_order(self, order_id, data):
+        return None
+
+
+def test_concurrent_sizing_shares_one_fetch_and_never_over_commits():
+    """A burst of signals is sized against one fetch_balance and successive reservations."""
+    client = FakeClient()
+    engine = TradingEngine(client, None, None)
+    engine._max_position_size_percent = Decimal('40')
+
+    async def main():
+        symbols = ['AAA/USDT', 'BBB/USDT', 'CCC/USDT', 'DDD/USDT']
+        return await asyncio.gather(*(engine._calculate_position_size(s, Decimal('1')) for s in symbols))
+
+    sizings = asyncio.run(main())
+    assert client.calls == 1
+    quantities = [quantity for quantity, _ in sizings]
+    assert quantities == [Decimal('400'), Decimal('240'), Decimal('144'), Decimal('86.4')]
+    assert sum(quantities) <= client.free
+    assert engine.ledger.reserved == sum(quantities)
+
+    # A filled order becomes a debit at its actual cost; a failed one gives its reservation back
+    engine.ledger.commit(sizings[0][1], Decimal('401'))
+    engine.ledger.release(sizings[1][1])
+    assert engine.ledger.free == Decimal('599')
+    assert engine.ledger.available() == Decimal('599') - Decimal('144') - Decimal('86.4')
+
+
+def test_reservation_rejected_when_balance_is_taken():
+    """Reserving more than is available fails instead of over-committing."""
+    ledger = BalanceLedger(FakeClient('100'))
+    asyncio.run(ledger.sync())
+    assert ledger.reserve(Decimal('80'), 'AAA/USDT') is not None
+    assert ledger.reserve(Decimal('30'), 'BBB/USDT') is None
+    assert ledger.get_stats()['rejected'] == 1
+
+    ledger.reservation_ttl = -1  # Everything outstanding has expired
+    assert ledger.available() == Decimal('100') and ledger.get_stats()['expired'] == 1
+
+
+def test_reconcile_keeps_reservations_and_in_flight_debits():
+    """fetch_balance replaces the free balance; reservations and debits made during the request survive."""
+    client = FakeClient('1000', delay=0.05)
+    ledger = BalanceLedger(client, reconcile_interval=60)
+
+    async def main():
+        await ledger.sync()
+        reservation = ledger.reserve(Decimal('100'), 'AAA/USDT')
+        client.free = Decimal('900')  # Exchange-side change, e.g. funding
+
+        sync = asyncio.create_task(ledger.sync())
+        await asyncio.sleep(0.01)
+        ledger.record_fill(Decimal('50'))  # Filled while fetch_balance is in flight
+        await sync
+        return reservation
+
+    reservation = asyncio.run(main())
+    assert ledger.free == Decimal('850') and ledger.available() == Decimal('750')
+    assert reservation.id in ledger._reservations and client.calls == 2
+
+
+def test_stale_ledger_reconciles_in_background():
+    """Reads on a stale ledger return the local value at once and refresh behind it."""
+    client = FakeClient('1000')
+    ledger = BalanceLedger(client, reconcile_interval=60)
+
+    async def main():
+        await ledger.sync()
+        client.free = Decimal('1200')
+        ledger.request_reconcile()
+        assert await ledger.get_available() == Decimal('1000')
+        await asyncio.sleep(0.05)
+        assert await ledger.get_available() == Decimal('1200')
+
+    asyncio.run(main())
+    assert client.calls == 2
+
+
+def test_order_manager_fills_update_shared_ledger():
+    """Entry fills debit the ledger the engine sizes against; exits debit fees and force a reconcile."""
+    client = FakeClient('1000')
+    manager = OrderManager(client, FakeOrderRepo(), None)
+    engine = TradingEngine(client, None, None)
+    assert manager.ledger is engine.ledger is get_balance_ledger(client)
+
+    async def main():
+        await manager.ledger.sync()
+        manager._active_orders['1'] = {'id': '1', 'type': OrderType.LIMIT.value, 'quantity': Decimal('2'),
+                                       'status': OrderStatus.SUBMITTED.value}
+        await manager._process_order_update('1', {'status': 'open', 'filled': 1, 'average': 100})
+        assert manager.ledger.free == Decimal('900')
+        await manager._process_order_update('1', {'status': 'closed', 'filled': 2, 'average': 100})
+        assert manager.ledger.free == Decimal('800') and not manager.ledger.is_stale()
+
+        manager._active_orders['2'] = {'id': '2', 'type': OrderType.STOP_LOSS.value, 'quantity': Decimal('2'),
+                                       'status': OrderStatus.SUBMITTED.value}
+        await manager._process_order_update('2', {'status': 'closed', 'filled': 2, 'average': 90})
+        assert manager.ledger.free == Decimal('800') and manager.ledger.is_stale()
+
+    asyncio.run(main())
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Balance Ledger Test")
+    print("=" * 50)
+
+    tests = [
+        test_concurrent_sizing_shares_one_fetch_and_never_over_commits,
+        test_reservation_rejected_when_balance_is_taken,
+        test_reconcile_keeps_reservations_and_in_flight_debits,
+        test_stale_ledger_reconciles_in_background,
+        test_order_manager_fills_update_shared_ledger,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script for the benchmark harness.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.core import BenchmarkCase, compare_results, run_benchmark
+from benchmarks.fixtures import load_candles
+
+
+def test_fixture_candles_match_client_format():
+    """Recorded fixtures load in BingXClient.fetch_ohlcv format."""
+    candles = load_candles('2h', limit=50)
+    assert len(candles) == 50
+    assert set(candles[0]) == {'timestamp', 'open', 'high', 'low', 'close', 'volume'}
+    assert candles[0]['timestamp'] < candles[-1]['timestamp']
+
+
+def test_run_benchmark_sync_and_async():
+    """Sync and async benchmarks produce per-call timing statistics."""
+    async def async_noop(state):
+        state.append(1)
+
+    sync_result = run_benchmark(BenchmarkCase('sync', 'test', lambda: sum(range(100)), rounds=3))
+    async_result = run_benchmark(BenchmarkCase('async', 'test', async_noop, setup=list, rounds=3, iterations=5))
+
+    assert sync_result.rounds == 3 and sync_result.min <= sync_result.median <= sync_result.p95
+    assert async_result.iterations == 5 and async_result.median > 0
+
+
+def test_compare_results_flags_regressions():
+    """Median slowdowns beyond the threshold are flagged."""
+    baseline = {'a': {'median': 1.0}, 'b': {'median': 1.0}, 'gone': {'median': 1.0}}
+    current = {'a': {'median': 1.1}, 'b': {'median': 1.5}, 'new': {'median': 1.0}}
+
+    comparisons = {c['name']: c for c in compare_results(current, baseline, threshold=0.25)}
+    assert set(comparisons) == {'a', 'b'}
+    assert not comparisons['a']['regression']
+    assert comparisons['b']['regression']
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Benchmark Harness Test")
+    print("=" * 50)
+
+    tests = [
+        test_fixture_candles_match_client_format,
+        test_run_benchmark_sync_and_async,
+        test_compare_results_flags_regressions,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for higher-timeframe candle resampling.
+"""
+
+import asyncio
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from analysis.resampling import resample_candles, verify_resampled_candles
+from api.market_data_hub import MarketDataHub
+
+HOUR_MS = 3_600_000
+DAY_START_MS = 1_704_067_200_000  # 2024-01-01T00:00:00Z
+
+
+def _hourly(start_ms, count):
+    """Hourly candles whose close is the hour index, so buckets are easy to check."""
+    return [
+        {
+            'timestamp': start_ms + i * HOUR_MS,
+            'open': Decimal(i), 'high': Decimal(i) + Decimal('0.5'),
+            'low': Decimal(i) - Decimal('0.5'), 'close': Decimal(i) + Decimal('0.25'),
+            'volume': Decimal(10),
+        }
+        for i in range(count)
+    ]
+
+
+def test_buckets_align_to_utc_and_aggregate():
+    """4h candles open at 00:00/04:00 UTC with correct OHLCV."""
+    candles = resample_candles(_hourly(DAY_START_MS, 8), '1h', '4h')
+
+    assert [c['timestamp'] for c in candles] == [DAY_START_MS, DAY_START_MS + 4 * HOUR_MS]
+    first = candles[0]
+    assert (first['open'], first['high'], first['low'], first['close']) == (
+        Decimal(0), Decimal('3.5'), Decimal('-0.5'), Decimal('3.25'))
+    assert first['volume'] == Decimal(40)
+    assert not any(c['is_partial'] for c in candles)
+
+
+def test_leading_fragment_dropped_and_trailing_bucket_partial():
+    """A series starting mid-bucket drops that bucket; the forming bucket is flagged."""
+    candles = resample_candles(_hourly(DAY_START_MS + HOUR_MS, 9), '1h', '4h')
+
+    assert candles[0]['timestamp'] == DAY_START_MS + 4 * HOUR_MS
+    assert candles[-1]['is_partial'] is True
+    assert candles[-1]['volume'] == Decimal(20)
+    assert resample_candles(_hourly(DAY_START_MS + HOUR_MS, 9), '1h', '4h', include_partial=False)[-1]['is_partial'] is False
+
+
+def test_verify_against_exchange_candles():
+    """Verification reports matching and mismatching exchange candles."""
+    resampled = resample_candles(_hourly(DAY_START_MS, 8), '1h', '2h')
+    exchange = [dict(c) for c in resampled]
+    assert verify_resampled_candles(resampled, exchange)['matches'] is True
+
+    exchange[1]['high'] = exchange[1]['high'] * 2
+    result = verify_resampled_candles(resampled, exchange)
+    assert result['matches'] is False
+    assert result['mismatches'][0]['field'] == 'high'
+
+
+class HourlyHub(MarketDataHub):
+    """Hub serving generated hourly candles and counting exchange fetches."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.fetch_calls = []
+
+    async def _fetch(self, key, history):
+        self.fetch_calls.append((key[1], history))
+        return _hourly(DAY_START_MS, history)
+
+
+def test_hub_builds_2h_and_4h_from_one_source_fetch():
+    """2h and 4h requests are served from a single 1h series."""
+    hub = HourlyHub(resample_source='1h')
+
+    async def run():
+        candles_4h = await hub.get_candles('BTC/USDT', '4h', 100)
+        candles_2h = await hub.get_candles('BTC/USDT', '2h', 100)
+        return candles_2h, candles_4h
+
+    candles_2h, candles_4h = asyncio.run(run())
+    assert [timeframe for timeframe, _ in hub.fetch_calls] == ['1h']
+    assert len(candles_4h) == 100 and len(candles_2h) == 100
+    assert candles_4h[-1]['timestamp'] % (4 * HOUR_MS) == 0
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Candle Resampling Test")
+    print("=" * 50)
+
+    tests = [
+        test_buckets_align_to_utc_and_aggregate,
+        test_leading_fragment_dropped_and_trailing_bucket_partial,
+        test_verify_against_exchange_candles,
+        test_hub_builds_2h_and_4h_from_one_source_fetch,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-endpoint-class circuit breakers.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import ccxt
+import pytest
+
+from api.client import BingXClient, RateLimitError, endpoint_class
+from utils.circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitOpenError, parse_retry_after
+
+
+class Clock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _breaker(clock, **overrides):
+    config = CircuitBreakerConfig(window_seconds=30, min_requests=4, failure_rate=0.5,
+                                  base_recovery=2, max_recovery=16, **overrides)
+    return CircuitBreaker('test', config, clock=clock)
+
+
+def test_opens_on_error_rate_not_on_isolated_failures():
+    """A few failures among successes keep the breaker closed; a high error rate opens it."""
+    clock = Clock()
+    breaker = _breaker(clock)
+    for _ in range(3):
+        breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED  # 2 of 5 failed
+
+    # Old successes leave the window; the remaining failures dominate
+    clock.now += 31
+    for _ in range(4):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and breaker.retry_in() == 2
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_half_open_probe_and_exponential_recovery():
+    """One probe goes through after the pause; failed probes double the pause up to the cap."""
+    clock = Clock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+
+    pauses = []
+    for _ in range(5):
+        pauses.append(breaker.retry_in())
+        clock.now += breaker.retry_in()
+        breaker.before_request()  # The probe
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()  # Only one probe at a time
+        breaker.record_failure()
+    assert pauses == [2, 4, 8, 16, 16]
+
+    clock.now += breaker.retry_in()
+    breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.get_stats()['consecutive_opens'] == 0
+
+    # Recovery starts from the base period again
+    for _ in range(4):
+        breaker.record_failure()
+    assert breaker.retry_in() == 2
+
+
+def test_abandoned_probe_does_not_block_forever():
+    """A probe that never reports back frees its slot, on release or after one recovery period."""
+    clock = Clock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now += breaker.retry_in()
+
+    assert breaker.before_request() is True
+    breaker.release_probe()
+    assert breaker.before_request() is True  # Slot given back
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    clock.now += 2  # One recovery period without an outcome
+    assert breaker.before_request() is True
+
+
+def test_cancelled_probe_releases_its_slot():
+    """Cancelling a request admitted as the half-open probe lets the next request probe."""
+    client = BingXClient()
+    breaker = client._breakers['market']
+    breaker.record_failure(retry_after=0.01)
+
+    async def hang(symbol):
+        await asyncio.sleep(10)
+
+    async def fetch_ticker(symbol):
+        return {'symbol': symbol}
+
+    async def main():
+        await asyncio.sleep(0.02)
+        probe = asyncio.create_task(client._execute_with_retry(hang, 'BTC/USDT'))
+        await asyncio.sleep(0.01)
+        assert breaker.state == CircuitBreaker.HALF_OPEN and breaker._probes_in_flight == 1
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        return await client._execute_with_retry(fetch_ticker, 'BTC/USDT')
+
+    assert asyncio.run(main()) == {'symbol': 'BTC/USDT'}
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_retry_after_headers():
+    """Retry-After and X-RateLimit-Reset headers become a pause in seconds."""
+    assert parse_retry_after({'Retry-After': '7'}) == 7
+    assert parse_retry_after({'retry-after': 'Wed, 21 Oct 2015 07:28:10 GMT'}, now=1445412480) == 10
+    assert parse_retry_after({'X-RateLimit-Reset': '3'}) == 3
+    assert parse_retry_after({'X-RateLimit-Reset': '1445412490000'}, now=1445412480) == 10
+    assert parse_retry_after({'Content-Type': 'application/json'}) is None
+    assert parse_retry_after(None) is None
+
+    clock = Clock()
+    breaker = _breaker(clock)
+    breaker.record_failure(retry_after=5)
+    assert breaker.state == CircuitBreaker.OPEN and breaker.retry_in() == 5
+    breaker.record_failure(retry_after=600)
+    assert breaker.retry_in() == 16  # Capped at max_recovery
+
+
+def test_endpoint_classes():
+    """ccxt method names map onto the market, account and order breakers."""
+    assert endpoint_class('fetch_order_book') == 'market'
+    assert endpoint_class('fetch_tickers') == 'market'
+    assert endpoint_class('fetch_balance') == 'account'
+    assert endpoint_class('fetch_open_orders') == 'account'
+    assert endpoint_class('create_market_order') == 'order'
+    assert endpoint_class('cancel_order') == 'order'
+
+
+def test_failing_market_endpoint_does_not_block_orders():
+    """Order book failures open the market breaker only; orders still go through."""
+    client = BingXClient()
+    failures = []
+
+    def fetch_order_book(symbol):
+        failures.append(symbol)
+        raise ccxt.NetworkError("timeout")
+
+    def create_order(symbol):
+        return {'id': '1', 'symbol': symbol}
+
+    async def main():
+        with pytest.raises(RateLimitError):
+            await client._execute_with_retry(fetch_order_book, 'BTC/USDT', max_retries=10, delay_factor=0.001)
+        assert client._breakers['market'].is_open
+        assert len(failures) == CircuitBreakerConfig().min_requests
+
+        assert await client._execute_with_retry(create_order, 'BTC/USDT') == {'id': '1', 'symbol': 'BTC/USDT'}
+        assert client._breakers['order'].state == CircuitBreaker.CLOSED
+
+    asyncio.run(main())
+
+
+def test_retry_waits_for_retry_after():
+    """A 429 with Retry-After is retried after the requested pause, as the half-open probe."""
+    client = BingXClient()
+    client._breakers['market'].config.base_recovery = 0.01
+    calls = []
+
+    class FakeExchange:
+        last_response_headers = {}
+
+        def fetch_ticker(self, symbol):
+            calls.append(symbol)
+            if len(calls) == 1:
+                self.last_response_headers = {'Retry-After': '0.05'}
+                raise ccxt.RateLimitExceeded("429 Too Many Requests")
+            return {'symbol': symbol}
+
+    client.exchange = FakeExchange()
+    result = asyncio.run(client._execute_with_retry(client.exchange.fetch_ticker, 'ETH/USDT', delay_factor=10))
+
+    assert result == {'symbol': 'ETH/USDT'} and len(calls) == 2
+    stats = client._breakers['market'].get_stats()
+    assert stats['retry_after_honoured'] == 1 and stats['probes'] == 1 and stats['state'] == CircuitBreaker.CLOSED
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Circuit Breaker Test")
+    print("=" * 50)
+
+    tests = [
+        test_opens_on_error_rate_not_on_isolated_failures,
+        test_half_open_probe_and_exponential_recovery,
+        test_abandoned_probe_does_not_block_forever,
+        test_cancelled_probe_releases_its_slot,
+        test_retry_after_headers,
+        test_endpoint_classes,
+        test_failing_market_endpoint_does_not_block_orders,
+        test_retry_waits_for_retry_after,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
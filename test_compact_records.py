@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test script for the slot-based and array-backed in-memory records.
+"""
+
+import asyncio
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scanner.asset_table import AssetMetrics
+from scanner.symbol_cache import SymbolData
+from trading.position_tracker import PositionData, PriceHistory
+from trading.risk_manager import RiskManager, TrailingStopState
+from trading.trading_cache import TradingSymbolData
+
+
+def test_hot_records_have_no_instance_dict():
+    """Per-symbol and per-position records use __slots__ instead of a __dict__ each."""
+    now = datetime.now(timezone.utc)
+    records = [
+        AssetMetrics(symbol='BTC/USDT', base_currency='BTC', quote_currency='USDT'),
+        SymbolData(symbol='BTC/USDT'),
+        TradingSymbolData(symbol=None),
+        PositionData(trade_id='1', symbol='BTC/USDT', side='BUY', entry_price=Decimal('1'),
+                     current_price=Decimal('1'), quantity=Decimal('1'), unrealized_pnl=Decimal('0'),
+                     unrealized_pnl_percent=Decimal('0'), stop_loss=None, take_profit=None,
+                     entry_time=now, duration=now - now, last_update=now),
+    ]
+    for record in records:
+        assert not hasattr(record, '__dict__'), type(record).__name__
+
+    metrics = records[0]
+    assert metrics.validation_reasons == [] and metrics.rules_triggered == []
+    assert metrics.validation_reasons is not AssetMetrics('ETH/USDT', 'ETH', 'USDT').validation_reasons
+
+
+def test_price_history_trims_and_formats():
+    """Samples are kept column-wise, trimmed like the old list and returned in API format."""
+    history = PriceHistory()
+    for i in range(PriceHistory.MAX_POINTS + 1):
+        history.append(Decimal('100') + i, Decimal(i), Decimal('0.01'), timestamp=1_700_000_000 + i)
+    assert len(history) == PriceHistory.KEEP_POINTS
+
+    history.append(Decimal('50.5'), Decimal('-1.25'), Decimal('-0.02'), final=True, timestamp=1_700_000_000)
+    tail = history.tail(2)
+    assert tail[-1] == {'timestamp': '2023-11-14T22:13:20+00:00', 'price': 50.5, 'pnl': -1.25,
+                        'pnl_percent': -0.02, 'final': True}
+    assert tail[0]['price'] == 100.0 + PriceHistory.MAX_POINTS and tail[0]['final'] is False
+    assert len(history.tail(10_000)) == PriceHistory.KEEP_POINTS + 1
+
+
+def test_price_history_is_much_smaller_than_dict_samples():
+    """A thousand samples take a fraction of the memory of a list of Decimal dicts."""
+    def measure(build):
+        tracemalloc.start()
+        try:
+            kept = build()
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del kept
+        return size
+
+    def as_dicts():
+        return [{'timestamp': datetime.now(timezone.utc), 'price': Decimal('100.12') + i,
+                 'pnl': Decimal('1.5') * i, 'pnl_percent': Decimal('0.015')} for i in range(1000)]
+
+    def as_arrays():
+        history = PriceHistory()
+        for i in range(1000):
+            history.append(Decimal('100.12') + i, Decimal('1.5') * i, Decimal('0.015'))
+        return history
+
+    assert measure(as_arrays) * 10 < measure(as_dicts)
+
+
+def test_trailing_stop_state_updates():
+    """Trailing stops keep their Decimal stop prices in slotted state records."""
+    class OrderManager:
+        def __init__(self):
+            self.updates = []
+
+        async def update_stop_loss(self, trade_id, stop):
+            self.updates.append(stop)
+            return True
+
+    manager = RiskManager(None, None, OrderManager())
+    trade_id = uuid.uuid4()
+
+    async def main():
+        assert await manager.initialize_trailing_stop(trade_id, Decimal('100'), 'BUY')
+        state = manager._trailing_stops[str(trade_id)]
+        assert isinstance(state, TrailingStopState) and not hasattr(state, '__dict__')
+        assert state.current_stop_loss == Decimal('100') * (1 - manager.config.INITIAL_STOP_LOSS_PERCENT)
+
+        level = manager.config.TRAILING_STOP_LEVELS[1]
+        price = Decimal('100') * (1 + level.trigger) + 1
+        update = await manager.update_position_price(trade_id, price)
+        assert update['new_stop_loss'] == Decimal('100') * (1 + level.stop)
+        assert manager.order_manager.updates == [update['new_stop_loss']]
+        assert state.highest_price == price and state.trailing_level == 1
+
+        info = await manager.get_trailing_stop_info(trade_id)
+        assert info['current_price'] == float(price) and info['current_stop_loss'] == float(update['new_stop_loss'])
+
+    asyncio.run(main())
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Compact Records Test")
+    print("=" * 50)
+
+    tests = [
+        test_hot_records_have_no_instance_dict,
+        test_price_history_trims_and_formats,
+        test_price_history_is_much_smaller_than_dict_samples,
+        test_trailing_stop_state_updates,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
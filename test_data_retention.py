@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Test script for time-series partitions, retention and indicator rollups.
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.models import Asset, Base, Indicator, IndicatorRollup, MarketData, Signal
+from database.retention import (
+    RetentionManager, RetentionPolicy, partition_ddl, partition_start, planned_partitions,
+)
+
+NOW = datetime(2026, 10, 18, 15, 30, tzinfo=timezone.utc)
+POLICY = RetentionPolicy(market_data_days=30, indicator_days=5, indicator_rollup_days=20, signal_days=10)
+
+
+def _populate(days=40):
+    """Two assets with hourly candles, indicators and a daily signal for `days` days."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    for symbol in ('BTC/USDT', 'ETH/USDT'):
+        asset = Asset(symbol=symbol, base_currency=symbol[:3], quote_currency='USDT')
+        session.add(asset)
+        session.flush()
+        for hour in range(days * 24):
+            timestamp = NOW - timedelta(hours=hour)
+            price = Decimal(100 + hour % 24)
+            session.add(MarketData(asset_id=asset.id, timeframe='1h', timestamp=timestamp, open=price,
+                                   high=price, low=price, close=price, volume=Decimal('5')))
+            session.add(Indicator(asset_id=asset.id, timeframe='1h', timestamp=timestamp, mm1=price,
+                                  center=price, rsi=Decimal(20 + hour % 24), volume_sma=Decimal('5')))
+            if hour % 24 == 0:
+                session.add(Signal(asset_id=asset.id, timestamp=timestamp, signal_type='BUY',
+                                   strength=Decimal('60'), rules_triggered=['ma_crossover']))
+    session.commit()
+    return engine, session
+
+
+def test_partition_layout():
+    """Partitions are epoch-aligned and cover the retention window plus the next intervals."""
+    start = partition_start(NOW, 7)
+    assert start <= NOW < start + timedelta(days=7)
+    assert (start - datetime(1970, 1, 1, tzinfo=timezone.utc)).days % 7 == 0
+
+    partitions = planned_partitions('market_data', POLICY, NOW)
+    assert partitions[0][1] <= POLICY.cutoff('market_data', NOW) < partitions[0][2]
+    assert partitions[-1][1] == start + timedelta(days=7 * POLICY.partitions_ahead)
+    assert all(a[2] == b[1] for a, b in zip(partitions, partitions[1:]))
+
+    name, lower, upper = partitions[0]
+    assert name == f"market_data_p{lower:%Y%m%d}"
+    assert partition_ddl('market_data', name, lower, upper) == (
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF market_data "
+        f"FOR VALUES FROM ('{lower:%Y-%m-%d} 00:00:00+00') TO ('{upper:%Y-%m-%d} 00:00:00+00')"
+    )
+
+    forever = RetentionPolicy(0, 0, 0, 0)
+    assert forever.cutoff('signals', NOW) is None
+    assert planned_partitions('signals', forever, NOW)[0][1] == start
+
+
+def test_expired_rows_are_deleted_and_recent_rows_kept():
+    """Each table keeps exactly the rows inside its own retention window."""
+    engine, session = _populate()
+    manager = RetentionManager(engine, POLICY)
+    report = manager.run(NOW)
+
+    for model, table in ((MarketData, 'market_data'), (Indicator, 'indicators'), (Signal, 'signals')):
+        cutoff = POLICY.cutoff(table, NOW)
+        remaining = session.query(model).all()
+        assert remaining and all(row.timestamp.replace(tzinfo=timezone.utc) >= cutoff for row in remaining)
+        # Everything newer than the cutoff survived
+        expected = 2 * sum(1 for hour in range(40 * 24) if NOW - timedelta(hours=hour) >= cutoff
+                           and (model is not Signal or hour % 24 == 0))
+        assert len(remaining) == expected, table
+        assert report[table]['partitions_dropped'] == 0
+
+    assert manager.get_stats()['runs'] == 1
+    assert manager.get_stats()['rows_deleted'] == sum(
+        report[t]['rows_deleted'] for t in ('market_data', 'indicators', 'signals', 'indicator_rollups')
+    )
+
+
+def test_indicators_roll_up_to_daily_rows_before_expiry():
+    """Expired indicators become one row per asset, day and timeframe with averaged values."""
+    engine, session = _populate(days=12)
+    manager = RetentionManager(engine, POLICY)
+    report = manager.purge_table('indicators', NOW)
+
+    cutoff = POLICY.cutoff('indicators', NOW)
+    rollups = session.query(IndicatorRollup).all()
+    assert report['rollup_rows'] == len(rollups) > 0
+    assert all(r.bucket.replace(tzinfo=timezone.utc) < cutoff for r in rollups)
+
+    full_days = [r for r in rollups if r.samples == 24]
+    assert full_days, "expected complete days among the rollups"
+    for rollup in full_days:
+        assert float(rollup.rsi) == sum(20 + h for h in range(24)) / 24
+        assert (float(rollup.rsi_min), float(rollup.rsi_max)) == (20, 43)
+        assert rollup.bucket.hour == 0
+
+    # Hours rolled up match the hours deleted
+    assert sum(r.samples for r in rollups) == report['rows_deleted']
+
+    # A second pass has nothing left to roll up or delete
+    again = manager.purge_table('indicators', NOW)
+    assert (again['rollup_rows'], again['rows_deleted']) == (0, 0)
+    assert session.query(IndicatorRollup).count() == len(rollups)
+
+
+def test_rollups_expire_after_their_own_window():
+    """Rollups older than the rollup retention are deleted."""
+    engine, session = _populate(days=30)
+    manager = RetentionManager(engine, POLICY)
+    manager.purge_table('indicators', NOW)
+    before = session.query(IndicatorRollup).count()
+
+    cutoff = POLICY.cutoff('indicator_rollups', NOW)
+    expired = sum(1 for r in session.query(IndicatorRollup) if r.bucket.replace(tzinfo=timezone.utc) < cutoff)
+    deleted = manager.purge_rollups(NOW)
+    session.expire_all()
+    remaining = session.query(IndicatorRollup).all()
+    assert deleted == expired > 0 and len(remaining) == before - deleted
+    assert all(r.bucket.replace(tzinfo=timezone.utc) >= cutoff for r in remaining)
+
+
+def test_zero_retention_keeps_everything():
+    """A retention of 0 days never deletes."""
+    engine, session = _populate(days=3)
+    manager = RetentionManager(engine, RetentionPolicy(0, 0, 0, 0))
+    report = manager.run(NOW + timedelta(days=365))
+
+    assert session.query(MarketData).count() == 2 * 3 * 24
+    assert session.query(Signal).count() == 2 * 3
+    assert report['indicators']['cutoff'] is None
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Data Retention Test")
+    print("=" * 50)
+
+    tests = [
+        test_partition_layout,
+        test_expired_rows_are_deleted_and_recent_rows_kept,
+        test_indicators_roll_up_to_daily_rows_before_expiry,
+        test_rollups_expire_after_their_own_window,
+        test_zero_retention_keeps_everything,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
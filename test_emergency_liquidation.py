@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent emergency liquidation in the trading engine.
+"""
+
+import asyncio
+import sys
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+import trading.engine as engine_module
+from api.client import BingXError, RateLimitError, TradingAPIError, order_not_placed
+from trading.engine import TradingEngine
+
+ROUND_TRIP = 0.1
+
+
+def _rejected():
+    try:
+        raise RateLimitError("Circuit breaker 'order' open - retry in 2.0s")
+    except RateLimitError as e:
+        raise TradingAPIError(f"Failed to create market order: {e}")
+
+
+def _timed_out():
+    try:
+        raise BingXError("Network error after 5 attempts: bingx POST timed out")
+    except BingXError as e:
+        raise TradingAPIError(f"Failed to create market order: {e}")
+
+
+class FakeClient:
+    """Order endpoint with a fixed round-trip; listed symbols fail a number of times first."""
+
+    def __init__(self, failures=None, timeouts=()):
+        self.failures = dict(failures or {})
+        self.timeouts = set(timeouts)
+        self.orders = []
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create_market_order(self, symbol, side, amount, params=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.calls.append((symbol, params))
+        try:
+            await asyncio.sleep(ROUND_TRIP)
+            if symbol in self.timeouts:
+                _timed_out()
+            if self.failures.get(symbol, 0) > 0:
+                self.failures[symbol] -= 1
+                _rejected()
+            self.orders.append((symbol, side, amount))
+            return {'id': str(len(self.orders)), 'average': Decimal('99.5')}
+        finally:
+            self.in_flight -= 1
+
+
+class FakeTradeRepo:
+    def __init__(self):
+        self.updates = []
+
+    def update(self, session, id, **kwargs):
+        self.updates.append((session, id, kwargs))
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+
+
+def _engine(client, monkeypatch, positions=10):
+    sessions = []
+
+    @contextmanager
+    def get_session():
+        session = FakeSession()
+        sessions.append(session)
+        yield session
+
+    monkeypatch.setattr(engine_module, 'get_session', get_session)
+    monkeypatch.setattr(engine_module.TradingConfig, 'ORDER_RETRY_DELAY', 0.01)
+    engine = TradingEngine(client, FakeTradeRepo(), None)
+    for i in range(positions):
+        engine._open_trades[f"t{i}"] = {
+            'id': f"t{i}", 'symbol': f"C{i}/USDT", 'side': 'BUY' if i % 2 == 0 else 'SELL',
+            'quantity': Decimal('1.5'),
+        }
+    return engine, sessions
+
+
+def test_positions_close_in_about_one_round_trip(monkeypatch):
+    """Ten positions are flat after roughly one order round-trip, recorded in one transaction."""
+    client = FakeClient()
+    engine, sessions = _engine(client, monkeypatch)
+
+    started = time.perf_counter()
+    assert asyncio.run(engine.emergency_stop_all()) is True
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < ROUND_TRIP * 3  # Sequential closing would take 10 round-trips
+    assert client.max_in_flight == 10 and len(client.orders) == 10
+    assert ('C0/USDT', 'sell', 1.5) in client.orders and ('C1/USDT', 'buy', 1.5) in client.orders
+    assert all(params == {'reduceOnly': True} for _, params in client.calls)
+    assert engine._open_trades == {}
+
+    assert len(sessions) == 1 and sessions[0].commits == 1
+    assert len(engine.trade_repo.updates) == 10
+    _, _, fields = engine.trade_repo.updates[0]
+    assert fields['status'] == 'CLOSED' and fields['exit_reason'] == 'EMERGENCY_STOP'
+    assert fields['exit_price'] == Decimal('99.5')
+
+    report = engine.last_liquidation_report
+    assert report['closed'] == 10 and report['failed'] == 0
+    assert report['time_to_flat'] < ROUND_TRIP * 3 and report['max_latency'] <= report['time_to_flat']
+
+
+def test_failed_orders_are_retried_and_stay_tracked(monkeypatch):
+    """Each order retries on its own; a position that cannot be closed is kept for another attempt."""
+    client = FakeClient({'C1/USDT': 1, 'C2/USDT': 99})
+    engine, sessions = _engine(client, monkeypatch, positions=4)
+    monkeypatch.setattr(engine_module.TradingConfig, 'EMERGENCY_CLOSE_CONCURRENCY', 2)
+
+    assert asyncio.run(engine.emergency_stop_all()) is False
+    assert client.max_in_flight == 2
+    assert list(engine._open_trades) == ['t2']
+
+    report = engine.last_liquidation_report
+    assert (report['closed'], report['failed']) == (3, 1)
+    orders = {order['trade_id']: order for order in report['orders']}
+    assert orders['t1']['success'] and orders['t1']['attempts'] == 2
+    assert not orders['t2']['success'] and orders['t2']['attempts'] == engine.config.ORDER_RETRY_ATTEMPTS
+    assert 'Circuit breaker' in orders['t2']['error']
+    assert sorted(update[1] for update in engine.trade_repo.updates) == ['t0', 't1', 't3']
+
+
+def test_ambiguous_failures_are_not_retried(monkeypatch):
+    """A close order that may have reached the exchange is not sent again."""
+    client = FakeClient(timeouts={'C0/USDT'})
+    engine, _ = _engine(client, monkeypatch, positions=2)
+
+    assert asyncio.run(engine.emergency_stop_all()) is False
+    assert [symbol for symbol, _ in client.calls].count('C0/USDT') == 1
+    assert list(engine._open_trades) == ['t0']
+    assert engine.last_liquidation_report['orders'][0]['attempts'] == 1
+
+    with pytest.raises(TradingAPIError) as rejected:
+        _rejected()
+    with pytest.raises(TradingAPIError) as timed_out:
+        _timed_out()
+    assert order_not_placed(rejected.value) and not order_not_placed(timed_out.value)
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Emergency Liquidation Test")
+    print("=" * 50)
+
+    tests = [
+        test_positions_close_in_about_one_round_trip,
+        test_failed_orders_are_retried_and_stay_tracked,
+        test_ambiguous_failures_are_not_retried,
+    ]
+
+    failed = 0
+    for test in tests:
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            try:
+                test(monkeypatch)
+                print(f"✅ {test.__name__}")
+            except AssertionError as e:
+                failed += 1
+                print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test script for the equity curve and drawdown tracking.
+"""
+
+import asyncio
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import trading.equity_curve as equity_module
+import trading.risk_manager as risk_module
+from database.models import Asset, Base, Trade
+from trading.equity_curve import DrawdownTracker, EquityCurve, downsample_points
+from trading.risk_manager import RiskManager
+
+
+def test_drawdown_tracker_matches_full_rescan():
+    """Incremental peak/drawdown equals a brute-force rescan of the series."""
+    series = [Decimal(v) for v in ['100', '110', '99', '105', '120', '90', '95', '130', '117']]
+    tracker = DrawdownTracker()
+    for equity in series:
+        tracker.update(equity)
+
+    expected = max(
+        (max(series[:i + 1]) - series[i]) / max(series[:i + 1]) for i in range(len(series))
+    )
+    assert tracker.max_drawdown == expected
+    assert tracker.peak == Decimal('130')
+    assert tracker.current_drawdown == Decimal('0.1')
+
+
+def test_curve_records_realized_and_throttles_samples():
+    """Realized P&L always records a point; unrealized samples respect the interval."""
+    curve = EquityCurve(sample_interval_seconds=60, persist=False)
+    curve.load(starting_equity=Decimal('1000'))
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    assert curve.sample_unrealized(Decimal('50'), timestamp=start) is not None
+    assert curve.sample_unrealized(Decimal('-150'), timestamp=start + timedelta(seconds=10)) is None
+    curve.record_realized(Decimal('-100'), timestamp=start + timedelta(seconds=20))
+
+    assert curve.equity == Decimal('750')
+    assert len(curve.get_recent_points()) == 2
+    # The throttled trough (1050 -> 850) still counts toward max drawdown
+    assert curve.max_drawdown == (Decimal('1050') - Decimal('750')) / Decimal('1050')
+
+
+def test_downsampling_keeps_extremes():
+    """Downsampled curves keep each bucket's min and max."""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    points = [(start + timedelta(minutes=i), Decimal(1000 + (i % 50))) for i in range(1000)]
+    points[437] = (points[437][0], Decimal('1'))
+
+    sampled = downsample_points(points, 100)
+
+    assert len(sampled) <= 100
+    assert min(p[1] for p in sampled) == Decimal('1')
+    assert [p[0] for p in sampled] == sorted(p[0] for p in sampled)
+
+
+def test_closes_sharing_the_watermark_are_counted_once(monkeypatch):
+    """A trade closed in the same instant as the last synced one is picked up, and only once."""
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    asset = Asset(symbol='BTC/USDT', base_currency='BTC', quote_currency='USDT')
+    session.add(asset)
+    session.flush()
+
+    @contextmanager
+    def get_session():
+        yield session
+
+    monkeypatch.setattr(equity_module, 'get_session', get_session)
+    curve = EquityCurve(persist=False)
+    curve.load(starting_equity=Decimal('1000'))
+    closed_at = datetime.now(timezone.utc) + timedelta(seconds=1)
+
+    def close(pnl):
+        session.add(Trade(asset_id=asset.id, side='BUY', entry_price=Decimal('1'), quantity=Decimal('1'),
+                          status='CLOSED', exit_time=closed_at, pnl=Decimal(pnl)))
+        session.flush()
+
+    close('10')
+    assert curve.sync_realized() is not None
+    close('5')  # Committed after the sync, with the same exit_time
+    assert curve.sync_realized() is not None
+    assert curve.sync_realized() is None
+    assert curve.equity == Decimal('1015')
+    assert curve._realized_seen_ids == curve.trade_repo.get_ids_closed_at(session, closed_at)
+    assert len(curve._realized_seen_ids) == 2
+
+
+def test_recovered_drawdown_does_not_block_entries(monkeypatch):
+    """Entries are gated on the drawdown from the running peak; the all-time maximum is only reported."""
+    class TradeRepo:
+        def get_open_trade_rows(self, session):
+            return []
+
+    @contextmanager
+    def get_session():
+        yield None
+
+    async def no_daily_pnl():
+        return Decimal('0')
+
+    async def no_performance():
+        return Decimal('0.5'), Decimal('1')
+
+    monkeypatch.setattr(risk_module, 'get_session', get_session)
+    manager = RiskManager(None, TradeRepo(), None)
+    monkeypatch.setattr(manager, '_calculate_daily_pnl', no_daily_pnl)
+    monkeypatch.setattr(manager, '_calculate_performance_metrics', no_performance)
+    curve = manager.equity_curve = EquityCurve(persist=False)
+    curve.load(starting_equity=Decimal('1000'))
+    curve.sync_realized = lambda: None
+    loss = Decimal('1000') * manager._max_drawdown_limit * 2
+
+    async def drawdown_reasons():
+        await manager._update_risk_metrics()
+        _, reasons = await manager.check_risk_limits({'quantity': 0, 'price': 0})
+        return [reason for reason in reasons if 'drawdown' in reason]
+
+    curve.record_realized(-loss)
+    assert asyncio.run(drawdown_reasons())
+
+    curve.record_realized(loss)  # Equity back at its peak
+    assert asyncio.run(drawdown_reasons()) == []
+    metrics = asyncio.run(manager.get_risk_metrics())
+    assert metrics['current_drawdown'] == 0 and metrics['max_drawdown'] == float(curve.max_drawdown) > 0
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Equity Curve Test")
+    print("=" * 50)
+
+    tests = [
+        test_drawdown_tracker_matches_full_rescan,
+        test_curve_records_realized_and_throttles_samples,
+        test_downsampling_keeps_extremes,
+        test_closes_sharing_the_watermark_are_counted_once,
+        test_recovered_drawdown_does_not_block_entries,
+    ]
+
+    failed = 0
+    for test in tests:
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            try:
+                if test in (test_closes_sharing_the_watermark_are_counted_once,
+                            test_recovered_drawdown_does_not_block_entries):
+                    test(monkeypatch)
+                else:
+                    test()
+                print(f"✅ {test.__name__}")
+            except AssertionError as e:
+                failed += 1
+                print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for indicator memoization.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from analysis.indicator_cache import IndicatorCache
+from analysis.indicators import TechnicalIndicators
+from benchmarks.fixtures import load_candles
+
+
+def test_same_candles_compute_once():
+    """Identical candle series are computed once and shared."""
+    cache = IndicatorCache()
+    candles = load_candles('2h', 100)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'mm1': 1}
+
+    for _ in range(5):
+        assert cache.get_or_compute('all', list(candles), (9, 21), compute) == {'mm1': 1}
+
+    assert len(calls) == 1
+    assert cache.get_stats()['hits'] == 4
+
+
+def test_new_candle_invalidates_previous_result():
+    """A newly closed candle supersedes results keyed on the previous one."""
+    cache = IndicatorCache()
+    candles = load_candles('2h', 101)
+
+    cache.get_or_compute('all', candles[:-1], (9,), lambda: 'old', 'BTC/USDT', '2h')
+    assert cache.get_or_compute('all', candles[1:], (9,), lambda: 'new', 'BTC/USDT', '2h') == 'new'
+
+    stats = cache.get_stats()
+    assert stats['entries'] == 1
+    assert stats['invalidations'] == 1
+
+
+def test_period_set_and_forming_candle_change_key():
+    """Different periods or an updated forming candle are separate entries."""
+    cache = IndicatorCache()
+    candles = load_candles('4h', 60)
+    cache.get_or_compute('all', candles, (9, 21), lambda: 'a')
+
+    assert cache.get_or_compute('all', candles, (10, 21), lambda: 'b') == 'b'
+    updated = candles[:-1] + [{**candles[-1], 'close': candles[-1]['close'] * 2}]
+    assert cache.get_or_compute('all', updated, (9, 21), lambda: 'c') == 'c'
+
+
+def test_calculate_all_indicators_is_memoized():
+    """TechnicalIndicators returns equal, independent results from the cache."""
+    indicators = TechnicalIndicators()
+    candles = load_candles('spot', 100)
+
+    first = indicators.calculate_all_indicators(candles, 'BENCH/USDT', 'spot')
+    first['mm1'] = None
+    second = indicators.calculate_all_indicators(candles, 'BENCH/USDT', 'spot')
+
+    assert second['mm1'] is not None
+    assert set(second) == {'mm1', 'center', 'rsi', 'volume_sma'}
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Indicator Cache Test")
+    print("=" * 50)
+
+    tests = [
+        test_same_candles_compute_once,
+        test_new_candle_invalidates_previous_result,
+        test_period_set_and_forming_candle_change_key,
+        test_calculate_all_indicators_is_memoized,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test script for the queue-based logging backend and hot-path sampling.
+"""
+
+import json
+import logging
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from utils.log_queue import (
+    LogSampler, get_queue_logging_stats, install_queue_logging, parse_sample_rates, remove_queue_logging,
+)
+from utils.logger import StructuredFormatter
+
+
+class RecordingHandler(logging.Handler):
+    """Keeps formatted messages and the thread that wrote them."""
+
+    def __init__(self, gate: threading.Event = None):
+        super().__init__()
+        self.gate = gate
+        self.messages = []
+        self.threads = set()
+        self.closed = False
+
+    def emit(self, record):
+        if self.gate is not None:
+            self.gate.wait()
+        self.messages.append(self.format(record))
+        self.threads.add(threading.current_thread().name)
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+def _logger(name, handler, **kwargs):
+    logger = logging.getLogger(f"test_log_queue.{name}")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    install_queue_logging(logger, [handler], **kwargs)
+    return logger
+
+
+def _record(created, lineno=10, level=logging.INFO, name='scanner.worker'):
+    record = logging.LogRecord(name, level, 'scanner/worker.py', lineno, 'validated %s', ('BTC',), None)
+    record.created = created
+    return record
+
+
+def test_records_are_written_on_the_writer_thread():
+    """The calling thread only enqueues; handlers run on the listener thread."""
+    handler = RecordingHandler()
+    logger = _logger('writer', handler)
+    for i in range(50):
+        logger.info("record %d", i)
+    remove_queue_logging(logger)
+
+    assert handler.messages == [f"record {i}" for i in range(50)]
+    assert threading.current_thread().name not in handler.threads
+
+
+def test_formatting_is_deferred_only_for_immutable_args():
+    """Immutable args are rendered later; mutable args are pinned at the log call."""
+    handler = RecordingHandler()
+    logger = _logger('lazy', handler)
+    positions = ['BTC']
+    logger.info("positions: %s", positions)
+    positions.append('ETH')
+    logger.info("count: %d", len(positions))
+    remove_queue_logging(logger)
+
+    assert handler.messages == ["positions: ['BTC']", "count: 2"]
+
+
+def test_sampler_limits_each_call_site():
+    """Bursts from one statement are cut to the rate; the next passing record reports the suppressed count."""
+    sampler = LogSampler(parse_sample_rates("scanner=10, api=0"))
+    now = 1000.0
+    passed = [sampler.filter(_record(now)) for _ in range(100)]
+    assert sum(passed) == 10 and sampler.suppressed == 90
+
+    # A different statement has its own bucket; warnings and unsampled loggers always pass
+    assert sampler.filter(_record(now, lineno=11))
+    assert sampler.filter(_record(now, level=logging.WARNING))
+    assert sampler.filter(_record(now, name='api.client'))
+    assert sampler.filter(_record(now, name='analysis.worker'))
+
+    later = _record(now + 1)
+    assert sampler.filter(later)
+    assert later.getMessage() == "validated BTC [+90 similar suppressed]"
+
+
+def test_full_queue_drops_instead_of_blocking():
+    """A stalled writer never blocks the caller; overflow is counted."""
+    gate = threading.Event()
+    handler = RecordingHandler(gate)
+    logger = _logger('full', handler, maxsize=10)
+
+    started = time.perf_counter()
+    for i in range(200):
+        logger.info("record %d", i)
+    elapsed = time.perf_counter() - started
+
+    stats = get_queue_logging_stats()[logger.name]
+    gate.set()
+    remove_queue_logging(logger)
+
+    assert elapsed < 1.0
+    assert stats['dropped'] > 0
+    assert len(handler.messages) + stats['dropped'] == 200
+
+
+def test_reinstalling_closes_replaced_handlers_and_keeps_call_time():
+    """Installing again drains and closes the old handlers; JSON timestamps are the log call time."""
+    old = RecordingHandler()
+    logger = _logger('reinstall', old)
+    logger.info("before")
+
+    new = RecordingHandler()
+    new.setFormatter(StructuredFormatter())
+    install_queue_logging(logger, [new])
+    assert old.messages == ["before"] and old.closed
+    assert logger.handlers and all(h not in logger.handlers for h in (old, new))
+
+    called_at = datetime.utcnow()
+    logger.info("after", extra={'symbol': 'BTC/USDT'})
+    time.sleep(0.3)
+    remove_queue_logging(logger)
+
+    entry = json.loads(new.messages[0])
+    assert entry['message'] == "after" and entry['symbol'] == 'BTC/USDT'
+    logged_at = datetime.fromisoformat(entry['timestamp'])
+    assert timedelta(0) <= logged_at - called_at < timedelta(seconds=0.2)
+    assert logger.name not in get_queue_logging_stats()
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Log Queue Test")
+    print("=" * 50)
+
+    tests = [
+        test_records_are_written_on_the_writer_thread,
+        test_formatting_is_deferred_only_for_immutable_args,
+        test_sampler_limits_each_call_site,
+        test_full_queue_drops_instead_of_blocking,
+        test_reinstalling_closes_replaced_handlers_and_keeps_call_time,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared market data hub.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from api.market_data_hub import MarketDataHub
+
+
+class CountingMarketHub(MarketDataHub):
+    """Hub whose exchange fetch returns generated candles and counts calls."""
+
+    def __init__(self, available=None, **kwargs):
+        super().__init__(**kwargs)
+        self.fetch_calls = []
+        self.available = available  # Candles the exchange has (None: as many as requested)
+
+    async def _fetch(self, key, history):
+        self.fetch_calls.append((key, history))
+        await asyncio.sleep(0.01)
+        if key[1] == 'ticker':
+            return {'symbol': key[0], 'last': 100}
+        count = history if self.available is None else min(history, self.available)
+        return [{'timestamp': i, 'close': i} for i in range(count)]
+
+
+def test_concurrent_consumers_share_one_fetch():
+    """Many consumers asking for the same series trigger one fetch."""
+    hub = CountingMarketHub()
+
+    async def run():
+        return await asyncio.gather(*(hub.get_candles('BTC/USDT', '2h', 100) for _ in range(10)))
+
+    results = asyncio.run(run())
+    assert len(hub.fetch_calls) == 1
+    assert all(len(candles) == 100 for candles in results)
+    assert hub.stats['coalesced'] == 9
+
+
+def test_smaller_history_served_from_cached_tail():
+    """A request for fewer candles is served from the cached, longer series."""
+    hub = CountingMarketHub()
+
+    async def run():
+        await hub.get_candles('BTC/USDT', '2h', 100)
+        return await hub.get_candles('BTC/USDT', '2h', 50)
+
+    candles = asyncio.run(run())
+    assert len(hub.fetch_calls) == 1
+    assert candles[0]['timestamp'] == 50 and candles[-1]['timestamp'] == 99
+
+
+def test_stale_or_longer_requests_refetch():
+    """Series are refetched after the freshness window or when more history is needed."""
+    hub = CountingMarketHub(freshness={'2h': 0})
+
+    async def run():
+        await hub.get_candles('BTC/USDT', '2h', 50)
+        await asyncio.sleep(0.01)
+        await hub.get_candles('BTC/USDT', '2h', 100)
+
+    asyncio.run(run())
+    assert [history for _, history in hub.fetch_calls] == [50, 100]
+
+
+def test_short_history_is_cached_for_new_listings():
+    """A symbol with fewer candles than requested is not refetched on every call."""
+    hub = CountingMarketHub(available=30)
+
+    async def run():
+        first = await hub.get_candles('NEW/USDT', '2h', 100)
+        second = await hub.get_candles('NEW/USDT', '2h', 100)
+        await hub.get_candles('NEW/USDT', '2h', 150)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert len(first) == len(second) == 30
+    assert [history for _, history in hub.fetch_calls] == [100, 150]
+
+
+def test_longer_request_does_not_join_shorter_fetch():
+    """A request for more history than the in-flight fetch asked for starts its own fetch."""
+    hub = CountingMarketHub()
+
+    async def run():
+        short = asyncio.create_task(hub.get_candles('BTC/USDT', '2h', 50))
+        await asyncio.sleep(0)  # Let the 50-candle fetch start
+        long = await hub.get_candles('BTC/USDT', '2h', 100)
+        shorter = await hub.get_candles('BTC/USDT', '2h', 80)
+        return await short, long, shorter
+
+    short, long, shorter = asyncio.run(run())
+    assert (len(short), len(long), len(shorter)) == (50, 100, 80)
+    assert [history for _, history in hub.fetch_calls] == [50, 100]
+    assert hub.stats['coalesced'] == 0
+
+
+def test_subscribers_receive_updates():
+    """Subscribers get pushed the refreshed series."""
+    hub = CountingMarketHub(refresh_interval=0.01)
+
+    async def run():
+        subscription = hub.subscribe('ETH/USDT', 'ticker')
+        update = await asyncio.wait_for(subscription.get(), timeout=1)
+        subscription.close()
+        return update
+
+    update = asyncio.run(run())
+    assert update.symbol == 'ETH/USDT' and update.data['last'] == 100
+    assert hub.get_stats()['subscriptions'] == 0
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Market Data Hub Test")
+    print("=" * 50)
+
+    tests = [
+        test_concurrent_consumers_share_one_fetch,
+        test_smaller_history_served_from_cached_tail,
+        test_stale_or_longer_requests_refetch,
+        test_short_history_is_cached_for_new_listings,
+        test_longer_request_does_not_join_shorter_fetch,
+        test_subscribers_receive_updates,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared market metadata store (snapshot, symbol index and delta refresh).
+"""
+
+import asyncio
+import sys
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import ccxt
+import pytest
+
+import api.market_metadata as market_metadata
+from api.client import BingXClient
+from api.market_metadata import DECIMAL_PLACES, TICK_SIZE, MarketMetadataError, MarketMetadataStore, _decimals
+
+
+def _market(base, type_='swap', active=True, amount_precision=3, min_amount=0.001, quote='USDT'):
+    suffix = f":{quote}" if type_ == 'swap' else ''
+    return {
+        'id': f"{base}-{quote}", 'symbol': f"{base}/{quote}{suffix}", 'base': base, 'quote': quote,
+        'type': type_, 'spot': type_ == 'spot', 'swap': type_ == 'swap', 'active': active,
+        'precision': {'price': 2, 'amount': amount_precision},
+        'limits': {'amount': {'min': min_amount, 'max': None}, 'cost': {'min': 5, 'max': None}},
+        'maker': 0.0002, 'taker': 0.0005, 'info': {'symbol': f"{base}-{quote}"},
+    }
+
+
+MARKETS = [
+    _market('BTC', 'spot', amount_precision=5),
+    _market('BTC'),
+    _market('ETH', amount_precision=2),
+    _market('OLD', active=False),
+    _market('BTC', quote='USDC'),
+]
+
+
+class Fetcher:
+    """Counts exchange downloads and returns whatever the test sets."""
+
+    def __init__(self, markets):
+        self.markets = markets
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.markets
+
+
+def test_symbol_index_prefers_swaps_and_reads_precision():
+    """USDT markets are indexed by BASE/USDT; swaps win over spot and precision is read per market."""
+    store = MarketMetadataStore()
+    store.apply(MARKETS)
+
+    assert len(store) == 3 and [m['symbol'] for m in store.markets()] == ['BTC/USDT', 'ETH/USDT']
+    assert store.get('BTC/USDT')['type'] == 'swap' and store.get('BTC/USDT:USDT') is store.get('BTC/USDT')
+    assert 'OLD/USDT' in store and 'BTC/USDC' not in store
+    assert store.get('ETH/USDT')['quantity_precision'] == 2
+    assert store.round_quantity('BTC/USDT', Decimal('0.123456')) == Decimal('0.123')
+    assert store.round_quantity('XYZ/USDT', Decimal('1')) is None
+    assert store.min_notional('BTC/USDT', Decimal('60000')) == Decimal('60')
+    assert store.min_notional('ETH/USDT', Decimal('10')) == Decimal('5')
+
+
+def test_precision_follows_exchange_precision_mode():
+    """Precision values are read as decimal places or tick sizes according to precisionMode."""
+    assert (DECIMAL_PLACES, TICK_SIZE) == (ccxt.DECIMAL_PLACES, ccxt.TICK_SIZE)
+    assert _decimals(0, 6) == 0 and _decimals(1, 6) == 1 and _decimals(8, 6) == 8
+    assert _decimals(None, 6) == 6 and _decimals('abc', 6) == 6 and _decimals(0.01, 6) == 6
+    assert _decimals(0.01, 6, TICK_SIZE) == 2 and _decimals(1, 6, TICK_SIZE) == 0
+    assert _decimals(10, 6, TICK_SIZE) == 0 and _decimals(0, 6, TICK_SIZE) == 6
+
+    store = MarketMetadataStore(precision_mode=TICK_SIZE)
+    store.apply([_market('ETH', amount_precision=0.01), _market('XRP', amount_precision=1)])
+    assert store.get('ETH/USDT')['quantity_precision'] == 2 and store.get('XRP/USDT')['quantity_precision'] == 0
+    assert store.round_quantity('XRP/USDT', Decimal('12.7')) == Decimal('12')
+
+    store = MarketMetadataStore(precision_mode=DECIMAL_PLACES)
+    store.apply([_market('XRP', amount_precision=0)])
+    assert store.round_quantity('XRP/USDT', Decimal('12.7')) == Decimal('12')
+
+
+def test_snapshot_round_trip_needs_no_download(tmp_path):
+    """A restarted process serves markets from the snapshot without asking the exchange."""
+    fetcher = Fetcher(MARKETS)
+    first = MarketMetadataStore(tmp_path / 'markets.json', fetcher=fetcher)
+    asyncio.run(first.get_markets())
+    assert fetcher.calls == 1 and (tmp_path / 'markets.json').exists()
+
+    second = MarketMetadataStore(tmp_path / 'markets.json', fetcher=fetcher)
+    markets = asyncio.run(second.get_markets())
+    assert fetcher.calls == 1
+    assert [m['symbol'] for m in markets] == ['BTC/USDT', 'ETH/USDT']
+    assert second.updated_at == first.updated_at and second.get_stats()['snapshot_loads'] == 1
+
+    tick_size = MarketMetadataStore(tmp_path / 'ticks.json', precision_mode=TICK_SIZE)
+    tick_size.apply([_market('ETH', amount_precision=0.01)])
+    tick_size.save()
+    reloaded = MarketMetadataStore(tmp_path / 'ticks.json')
+    assert reloaded.load() and reloaded.precision_mode == TICK_SIZE
+    assert reloaded.get('ETH/USDT')['quantity_precision'] == 2
+
+
+def test_refresh_reports_listings_delistings_and_changes(tmp_path):
+    """Refreshes are diffed against the previous list and listeners get the diff."""
+    store = MarketMetadataStore(tmp_path / 'markets.json', fetcher=Fetcher(MARKETS))
+    asyncio.run(store.refresh())
+    diffs = []
+    store.add_listener(diffs.append)
+
+    store.fetcher = Fetcher([_market('BTC', amount_precision=4), _market('SOL'), _market('ETH', active=False)])
+    diff = asyncio.run(store.refresh())
+    assert diff.listed == ['SOL/USDT'] and diff.delisted == ['ETH/USDT'] and diff.changed == ['BTC/USDT']
+    assert diffs == [diff]
+
+    # Nothing changed: no notification
+    asyncio.run(store.refresh())
+    assert len(diffs) == 1 and store.get_stats()['listed'] == 1
+
+
+def test_stale_data_is_served_while_one_refresh_runs(tmp_path):
+    """Concurrent callers share a download; stale data is returned without waiting."""
+    fetcher = Fetcher(MARKETS)
+    store = MarketMetadataStore(tmp_path / 'markets.json', max_age=60, fetcher=fetcher)
+
+    async def main():
+        results = await asyncio.gather(*(store.get_markets() for _ in range(5)))
+        assert all(len(markets) == 2 for markets in results) and fetcher.calls == 1
+
+        store.updated_at -= 120
+        fetcher.markets = MARKETS + [_market('SOL')]
+        assert len(await store.get_markets()) == 2  # Old list, refresh started
+        await asyncio.sleep(0.05)
+        assert len(await store.get_markets()) == 3 and fetcher.calls == 2
+
+    asyncio.run(main())
+
+    store.fetcher = Fetcher([])
+    with pytest.raises(MarketMetadataError):
+        asyncio.run(store.get_markets(force_refresh=True))
+    assert store.get_stats()['refresh_errors'] == 1
+
+
+def test_client_starts_from_snapshot_without_fetch_markets(tmp_path, monkeypatch):
+    """With a snapshot the connection test makes one light call and seeds ccxt's markets."""
+    store = MarketMetadataStore(tmp_path / 'markets.json')
+    store.apply(MARKETS)
+    store.save()
+    monkeypatch.setattr(market_metadata, '_market_store', MarketMetadataStore(tmp_path / 'markets.json'))
+
+    class FakeExchange:
+        def __init__(self):
+            self.calls = []
+            self.markets = None
+
+        def fetch_time(self):
+            self.calls.append('fetch_time')
+            return 0
+
+        def fetch_markets(self):
+            self.calls.append('fetch_markets')
+            return MARKETS
+
+        def set_markets(self, markets):
+            self.markets = markets
+
+    monkeypatch.setattr('api.client.Settings.BINGX_TESTNET', True)
+    client = BingXClient()
+    client.exchange = FakeExchange()
+    asyncio.run(client._test_connection())
+
+    assert client.exchange.calls == ['fetch_time']
+    assert len(client.exchange.markets) == len(MARKETS)
+    assert len(market_metadata.get_market_store()) == 3
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Market Metadata Test")
+    print("=" * 50)
+
+    tests = [
+        test_symbol_index_prefers_swaps_and_reads_precision,
+        test_precision_follows_exchange_precision_mode,
+        test_snapshot_round_trip_needs_no_download,
+        test_refresh_reports_listings_delistings_and_changes,
+        test_stale_data_is_served_while_one_refresh_runs,
+    ]
+
+    failed = 0
+    for test in tests:
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                if test in (test_symbol_index_prefers_swaps_and_reads_precision,
+                            test_precision_follows_exchange_precision_mode):
+                    test()
+                else:
+                    test(Path(tmp))
+                print(f"✅ {test.__name__}")
+            except AssertionError as e:
+                failed += 1
+                print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script for Prometheus metrics export.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from utils import metrics
+from utils.smart_cache import SmartCache
+
+
+def test_api_latency_and_retries_exported():
+    """Per-endpoint latency, retries and 429s show up in the exposition output."""
+    metrics.observe_api_request('fetch_ticker', 0.12)
+    metrics.record_api_retry('fetch_ohlcv', 'rate_limited')
+    metrics.record_rate_limited('fetch_ohlcv')
+
+    payload, content_type = metrics.render_metrics()
+    text = payload.decode()
+
+    assert content_type.startswith('text/plain')
+    assert 'bingx_api_request_duration_seconds_bucket{endpoint="fetch_ticker"' in text
+    assert 'bingx_api_retries_total{endpoint="fetch_ohlcv",reason="rate_limited"}' in text
+    assert 'bingx_api_rate_limited_total{endpoint="fetch_ohlcv"}' in text
+
+
+def test_smart_cache_hits_and_misses_counted():
+    """SmartCache lookups feed the cache hit/miss counters."""
+    cache = SmartCache(max_size=10)
+    cache.get('ticker', 'BTC/USDT')
+    cache.set('ticker', 'BTC/USDT', {'last': 1})
+    cache.get('ticker', 'BTC/USDT')
+
+    text = metrics.render_metrics()[0].decode()
+    assert 'cache_requests_total{cache="smart_cache",result="hit"}' in text
+    assert 'cache_requests_total{cache="smart_cache",result="miss"}' in text
+    assert 'cache_entries{cache="smart_cache"} 1.0' in text
+
+
+def test_db_statement_timing():
+    """SQLAlchemy statements are timed by operation."""
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine("sqlite://")
+    metrics.install_db_metrics(engine)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    exported = metrics.render_metrics()[0].decode()
+    assert 'db_query_duration_seconds_count{operation="SELECT"}' in exported
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Metrics Test")
+    print("=" * 50)
+
+    tests = [
+        test_api_latency_and_retries_exported,
+        test_smart_cache_hits_and_misses_counted,
+        test_db_statement_timing,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
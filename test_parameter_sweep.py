@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test script for the backtest parameter sweep.
+"""
+
+import random
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from analysis.resampling import resample_candles
+from backtesting import BacktestParams, CandleMatrix, run_backtest
+from backtesting.sweep import (
+    PrecomputedSeries, SweepError, evaluate_combinations, grid_combinations, random_combinations, run_sweep,
+)
+from benchmarks.fixtures import _random_walk
+
+SPACE = {
+    'mm1_period': [5, 9],
+    'center_period': [21, 30],
+    'rsi_min': [30, 35],
+    'ma_distance_2h': [0.01, 0.02],
+    'volume_spike_threshold': [1.5, 2.0],
+}
+
+
+def _synthetic_matrices(symbol_count, bars=600):
+    rng = random.Random(11)
+    candles_2h = {}
+    for i in range(symbol_count):
+        rows = _random_walk(rng, bars, 7_200_000, 50.0 + i)
+        candles_2h[f"S{i}/USDT"] = [dict(zip(('timestamp', 'open', 'high', 'low', 'close', 'volume'), row))
+                                    for row in rows]
+    candles_4h = {symbol: resample_candles(candles, '2h', '4h', include_partial=False)
+                  for symbol, candles in candles_2h.items()}
+    return CandleMatrix.from_candles('2h', candles_2h), CandleMatrix.from_candles('4h', candles_4h)
+
+
+def test_grid_and_random_combinations():
+    """Grids enumerate every valid combination; random sampling is distinct and reproducible."""
+    grid = grid_combinations({'mm1_period': [9, 21, 30], 'center_period': [21, 30]})
+    assert sorted((c['mm1_period'], c['center_period']) for c in grid) == [(9, 21), (9, 30), (21, 30)]
+
+    space = {'rsi_min': {'min': 20, 'max': 45}, 'ma_distance_4h': {'min': 0.01, 'max': 0.05}, 'rsi_max': [70, 75]}
+    first = random_combinations(space, 25, seed=3)
+    assert first == random_combinations(space, 25, seed=3)
+    assert len({tuple(sorted(c.items())) for c in first}) == 25
+    assert all(isinstance(c['rsi_min'], int) and 0.01 <= c['ma_distance_4h'] <= 0.05 for c in first)
+
+    with pytest.raises(SweepError):
+        grid_combinations({'initial_stop_loss': [0.01, 0.02]})
+
+
+def test_broadcast_evaluation_matches_run_backtest():
+    """Each combination's stats equal a standalone backtest with the same parameters."""
+    matrix_2h, matrix_4h = _synthetic_matrices(4)
+    base = BacktestParams()
+    combos = grid_combinations(SPACE, base)
+    series = PrecomputedSeries(matrix_2h, matrix_4h)
+    # A tiny batch limit forces several batches per period group
+    results = evaluate_combinations(series, combos, base, max_batch_cells=matrix_2h.close.size * 3)
+
+    assert any(stats['total_trades'] for stats in results)
+    for combo, stats in zip(combos, results):
+        expected = run_backtest(matrix_2h, matrix_4h, replace(base, **combo), workers=1).get_stats()
+        for name in ('total_trades', 'winning_trades', 'total_return', 'max_drawdown', 'signals'):
+            assert stats[name] == pytest.approx(expected[name]), (combo, name)
+
+
+def test_checkpoint_resume_skips_finished_combinations(tmp_path):
+    """A second run only evaluates what the checkpoint lacks; different data is rejected."""
+    matrix_2h, matrix_4h = _synthetic_matrices(3)
+    combos = grid_combinations(SPACE)
+    checkpoint = tmp_path / 'sweep.jsonl'
+
+    partial = run_sweep(matrix_2h, matrix_4h, combos[:10], workers=1, checkpoint_path=checkpoint)
+    assert partial.evaluated == 10
+
+    full = run_sweep(matrix_2h, matrix_4h, combos, workers=1, checkpoint_path=checkpoint)
+    assert (full.resumed, full.evaluated, len(full.records)) == (10, len(combos) - 10, len(combos))
+
+    fresh = run_sweep(matrix_2h, matrix_4h, combos, workers=1)
+    key = lambda r: sorted(r['params'].items())
+    assert sorted(full.records, key=key) == sorted(fresh.records, key=key)
+
+    other_2h, other_4h = _synthetic_matrices(2)
+    with pytest.raises(SweepError):
+        run_sweep(other_2h, other_4h, combos, workers=1, checkpoint_path=checkpoint)
+
+
+def test_ranking_by_return_and_drawdown():
+    """Ranking sorts by the chosen metric and honours the drawdown and trade filters."""
+    matrix_2h, matrix_4h = _synthetic_matrices(3)
+    result = run_sweep(matrix_2h, matrix_4h, grid_combinations(SPACE), workers=1)
+
+    ranked = result.ranked('total_return', min_trades=1)
+    returns = [r['stats']['total_return'] for r in ranked]
+    assert returns == sorted(returns, reverse=True)
+    assert all(r['stats']['total_trades'] >= 1 for r in ranked)
+
+    limit = sorted(r['stats']['max_drawdown'] for r in ranked)[len(ranked) // 2]
+    assert all(r['stats']['max_drawdown'] <= limit for r in result.ranked(max_drawdown=limit))
+
+    best = result.best(sort_by='total_return')
+    assert best.mm1_period == ranked[0]['params']['mm1_period']
+
+    with pytest.raises(SweepError):
+        result.ranked('sharpe')
+
+
+def test_process_pool_matches_in_process():
+    """Spreading combinations across worker processes gives the same results."""
+    matrix_2h, matrix_4h = _synthetic_matrices(2, bars=400)
+    combos = grid_combinations(SPACE)
+    serial = run_sweep(matrix_2h, matrix_4h, combos, workers=1)
+    parallel = run_sweep(matrix_2h, matrix_4h, combos, workers=2)
+
+    key = lambda r: sorted(r['params'].items())
+    assert sorted(serial.records, key=key) == sorted(parallel.records, key=key)
+
+
+def main():
+    """Main test function."""
+    import tempfile
+
+    print("🤖 BingX Trading Bot - Parameter Sweep Test")
+    print("=" * 50)
+
+    tests = [
+        test_grid_and_random_combinations,
+        test_broadcast_evaluation_matches_run_backtest,
+        test_ranking_by_return_and_drawdown,
+        test_process_pool_matches_in_process,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            test_checkpoint_resume_skips_finished_combinations(Path(tmp))
+            print("✅ test_checkpoint_resume_skips_finished_combinations")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ test_checkpoint_resume_skips_finished_combinations: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for symbol-joined trade/signal row projections.
+"""
+
+import sys
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from database.models import Asset, Base, Signal, Trade
+from database.projections import TradeRow
+from database.repository import SignalRepository, TradeRepository
+
+
+def _session(trade_count):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    for i in range(trade_count):
+        asset = Asset(symbol=f"C{i}/USDT", base_currency=f"C{i}", quote_currency='USDT')
+        session.add(asset)
+        session.flush()
+        session.add(Trade(asset_id=asset.id, side='BUY' if i % 2 else 'SELL', entry_price=Decimal('100'),
+                          quantity=Decimal('2'), status='OPEN', entry_time=datetime.now(timezone.utc)))
+        session.add(Signal(asset_id=asset.id, timestamp=datetime.utcnow(), signal_type='BUY',
+                           strength=Decimal('80')))
+    session.commit()
+    session.expunge_all()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return session, statements
+
+
+def test_open_trade_rows_use_one_query():
+    """Open trades and their symbols come back in a single SELECT regardless of count."""
+    for count in (3, 30):
+        session, statements = _session(count)
+        rows = TradeRepository().get_open_trade_rows(session)
+        symbols = {row.symbol for row in rows}
+
+        assert len(rows) == count
+        assert symbols == {f"C{i}/USDT" for i in range(count)}
+        assert len(statements) == 1
+
+
+def test_signal_rows_carry_symbol_without_identity_tracking():
+    """Signal rows are plain objects, not ORM instances in the session."""
+    session, statements = _session(5)
+    rows = SignalRepository().get_recent_signal_rows(session, hours=1)
+
+    assert len(rows) == 5 and all(row.symbol for row in rows)
+    assert len(statements) == 1
+    assert len(session.identity_map) == 0
+
+
+def test_trade_row_pnl_matches_model():
+    """TradeRow.calculate_pnl follows Trade.calculate_pnl."""
+    row = TradeRow(id='1', asset_id='a', symbol='BTC/USDT', side='SELL', entry_price=Decimal('100'),
+                   quantity=Decimal('2'), stop_loss=None, take_profit=None, status='OPEN',
+                   entry_reason=None, entry_time=None, exit_time=None, exit_price=None,
+                   exit_reason=None, pnl=None, pnl_percentage=None, fees=None, created_at=None)
+    trade = Trade(side='SELL', entry_price=Decimal('100'), quantity=Decimal('2'), status='OPEN')
+
+    assert row.calculate_pnl(Decimal('90')) == trade.calculate_pnl(Decimal('90')) == Decimal('20')
+    assert not hasattr(row, '__dict__')
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Row Projections Test")
+    print("=" * 50)
+
+    tests = [
+        test_open_trade_rows_use_one_query,
+        test_signal_rows_carry_symbol_without_identity_tracking,
+        test_trade_row_pnl_matches_model,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
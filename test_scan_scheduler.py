@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script for the adaptive scan scheduler.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from scanner.scan_scheduler import AdaptiveScanScheduler, extract_signal_observation
+
+
+def test_new_symbols_are_due_immediately():
+    """New symbols are scanned right away and removed symbols are dropped."""
+    scheduler = AdaptiveScanScheduler('test', min_interval=5, max_interval=300)
+    scheduler.sync_symbols(['BTC/USDT', 'ETH/USDT'], now=1000.0)
+
+    assert set(scheduler.get_due_symbols(now=1000.0)) == {'BTC/USDT', 'ETH/USDT'}
+
+    scheduler.sync_symbols(['BTC/USDT'], now=1001.0)
+    assert scheduler.get_due_symbols(now=1001.0) == ['BTC/USDT']
+
+
+def test_hot_symbols_rescheduled_sooner_than_quiet_symbols():
+    """Symbols near a crossover/RSI bound/volume spike get shorter intervals."""
+    scheduler = AdaptiveScanScheduler('test', min_interval=5, max_interval=300)
+    scheduler.sync_symbols(['HOT/USDT', 'QUIET/USDT'], now=0.0)
+
+    hot_interval = scheduler.record_scan('HOT/USDT', mm1=100.05, center=100.0, rsi=36,
+                                         volume_ratio=2.5, now=0.0)
+    quiet_interval = scheduler.record_scan('QUIET/USDT', mm1=110.0, center=100.0, rsi=55,
+                                           volume_ratio=0.8, now=0.0)
+
+    assert hot_interval < 60
+    assert quiet_interval == 300
+    assert scheduler.get_due_symbols(now=hot_interval) == ['HOT/USDT']
+
+
+def test_open_position_always_fastest():
+    """Open positions are scanned at the minimum interval."""
+    scheduler = AdaptiveScanScheduler('test', min_interval=5, max_interval=300)
+    scheduler.sync_symbols(['POS/USDT'], now=0.0)
+    scheduler.set_position_open('POS/USDT', True, now=0.0)
+
+    interval = scheduler.record_scan('POS/USDT', mm1=120.0, center=100.0, rsi=50, now=0.0)
+    assert interval == 5
+
+
+def test_due_symbols_ordered_by_priority_and_limited():
+    """Due symbols come back most urgent first and respect the limit."""
+    scheduler = AdaptiveScanScheduler('test', min_interval=5, max_interval=300)
+    scheduler.sync_symbols(['A/USDT', 'B/USDT', 'C/USDT'], now=0.0)
+    scheduler.record_scan('A/USDT', rsi=55, now=0.0)
+    scheduler.record_scan('B/USDT', rsi=35, now=0.0)
+    scheduler.record_scan('C/USDT', rsi=38, now=0.0)
+
+    due = scheduler.get_due_symbols(limit=2, now=300.0)
+    assert due == ['B/USDT', 'C/USDT']
+    assert scheduler.stats['symbols_deferred'] == 1
+
+
+def test_staleness_metrics():
+    """Per-symbol staleness and summary stats are exposed."""
+    scheduler = AdaptiveScanScheduler('test', min_interval=5, max_interval=300)
+    scheduler.sync_symbols(['BTC/USDT', 'ETH/USDT'], now=0.0)
+    scheduler.record_scan('BTC/USDT', rsi=50, now=0.0)
+
+    staleness = scheduler.get_staleness(now=30.0)
+    assert staleness['BTC/USDT']['staleness_seconds'] == 30.0
+    assert staleness['ETH/USDT']['staleness_seconds'] is None
+
+    stats = scheduler.get_stats(now=30.0)
+    assert stats['tracked_symbols'] == 2
+    assert stats['never_scanned'] == 1
+    assert stats['max_staleness_seconds'] == 30.0
+
+
+def test_extract_signal_observation():
+    """Indicator readings are pulled out of a generate_trading_signal result."""
+    signal_result = {
+        'rules_analysis': {
+            'rule_1_crossover': {'details': {'2h': {'indicators': {'mm1': 101, 'center': 100, 'rsi': 40}}}},
+            'rule_3_volume': {'details': {'volume_analysis': {'volume_ratio': 1.7}}},
+        }
+    }
+    assert extract_signal_observation(signal_result) == (101.0, 100.0, 40.0, 1.7)
+    assert extract_signal_observation(None) == (None, None, None, None)
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Adaptive Scan Scheduler Test")
+    print("=" * 50)
+
+    tests = [
+        test_new_symbols_are_due_immediately,
+        test_hot_symbols_rescheduled_sooner_than_quiet_symbols,
+        test_open_position_always_fastest,
+        test_due_symbols_ordered_by_priority_and_limited,
+        test_staleness_metrics,
+        test_extract_signal_observation,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Test script for sharded scanner partitioning.
+"""
+
+import asyncio
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+import database.connection
+from database.repository import SystemConfigRepository
+from scanner.sharding import ConsistentHashRing, ShardedScannerSupervisor, ShardMembership, SignalAggregator
+
+SYMBOLS = [f"COIN{i}/USDT" for i in range(500)]
+
+
+def test_partitions_cover_all_symbols_once():
+    """Every symbol is owned by exactly one shard and load is spread."""
+    ring = ConsistentHashRing(['shard-0', 'shard-1', 'shard-2', 'shard-3'])
+    partitions = ring.partition(SYMBOLS)
+
+    owned = [symbol for symbols in partitions.values() for symbol in symbols]
+    assert sorted(owned) == sorted(SYMBOLS)
+    assert all(len(symbols) > 50 for symbols in partitions.values())
+
+
+def test_rebalance_moves_only_removed_shard_symbols():
+    """Removing a shard only reassigns that shard's symbols."""
+    ring = ConsistentHashRing(['shard-0', 'shard-1', 'shard-2', 'shard-3'])
+    before = {symbol: ring.get_node(symbol) for symbol in SYMBOLS}
+
+    ring.remove_node('shard-3')
+    after = {symbol: ring.get_node(symbol) for symbol in SYMBOLS}
+
+    moved = [symbol for symbol in SYMBOLS if before[symbol] != after[symbol]]
+    assert moved and all(before[symbol] == 'shard-3' for symbol in moved)
+    assert 'shard-3' not in after.values()
+
+
+def test_static_membership_filters_symbols():
+    """Shards sharing a static member list split symbols without overlap."""
+    members = ['Host-0', 'Host-1']
+    shard_a = ShardMembership('Host-0', static_members=members)
+    shard_b = ShardMembership('Host-1', static_members=members)
+
+    owned_a = set(shard_a.filter_symbols(SYMBOLS))
+    owned_b = set(shard_b.filter_symbols(SYMBOLS))
+    assert owned_a.isdisjoint(owned_b)
+    assert owned_a | owned_b == set(SYMBOLS)
+
+
+def test_static_members_stay_in_ring_during_startup(monkeypatch):
+    """Siblings without a heartbeat yet keep their partitions for the first TTL."""
+    heartbeats = {'scanner_shard:host-0': {'heartbeat': time.time()}}
+
+    @contextmanager
+    def get_session():
+        yield None
+
+    monkeypatch.setattr(database.connection, 'get_session', get_session)
+    monkeypatch.setattr(SystemConfigRepository, 'get_configs_by_prefix', lambda self, session, prefix: heartbeats)
+
+    shard = ShardMembership('Host-0', static_members=['Host-0', 'Host-1'], member_ttl=30)
+    assert shard.get_live_members() == ['host-0', 'host-1']
+
+    shard._started_at -= 31
+    assert shard.get_live_members() == ['host-0']
+
+
+def test_supervisor_selects_universe_once_for_all_shards(monkeypatch):
+    """Shards get the supervisor's single symbol selection instead of each selecting their own."""
+    from scanner.enhanced_worker import EnhancedScannerWorker
+    from trading.symbol_selector import TradingSymbol
+
+    universe = [TradingSymbol(symbol='BTC/USDT', volume_24h=1e6, spread_percent=0.01, volatility_24h=2.0,
+                              liquidity_score=1.0, selection_score=1.0)]
+    selections, started = [], []
+
+    async def select(self, force_refresh=False):
+        selections.append(force_refresh)
+        return universe
+
+    class FakeProcess:
+        pid = 0
+
+        def __init__(self, target, args, name, daemon):
+            started.append(args)
+
+        def start(self):
+            pass
+
+    monkeypatch.setattr(ShardedScannerSupervisor, 'select_trading_symbols', select)
+    supervisor = ShardedScannerSupervisor(num_shards=3, shard_prefix='host')
+    monkeypatch.setattr(supervisor._context, 'Process', FakeProcess)
+
+    supervisor.trading_symbols = asyncio.run(supervisor.select_trading_symbols())
+    for shard_id in supervisor.shard_ids:
+        supervisor._start_shard(shard_id)
+    assert len(selections) == 1 and all(args[3] is universe for args in started)
+
+    worker = EnhancedScannerWorker(use_parallel=False, trading_symbols=universe)
+    monkeypatch.setattr(type(worker.symbol_selector), 'select_trading_symbols', select)
+    asyncio.run(worker._ensure_trading_symbols())
+    assert len(selections) == 1
+    assert asyncio.run(worker.trading_cache.get_trading_symbols()) == ['BTC/USDT']
+
+
+def test_supervisor_callbacks_receive_aggregated_signals():
+    """Aggregated signals go to the supervisor's callbacks, as an unsharded worker's signals do."""
+    supervisor = ShardedScannerSupervisor(num_shards=1, shard_prefix='host')
+    published = []
+    supervisor.add_signal_callback(published.append)
+
+    signal = {'symbol': 'BTC/USDT', 'signal_type': 'STRONG_BUY', 'confidence': 0.85, 'shard_id': 'host-0'}
+    asyncio.run(supervisor.aggregator.handle_signal(signal))
+    assert published == [signal]
+
+
+def test_aggregator_drops_duplicate_signals():
+    """The aggregator publishes a symbol/signal pair once per dedup window."""
+    aggregator = SignalAggregator(signal_queue=None)
+    published = []
+    aggregator.add_callback(published.append)
+
+    signal = {'symbol': 'BTC/USDT', 'signal_type': 'BUY', 'confidence': 0.8, 'shard_id': 'shard-0'}
+
+    async def run():
+        await aggregator.handle_signal(signal)
+        await aggregator.handle_signal(signal)
+
+    asyncio.run(run())
+    assert len(published) == 1
+    assert aggregator.stats['duplicates_dropped'] == 1
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Sharded Scanner Test")
+    print("=" * 50)
+
+    tests = [
+        test_partitions_cover_all_symbols_once,
+        test_rebalance_moves_only_removed_shard_symbols,
+        test_static_membership_filters_symbols,
+        test_static_members_stay_in_ring_during_startup,
+        test_supervisor_selects_universe_once_for_all_shards,
+        test_supervisor_callbacks_receive_aggregated_signals,
+        test_aggregator_drops_duplicate_signals,
+    ]
+
+    failed = 0
+    for test in tests:
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            try:
+                if test in (test_static_members_stay_in_ring_during_startup,
+                            test_supervisor_selects_universe_once_for_all_shards):
+                    test(monkeypatch)
+                else:
+                    test()
+                print(f"✅ {test.__name__}")
+            except AssertionError as e:
+                failed += 1
+                print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
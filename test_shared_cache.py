@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test script for the two-level SmartCache (local L1 plus shared L2 tier).
+"""
+
+import sys
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from config.settings import Settings
+from utils.shared_cache import (
+    COMPRESS_MIN_BYTES, InMemoryCacheBackend, InMemoryCacheServer, RedisCacheBackend, SharedCacheError,
+    decode_cache_value, encode_cache_value,
+)
+from utils.smart_cache import SmartCache
+
+TICKER = {
+    'symbol': 'BTC/USDT',
+    'last': Decimal('42000.50'),
+    'timestamp': datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc),
+    'levels': (1, 2.5, None),
+    'rules': {'ma_crossover', 'rsi'},
+    'nested': [{'$d': 'looks like a tag'}],
+}
+
+
+def _processes(count=2):
+    """SmartCaches that behave like separate processes sharing one server."""
+    server = InMemoryCacheServer()
+    return [SmartCache(shared=InMemoryCacheBackend(server)) for _ in range(count)]
+
+
+def test_codec_round_trips_and_compresses():
+    """Decimal, datetime, tuple, set and tag-like dicts come back unchanged; big payloads are compressed."""
+    raw = encode_cache_value(TICKER, 123.5)
+    value, expires_at = decode_cache_value(raw)
+    assert value == TICKER and expires_at == 123.5
+    assert isinstance(value['last'], Decimal) and isinstance(value['levels'], tuple)
+
+    candles = [[1700000000000 + i, 1.0, 2.0, 0.5, 1.5, 100.0] for i in range(500)]
+    packed = encode_cache_value(candles, 0)
+    assert len(packed) < len(str(candles)) / 3
+    assert decode_cache_value(packed)[0] == candles
+    assert len(encode_cache_value('x', 0)) < COMPRESS_MIN_BYTES
+
+    # Types that would not survive the trip stay local
+    assert encode_cache_value({1: 'int key'}, 0) is None
+    assert encode_cache_value(object(), 0) is None
+
+
+def test_second_process_is_served_from_the_shared_tier():
+    """One fetch per datum: the second process gets the value (and its expiry) from the shared tier."""
+    first, second = _processes()
+    fetches = []
+
+    async def fetch():
+        fetches.append(1)
+        return TICKER
+
+    import asyncio
+    assert asyncio.run(first.get_or_fetch('ticker', 'BTC/USDT', fetch)) == TICKER
+    assert asyncio.run(second.get_or_fetch('ticker', 'BTC/USDT', fetch)) == TICKER
+    assert len(fetches) == 1
+
+    key = first._make_key('ticker', 'BTC/USDT')
+    assert second.cache[key].expires_at == pytest.approx(first.cache[key].expires_at)
+    assert second.get_stats()['shared_hits'] == 1
+
+    # Later reads in the second process are local hits
+    second.get('ticker', 'BTC/USDT')
+    assert second.get_stats()['hits'] == 1 and second.get_stats()['shared_hits'] == 1
+
+
+def test_sets_and_invalidations_reach_other_processes():
+    """Replacing or invalidating a value drops the stale local copy everywhere."""
+    first, second = _processes()
+    first.set('market_summary', 'ETH/USDT', {'price': 1})
+    assert second.get('market_summary', 'ETH/USDT') == {'price': 1}
+
+    first.set('market_summary', 'ETH/USDT', {'price': 2})
+    assert second.get('market_summary', 'ETH/USDT') == {'price': 2}
+    assert second.get_stats()['remote_invalidations'] == 2
+
+    first.set('market_summary', 'SOL/USDT', {'price': 3})
+    second.get('market_summary', 'SOL/USDT')
+    first.invalidate('market_summary')
+    assert second.cache == {}
+    assert second.get('market_summary', 'SOL/USDT') is None
+    assert first.shared.server.data == {}
+
+
+def test_shared_expiry_is_respected():
+    """The shared tier forgets values when their TTL runs out."""
+    first, second = _processes()
+    first.policies['ticker'] = {'ttl': 0.05, 'priority': 'critical'}
+    first.set('ticker', 'BTC/USDT', 1)
+    time.sleep(0.1)
+    assert second.get('ticker', 'BTC/USDT') is None
+
+
+def test_shared_tier_failure_falls_back_to_local():
+    """Errors from the shared tier are counted and the local tier keeps working."""
+
+    class BrokenBackend(InMemoryCacheBackend):
+        def get(self, key):
+            raise ConnectionError("redis down")
+
+        def set(self, key, value, ttl_ms):
+            raise ConnectionError("redis down")
+
+    cache = SmartCache(shared=BrokenBackend())
+    cache.set('ticker', 'BTC/USDT', 1)
+    assert cache.get('ticker', 'BTC/USDT') == 1
+    assert cache.get('ticker', 'ETH/USDT') is None
+    assert cache.get_stats()['shared_errors'] == 1  # Skipped while backing off
+    assert cache.get_stats()['shared_tier'] == 'BrokenBackend'
+
+
+def test_redis_backend():
+    """Same behaviour against a real Redis server (skipped when none is reachable)."""
+    pytest.importorskip('redis')
+    try:
+        backends = [RedisCacheBackend.from_url(Settings.REDIS_URL, namespace='bingx:test:',
+                                               channel='bingx:test:invalidate') for _ in range(2)]
+    except SharedCacheError as e:
+        pytest.skip(str(e))
+
+    first, second = (SmartCache(shared=backend) for backend in backends)
+    try:
+        first.set('ticker', 'BTC/USDT', TICKER)
+        assert second.get('ticker', 'BTC/USDT') == TICKER
+        first.set('ticker', 'BTC/USDT', {'last': 1})
+        deadline = time.time() + 2
+        while second.get_stats()['remote_invalidations'] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        assert second.get('ticker', 'BTC/USDT') == {'last': 1}
+        first.invalidate('ticker')
+        assert backends[0].get(first._make_key('ticker', 'BTC/USDT')) is None
+    finally:
+        first.close()
+        second.close()
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Shared Cache Test")
+    print("=" * 50)
+
+    tests = [
+        test_codec_round_trips_and_compresses,
+        test_second_process_is_served_from_the_shared_tier,
+        test_sets_and_invalidations_reach_other_processes,
+        test_shared_expiry_is_respected,
+        test_shared_tier_failure_falls_back_to_local,
+        test_redis_backend,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except pytest.skip.Exception as e:
+            print(f"⏭️  {test.__name__}: {e}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Test script for signal claims and push delivery through the signal bus.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy.orm import sessionmaker
+
+from database.connection import create_sqlite_engine
+from database.models import Asset, Base, Signal
+from database.repository import SignalRepository
+from database.signal_bus import SignalBus, get_signal_bus
+
+
+def _database(tmp_path, signals=0):
+    engine = create_sqlite_engine(f"sqlite:///{tmp_path / 'signals.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+
+    with Session() as session:
+        asset = Asset(symbol='BTC/USDT', base_currency='BTC', quote_currency='USDT')
+        session.add(asset)
+        session.flush()
+        for _ in range(signals):
+            SignalRepository().create_signal(session, asset.id, 'BUY', Decimal('60'), ['ma_crossover'], {})
+        session.commit()
+        asset_id = asset.id
+    return Session, asset_id
+
+
+def _claim(Session, consumer, limit=10, lease_seconds=120):
+    with Session() as session:
+        claimed = SignalRepository().claim_pending_signals(session, consumer, limit=limit,
+                                                           lease_seconds=lease_seconds)
+        session.commit()
+    return claimed
+
+
+def test_claims_are_exclusive_and_carry_the_symbol(tmp_path):
+    """Two consumers split the pending signals; claimed rows come with the asset symbol."""
+    Session, _ = _database(tmp_path, signals=5)
+
+    first = _claim(Session, 'a', limit=3)
+    second = _claim(Session, 'b')
+    assert len(first) == 3 and len(second) == 2
+    assert not {s.id for s in first} & {s.id for s in second}
+    assert all(s.symbol == 'BTC/USDT' for s in first + second)
+    assert [s.timestamp for s in first] == sorted(s.timestamp for s in first)
+    assert _claim(Session, 'c') == []
+
+    with Session() as session:
+        owners = {row.claimed_by for row in session.query(Signal)}
+    assert owners == {'a', 'b'}
+
+
+def test_finished_signals_are_not_redelivered(tmp_path):
+    """Processed and rejected signals leave the queue; the rejection reason is kept."""
+    Session, _ = _database(tmp_path, signals=2)
+    processed, rejected = _claim(Session, 'a')
+
+    repo = SignalRepository()
+    with Session() as session:
+        assert repo.mark_signal_processed(session, processed.id)
+        assert repo.mark_signal_rejected(session, rejected.id, "Trading conditions not met")
+        session.commit()
+
+    assert _claim(Session, 'b', lease_seconds=0) == []
+    with Session() as session:
+        row = session.query(Signal).filter(Signal.id == rejected.id).one()
+    assert row.is_processed and row.rejection_reason == "Trading conditions not met"
+
+
+def test_expired_claims_are_redelivered(tmp_path):
+    """A claim whose consumer never finished becomes claimable after the lease."""
+    Session, _ = _database(tmp_path, signals=1)
+    [claimed] = _claim(Session, 'a')
+
+    assert _claim(Session, 'b', lease_seconds=60) == []
+    time.sleep(0.01)
+    [again] = _claim(Session, 'b', lease_seconds=0)
+    assert again.id == claimed.id
+
+
+def test_stale_signals_are_rejected_not_delivered(tmp_path):
+    """Unprocessed signals older than the max age are marked stale instead of being traded."""
+    Session, _ = _database(tmp_path, signals=3)
+    with Session() as session:
+        old = session.query(Signal).order_by(Signal.timestamp).first()
+        old_id = old.id
+        session.query(Signal).filter(Signal.id == old_id).update(
+            {Signal.timestamp: datetime.utcnow() - timedelta(days=30)}, synchronize_session=False)
+        session.commit()
+
+    with Session() as session:
+        claimed = SignalRepository().claim_pending_signals(session, 'a', max_age_seconds=300)
+        session.commit()
+    assert len(claimed) == 2 and old_id not in {s.id for s in claimed}
+
+    with Session() as session:
+        row = session.query(Signal).filter(Signal.id == old_id).one()
+    assert row.is_processed and row.rejection_reason == 'stale'
+
+
+def test_concurrent_consumers_never_share_a_signal(tmp_path):
+    """Consumers on several threads drain the table without duplicates or gaps."""
+    Session, _ = _database(tmp_path, signals=60)
+    seen = []
+    lock = threading.Lock()
+
+    def consumer(name):
+        while True:
+            claimed = _claim(Session, name, limit=4)
+            if not claimed:
+                return
+            with lock:
+                seen.extend(s.id for s in claimed)
+
+    threads = [threading.Thread(target=consumer, args=(f"c{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(seen) == len(set(seen)) == 60
+
+
+def test_publish_wakes_subscribers_only_on_commit(tmp_path):
+    """A committed signal wakes waiting consumers within milliseconds; a rolled back one does not."""
+    Session, asset_id = _database(tmp_path)
+    bus = get_signal_bus()
+
+    def insert(commit):
+        with Session() as session:
+            SignalRepository().create_signal(session, asset_id, 'SELL', Decimal('70'), ['rsi'], {})
+            session.commit() if commit else session.rollback()
+
+    async def main():
+        subscription = bus.subscribe()
+        try:
+            await asyncio.to_thread(insert, False)
+            assert not await subscription.wait(0.2)
+
+            started = time.perf_counter()
+            threading.Thread(target=insert, args=(True,)).start()
+            assert await subscription.wait(5)
+            return time.perf_counter() - started
+        finally:
+            subscription.close()
+
+    latency = asyncio.run(main())
+    assert latency < 1.0
+    assert bus.get_stats()['subscribers'] == 0
+
+    # Without PostgreSQL there is nothing to listen on
+    local = SignalBus()
+    asyncio.run(local.start(create_sqlite_engine("sqlite://")))
+    assert not local.is_listening
+
+
+def main():
+    """Main test function."""
+    import tempfile
+
+    print("🤖 BingX Trading Bot - Signal Bus Test")
+    print("=" * 50)
+
+    tests = [
+        test_claims_are_exclusive_and_carry_the_symbol,
+        test_finished_signals_are_not_redelivered,
+        test_expired_claims_are_redelivered,
+        test_stale_signals_are_rejected_not_delivered,
+        test_concurrent_consumers_never_share_a_signal,
+        test_publish_wakes_subscribers_only_on_commit,
+    ]
+
+    failed = 0
+    for test in tests:
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                test(Path(tmp))
+                print(f"✅ {test.__name__}")
+            except AssertionError as e:
+                failed += 1
+                print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
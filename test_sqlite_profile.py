@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQLite concurrency profile and the database write queue.
+"""
+
+import asyncio
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from database.connection import create_sqlite_engine
+from database.models import Asset, Base, Signal
+from database.repository import IndicatorRepository, SignalRepository
+from database.write_queue import DatabaseWriteQueue
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _database(tmp_path):
+    url = f"sqlite:///{tmp_path / 'profile.db'}"
+    engine = create_sqlite_engine(url)
+    Base.metadata.create_all(engine)
+    writer = create_sqlite_engine(url, writer=True)
+
+    with sessionmaker(bind=engine)() as session:
+        asset = Asset(symbol='BTC/USDT', base_currency='BTC', quote_currency='USDT')
+        session.add(asset)
+        session.commit()
+        asset_id = asset.id
+    return engine, writer, asset_id
+
+
+def _add_signal(session, asset_id, minute):
+    session.add(Signal(asset_id=asset_id, timestamp=START + timedelta(minutes=minute), signal_type='BUY',
+                       strength=Decimal('60'), rules_triggered=['ma_crossover']))
+    session.flush()
+    return minute
+
+
+def _signal_count(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT COUNT(*) FROM signals")).scalar()
+
+
+def test_sqlite_pragmas_and_pool(tmp_path):
+    """File databases get WAL, relaxed fsync, a busy timeout, a large cache and pooled readers."""
+    engine, writer, _ = _database(tmp_path)
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == 'wal'
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() > 0
+        assert conn.exec_driver_sql("PRAGMA cache_size").scalar() < -2000  # KiB, above the 2 MB default
+        assert conn.exec_driver_sql("PRAGMA mmap_size").scalar() > 0
+    assert isinstance(engine.pool, QueuePool) and engine.pool.size() > 1
+    assert writer.pool.size() == 1
+
+    memory = create_sqlite_engine("sqlite://")
+    with memory.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == 'memory'
+
+
+def test_readers_are_not_blocked_by_an_open_write(tmp_path):
+    """With WAL a pooled reader sees the last committed state while the writer holds its lock."""
+    engine, writer, asset_id = _database(tmp_path)
+    WriterSession = sessionmaker(bind=writer)
+
+    with WriterSession() as session:
+        _add_signal(session, asset_id, 0)
+        # BEGIN IMMEDIATE: the write lock is held from the start of the transaction
+        assert _signal_count(engine) == 0
+        session.commit()
+    assert _signal_count(engine) == 1
+
+
+def test_write_queue_group_commits_concurrent_writers(tmp_path):
+    """Writes from many threads are committed in far fewer transactions than jobs."""
+    engine, writer, asset_id = _database(tmp_path)
+    write_queue = DatabaseWriteQueue(sessionmaker(bind=writer, expire_on_commit=False), max_batch=50,
+                                     max_delay=0.02)
+
+    futures = []
+    lock = threading.Lock()
+
+    def producer(offset):
+        for i in range(50):
+            future = write_queue.submit(_add_signal, asset_id, offset * 1000 + i)
+            with lock:
+                futures.append(future)
+
+    threads = [threading.Thread(target=producer, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(f.result(timeout=10) for f in futures) == sorted(n * 1000 + i for n in range(4) for i in range(50))
+    write_queue.stop()
+
+    stats = write_queue.get_stats()
+    assert _signal_count(engine) == 200
+    assert stats['jobs'] == 200 and stats['batches'] < 200
+    assert not stats['running']
+
+
+def test_failing_jobs_only_fail_themselves(tmp_path):
+    """A raising job and a job that rolls the session back leave the other writes of the batch intact."""
+    engine, writer, asset_id = _database(tmp_path)
+    write_queue = DatabaseWriteQueue(sessionmaker(bind=writer, expire_on_commit=False), max_delay=0.05)
+
+    def broken(session):
+        _add_signal(session, asset_id, 500)
+        raise ValueError("bad row")
+
+    def rolls_back(session):
+        _add_signal(session, asset_id, 600)
+        session.rollback()  # what repository error handlers do
+        return 'rolled back'
+
+    futures = [write_queue.submit(_add_signal, asset_id, 1), write_queue.submit(broken),
+               write_queue.submit(_add_signal, asset_id, 2), write_queue.submit(rolls_back),
+               write_queue.submit(_add_signal, asset_id, 3)]
+
+    assert futures[0].result(timeout=10) == 1
+    with pytest.raises(ValueError):
+        futures[1].result(timeout=10)
+    assert futures[2].result(timeout=10) == 2
+    assert futures[3].result(timeout=10) == 'rolled back'
+    assert futures[4].result(timeout=10) == 3
+    write_queue.stop()
+
+    assert _signal_count(engine) == 3
+    assert write_queue.get_stats()['failed_jobs'] == 1
+
+
+def test_async_writes_do_not_block_the_event_loop(tmp_path):
+    """Awaiting run() resolves once the write is committed."""
+    engine, writer, asset_id = _database(tmp_path)
+    write_queue = DatabaseWriteQueue(sessionmaker(bind=writer, expire_on_commit=False))
+
+    async def main():
+        return await asyncio.gather(*(write_queue.run(_add_signal, asset_id, i) for i in range(20)))
+
+    assert asyncio.run(main()) == list(range(20))
+    write_queue.stop()
+    assert _signal_count(engine) == 20
+
+
+def test_analysis_side_effects_run_once_when_batch_is_retried(tmp_path, monkeypatch):
+    """Test-mode adjustments, statistics and the broadcast happen once, outside the retried write job."""
+    import analysis.worker as worker_module
+
+    engine, writer, asset_id = _database(tmp_path)
+    write_queue = DatabaseWriteQueue(sessionmaker(bind=writer, expire_on_commit=False), max_delay=0.05)
+    stats, broadcasts = [], []
+
+    async def broadcast(message):
+        broadcasts.append(message)
+
+    monkeypatch.setattr(worker_module, 'get_write_queue', lambda: write_queue)
+    monkeypatch.setattr(worker_module, 'is_test_mode_active', lambda: True)
+    monkeypatch.setattr(worker_module, 'get_test_mode_config', lambda: {})
+    monkeypatch.setattr(worker_module, 'increment_test_mode_stat', lambda name, increment=1: stats.append(name))
+    monkeypatch.setattr(worker_module.connection_manager, 'broadcast', broadcast)
+
+    worker = worker_module.AnalysisWorker.__new__(worker_module.AnalysisWorker)
+    worker.indicator_repo = IndicatorRepository()
+    worker.signal_repo = SignalRepository()
+    result = {'symbol': 'BTC/USDT', 'asset_id': asset_id, 'timestamp': START.isoformat(), 'indicators': {},
+              'signal': {'signal_type': 'BUY', 'confidence': 0.5, 'rules_triggered': ['ma_crossover']}}
+
+    def broken(session):
+        raise ValueError("bad row")  # Fails the batch, so every job in it runs again
+
+    async def main():
+        await asyncio.gather(worker._persist_analysis_result(result), write_queue.run(broken),
+                             return_exceptions=True)
+
+    asyncio.run(main())
+    write_queue.stop()
+
+    assert write_queue.get_stats()['retried_batches'] == 1
+    assert stats == ['signals_generated'] and len(broadcasts) == 1
+    assert broadcasts[0]['payload']['strength'] == 0.8 and result['signal']['confidence'] == 0.5
+    with sessionmaker(bind=engine)() as session:
+        strengths = [float(signal.strength) for signal in session.query(Signal)]
+    assert strengths == [0.8]
+
+
+def main():
+    """Main test function."""
+    import tempfile
+
+    print("🤖 BingX Trading Bot - SQLite Profile Test")
+    print("=" * 50)
+
+    tests = [
+        test_sqlite_pragmas_and_pool,
+        test_readers_are_not_blocked_by_an_open_write,
+        test_write_queue_group_commits_concurrent_writers,
+        test_failing_jobs_only_fail_themselves,
+        test_async_writes_do_not_block_the_event_loop,
+        test_analysis_side_effects_run_once_when_batch_is_retried,
+    ]
+
+    failed = 0
+    for test in tests:
+        with tempfile.TemporaryDirectory() as tmp, pytest.MonkeyPatch.context() as monkeypatch:
+            try:
+                if test is test_analysis_side_effects_run_once_when_batch_is_retried:
+                    test(Path(tmp), monkeypatch)
+                else:
+                    test(Path(tmp))
+                print(f"✅ {test.__name__}")
+            except AssertionError as e:
+                failed += 1
+                print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
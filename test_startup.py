@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the web API cold start: deferred imports and the background task registry.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from benchmarks.bench_startup import DEFERRED_MODULES, import_time_ms, profile_import
+from utils.background_tasks import BackgroundTaskError, BackgroundTaskRegistry
+
+
+def test_web_api_import_defers_heavy_modules():
+    """Importing the web API loads the client module but not ccxt, pandas or the workers."""
+    profile = profile_import('api.web_api')
+    assert 'api.client' in profile and 'utils.background_tasks' in profile
+    assert not [name for name in profile if name.split('.')[0] in DEFERRED_MODULES]
+    assert import_time_ms(profile, 'api.web_api') > 0
+
+
+def test_registry_starts_tasks_after_their_delay_and_cancels_on_stop():
+    """Tasks start together, honour their delay, and are cancelled by stop_all."""
+    registry = BackgroundTaskRegistry()
+    events = []
+
+    @registry.task('quick')
+    async def quick():
+        events.append('quick')
+
+    @registry.task('delayed', delay=0.05)
+    async def delayed():
+        events.append('delayed')
+
+    @registry.task('forever')
+    async def forever():
+        await asyncio.Event().wait()
+
+    async def main():
+        assert registry.start_all() == ['quick', 'delayed', 'forever']
+        assert registry.start_all() == []  # Still running
+        await asyncio.sleep(0.01)
+        assert events == ['quick']
+        await asyncio.sleep(0.1)
+        assert events == ['quick', 'delayed']
+        assert registry.get_stats()['running'] == ['forever']
+        await registry.stop_all()
+
+    asyncio.run(main())
+    stats = registry.get_stats()
+    assert stats['started'] == 3 and stats['cancelled'] == 1 and stats['running'] == []
+
+
+def test_registry_counts_failures_and_rejects_duplicates():
+    """A crashing task is logged and counted; names are unique."""
+    registry = BackgroundTaskRegistry()
+
+    async def crash():
+        raise RuntimeError("boom")
+
+    registry.register('crash', crash)
+    with pytest.raises(BackgroundTaskError):
+        registry.register('crash', crash)
+
+    async def main():
+        registry.start_all()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert registry.get_stats()['failed'] == 1
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Startup Test")
+    print("=" * 50)
+
+    tests = [
+        test_web_api_import_defers_heavy_modules,
+        test_registry_starts_tasks_after_their_delay_and_cancels_on_stop,
+        test_registry_counts_failures_and_rejects_duplicates,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
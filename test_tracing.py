@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for in-process tracing spans.
+"""
+
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from utils.tracing import Tracer
+
+
+def test_nested_spans_share_trace_across_await():
+    """Child spans created in awaited coroutines join the parent trace."""
+    tracer = Tracer(sample_rate=1.0)
+
+    async def submit_order():
+        with tracer.span('order.submit', side='buy'):
+            await asyncio.sleep(0)
+
+    async def process_signal():
+        with tracer.span('trading.process_signal') as root:
+            await submit_order()
+        return root
+
+    root = asyncio.run(process_signal())
+    spans = tracer.ring_buffer.get_spans()
+
+    assert [s.name for s in spans] == ['order.submit', 'trading.process_signal']
+    assert spans[0].trace_id == root.trace_id
+    assert spans[0].parent_id == root.span_id
+    assert spans[0].attributes == {'side': 'buy'}
+
+
+def test_unsampled_trace_records_nothing_unless_forced():
+    """Children of an unsampled root are no-ops; always_sample starts a new trace."""
+    tracer = Tracer(sample_rate=0.0)
+
+    with tracer.span('scan.process_symbol'):
+        with tracer.span('bingx.request'):
+            pass
+        with tracer.span('trading.process_signal', always_sample=True):
+            with tracer.span('order.create_market_order'):
+                pass
+
+    assert [s.name for s in tracer.ring_buffer.get_spans()] == [
+        'order.create_market_order', 'trading.process_signal'
+    ]
+    assert tracer.stats['traces_sampled'] == 1
+
+
+def test_child_only_spans_and_errors():
+    """root=False spans are skipped without a parent; exceptions mark the span."""
+    tracer = Tracer(sample_rate=1.0)
+
+    with tracer.span('indicators.calculate_all', root=False) as span:
+        assert not span.sampled
+
+    try:
+        with tracer.span('signal.generate'):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+
+    spans = tracer.ring_buffer.get_spans()
+    assert len(spans) == 1
+    assert spans[0].status == 'error' and 'boom' in spans[0].error
+    assert tracer.ring_buffer.latency_percentiles('signal.generate')['count'] == 1
+
+
+def test_otlp_json_file_export():
+    """Finished spans are written as OTLP/JSON resourceSpans on flush."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'traces.jsonl'
+        tracer = Tracer(sample_rate=1.0, otlp_file=str(path))
+
+        with tracer.span('bingx.request', endpoint='fetch_ticker'):
+            pass
+        tracer.flush()
+
+        document = json.loads(path.read_text().splitlines()[0])
+        span = document['resourceSpans'][0]['scopeSpans'][0]['spans'][0]
+        assert span['name'] == 'bingx.request'
+        assert span['attributes'][0] == {'key': 'endpoint', 'value': {'stringValue': 'fetch_ticker'}}
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Tracing Test")
+    print("=" * 50)
+
+    tests = [
+        test_nested_spans_share_trace_across_await,
+        test_unsampled_trace_records_nothing_unless_forced,
+        test_child_only_spans_and_errors,
+        test_otlp_json_file_export,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
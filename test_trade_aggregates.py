@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for SQL-side trade P&L aggregation.
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.models import Asset, Base, Trade
+from database.repository import TradeRepository
+
+PNLS = ['12.5', '-4', '0', '30', '-10.25', '7']
+
+
+def _session_with_trades():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+
+    asset = Asset(symbol='BTC/USDT', base_currency='BTC', quote_currency='USDT')
+    session.add(asset)
+    session.flush()
+
+    now = datetime.now(timezone.utc)
+    for i, pnl in enumerate(PNLS):
+        # One trade per day going back, the oldest is 50 days old
+        entry_time = now - timedelta(days=50 if i == len(PNLS) - 1 else i * 3, hours=1)
+        session.add(Trade(
+            asset_id=asset.id, side='BUY', entry_price=Decimal('100'), quantity=Decimal('1'),
+            status='CLOSED', entry_time=entry_time, exit_time=entry_time + timedelta(minutes=30),
+            pnl=Decimal(pnl),
+        ))
+    session.add(Trade(asset_id=asset.id, side='BUY', entry_price=Decimal('100'),
+                      quantity=Decimal('1'), status='OPEN', entry_time=now))
+    session.commit()
+    return session
+
+
+def test_performance_stats_match_python_reference():
+    """Aggregate stats over 30 days equal the per-trade computation."""
+    session = _session_with_trades()
+    stats = TradeRepository().get_performance_stats(session, days=30)
+
+    pnls = [Decimal(p) for p in PNLS[:-1]]
+    assert stats['total_trades'] == len(pnls)
+    assert stats['winning_trades'] == 2
+    assert stats['losing_trades'] == 2
+    assert stats['total_pnl'] == float(sum(pnls))
+    assert stats['max_win'] == 30.0
+    assert stats['max_loss'] == -10.25
+
+
+def test_recent_closed_stats_respect_limit():
+    """Only the most recent closed trades are aggregated."""
+    session = _session_with_trades()
+    stats = TradeRepository().get_recent_closed_pnl_stats(session, limit=2)
+
+    assert stats['total_trades'] == 2
+    assert stats['gross_profit'] == Decimal('12.5')
+    assert stats['gross_loss'] == Decimal('-4')
+
+
+def test_period_pnl_in_one_query():
+    """Several look-back periods are summed in a single query."""
+    session = _session_with_trades()
+    now = datetime.now(timezone.utc)
+    periods = TradeRepository().get_closed_pnl_by_period(session, {
+        'daily': now - timedelta(days=1),
+        'weekly': now - timedelta(days=7),
+        'monthly': now - timedelta(days=30),
+    })
+
+    assert periods['daily'] == Decimal('12.5')
+    assert periods['weekly'] == Decimal('8.5')
+    assert periods['monthly'] == sum(Decimal(p) for p in PNLS[:-1])
+
+
+def test_empty_history_returns_zeros():
+    """No trades yields zero aggregates rather than errors."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    repo = TradeRepository()
+
+    assert repo.get_performance_stats(session)['total_trades'] == 0
+    assert repo.get_pnl_between(session, datetime.now(timezone.utc) - timedelta(days=1)) == Decimal('0')
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Trade Aggregates Test")
+    print("=" * 50)
+
+    tests = [
+        test_performance_stats_match_python_reference,
+        test_recent_closed_stats_respect_limit,
+        test_period_pnl_in_one_query,
+        test_empty_history_returns_zeros,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
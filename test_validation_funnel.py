@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test script for the staged asset validation funnel.
+"""
+
+import asyncio
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from api.market_data import MarketDataError, summarize_ticker
+from api.market_metadata import MarketMetadataStore
+from scanner.validator import AssetValidator
+
+LIQUID = [f"LIQ{i}/USDT" for i in range(5)]
+ILLIQUID = [f"ILL{i}/USDT" for i in range(90)]
+UNIVERSE = LIQUID + ILLIQUID + ['THIN/USDT', 'SPREAD/USDT']
+
+
+def _ticker(symbol, quote_volume, bid='99.9', ask='100.1'):
+    return {
+        'symbol': symbol, 'timestamp': 0, 'datetime': None,
+        'last': Decimal('100'), 'bid': Decimal(bid) if bid else None, 'ask': Decimal(ask) if ask else None,
+        'volume': Decimal(quote_volume) / 100, 'quote_volume': Decimal(quote_volume),
+        'change': Decimal('1'), 'percentage': Decimal('1'),
+        'high': Decimal('101'), 'low': Decimal('99'), 'open': Decimal('99'),
+    }
+
+
+class FakeMarketAPI:
+    """Market data API double that counts calls per kind."""
+
+    def __init__(self, tickers, bulk_available=True):
+        self.tickers = tickers
+        self.bulk_available = bulk_available
+        self.calls = {'bulk': 0, 'summary': 0, 'candles': 0, 'orderbook': 0}
+
+    async def get_market_summaries(self):
+        self.calls['bulk'] += 1
+        if not self.bulk_available:
+            raise MarketDataError("fetchTickers not supported")
+        return {symbol: summarize_ticker(symbol, t) for symbol, t in self.tickers.items()}
+
+    async def get_market_summary(self, symbol):
+        self.calls['summary'] += 1
+        if symbol == 'FLAKY/USDT':
+            raise MarketDataError("Request timed out")
+        if symbol not in self.tickers:
+            raise MarketDataError(f"bingx does not have market symbol {symbol}")
+        return summarize_ticker(symbol, self.tickers[symbol])
+
+    async def get_volume_analysis(self, symbol, timeframe, periods):
+        self.calls['candles'] += 1
+        return {'symbol': symbol, 'average_volume': 10.0}
+
+    async def get_orderbook(self, symbol, depth=20):
+        self.calls['orderbook'] += 1
+        size = Decimal('0.1') if symbol == 'THIN/USDT' else Decimal('50')
+        spread = Decimal('5') if symbol == 'SPREAD/USDT' else Decimal('0.1')
+        return {
+            'bids': [[Decimal('100'), size]], 'asks': [[Decimal('100') + spread, size]],
+            'spread_percent': spread,
+        }
+
+
+def _validator(market_api, strict=True):
+    validator = AssetValidator(strict=strict)
+    validator.market_api = market_api
+    store = MarketMetadataStore()
+    store.apply([{'symbol': f"{s}:USDT", 'base': s.split('/')[0], 'quote': 'USDT', 'type': 'swap', 'active': True}
+                 for s in UNIVERSE + ['FLAKY/USDT']])
+    validator.market_store = store
+    return validator
+
+
+def _universe_tickers(with_spread=True):
+    bid, ask = ('99.9', '100.1') if with_spread else (None, None)
+    tickers = {s: _ticker(s, '5000000', bid, ask) for s in LIQUID + ['THIN/USDT']}
+    tickers.update({s: _ticker(s, '10', bid, ask) for s in ILLIQUID})
+    # The ticker spread looks fine; only the order book shows the real one
+    tickers['SPREAD/USDT'] = _ticker('SPREAD/USDT', '5000000', None, None)
+    return tickers
+
+
+def test_funnel_only_deep_checks_survivors():
+    """Screening and the bulk snapshot reject most symbols; only survivors cost per-symbol requests."""
+    api = FakeMarketAPI(_universe_tickers())
+    validator = _validator(api)
+    validator.criteria.BLACKLISTED_SYMBOLS = ['LIQ4/USDT']
+
+    results = asyncio.run(validator.validate_multiple_assets(UNIVERSE + ['bad symbol', 'GONE/USDT']))
+
+    assert len(results) == len(UNIVERSE) + 2
+    assert {s for s, r in results.items() if r['is_valid']} == set(LIQUID[:4])
+    assert results['LIQ4/USDT']['reason'] == "Symbol is blacklisted"
+    assert results['GONE/USDT']['reason'] == "Symbol not available on exchange"
+    assert 'volume_24h' in results['ILL0/USDT']['reason']
+    assert results['ILL0/USDT']['data']['funnel_stage'] == 'market_snapshot'
+    assert 'liquidity' in results['THIN/USDT']['reason']
+    assert 'spread' in results['SPREAD/USDT']['reason']
+    assert set(results['LIQ0/USDT']['data']['validation_checks']) >= {'volume_24h', 'spread', 'liquidity',
+                                                                      'volume_consistency'}
+
+    # One bulk request plus two per survivor, instead of two per symbol
+    assert api.calls == {'bulk': 1, 'summary': 0, 'candles': 6, 'orderbook': 6}
+    stages = validator.get_funnel_stats()['stages']
+    assert (stages['screening']['checked'], stages['screening']['passed']) == (len(UNIVERSE) + 2, len(UNIVERSE) - 1)
+    assert stages['market_snapshot']['passed'] == 6 and stages['deep_checks']['passed'] == 4
+    assert validator.get_funnel_stats()['requests'] == 13
+
+
+def test_spread_falls_back_to_order_book_and_bulk_failure_to_single_tickers():
+    """Without bid/ask in the snapshot the order book decides the spread; no bulk endpoint means per-symbol tickers."""
+    api = FakeMarketAPI(_universe_tickers(with_spread=False), bulk_available=False)
+    validator = _validator(api)
+
+    result = asyncio.run(validator.validate_asset('LIQ0/USDT'))
+    assert result['is_valid'] and result['data']['validation_checks']['spread']
+    assert api.calls == {'bulk': 1, 'summary': 1, 'candles': 1, 'orderbook': 1}
+
+    assert asyncio.run(validator.validate_asset('SPREAD/USDT'))['reason'] == "Failed checks: spread"
+
+
+def test_default_policy_only_screens():
+    """Without strict validation every listed symbol is accepted except bad formats and the blacklist."""
+    api = FakeMarketAPI(_universe_tickers())
+    validator = _validator(api, strict=False)
+    validator.criteria.BLACKLISTED_SYMBOLS = ['LIQ4/USDT']
+
+    results = asyncio.run(validator.validate_multiple_assets(UNIVERSE + ['bad symbol', 'GONE/USDT']))
+
+    invalid = {s: r['reason'] for s, r in results.items() if not r['is_valid']}
+    assert invalid == {'LIQ4/USDT': "Symbol is blacklisted", 'bad symbol': "Invalid symbol format",
+                       'GONE/USDT': "Symbol not available on exchange"}
+    assert results['ILL0/USDT']['data']['market_summary']['quote_volume_24h'] == Decimal('10')
+    assert api.calls == {'bulk': 1, 'summary': 0, 'candles': 0, 'orderbook': 0}
+
+
+def test_transient_ticker_error_does_not_reject():
+    """A ticker that fails for a reason other than an unknown symbol leaves the decision to the deep checks."""
+    tickers = _universe_tickers()
+    tickers['FLAKY/USDT'] = tickers['LIQ0/USDT']
+    api = FakeMarketAPI(tickers, bulk_available=False)
+
+    result = asyncio.run(_validator(api).validate_asset('FLAKY/USDT'))
+    assert result['is_valid'] and result['data']['market_summary'] is None
+    assert set(result['data']['validation_checks']) == {'volume_consistency', 'liquidity', 'spread'}
+
+    assert asyncio.run(_validator(api, strict=False).validate_asset('FLAKY/USDT'))['is_valid']
+
+
+def main():
+    """Main test function."""
+    print("🤖 BingX Trading Bot - Validation Funnel Test")
+    print("=" * 50)
+
+    tests = [
+        test_funnel_only_deep_checks_survivors,
+        test_spread_falls_back_to_order_book_and_bulk_failure_to_single_tickers,
+        test_default_policy_only_screens,
+        test_transient_ticker_error_does_not_reject,
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
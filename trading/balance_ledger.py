@@ -0,0 +1,225 @@
+# trading/balance_ledger.py
+"""Local balance ledger: seeded from fetch_balance, adjusted on fills and reconciled periodically."""
+
+import asyncio
+import time
+import uuid
+import weakref
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from config.trading_config import TradingConfig
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BalanceLedgerError(Exception):
+    """Exception for balance ledger errors."""
+    pass
+
+
+@dataclass
+class Reservation:
+    """Balance set aside for an order that has been sized but not filled yet."""
+    id: str
+    symbol: str
+    amount: Decimal
+    created_at: float  # time.monotonic()
+
+
+class BalanceLedger:
+    """
+    Optimistic local copy of the free balance of one currency.
+
+    fetch_balance is limited to one request per second, so sizing every
+    signal against the exchange serializes signal bursts. The ledger is
+    seeded from fetch_balance and then kept locally:
+
+    - reserve() sets the value of a sized order aside, so concurrent
+      signals are sized against what is left and cannot over-commit;
+    - commit() turns a reservation into a debit once the order fills,
+      release() returns it when the order fails;
+    - record_fill() debits fills made outside a reservation. Exits only
+      debit their fee and mark the ledger stale, since the realised PnL is
+      only known to the exchange;
+    - the free balance is replaced by fetch_balance every
+      reconcile_interval seconds (in the background, the local value keeps
+      serving meanwhile). Outstanding reservations survive a reconcile.
+
+    reserve/commit/release never await, so they are atomic within the
+    event loop.
+    """
+
+    def __init__(self, client, currency: str = 'USDT', reconcile_interval: Optional[float] = None,
+                 reservation_ttl: Optional[float] = None):
+        self.client = client
+        self.currency = currency
+        self.reconcile_interval = reconcile_interval or TradingConfig.BALANCE_RECONCILE_SECONDS
+        self.reservation_ttl = reservation_ttl or TradingConfig.BALANCE_RESERVATION_TTL_SECONDS
+        self.synced_at = 0.0  # time.monotonic() of the last reconcile
+        self._free: Optional[Decimal] = None
+        self._reservations: Dict[str, Reservation] = {}
+        self._sync_task: Optional[asyncio.Task] = None
+        self._debits_during_sync: Optional[Decimal] = None  # Debits made while fetch_balance is in flight
+        self.stats = {
+            'syncs': 0,
+            'sync_errors': 0,
+            'reservations': 0,
+            'rejected': 0,
+            'expired': 0,
+            'fills': 0,
+        }
+
+    @property
+    def free(self) -> Optional[Decimal]:
+        """Free balance including local debits (None until the first sync)."""
+        return self._free
+
+    @property
+    def reserved(self) -> Decimal:
+        """Total of outstanding reservations."""
+        self._expire_reservations()
+        return sum((r.amount for r in self._reservations.values()), Decimal('0'))
+
+    def available(self) -> Optional[Decimal]:
+        """Free balance minus outstanding reservations (None until the first sync)."""
+        if self._free is None:
+            return None
+        return self._free - self.reserved
+
+    def is_stale(self) -> bool:
+        return self._free is None or time.monotonic() - self.synced_at >= self.reconcile_interval
+
+    async def get_available(self) -> Optional[Decimal]:
+        """
+        Balance available for new orders.
+
+        Waits for fetch_balance only when the ledger has never been seeded;
+        a stale ledger is reconciled in the background.
+        """
+        if self._free is None:
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.error(f"Error seeding {self.currency} balance ledger: {e}")
+                return None
+        elif self.is_stale():
+            self.sync_in_background()
+        return self.available()
+
+    async def sync(self) -> Decimal:
+        """Reconcile with fetch_balance; concurrent callers share one request."""
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._sync())
+        # Shielded: a cancelled caller must not cancel the request other callers wait on
+        return await asyncio.shield(self._sync_task)
+
+    def sync_in_background(self):
+        """Start a reconcile without waiting for it."""
+        if self._sync_task is not None and not self._sync_task.done():
+            return
+        self._sync_task = asyncio.create_task(self._sync())
+        self._sync_task.add_done_callback(self._on_background_sync_done)
+
+    def request_reconcile(self):
+        """Mark the ledger stale so the next read reconciles it."""
+        self.synced_at = 0.0
+
+    async def _sync(self) -> Decimal:
+        self._debits_during_sync = Decimal('0')
+        try:
+            balance = await self.client.fetch_balance()
+            free = Decimal(str(balance.get(self.currency, {}).get('free', 0)))
+            # The response may predate fills debited while it was in flight; keep those debits
+            # (at worst a debit counts twice until the next reconcile, never a credit)
+            drift = None if self._free is None else free - self._debits_during_sync - self._free
+            self._free = free - self._debits_during_sync
+            self.synced_at = time.monotonic()
+            self.stats['syncs'] += 1
+            if drift:
+                logger.debug(f"{self.currency} ledger reconciled: {self._free} (drift {drift:+})")
+            return self._free
+        except Exception:
+            self.stats['sync_errors'] += 1
+            raise
+        finally:
+            self._debits_during_sync = None
+
+    def _on_background_sync_done(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background {self.currency} balance reconcile failed: {task.exception()}")
+
+    def reserve(self, amount: Decimal, symbol: str) -> Optional[Reservation]:
+        """Set amount aside for an order; None if the available balance does not cover it."""
+        available = self.available()
+        if available is None or amount > available:
+            self.stats['rejected'] += 1
+            return None
+        reservation = Reservation(id=str(uuid.uuid4()), symbol=symbol, amount=amount,
+                                  created_at=time.monotonic())
+        self._reservations[reservation.id] = reservation
+        self.stats['reservations'] += 1
+        return reservation
+
+    def release(self, reservation: Optional[Reservation]):
+        """Return an unused reservation (no-op if already committed or released)."""
+        if reservation is not None:
+            self._reservations.pop(reservation.id, None)
+
+    def commit(self, reservation: Optional[Reservation], cost: Decimal):
+        """The reserved order filled for cost: drop the reservation and debit the actual cost."""
+        self.release(reservation)
+        self._debit(cost)
+        self.stats['fills'] += 1
+
+    def record_fill(self, cost: Decimal, fee: Decimal = Decimal('0'), opening: bool = True):
+        """Apply a fill that had no reservation."""
+        self.stats['fills'] += 1
+        if opening:
+            self._debit(cost + fee)
+            return
+        self._debit(fee)
+        self.request_reconcile()
+
+    def _debit(self, amount: Decimal):
+        if self._free is None or not amount:
+            return
+        self._free -= amount
+        if self._debits_during_sync is not None:
+            self._debits_during_sync += amount
+
+    def _expire_reservations(self):
+        # Reservations whose order never reported back must not hold balance forever
+        cutoff = time.monotonic() - self.reservation_ttl
+        expired: List[str] = [rid for rid, r in self._reservations.items() if r.created_at < cutoff]
+        for rid in expired:
+            del self._reservations[rid]
+        if expired:
+            self.stats['expired'] += len(expired)
+            logger.warning(f"Expired {len(expired)} unclaimed {self.currency} balance reservations")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Ledger balances and counters."""
+        return {
+            **self.stats,
+            'currency': self.currency,
+            'free': float(self._free) if self._free is not None else None,
+            'reserved': float(self.reserved),
+            'open_reservations': len(self._reservations),
+            'age': round(time.monotonic() - self.synced_at, 1) if self.synced_at else None,
+        }
+
+
+# One ledger per exchange client, shared by the engine and the order manager
+_ledgers: 'weakref.WeakKeyDictionary[Any, BalanceLedger]' = weakref.WeakKeyDictionary()
+
+
+def get_balance_ledger(client) -> BalanceLedger:
+    """Get the USDT balance ledger of a client."""
+    ledger = _ledgers.get(client)
+    if ledger is None:
+        ledger = BalanceLedger(client)
+        _ledgers[client] = ledger
+    return ledger
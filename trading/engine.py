@@ -3,7 +3,9 @@
 
 import asyncio
 import logging
+import time
 import uuid
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Dict, List, Optional, Any, Tuple
@@ -12,8 +14,11 @@ from database.models import Trade, Signal, Asset
 from database.repository import TradeRepository, AssetRepository
 from database.connection import get_session
 from config.trading_config import TradingConfig
-from api.client import BingXClient, TradingAPIError
+from api.client import BingXClient, TradingAPIError, order_not_placed
+from api.market_metadata import get_market_store
+from trading.balance_ledger import Reservation, get_balance_ledger
 from utils.logger import get_logger
+from utils.tracing import traced, current_span
 from utils.validators import Validator, ValidationError
 
 # Import test mode functions for aggressive testing
@@ -38,6 +43,21 @@ class InsufficientBalanceError(TradingEngineError):
     pass
 
 
+@dataclass
+class LiquidationOrder:
+    """A close order prepared by an emergency stop and its outcome."""
+    trade_id: str
+    symbol: str
+    side: str
+    amount: float
+    success: bool = False
+    attempts: int = 0
+    latency: float = 0.0  # Seconds from the start of the stop to the exchange's acknowledgement
+    exit_price: Optional[Decimal] = None
+    closed_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+
 class TradingEngine:
     """
     Core trading engine responsible for:
@@ -55,7 +75,8 @@ class TradingEngine:
         
         # Trading state
         self._open_trades: Dict[str, Dict] = {}
-        self._balance_cache: Dict[str, Decimal] = {}
+        self.ledger = get_balance_ledger(client)
+        self.last_liquidation_report: Optional[Dict[str, Any]] = None
         self._is_running = False
         
         # Trading limits
@@ -82,6 +103,7 @@ class TradingEngine:
         self._is_running = False
         logger.info("TradingEngine stopped")
     
+    @traced('trading.process_signal', always_sample=True)
     async def process_signal(self, signal: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Process a trading signal and execute trade if conditions are met.
@@ -92,6 +114,8 @@ class TradingEngine:
         Returns:
             Dictionary with trade result or None if not executed
         """
+        current_span().set_attribute('symbol', signal.get('symbol'))
+        
         if not self._is_running:
             logger.warning("TradingEngine not running, ignoring signal")
             return None
@@ -106,18 +130,22 @@ class TradingEngine:
             if not await self._check_trading_limits(validated_signal):
                 return None
             
-            # Calculate position size
-            position_size = await self._calculate_position_size(
+            # Calculate position size (its value stays reserved in the ledger until the order settles)
+            sizing = await self._calculate_position_size(
                 validated_signal['symbol'], 
                 validated_signal['current_price']
             )
             
-            if not position_size:
+            if not sizing:
                 logger.warning(f"Could not calculate position size for {validated_signal['symbol']}")
                 return None
+            position_size, reservation = sizing
             
             # Execute trade
-            trade_result = await self._execute_trade(validated_signal, position_size)
+            try:
+                trade_result = await self._execute_trade(validated_signal, position_size, reservation)
+            finally:
+                self.ledger.release(reservation)  # No-op once the fill committed it
             
             if trade_result:
                 logger.info(f"✅ Trade executed: {trade_result['symbol']} {trade_result['side']} "
@@ -230,12 +258,18 @@ class TradingEngine:
             logger.error(f"Error checking trading limits: {e}")
             return False
     
-    async def _calculate_position_size(self, symbol: str, price: Decimal) -> Optional[Decimal]:
-        """Calculate appropriate position size based on risk management."""
+    async def _calculate_position_size(self, symbol: str, price: Decimal) -> Optional[Tuple[Decimal, Reservation]]:
+        """
+        Calculate appropriate position size based on risk management.
+        
+        Sizes against the ledger's available balance (free minus other
+        signals' reservations) and reserves the position value, so
+        concurrent signals cannot commit the same margin twice.
+        """
         try:
             # Get current balance
             usdt_balance = await self._get_usdt_balance()
-            if not usdt_balance:
+            if not usdt_balance or usdt_balance <= 0:
                 logger.error("Could not get USDT balance")
                 return None
             
@@ -245,8 +279,8 @@ class TradingEngine:
             # Calculate quantity
             quantity = max_position_value / price
             
-            # Check minimum order size
-            min_order_value = self._min_order_size
+            # Check minimum order size (exchange limits for the symbol when known)
+            min_order_value = max(self._min_order_size, get_market_store().min_notional(symbol, price))
             min_quantity = min_order_value / price
             
             if quantity < min_quantity:
@@ -256,15 +290,22 @@ class TradingEngine:
             # Round to appropriate precision
             quantity = self._round_quantity(symbol, quantity)
             
+            # No await between reading the balance above and reserving it here
+            reservation = self.ledger.reserve(quantity * price, symbol)
+            if reservation is None:
+                logger.warning(f"Balance already reserved by other orders, skipping {symbol}")
+                return None
+            
             logger.debug(f"Calculated position size for {symbol}: {quantity} (value: {quantity * price:.2f} USDT)")
             
-            return quantity
+            return quantity, reservation
             
         except Exception as e:
             logger.error(f"Error calculating position size: {e}")
             return None
     
-    async def _execute_trade(self, signal: Dict[str, Any], quantity: Decimal) -> Optional[Dict[str, Any]]:
+    async def _execute_trade(self, signal: Dict[str, Any], quantity: Decimal,
+                             reservation: Optional[Reservation] = None) -> Optional[Dict[str, Any]]:
         """Execute the actual trade on the exchange."""
         try:
             symbol = signal['symbol']
@@ -312,6 +353,8 @@ class TradingEngine:
                 # Update trade with execution details
                 actual_price = Decimal(str(order_result.get('average', current_price)))
                 actual_quantity = Decimal(str(order_result.get('amount', quantity)))
+                fee = Decimal(str((order_result.get('fee') or {}).get('cost') or 0))
+                self.ledger.commit(reservation, actual_price * actual_quantity + fee)
                 
                 with get_session() as session:
                     updated_trade = self.trade_repo.update(session, str(trade.id), 
@@ -420,33 +463,18 @@ class TradingEngine:
             return None
     
     async def _get_usdt_balance(self) -> Optional[Decimal]:
-        """Get available USDT balance."""
+        """Get USDT balance available for new orders (from the local ledger)."""
         try:
-            # Check cache first
-            if 'USDT' in self._balance_cache:
-                return self._balance_cache['USDT']
-            
-            balance = await self.client.fetch_balance()
-            usdt_balance = Decimal(str(balance.get('USDT', {}).get('free', 0)))
-            
-            # Update cache
-            self._balance_cache['USDT'] = usdt_balance
-            
-            return usdt_balance
-            
+            return await self.ledger.get_available()
         except Exception as e:
             logger.error(f"Error getting USDT balance: {e}")
             return None
     
     async def _refresh_balance(self):
-        """Refresh balance cache."""
+        """Reconcile the balance ledger with the exchange."""
         try:
-            balance = await self.client.fetch_balance()
-            for currency, data in balance.items():
-                if isinstance(data, dict) and 'free' in data:
-                    self._balance_cache[currency] = Decimal(str(data['free']))
-            
-            logger.debug(f"Balance refreshed: {dict(self._balance_cache)}")
+            balance = await self.ledger.sync()
+            logger.debug(f"Balance refreshed: {balance} {self.ledger.currency}")
             
         except Exception as e:
             logger.error(f"Error refreshing balance: {e}")
@@ -480,7 +508,10 @@ class TradingEngine:
     
     def _round_quantity(self, symbol: str, quantity: Decimal) -> Decimal:
         """Round quantity to appropriate precision for the symbol."""
-        # Default to 6 decimal places for most crypto pairs
+        rounded = get_market_store().round_quantity(symbol, quantity)
+        if rounded is not None:
+            return rounded
+        # Default to 6 decimal places for symbols without market metadata
         return quantity.quantize(Decimal('0.000001'))
     
     async def get_open_trades(self) -> List[Dict[str, Any]]:
@@ -506,6 +537,7 @@ class TradingEngine:
                 'open_trades': open_trades_count,
                 'max_trades': self._max_concurrent_trades,
                 'usdt_balance': float(usdt_balance) if usdt_balance else 0,
+                'balance_ledger': self.ledger.get_stats(),
                 'total_trades': total_trades,
                 'trading_enabled': self.config.TRADING_ENABLED,
                 'emergency_stop': self.config.EMERGENCY_STOP,
@@ -517,42 +549,132 @@ class TradingEngine:
             return {}
     
     async def emergency_stop_all(self) -> bool:
-        """Emergency stop - close all open positions."""
+        """
+        Emergency stop - close all open positions.
+        
+        Close orders are prepared up front and submitted concurrently (at
+        most EMERGENCY_CLOSE_CONCURRENCY in flight; the client's order rate
+        limit still applies), each with its own retries. Closed trades are
+        written in one transaction afterwards, so time to flat is about one
+        order round-trip instead of one per position. Close orders are
+        reduce-only, so a duplicate can never open an opposite position.
+        Positions that could not be closed stay tracked. Returns True if
+        every position closed.
+        """
         try:
             logger.warning("🚨 EMERGENCY STOP - Closing all positions")
+            started = time.perf_counter()
+            
+            orders = [
+                LiquidationOrder(
+                    trade_id=trade_id,
+                    symbol=trade_data['symbol'],
+                    side='sell' if trade_data['side'] == 'BUY' else 'buy',
+                    amount=float(trade_data['quantity'])
+                )
+                for trade_id, trade_data in self._open_trades.items()
+            ]
+            semaphore = asyncio.Semaphore(max(1, self.config.EMERGENCY_CLOSE_CONCURRENCY))
+            await asyncio.gather(*(self._submit_liquidation(order, semaphore, started) for order in orders))
+            time_to_flat = time.perf_counter() - started
+            
+            closed = [order for order in orders if order.success]
+            self._record_liquidations(closed)
+            for order in closed:
+                self._open_trades.pop(order.trade_id, None)
+            # Closed positions released margin and realised PnL only the exchange knows
+            self.ledger.request_reconcile()
+            
+            report = self._liquidation_report(orders, time_to_flat)
+            self.last_liquidation_report = report
+            logger.warning(f"Emergency stop completed - {report['closed']}/{report['positions']} positions closed, "
+                           f"time to flat {report['time_to_flat']:.3f}s (max order latency {report['max_latency']:.3f}s)")
+            for order in orders:
+                if not order.success:
+                    logger.error(f"Failed to close trade {order.trade_id} ({order.symbol}) "
+                                 f"after {order.attempts} attempts: {order.error}")
+            return len(closed) == len(orders)
             
-            closed_count = 0
-            for trade_id, trade_data in self._open_trades.items():
+        except Exception as e:
+            logger.error(f"Error during emergency stop: {e}")
+            return False
+    
+    async def _submit_liquidation(self, order: LiquidationOrder, semaphore: asyncio.Semaphore, started: float):
+        """
+        Close one position with a reduce-only market order.
+        
+        Only failures that show no order was placed are retried (with the
+        order retry settings); after an ambiguous failure such as a timeout
+        the position is left for the next stop attempt.
+        """
+        attempts = max(1, self.config.ORDER_RETRY_ATTEMPTS)
+        async with semaphore:
+            for attempt in range(attempts):
+                order.attempts = attempt + 1
                 try:
-                    # Close position at market
-                    side = 'sell' if trade_data['side'] == 'BUY' else 'buy'
-                    
-                    await self.client.create_market_order(
-                        symbol=trade_data['symbol'],
-                        side=side,
-                        amount=float(trade_data['quantity'])
+                    result = await self.client.create_market_order(
+                        symbol=order.symbol,
+                        side=order.side,
+                        amount=order.amount,
+                        params={'reduceOnly': True}
                     )
-                    
-                    # Update trade as closed
-                    with get_session() as session:
-                        self.trade_repo.update(session, trade_id,
-                            status='CLOSED',
-                            exit_time=datetime.now(timezone.utc),
-                            exit_reason='EMERGENCY_STOP'
-                        )
-                        session.commit()
-                    
-                    closed_count += 1
-                    
+                    order.success = True
+                    order.latency = time.perf_counter() - started
+                    order.closed_at = datetime.now(timezone.utc)
+                    order.exit_price = (result or {}).get('average')
+                    return
                 except Exception as e:
-                    logger.error(f"Failed to close trade {trade_id}: {e}")
-            
-            # Clear open trades
-            self._open_trades.clear()
-            
-            logger.warning(f"Emergency stop completed - {closed_count} positions closed")
-            return True
-            
+                    order.error = str(e)
+                    if not order_not_placed(e):
+                        logger.error(f"Close order for {order.symbol} may have been placed, not retrying: {e}")
+                        break
+                    if attempt < attempts - 1:
+                        await asyncio.sleep(self.config.ORDER_RETRY_DELAY * (2 ** attempt))
+            order.latency = time.perf_counter() - started
+    
+    def _record_liquidations(self, orders: List[LiquidationOrder]):
+        """Mark the closed trades CLOSED in a single transaction."""
+        if not orders:
+            return
+        try:
+            with get_session() as session:
+                for order in orders:
+                    fields = {
+                        'status': 'CLOSED',
+                        'exit_time': order.closed_at,
+                        'exit_reason': 'EMERGENCY_STOP',
+                    }
+                    if order.exit_price:
+                        fields['exit_price'] = order.exit_price
+                    self.trade_repo.update(session, order.trade_id, **fields)
+                session.commit()
         except Exception as e:
-            logger.error(f"Error during emergency stop: {e}")
-            return False
\ No newline at end of file
+            # The positions are flat on the exchange either way; the records can be fixed from the exchange
+            logger.error(f"Error recording emergency stop closures: {e}")
+    
+    def _liquidation_report(self, orders: List[LiquidationOrder], time_to_flat: float) -> Dict[str, Any]:
+        """Latency summary of an emergency stop."""
+        latencies = sorted(order.latency for order in orders if order.success)
+        return {
+            'positions': len(orders),
+            'closed': len(latencies),
+            'failed': len(orders) - len(latencies),
+            'time_to_flat': time_to_flat,
+            'first_close': latencies[0] if latencies else 0.0,
+            'median_latency': latencies[len(latencies) // 2] if latencies else 0.0,
+            'max_latency': latencies[-1] if latencies else 0.0,
+            'retries': sum(order.attempts - 1 for order in orders),
+            'orders': [
+                {
+                    'trade_id': order.trade_id,
+                    'symbol': order.symbol,
+                    'side': order.side,
+                    'success': order.success,
+                    'attempts': order.attempts,
+                    'latency': order.latency,
+                    'error': order.error,
+                }
+                for order in orders
+            ],
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+        }
@@ -0,0 +1,277 @@
+# trading/equity_curve.py
+"""Incremental equity curve with O(1) peak and drawdown tracking."""
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from config.trading_config import TradingConfig
+from database.connection import get_session
+from database.repository import EquitySnapshotRepository, TradeRepository
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class EquityCurveError(Exception):
+    """Exception for equity curve errors."""
+    pass
+
+
+@dataclass
+class EquityPoint:
+    """A point on the equity curve."""
+    timestamp: datetime
+    kind: str  # 'REALIZED' or 'SAMPLE'
+    equity: Decimal
+    realized_pnl: Decimal
+    unrealized_pnl: Decimal
+
+
+class DrawdownTracker:
+    """Running peak, current drawdown and max drawdown, updated in O(1) per point."""
+
+    def __init__(self, peak: Decimal = Decimal('0'), max_drawdown: Decimal = Decimal('0')):
+        self.peak = peak
+        self.max_drawdown = max_drawdown
+        self.current_drawdown = Decimal('0')
+
+    def update(self, equity: Decimal) -> Decimal:
+        """Feed the next equity value; returns the current drawdown (fraction of peak)."""
+        if equity > self.peak:
+            self.peak = equity
+        self.current_drawdown = (self.peak - equity) / self.peak if self.peak > 0 else Decimal('0')
+        if self.current_drawdown > self.max_drawdown:
+            self.max_drawdown = self.current_drawdown
+        return self.current_drawdown
+
+
+def downsample_points(points: Sequence[Tuple[datetime, Any]], max_points: int) -> List[Tuple[datetime, Any]]:
+    """
+    Reduce a time series to about max_points, keeping each bucket's min and max.
+
+    Keeping the extremes (rather than averaging) preserves the troughs that
+    define drawdown when a long history is shown on a small chart.
+    """
+    if max_points <= 0 or len(points) <= max_points:
+        return list(points)
+
+    bucket_size = -(-len(points) * 2 // max_points)  # ceil; two points per bucket
+    sampled = []
+    for start in range(0, len(points), bucket_size):
+        bucket = points[start:start + bucket_size]
+        low = min(bucket, key=lambda p: p[1])
+        high = max(bucket, key=lambda p: p[1])
+        sampled.extend(sorted({low, high}, key=lambda p: p[0]))
+    return sampled
+
+
+class EquityCurve:
+    """
+    Equity curve built from realized P&L and periodic unrealized samples.
+
+    Equity = starting equity + cumulative realized P&L + current unrealized P&L.
+    Realized P&L is picked up incrementally from trades closed since the last
+    watermark, so each update touches only new closes. Every point is appended
+    to an in-memory window and persisted with the running peak and max
+    drawdown, which lets a restart resume without rescanning history.
+    """
+
+    def __init__(self, trade_repo: Optional[TradeRepository] = None,
+                 snapshot_repo: Optional[EquitySnapshotRepository] = None,
+                 sample_interval_seconds: Optional[int] = None,
+                 memory_points: Optional[int] = None, persist: bool = True):
+        self.trade_repo = trade_repo or TradeRepository()
+        self.snapshot_repo = snapshot_repo or EquitySnapshotRepository()
+        self.sample_interval = timedelta(
+            seconds=sample_interval_seconds or TradingConfig.EQUITY_SAMPLE_INTERVAL_SECONDS
+        )
+        self.persist = persist
+
+        self.starting_equity = Decimal('0')
+        self.realized_pnl = Decimal('0')
+        self.unrealized_pnl = Decimal('0')
+        self.drawdown = DrawdownTracker()
+
+        self._points: deque = deque(maxlen=memory_points or TradingConfig.EQUITY_CURVE_MEMORY_POINTS)
+        self._realized_watermark: Optional[datetime] = None
+        self._realized_seen_ids: Set[str] = set()  # Trades closed at the watermark already counted
+        self._last_sample_at: Optional[datetime] = None
+        self._loaded = False
+
+        self.stats = {
+            'points_recorded': 0,
+            'realized_updates': 0,
+            'samples': 0,
+            'persist_errors': 0,
+        }
+
+    @property
+    def equity(self) -> Decimal:
+        return self.starting_equity + self.realized_pnl + self.unrealized_pnl
+
+    @property
+    def max_drawdown(self) -> Decimal:
+        return self.drawdown.max_drawdown
+
+    @property
+    def current_drawdown(self) -> Decimal:
+        return self.drawdown.current_drawdown
+
+    def load(self, starting_equity: Optional[Decimal] = None):
+        """
+        Resume from the latest persisted point, or start a new curve.
+
+        Args:
+            starting_equity: Account equity to start from when there is no history
+        """
+        latest = None
+        latest_realized = None
+        if self.persist:
+            try:
+                with get_session() as session:
+                    latest = self.snapshot_repo.get_latest(session)
+                    latest_realized = self.snapshot_repo.get_latest(session, kind='REALIZED')
+                    if latest is not None:
+                        watermark = latest_realized.timestamp if latest_realized else latest.timestamp
+                        self._realized_seen_ids = self.trade_repo.get_ids_closed_at(session, watermark)
+            except Exception as e:
+                logger.warning(f"Could not load equity curve history: {e}")
+
+        if latest is not None:
+            self.realized_pnl = Decimal(str(latest.realized_pnl))
+            self.unrealized_pnl = Decimal(str(latest.unrealized_pnl))
+            self.starting_equity = Decimal(str(latest.equity)) - self.realized_pnl - self.unrealized_pnl
+            self.drawdown = DrawdownTracker(Decimal(str(latest.peak_equity)), Decimal(str(latest.max_drawdown)))
+            self.drawdown.update(Decimal(str(latest.equity)))
+            self._last_sample_at = latest.timestamp
+            # Trades closed before the last restart are already in realized_pnl
+            self._realized_watermark = latest_realized.timestamp if latest_realized else latest.timestamp
+            logger.info(f"📈 Equity curve resumed at {latest.equity} "
+                        f"(peak {latest.peak_equity}, max drawdown {Decimal(str(latest.max_drawdown)):.2%})")
+        else:
+            self.starting_equity = starting_equity or Decimal('0')
+            self.drawdown.update(self.starting_equity)
+            # Historical closes are already reflected in the starting balance
+            self._realized_watermark = datetime.now(timezone.utc)
+            if self.starting_equity <= 0:
+                logger.warning("⚠️ Equity curve started without a starting balance; drawdown stays 0 until equity is positive")
+            else:
+                logger.info(f"📈 Equity curve started at {self.starting_equity}")
+
+        self._loaded = True
+
+    def sync_realized(self) -> Optional[EquityPoint]:
+        """Add P&L of trades closed since the last sync; records a point when there were any."""
+        if not self._loaded:
+            raise EquityCurveError("Equity curve not loaded")
+
+        try:
+            with get_session() as session:
+                pnl, count, latest_exit, latest_ids = self.trade_repo.get_realized_since(
+                    session, self._realized_watermark, self._realized_seen_ids
+                )
+        except Exception as e:
+            logger.error(f"Error syncing realized P&L into equity curve: {e}")
+            return None
+
+        if not count:
+            return None
+
+        self._realized_watermark = latest_exit
+        self._realized_seen_ids = latest_ids
+        return self.record_realized(pnl, timestamp=latest_exit)
+
+    def record_realized(self, pnl: Decimal, timestamp: Optional[datetime] = None) -> EquityPoint:
+        """Record realized P&L (e.g. a closed trade) as a new equity point."""
+        self.realized_pnl += pnl
+        self.stats['realized_updates'] += 1
+        return self._append('REALIZED', timestamp)
+
+    def sample_unrealized(self, unrealized_pnl: Decimal, timestamp: Optional[datetime] = None,
+                          force: bool = False) -> Optional[EquityPoint]:
+        """
+        Update unrealized P&L; a point is recorded at most once per sample interval.
+
+        The drawdown tracker still sees every update, so intra-interval troughs count.
+        """
+        timestamp = timestamp or datetime.now(timezone.utc)
+        self.unrealized_pnl = unrealized_pnl
+        self.drawdown.update(self.equity)
+
+        if not force and self._last_sample_at is not None:
+            last = self._last_sample_at
+            if last.tzinfo is None:
+                last = last.replace(tzinfo=timezone.utc)
+            if timestamp - last < self.sample_interval:
+                return None
+
+        self._last_sample_at = timestamp
+        self.stats['samples'] += 1
+        return self._append('SAMPLE', timestamp)
+
+    def _append(self, kind: str, timestamp: Optional[datetime]) -> EquityPoint:
+        point = EquityPoint(
+            timestamp=timestamp or datetime.now(timezone.utc),
+            kind=kind,
+            equity=self.equity,
+            realized_pnl=self.realized_pnl,
+            unrealized_pnl=self.unrealized_pnl,
+        )
+        self.drawdown.update(point.equity)
+        self._points.append(point)
+        self.stats['points_recorded'] += 1
+
+        if self.persist:
+            self._persist(point)
+        return point
+
+    def _persist(self, point: EquityPoint):
+        try:
+            with get_session() as session:
+                self.snapshot_repo.add_snapshot(
+                    session,
+                    timestamp=point.timestamp,
+                    kind=point.kind,
+                    equity=point.equity,
+                    realized_pnl=point.realized_pnl,
+                    unrealized_pnl=point.unrealized_pnl,
+                    peak_equity=self.drawdown.peak,
+                    max_drawdown=self.drawdown.max_drawdown,
+                )
+                session.commit()
+        except Exception as e:
+            self.stats['persist_errors'] += 1
+            logger.error(f"Error persisting equity point: {e}")
+
+    def get_recent_points(self, limit: Optional[int] = None) -> List[EquityPoint]:
+        """Get in-memory points, newest last."""
+        points = list(self._points)
+        return points[-limit:] if limit else points
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get equity and drawdown state."""
+        return {
+            'equity': float(self.equity),
+            'starting_equity': float(self.starting_equity),
+            'realized_pnl': float(self.realized_pnl),
+            'unrealized_pnl': float(self.unrealized_pnl),
+            'peak_equity': float(self.drawdown.peak),
+            'current_drawdown': float(self.current_drawdown),
+            'max_drawdown': float(self.max_drawdown),
+            'points_in_memory': len(self._points),
+            **self.stats,
+        }
+
+
+def get_equity_curve_history(start_time: Optional[datetime] = None, end_time: Optional[datetime] = None,
+                             max_points: int = 500) -> List[Dict[str, Any]]:
+    """Load persisted equity points for a time range, downsampled for charting."""
+    with get_session() as session:
+        points = EquitySnapshotRepository().get_points(session, start_time, end_time)
+    return [
+        {'timestamp': timestamp.isoformat(), 'equity': float(equity)}
+        for timestamp, equity in downsample_points(points, max_points)
+    ]
@@ -13,7 +13,9 @@ from database.models import Order, Trade
 from database.repository import OrderRepository, TradeRepository
 from config.trading_config import TradingConfig
 from api.client import BingXClient, TradingAPIError
+from trading.balance_ledger import get_balance_ledger
 from utils.logger import get_logger
+from utils.tracing import traced
 from utils.validators import Validator, ValidationError
 
 logger = get_logger(__name__)
@@ -57,6 +59,7 @@ class OrderManager:
         self.order_repo = order_repo
         self.trade_repo = trade_repo
         self.config = TradingConfig
+        self.ledger = get_balance_ledger(client)
         
         # Order tracking
         self._active_orders: Dict[str, Dict] = {}
@@ -99,13 +102,15 @@ class OrderManager:
         
         logger.info("OrderManager stopped")
     
+    @traced('order.create_market_order')
     async def create_market_order(
         self, 
         trade_id: uuid.UUID, 
         symbol: str, 
         side: str, 
         quantity: Decimal,
-        callback: Optional[callable] = None
+        callback: Optional[callable] = None,
+        closing: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
         Create and submit a market order.
@@ -116,6 +121,7 @@ class OrderManager:
             side: 'buy' or 'sell'
             quantity: Order quantity
             callback: Optional callback function for order updates
+            closing: True if the order exits a position (balance is reconciled instead of debited)
             
         Returns:
             Order result dictionary or None if failed
@@ -143,7 +149,8 @@ class OrderManager:
                 'quantity': quantity,
                 'status': OrderStatus.PENDING.value,
                 'created_at': datetime.now(timezone.utc),
-                'attempts': 0
+                'attempts': 0,
+                'closing': closing
             }
             
             # Add callback if provided
@@ -164,6 +171,7 @@ class OrderManager:
             logger.error(f"Error creating market order: {e}")
             return None
     
+    @traced('order.create_stop_loss_order')
     async def create_stop_loss_order(
         self,
         trade_id: uuid.UUID,
@@ -441,6 +449,9 @@ class OrderManager:
                     filled_price = Decimal(str(result.get('average', 0)))
                     filled_quantity = Decimal(str(result.get('amount', 0)))
                     
+                    fees = Decimal(str(result.get('fee', {}).get('cost', 0)))
+                    self._record_fill(order_data, filled_quantity, filled_price, fees)
+                    
                     order_data['exchange_order_id'] = exchange_order_id
                     order_data['filled_price'] = filled_price
                     order_data['filled_quantity'] = filled_quantity
@@ -449,7 +460,7 @@ class OrderManager:
                         'exchange_order_id': exchange_order_id,
                         'average_price': filled_price,
                         'filled_quantity': filled_quantity,
-                        'fees': Decimal(str(result.get('fee', {}).get('cost', 0)))
+                        'fees': fees
                     })
                     
                     return {
@@ -660,6 +671,9 @@ class OrderManager:
             
             # Update if status changed
             if new_status != order_data['status']:
+                newly_filled = filled - Decimal(str(order_data.get('filled_quantity') or 0))
+                self._record_fill(order_data, newly_filled, average_price)
+                
                 update_data = {
                     'filled_quantity': filled,
                     'average_price': average_price if average_price > 0 else None
@@ -673,6 +687,19 @@ class OrderManager:
         except Exception as e:
             logger.error(f"Error processing order update for {order_id}: {e}")
     
+    def _record_fill(self, order_data: Dict[str, Any], quantity: Decimal, price: Decimal,
+                     fee: Decimal = Decimal('0')):
+        """Apply a fill to the balance ledger; stop loss, take profit and closing orders are exits."""
+        if quantity <= 0:
+            return
+        if price <= 0:
+            # No fill price reported: let the exchange tell us the new balance
+            self.ledger.request_reconcile()
+            return
+        opening = (order_data['type'] in (OrderType.MARKET.value, OrderType.LIMIT.value)
+                   and not order_data.get('closing'))
+        self.ledger.record_fill(quantity * price, fee, opening=opening)
+    
     async def _check_expired_orders(self):
         """Check for orders that have exceeded timeout."""
         try:
@@ -4,6 +4,7 @@
 import asyncio
 import logging
 import uuid
+from array import array
 from datetime import datetime, timezone, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional, Any, Tuple
@@ -19,7 +20,7 @@ from utils.logger import get_logger
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class PositionData:
     """Position data structure."""
     trade_id: str
@@ -37,7 +38,7 @@ class PositionData:
     last_update: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class PortfolioMetrics:
     """Portfolio-wide metrics."""
     total_positions: int
@@ -52,6 +53,59 @@ class PortfolioMetrics:
     monthly_pnl: Decimal
 
 
+class PriceHistory:
+    """
+    Price and P&L samples of one position, stored column-wise in float arrays.
+    
+    A sample costs 33 bytes here instead of about 550 as a dict holding a
+    datetime and three Decimals. The history is only read by the API, which
+    returns floats anyway.
+    """
+    
+    __slots__ = ('timestamps', 'prices', 'pnls', 'pnl_percents', 'finals')
+    
+    MAX_POINTS = 1000   # Trim to KEEP_POINTS once exceeded
+    KEEP_POINTS = 500
+    
+    def __init__(self):
+        self.timestamps = array('d')  # Epoch seconds
+        self.prices = array('d')
+        self.pnls = array('d')
+        self.pnl_percents = array('d')
+        self.finals = array('b')
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    def append(self, price, pnl, pnl_percent, final: bool = False, timestamp: Optional[float] = None):
+        """Add a sample (Decimal or float values)."""
+        self.timestamps.append(datetime.now(timezone.utc).timestamp() if timestamp is None else timestamp)
+        self.prices.append(float(price))
+        self.pnls.append(float(pnl))
+        self.pnl_percents.append(float(pnl_percent))
+        self.finals.append(1 if final else 0)
+        
+        # Keep history manageable
+        if len(self.timestamps) > self.MAX_POINTS:
+            drop = len(self.timestamps) - self.KEEP_POINTS
+            for column in (self.timestamps, self.prices, self.pnls, self.pnl_percents, self.finals):
+                del column[:drop]
+    
+    def tail(self, limit: int) -> List[Dict[str, Any]]:
+        """The last `limit` samples in API format."""
+        start = max(0, len(self.timestamps) - limit)
+        return [
+            {
+                'timestamp': datetime.fromtimestamp(self.timestamps[i], timezone.utc).isoformat(),
+                'price': self.prices[i],
+                'pnl': self.pnls[i],
+                'pnl_percent': self.pnl_percents[i],
+                'final': bool(self.finals[i])
+            }
+            for i in range(start, len(self.timestamps))
+        ]
+
+
 class PositionTrackerError(Exception):
     """Base exception for position tracker errors."""
     pass
@@ -86,7 +140,7 @@ class PositionTracker:
         self._update_interval = 5  # seconds
         
         # Performance tracking
-        self._position_history: Dict[str, List[Dict]] = {}
+        self._position_history: Dict[str, PriceHistory] = {}
         self._daily_snapshots: List[Dict] = []
         
         logger.info("PositionTracker initialized")
@@ -166,12 +220,9 @@ class PositionTracker:
             self._positions[trade_id] = position
             
             # Initialize position history
-            self._position_history[trade_id] = [{
-                'timestamp': datetime.now(timezone.utc),
-                'price': current_price,
-                'pnl': unrealized_pnl,
-                'pnl_percent': unrealized_pnl_percent
-            }]
+            history = PriceHistory()
+            history.append(current_price, unrealized_pnl, unrealized_pnl_percent)
+            self._position_history[trade_id] = history
             
             logger.info(f"✅ Position added to tracking: {trade.asset.symbol} {trade.side} "
                        f"{trade.quantity} @ {trade.entry_price}")
@@ -211,13 +262,9 @@ class PositionTracker:
                     position.entry_price, exit_price, position.side
                 )
                 
-                self._position_history[trade_id_str].append({
-                    'timestamp': datetime.now(timezone.utc),
-                    'price': exit_price,
-                    'pnl': final_pnl,
-                    'pnl_percent': final_pnl_percent,
-                    'final': True
-                })
+                self._position_history[trade_id_str].append(
+                    exit_price, final_pnl, final_pnl_percent, final=True
+                )
             
             # Remove from active tracking
             del self._positions[trade_id_str]
@@ -264,16 +311,9 @@ class PositionTracker:
             
             # Add to history if price changed significantly
             if abs(current_price - old_price) > old_price * Decimal('0.001'):  # 0.1% change
-                self._position_history[trade_id_str].append({
-                    'timestamp': datetime.now(timezone.utc),
-                    'price': current_price,
-                    'pnl': position.unrealized_pnl,
-                    'pnl_percent': position.unrealized_pnl_percent
-                })
-                
-                # Keep history manageable
-                if len(self._position_history[trade_id_str]) > 1000:
-                    self._position_history[trade_id_str] = self._position_history[trade_id_str][-500:]
+                self._position_history[trade_id_str].append(
+                    current_price, position.unrealized_pnl, position.unrealized_pnl_percent
+                )
             
             return position
             
@@ -407,9 +447,8 @@ class PositionTracker:
             avg_position_age = timedelta(seconds=total_duration / total_positions) if total_positions > 0 else timedelta()
             
             # Calculate period P&L
-            daily_pnl = await self._calculate_period_pnl(days=1)
-            weekly_pnl = await self._calculate_period_pnl(days=7)
-            monthly_pnl = await self._calculate_period_pnl(days=30)
+            period_pnl = await self._calculate_period_pnl(days=[1, 7, 30])
+            daily_pnl, weekly_pnl, monthly_pnl = period_pnl[1], period_pnl[7], period_pnl[30]
             
             self._portfolio_metrics = PortfolioMetrics(
                 total_positions=total_positions,
@@ -427,25 +466,33 @@ class PositionTracker:
         except Exception as e:
             logger.error(f"Error calculating portfolio metrics: {e}")
     
-    async def _calculate_period_pnl(self, days: int) -> Decimal:
-        """Calculate P&L for a specific period."""
+    async def _calculate_period_pnl(self, days: List[int]) -> Dict[int, Decimal]:
+        """Calculate P&L for several look-back periods (realized via one aggregate query)."""
         try:
-            cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
-            period_trades = await self.trade_repo.get_trades_since(cutoff_date)
+            now = datetime.now(timezone.utc)
+            cutoffs = {period: now - timedelta(days=period) for period in days}
+            with get_session() as session:
+                realized = self.trade_repo.get_closed_pnl_by_period(
+                    session, {f"days_{period}": cutoff for period, cutoff in cutoffs.items()}
+                )
             
-            total_pnl = Decimal('0')
-            for trade in period_trades:
-                if trade.status == 'CLOSED' and trade.pnl:
-                    total_pnl += trade.pnl
-                elif trade.status == 'OPEN' and str(trade.id) in self._positions:
-                    # Add unrealized P&L for open positions
-                    total_pnl += self._positions[str(trade.id)].unrealized_pnl
+            period_pnl = {}
+            for period, cutoff in cutoffs.items():
+                total_pnl = realized.get(f"days_{period}", Decimal('0'))
+                # Add unrealized P&L for open positions entered in the period
+                for position in self._positions.values():
+                    entry_time = position.entry_time
+                    if entry_time.tzinfo is None:
+                        entry_time = entry_time.replace(tzinfo=timezone.utc)
+                    if entry_time >= cutoff:
+                        total_pnl += position.unrealized_pnl
+                period_pnl[period] = total_pnl
             
-            return total_pnl
+            return period_pnl
             
         except Exception as e:
-            logger.error(f"Error calculating {days}-day P&L: {e}")
-            return Decimal('0')
+            logger.error(f"Error calculating period P&L for {days} days: {e}")
+            return {period: Decimal('0') for period in days}
     
     async def _check_position_alerts(self):
         """Check for position-based alerts."""
@@ -621,15 +668,4 @@ class PositionTracker:
         if trade_id_str not in self._position_history:
             return []
         
-        history = self._position_history[trade_id_str][-limit:]
-        
-        return [
-            {
-                'timestamp': entry['timestamp'].isoformat(),
-                'price': float(entry['price']),
-                'pnl': float(entry['pnl']),
-                'pnl_percent': float(entry['pnl_percent']),
-                'final': entry.get('final', False)
-            }
-            for entry in history
-        ]
\ No newline at end of file
+        return self._position_history[trade_id_str].tail(limit)
\ No newline at end of file
@@ -14,16 +14,43 @@ from database.repository import TradeRepository
 from database.connection import get_session
 from config.trading_config import TradingConfig, TrailingStopLevel
 from api.client import BingXClient
+from api.market_metadata import get_market_store
+from trading.equity_curve import EquityCurve
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+@dataclass(slots=True)
+class TrailingStopState:
+    """Trailing stop state of one open trade (prices stay Decimal: stop losses become order prices)."""
+    trade_id: str
+    side: str
+    entry_price: Decimal
+    current_price: Decimal
+    highest_price: Decimal
+    lowest_price: Decimal
+    current_stop_loss: Decimal
+    trailing_level: int = 0  # Index in TRAILING_STOP_LEVELS
+    breakeven_triggered: bool = False
+    last_update: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class PositionUpdate:
+    """Latest price-derived figures of one open trade."""
+    current_price: Decimal
+    pnl_percent: Decimal
+    unrealized_pnl: Decimal
+    last_update: datetime
+
+
 @dataclass
 class RiskMetrics:
     """Risk metrics for position and portfolio."""
     total_exposure: Decimal
-    max_drawdown: Decimal
+    max_drawdown: Decimal      # All-time peak-to-trough decline (reporting only)
+    current_drawdown: Decimal  # Decline from the running equity peak, gates new trades
     daily_pnl: Decimal
     win_rate: Decimal
     profit_factor: Decimal
@@ -56,6 +83,7 @@ class RiskManager:
         self._risk_metrics: RiskMetrics = RiskMetrics(
             total_exposure=Decimal('0'),
             max_drawdown=Decimal('0'),
+            current_drawdown=Decimal('0'),
             daily_pnl=Decimal('0'),
             win_rate=Decimal('0'),
             profit_factor=Decimal('0'),
@@ -64,8 +92,11 @@ class RiskManager:
         )
         
         # Trailing stop tracking
-        self._trailing_stops: Dict[str, Dict] = {}  # trade_id -> trailing_stop_data
-        self._position_updates: Dict[str, Dict] = {}  # trade_id -> latest_position_data
+        self._trailing_stops: Dict[str, TrailingStopState] = {}  # trade_id -> trailing stop state
+        self._position_updates: Dict[str, PositionUpdate] = {}  # trade_id -> latest position figures
+        
+        # Equity curve for real drawdown tracking
+        self.equity_curve = EquityCurve(trade_repo=trade_repo)
         
         # Risk limits
         self._daily_loss_limit = self.config.MAX_DAILY_LOSS_PERCENT / 100
@@ -82,6 +113,7 @@ class RiskManager:
         try:
             self._is_running = True
             await self._load_trailing_stops()
+            self.equity_curve.load(starting_equity=await self._get_account_equity())
             await self._calculate_initial_metrics()
             
             # Start risk monitoring task
@@ -125,18 +157,16 @@ class RiskManager:
             initial_stop_loss = self._calculate_initial_stop_loss(entry_price, side)
             
             # Initialize trailing stop data
-            self._trailing_stops[trade_id_str] = {
-                'trade_id': trade_id_str,
-                'side': side,
-                'entry_price': entry_price,
-                'current_price': entry_price,
-                'highest_price': entry_price if side == 'BUY' else entry_price,
-                'lowest_price': entry_price if side == 'SELL' else entry_price,
-                'current_stop_loss': initial_stop_loss,
-                'trailing_level': 0,  # Index in TRAILING_STOP_LEVELS
-                'breakeven_triggered': False,
-                'last_update': datetime.now(timezone.utc)
-            }
+            self._trailing_stops[trade_id_str] = TrailingStopState(
+                trade_id=trade_id_str,
+                side=side,
+                entry_price=entry_price,
+                current_price=entry_price,
+                highest_price=entry_price,
+                lowest_price=entry_price,
+                current_stop_loss=initial_stop_loss,
+                last_update=datetime.now(timezone.utc)
+            )
             
             logger.info(f"Trailing stop initialized for trade {trade_id}: entry={entry_price}, initial_sl={initial_stop_loss}")
             
@@ -165,23 +195,23 @@ class RiskManager:
                 return None
             
             trailing_data = self._trailing_stops[trade_id_str]
-            side = trailing_data['side']
+            side = trailing_data.side
             
             # Update current price
-            trailing_data['current_price'] = current_price
-            trailing_data['last_update'] = datetime.now(timezone.utc)
+            trailing_data.current_price = current_price
+            trailing_data.last_update = datetime.now(timezone.utc)
             
             # Update highest/lowest price
             if side == 'BUY':
-                if current_price > trailing_data['highest_price']:
-                    trailing_data['highest_price'] = current_price
+                if current_price > trailing_data.highest_price:
+                    trailing_data.highest_price = current_price
             else:
-                if current_price < trailing_data['lowest_price']:
-                    trailing_data['lowest_price'] = current_price
+                if current_price < trailing_data.lowest_price:
+                    trailing_data.lowest_price = current_price
             
             # Calculate current P&L percentage
             pnl_percent = self._calculate_pnl_percentage(
-                trailing_data['entry_price'],
+                trailing_data.entry_price,
                 current_price,
                 side
             )
@@ -189,10 +219,10 @@ class RiskManager:
             # Check for trailing stop adjustments
             new_stop_loss = await self._check_trailing_stop_adjustment(trade_id_str, pnl_percent)
             
-            if new_stop_loss and new_stop_loss != trailing_data['current_stop_loss']:
+            if new_stop_loss and new_stop_loss != trailing_data.current_stop_loss:
                 # Update stop loss
-                old_stop_loss = trailing_data['current_stop_loss']
-                trailing_data['current_stop_loss'] = new_stop_loss
+                old_stop_loss = trailing_data.current_stop_loss
+                trailing_data.current_stop_loss = new_stop_loss
                 
                 # Update stop loss order
                 success = await self.order_manager.update_stop_loss(trade_id, new_stop_loss)
@@ -209,16 +239,16 @@ class RiskManager:
                     }
                 else:
                     # Revert on failure
-                    trailing_data['current_stop_loss'] = old_stop_loss
+                    trailing_data.current_stop_loss = old_stop_loss
                     logger.error(f"Failed to update stop loss order for trade {trade_id}")
             
             # Update position tracking
-            self._position_updates[trade_id_str] = {
-                'current_price': current_price,
-                'pnl_percent': pnl_percent,
-                'unrealized_pnl': self._calculate_unrealized_pnl(trailing_data, current_price),
-                'last_update': datetime.now(timezone.utc)
-            }
+            self._position_updates[trade_id_str] = PositionUpdate(
+                current_price=current_price,
+                pnl_percent=pnl_percent,
+                unrealized_pnl=self._calculate_unrealized_pnl(trailing_data, current_price),
+                last_update=datetime.now(timezone.utc)
+            )
             
             return None
             
@@ -230,9 +260,9 @@ class RiskManager:
         """Check if trailing stop should be adjusted based on current P&L."""
         try:
             trailing_data = self._trailing_stops[trade_id_str]
-            current_level = trailing_data['trailing_level']
-            side = trailing_data['side']
-            entry_price = trailing_data['entry_price']
+            current_level = trailing_data.trailing_level
+            side = trailing_data.side
+            entry_price = trailing_data.entry_price
             
             # Check if we should move to a higher trailing level
             for i, level in enumerate(self.config.TRAILING_STOP_LEVELS):
@@ -242,7 +272,7 @@ class RiskManager:
                 # Check if profit threshold is met
                 if pnl_percent >= level.trigger:
                     # Update trailing level
-                    trailing_data['trailing_level'] = i
+                    trailing_data.trailing_level = i
                     
                     # Calculate new stop loss
                     if side == 'BUY':
@@ -251,7 +281,7 @@ class RiskManager:
                         new_stop_loss = entry_price * (1 - level.stop)
                     
                     # Ensure stop loss only moves in favorable direction
-                    current_stop_loss = trailing_data['current_stop_loss']
+                    current_stop_loss = trailing_data.current_stop_loss
                     
                     if side == 'BUY':
                         # For long positions, stop loss should only increase (move up)
@@ -288,10 +318,10 @@ class RiskManager:
         else:
             return (entry_price - current_price) / entry_price
     
-    def _calculate_unrealized_pnl(self, trailing_data: Dict, current_price: Decimal) -> Decimal:
+    def _calculate_unrealized_pnl(self, trailing_data: TrailingStopState, current_price: Decimal) -> Decimal:
         """Calculate unrealized P&L in USDT for a position."""
-        entry_price = trailing_data['entry_price']
-        side = trailing_data['side']
+        entry_price = trailing_data.entry_price
+        side = trailing_data.side
         
         # This would need position size from trade data
         # For now, return percentage-based calculation
@@ -315,9 +345,9 @@ class RiskManager:
             if self._risk_metrics.daily_pnl < -self._daily_loss_limit:
                 reasons.append(f"Daily loss limit exceeded: {self._risk_metrics.daily_pnl:.2%}")
             
-            # Check maximum drawdown
-            if self._risk_metrics.max_drawdown > self._max_drawdown_limit:
-                reasons.append(f"Maximum drawdown exceeded: {self._risk_metrics.max_drawdown:.2%}")
+            # Check drawdown from the equity peak (recovers with equity, unlike the all-time maximum)
+            if self._risk_metrics.current_drawdown > self._max_drawdown_limit:
+                reasons.append(f"Maximum drawdown exceeded: {self._risk_metrics.current_drawdown:.2%}")
             
             # Check concurrent trades limit
             if self._risk_metrics.active_trades_count >= self.config.MAX_CONCURRENT_TRADES:
@@ -377,8 +407,9 @@ class RiskManager:
             # Convert to quantity
             quantity = adjusted_position_value / entry_price
             
-            # Ensure minimum order size
-            min_quantity = self.config.MIN_ORDER_SIZE_USDT / entry_price
+            # Ensure minimum order size (exchange limits for the symbol when known)
+            min_order_value = max(self.config.MIN_ORDER_SIZE_USDT, get_market_store().min_notional(symbol, entry_price))
+            min_quantity = min_order_value / entry_price
             quantity = max(quantity, min_quantity)
             
             logger.debug(f"Calculated position size for {symbol}: {quantity} (risk_adj: {risk_adjustment:.2f})")
@@ -427,9 +458,9 @@ class RiskManager:
     async def _update_risk_metrics(self):
         """Update current risk metrics."""
         try:
-            # Get open trades
+            # Get open trades (rows carry the symbol, so no per-trade asset lookups)
             with get_session() as session:
-                open_trades = self.trade_repo.get_open_trades(session)
+                open_trades = self.trade_repo.get_open_trade_rows(session)
             
             # Calculate metrics
             total_exposure = Decimal('0')
@@ -437,7 +468,7 @@ class RiskManager:
             
             for trade in open_trades:
                 # Get current price
-                current_price = await self._get_current_price(trade.asset.symbol)
+                current_price = await self._get_current_price(trade.symbol)
                 if current_price:
                     position_value = trade.quantity * current_price
                     total_exposure += position_value
@@ -446,6 +477,10 @@ class RiskManager:
                     pnl = trade.calculate_pnl(current_price)
                     total_unrealized_pnl += pnl
             
+            # Advance the equity curve (new closes + unrealized sample)
+            self.equity_curve.sync_realized()
+            self.equity_curve.sample_unrealized(total_unrealized_pnl)
+            
             # Get daily P&L
             daily_pnl = await self._calculate_daily_pnl()
             
@@ -456,6 +491,7 @@ class RiskManager:
             self._risk_metrics = RiskMetrics(
                 total_exposure=total_exposure,
                 max_drawdown=await self._calculate_max_drawdown(),
+                current_drawdown=self.equity_curve.current_drawdown,
                 daily_pnl=daily_pnl,
                 win_rate=win_rate,
                 profit_factor=profit_factor,
@@ -475,8 +511,8 @@ class RiskManager:
             if self._risk_metrics.daily_pnl < -self._daily_loss_limit:
                 violations.append("daily_loss_limit")
             
-            # Check maximum drawdown
-            if self._risk_metrics.max_drawdown > self._max_drawdown_limit:
+            # Check drawdown from the equity peak
+            if self._risk_metrics.current_drawdown > self._max_drawdown_limit:
                 violations.append("max_drawdown")
             
             # Check risk score
@@ -521,7 +557,7 @@ class RiskManager:
                     
                     # This would get current price from market data
                     # For now, skip if no current price available
-                    if 'current_price' not in trailing_data:
+                    if trailing_data.current_price is None:
                         continue
                     
                     # Update position (this is called elsewhere, so just monitor here)
@@ -544,28 +580,21 @@ class RiskManager:
     async def _calculate_daily_pnl(self) -> Decimal:
         """Calculate daily P&L."""
         try:
-            # Get trades from today
-            today = datetime.now(timezone.utc).date()
+            # Sum P&L of trades entered today in the database
+            start_of_day = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
             with get_session() as session:
-                daily_trades = self.trade_repo.get_trades_by_date(session, today)
-            
-            total_pnl = Decimal('0')
-            for trade in daily_trades:
-                if trade.pnl:
-                    total_pnl += trade.pnl
-            
-            return total_pnl
+                return self.trade_repo.get_pnl_between(
+                    session, start_of_day, start_of_day + timedelta(days=1) - timedelta(microseconds=1)
+                )
             
         except Exception as e:
             logger.error(f"Error calculating daily P&L: {e}")
             return Decimal('0')
     
     async def _calculate_max_drawdown(self) -> Decimal:
-        """Calculate maximum drawdown."""
+        """Get maximum peak-to-trough decline of the equity curve (fraction)."""
         try:
-            # This would calculate the maximum peak-to-trough decline
-            # For now, return a placeholder
-            return Decimal('0.05')  # 5% placeholder
+            return self.equity_curve.max_drawdown
             
         except Exception as e:
             logger.error(f"Error calculating max drawdown: {e}")
@@ -574,25 +603,17 @@ class RiskManager:
     async def _calculate_performance_metrics(self) -> Tuple[Decimal, Decimal]:
         """Calculate win rate and profit factor."""
         try:
-            # Get closed trades
+            # Aggregate the last 100 closed trades in the database
             with get_session() as session:
-                closed_trades = self.trade_repo.get_closed_trades(session, limit=100)
+                stats = self.trade_repo.get_recent_closed_pnl_stats(session, limit=100)
             
-            if not closed_trades:
+            if not stats or not stats['total_trades']:
                 return Decimal('0'), Decimal('0')
             
-            winning_trades = 0
-            total_wins = Decimal('0')
-            total_losses = Decimal('0')
-            
-            for trade in closed_trades:
-                if trade.pnl and trade.pnl > 0:
-                    winning_trades += 1
-                    total_wins += trade.pnl
-                elif trade.pnl and trade.pnl < 0:
-                    total_losses += abs(trade.pnl)
+            total_wins = stats['gross_profit']
+            total_losses = abs(stats['gross_loss'])
             
-            win_rate = Decimal(winning_trades) / Decimal(len(closed_trades))
+            win_rate = Decimal(stats['winning_trades']) / Decimal(stats['total_trades'])
             profit_factor = total_wins / total_losses if total_losses > 0 else Decimal('0')
             
             return win_rate, profit_factor
@@ -641,7 +662,7 @@ class RiskManager:
         """Load trailing stops for open trades."""
         try:
             with get_session() as session:
-                open_trades = self.trade_repo.get_open_trades(session)
+                open_trades = self.trade_repo.get_open_trade_rows(session)
             
             for trade in open_trades:
                 # Initialize trailing stop
@@ -656,6 +677,15 @@ class RiskManager:
         except Exception as e:
             logger.error(f"Error loading trailing stops: {e}")
     
+    async def _get_account_equity(self) -> Optional[Decimal]:
+        """Get total USDT balance as the equity curve's starting point."""
+        try:
+            balance = await self.client.fetch_balance()
+            return Decimal(str(balance.get('USDT', {}).get('total', 0) or 0))
+        except Exception as e:
+            logger.error(f"Error getting account equity: {e}")
+            return None
+    
     async def _calculate_initial_metrics(self):
         """Calculate initial risk metrics."""
         await self._update_risk_metrics()
@@ -665,6 +695,8 @@ class RiskManager:
         return {
             'total_exposure': float(self._risk_metrics.total_exposure),
             'max_drawdown': float(self._risk_metrics.max_drawdown),
+            'current_drawdown': float(self._risk_metrics.current_drawdown),
+            'equity': float(self.equity_curve.equity),
             'daily_pnl': float(self._risk_metrics.daily_pnl),
             'win_rate': float(self._risk_metrics.win_rate),
             'profit_factor': float(self._risk_metrics.profit_factor),
@@ -683,15 +715,15 @@ class RiskManager:
             return None
         
         trailing_data = self._trailing_stops[trade_id_str]
-        position_data = self._position_updates.get(trade_id_str, {})
+        position_data = self._position_updates.get(trade_id_str)
         
         return {
             'trade_id': trade_id_str,
-            'entry_price': float(trailing_data['entry_price']),
-            'current_price': float(trailing_data.get('current_price', 0)),
-            'current_stop_loss': float(trailing_data['current_stop_loss']),
-            'trailing_level': trailing_data['trailing_level'],
-            'pnl_percent': float(position_data.get('pnl_percent', 0)),
-            'unrealized_pnl': float(position_data.get('unrealized_pnl', 0)),
-            'breakeven_triggered': trailing_data['breakeven_triggered']
+            'entry_price': float(trailing_data.entry_price),
+            'current_price': float(trailing_data.current_price or 0),
+            'current_stop_loss': float(trailing_data.current_stop_loss),
+            'trailing_level': trailing_data.trailing_level,
+            'pnl_percent': float(position_data.pnl_percent) if position_data else 0.0,
+            'unrealized_pnl': float(position_data.unrealized_pnl) if position_data else 0.0,
+            'breakeven_triggered': trailing_data.breakeven_triggered
         }
\ No newline at end of file
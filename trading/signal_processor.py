@@ -9,6 +9,7 @@ from decimal import Decimal
 
 from analysis.signals import SignalGenerator
 from api.market_data import get_market_data_api
+from api.market_data_hub import get_market_data_hub
 from trading.symbol_selector import get_symbol_selector
 from trading.worker import TradingWorker
 from trading.trading_cache import TradingCache
@@ -243,7 +244,7 @@ class SignalProcessor:
     async def _fetch_candles(self, symbol: str, timeframe: str, limit: int) -> Optional[List[Dict[str, Any]]]:
         """Fetch candle data for a symbol and timeframe."""
         try:
-            candles = await self.market_api.get_candles(symbol, timeframe, limit=limit)
+            candles = await get_market_data_hub().get_candles(symbol, timeframe, limit)
             return candles
         except Exception as e:
             logger.error(f"Error fetching {timeframe} candles for {symbol}: {e}")
@@ -17,7 +17,7 @@ from trading.symbol_selector import TradingSymbol
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class TradingSymbolData:
     """Extended data for a trading symbol including real-time metrics."""
     symbol: TradingSymbol
@@ -3,14 +3,18 @@
 
 import asyncio
 import logging
+import os
 import signal
+import socket
 import sys
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
 
 from database.connection import DatabaseManager
 from database.repository import TradeRepository, OrderRepository, AssetRepository, SignalRepository
+from database.signal_bus import get_signal_bus
 from api.client import BingXClient
+from config.settings import Settings
 from config.trading_config import TradingConfig
 from utils.logger import get_logger
 
@@ -66,7 +70,8 @@ class TradingWorker:
         
         # Worker state
         self._is_running = False
-        self._signal_listener_task: Optional[asyncio.Task] = None
+        self._signal_listener_tasks: List[asyncio.Task] = []
+        self.signal_bus = get_signal_bus()
         self._health_check_task: Optional[asyncio.Task] = None
         
         # Configuration
@@ -74,6 +79,7 @@ class TradingWorker:
         
         # Performance metrics
         self._stats = {
+            'signals_claimed': 0,
             'signals_processed': 0,
             'trades_executed': 0,
             'orders_created': 0,
@@ -147,8 +153,15 @@ class TradingWorker:
             self._is_running = True
             self._stats['uptime_start'] = datetime.now(timezone.utc)
             
-            # Start signal listener
-            self._signal_listener_task = asyncio.create_task(self._listen_for_signals())
+            # Start signal consumers (woken by the signal bus instead of polling)
+            try:
+                await self.signal_bus.start()
+            except Exception as e:
+                logger.warning(f"Cross-process signal notifications unavailable, relying on fallback poll: {e}")
+            self._signal_listener_tasks = [
+                asyncio.create_task(self._listen_for_signals(index))
+                for index in range(Settings.SIGNAL_CONSUMERS)
+            ]
             
             # Start health check task
             self._health_check_task = asyncio.create_task(self._health_check_loop())
@@ -179,12 +192,14 @@ class TradingWorker:
             self._is_running = False
             
             # Cancel background tasks
-            if self._signal_listener_task:
-                self._signal_listener_task.cancel()
+            for task in self._signal_listener_tasks:
+                task.cancel()
                 try:
-                    await self._signal_listener_task
+                    await task
                 except asyncio.CancelledError:
                     pass
+            self._signal_listener_tasks = []
+            await self.signal_bus.stop()
             
             if self._health_check_task:
                 self._health_check_task.cancel()
@@ -286,58 +301,71 @@ class TradingWorker:
             self._stats['errors_encountered'] += 1
             return None
     
-    async def _listen_for_signals(self):
-        """Listen for trading signals from the signal queue."""
-        logger.info("🎧 Starting signal listener...")
+    async def _listen_for_signals(self, consumer_index: int = 0):
+        """Claim and process signals as soon as the signal bus announces them."""
+        from database.connection import get_session
         
-        while self._is_running:
-            try:
-                # Get pending signals from database
-                from database.connection import get_session
-                with get_session() as session:
-                    pending_signals = self.signal_repo.get_pending_signals(session, limit=10)
-                
-                for signal in pending_signals:
-                    if not self._is_running:
-                        break
+        consumer_id = f"{socket.gethostname()}:{os.getpid()}:{consumer_index}"[-64:]
+        subscription = self.signal_bus.subscribe()
+        logger.info(f"🎧 Starting signal consumer {consumer_id}...")
+        
+        try:
+            while self._is_running:
+                try:
+                    # Claim first: signals committed before we subscribed are picked up too
+                    with get_session() as session:
+                        claimed = self.signal_repo.claim_pending_signals(
+                            session, consumer_id,
+                            limit=Settings.SIGNAL_CLAIM_BATCH,
+                            lease_seconds=Settings.SIGNAL_CLAIM_LEASE_SECONDS,
+                            max_age_seconds=Settings.SIGNAL_MAX_AGE_SECONDS
+                        )
                     
-                    try:
-                        # Convert signal to dict format
-                        signal_data = {
-                            'symbol': signal.asset.symbol,
-                            'signal_type': signal.signal_type,
-                            'strength': signal.strength,
-                            'rules_triggered': signal.rules_triggered,
-                            'indicators_snapshot': signal.indicators_snapshot,
-                            'timestamp': signal.timestamp
-                        }
-                        
-                        # Process the signal
-                        result = await self.process_signal(signal_data)
-                        
-                        # Update signal status
-                        with get_session() as session:
-                            if result:
-                                self.signal_repo.mark_signal_processed(session, signal.id, result['trade_id'])
-                            else:
-                                self.signal_repo.mark_signal_rejected(session, signal.id, "Trading conditions not met")
-                        
-                    except Exception as e:
-                        logger.error(f"Error processing signal {signal.id}: {e}")
-                        with get_session() as session:
-                            self.signal_repo.mark_signal_rejected(session, signal.id, f"Processing error: {str(e)}")
-                
-                # Wait before checking for more signals
-                await asyncio.sleep(5)
-                
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Error in signal listener: {e}")
-                self._stats['errors_encountered'] += 1
-                await asyncio.sleep(10)
+                    for signal in claimed:
+                        if not self._is_running:
+                            break  # Unfinished claims are redelivered once their lease expires
+                        await self._handle_claimed_signal(signal, get_session)
+                    
+                    if len(claimed) < Settings.SIGNAL_CLAIM_BATCH:
+                        # Wait for the next publish; the timeout is the fallback poll
+                        await subscription.wait(Settings.SIGNAL_FALLBACK_POLL_SECONDS)
+                    
+                except asyncio.CancelledError:
+                    break
+                except Exception as e:
+                    logger.error(f"Error in signal listener: {e}")
+                    self._stats['errors_encountered'] += 1
+                    await asyncio.sleep(10)
+        finally:
+            subscription.close()
         
-        logger.info("🎧 Signal listener stopped")
+        logger.info(f"🎧 Signal consumer {consumer_id} stopped")
+    
+    async def _handle_claimed_signal(self, signal, get_session):
+        """Process one claimed signal and record the outcome."""
+        self._stats['signals_claimed'] += 1
+        try:
+            signal_data = {
+                'symbol': signal.symbol,
+                'signal_type': signal.signal_type,
+                'strength': signal.strength,
+                'rules_triggered': signal.rules_triggered,
+                'indicators_snapshot': signal.indicators_snapshot,
+                'timestamp': signal.timestamp
+            }
+            
+            result = await self.process_signal(signal_data)
+            
+            with get_session() as session:
+                if result:
+                    self.signal_repo.mark_signal_processed(session, signal.id, result['trade_id'])
+                else:
+                    self.signal_repo.mark_signal_rejected(session, signal.id, "Trading conditions not met")
+            
+        except Exception as e:
+            logger.error(f"Error processing signal {signal.id}: {e}")
+            with get_session() as session:
+                self.signal_repo.mark_signal_rejected(session, signal.id, f"Processing error: {str(e)}")
     
     async def _health_check_loop(self):
         """Periodic health check of all components."""
@@ -492,6 +520,7 @@ class TradingWorker:
                 'is_running': self._is_running,
                 'uptime_seconds': uptime,
                 'stats': self._stats.copy(),
+                'signal_bus': self.signal_bus.get_stats(),
                 'portfolio_metrics': await self.position_tracker.get_portfolio_metrics() if self.position_tracker else None,
                 'risk_metrics': await self.risk_manager.get_risk_metrics() if self.risk_manager else None,
                 'trading_stats': await self.trading_engine.get_trading_stats() if self.trading_engine else None,
@@ -0,0 +1,104 @@
+# utils/background_tasks.py
+"""Registry of long-running background tasks started with the server and cancelled on shutdown."""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BackgroundTaskError(Exception):
+    """Exception for background task registry errors."""
+    pass
+
+
+@dataclass
+class BackgroundTaskSpec:
+    """A registered background task."""
+    name: str
+    factory: Callable[[], Awaitable[Any]]
+    delay: float = 0.0  # Seconds to wait after start_all before running
+
+
+class BackgroundTaskRegistry:
+    """
+    Declares the server's background tasks in one place.
+
+    Tasks are registered at import time (cheap: nothing runs) and started
+    together once the event loop is up, so startup does not depend on where
+    in the module a task happens to be defined. Started tasks are kept
+    referenced, failures are logged instead of disappearing with the task,
+    and stop_all cancels everything on shutdown.
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, BackgroundTaskSpec] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            'started': 0,
+            'failed': 0,
+            'cancelled': 0,
+        }
+
+    def register(self, name: str, factory: Callable[[], Awaitable[Any]], delay: float = 0.0):
+        """Register a coroutine function to run as a background task."""
+        if name in self._specs:
+            raise BackgroundTaskError(f"Duplicate background task: {name}")
+        self._specs[name] = BackgroundTaskSpec(name=name, factory=factory, delay=delay)
+
+    def task(self, name: str, delay: float = 0.0):
+        """Decorator form of register."""
+        def decorator(func: Callable[[], Awaitable[Any]]):
+            self.register(name, func, delay)
+            return func
+        return decorator
+
+    def start_all(self) -> List[str]:
+        """Start every registered task that is not already running (needs a running event loop)."""
+        started = []
+        for name, spec in self._specs.items():
+            running = self._tasks.get(name)
+            if running is not None and not running.done():
+                continue
+            task = asyncio.create_task(self._run(spec), name=f"background:{name}")
+            task.add_done_callback(lambda t, name=name: self._on_done(name, t))
+            self._tasks[name] = task
+            self.stats['started'] += 1
+            started.append(name)
+        if started:
+            logger.info(f"🚀 Background tasks started: {', '.join(started)}")
+        return started
+
+    async def stop_all(self, timeout: float = 5.0):
+        """Cancel all running tasks and wait (up to timeout) for them to finish."""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+        self._tasks.clear()
+
+    async def _run(self, spec: BackgroundTaskSpec):
+        if spec.delay > 0:
+            await asyncio.sleep(spec.delay)
+        await spec.factory()
+
+    def _on_done(self, name: str, task: asyncio.Task):
+        if task.cancelled():
+            self.stats['cancelled'] += 1
+            return
+        error = task.exception()
+        if error is not None:
+            self.stats['failed'] += 1
+            logger.error(f"Background task {name} failed: {error}", exc_info=error)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Registered and running tasks plus lifetime counters."""
+        return {
+            **self.stats,
+            'registered': list(self._specs),
+            'running': [name for name, task in self._tasks.items() if not task.done()],
+        }
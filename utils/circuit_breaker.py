@@ -0,0 +1,227 @@
+# utils/circuit_breaker.py
+"""Circuit breaker with a rolling error-rate window, half-open probes and exponential recovery."""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Exception raised when a request is rejected by an open circuit breaker."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuit breaker '{name}' open - retry in {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """Thresholds for one circuit breaker."""
+    window_seconds: float = 30.0   # Rolling window for the error rate
+    min_requests: int = 5          # Outcomes needed in the window before the rate counts
+    failure_rate: float = 0.5      # Open when this share of the window failed
+    base_recovery: float = 2.0     # First open period (seconds)
+    max_recovery: float = 120.0    # Cap for the doubled open period and for Retry-After
+    half_open_probes: int = 1      # Requests let through to test recovery
+
+
+class CircuitBreaker:
+    """
+    Closed → open → half-open breaker for one class of endpoints.
+
+    Closed: outcomes go into a rolling window; once it holds min_requests
+    and the failure share reaches failure_rate the breaker opens.
+    Open: requests are rejected until the recovery period ends. The period
+    starts at base_recovery and doubles each time a probe fails.
+    Half-open: up to half_open_probes requests go through. A success closes
+    the breaker and resets the period; a failure reopens it.
+
+    A server-supplied Retry-After opens the breaker for exactly that long
+    (capped at max_recovery) regardless of the window.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, config: Optional[CircuitBreakerConfig] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.config = config or CircuitBreakerConfig()
+        self._clock = clock
+        self._state = self.CLOSED
+        self._outcomes: deque = deque()  # (timestamp, failed)
+        self._failures = 0
+        self._opened_at = 0.0
+        self._open_for = 0.0
+        self._consecutive_opens = 0
+        self._probes_in_flight = 0
+        self._probe_started_at = 0.0
+        self.stats = {
+            'opened': 0,
+            'rejected': 0,
+            'probes': 0,
+            'retry_after_honoured': 0,
+        }
+
+    @property
+    def state(self) -> str:
+        """Current state; an open breaker turns half-open once its period has passed."""
+        now = self._clock()
+        if self._state == self.OPEN and now - self._opened_at >= self._open_for:
+            self._state = self.HALF_OPEN
+            self._probes_in_flight = 0
+            logger.info(f"Circuit breaker '{self.name}' half-open, probing")
+        elif (self._state == self.HALF_OPEN and self._probes_in_flight
+              and now - self._probe_started_at >= max(self._open_for, self.config.base_recovery)):
+            # A probe that never reported back (e.g. its task was cancelled) must not
+            # hold the breaker half-open forever
+            logger.warning(f"Circuit breaker '{self.name}' probe timed out, probing again")
+            self._probes_in_flight = 0
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == self.OPEN
+
+    def retry_in(self) -> float:
+        """Seconds until the breaker lets a probe through (0 when requests are allowed)."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self._open_for - (self._clock() - self._opened_at))
+
+    def before_request(self) -> bool:
+        """Admit a request or raise CircuitOpenError; returns True if the request is a half-open probe."""
+        state = self.state
+        if state == self.CLOSED:
+            return False
+        if state == self.HALF_OPEN and self._probes_in_flight < self.config.half_open_probes:
+            self._probes_in_flight += 1
+            self._probe_started_at = self._clock()
+            self.stats['probes'] += 1
+            return True
+        self.stats['rejected'] += 1
+        # Half-open with its probes taken: the caller should come back after about one base period
+        raise CircuitOpenError(self.name, self.retry_in() or self.config.base_recovery)
+
+    def release_probe(self):
+        """Give back the slot of a probe that ended without an outcome (e.g. cancelled)."""
+        if self._state == self.HALF_OPEN and self._probes_in_flight > 0:
+            self._probes_in_flight -= 1
+
+    def record_success(self):
+        """Record a request the endpoint answered."""
+        if self._state == self.HALF_OPEN:
+            logger.info(f"✅ Circuit breaker '{self.name}' closed after successful probe")
+            self._state = self.CLOSED
+            self._consecutive_opens = 0
+            self._probes_in_flight = 0
+            self._outcomes.clear()
+            self._failures = 0
+        self._add_outcome(False)
+
+    def record_failure(self, retry_after: Optional[float] = None):
+        """Record a failed request; retry_after is the server's requested pause, if any."""
+        if retry_after is not None and retry_after > 0:
+            self.stats['retry_after_honoured'] += 1
+            self._open(min(retry_after, self.config.max_recovery), reason=f"Retry-After {retry_after:.1f}s")
+            return
+        if self._state == self.HALF_OPEN:
+            self._open(self._next_recovery(), reason="probe failed")
+            return
+        self._add_outcome(True)
+        if self._state == self.CLOSED and self._should_open():
+            self._open(self._next_recovery(), reason=f"error rate {self.error_rate():.0%}")
+
+    def error_rate(self) -> float:
+        """Failure share of the outcomes in the rolling window."""
+        self._prune()
+        return self._failures / len(self._outcomes) if self._outcomes else 0.0
+
+    def _should_open(self) -> bool:
+        return len(self._outcomes) >= self.config.min_requests and self.error_rate() >= self.config.failure_rate
+
+    def _next_recovery(self) -> float:
+        return min(self.config.base_recovery * (2 ** self._consecutive_opens), self.config.max_recovery)
+
+    def _open(self, seconds: float, reason: str):
+        # A longer pause already in force is never shortened
+        if self._state == self.OPEN and self.retry_in() >= seconds:
+            return
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        self._open_for = seconds
+        self._consecutive_opens += 1
+        self._probes_in_flight = 0
+        self.stats['opened'] += 1
+        logger.warning(f"Circuit breaker '{self.name}' opened for {seconds:.1f}s ({reason})")
+
+    def _add_outcome(self, failed: bool):
+        self._outcomes.append((self._clock(), failed))
+        if failed:
+            self._failures += 1
+        self._prune()
+
+    def _prune(self):
+        cutoff = self._clock() - self.config.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            _, failed = self._outcomes.popleft()
+            if failed:
+                self._failures -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """State, window and lifetime counters."""
+        return {
+            **self.stats,
+            'state': self.state,
+            'retry_in': round(self.retry_in(), 2),
+            'error_rate': round(self.error_rate(), 3),
+            'window_requests': len(self._outcomes),
+            'consecutive_opens': self._consecutive_opens,
+        }
+
+
+def parse_retry_after(headers: Optional[Mapping[str, Any]], now: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds to pause according to rate-limit response headers, or None.
+
+    Understands Retry-After (delta seconds or HTTP date) and
+    X-RateLimit-Reset style headers (delta seconds, or an epoch timestamp in
+    seconds or milliseconds).
+    """
+    if not headers:
+        return None
+    now = time.time() if now is None else now
+    lowered = {str(key).lower(): value for key, value in headers.items()}
+
+    value = lowered.get('retry-after')
+    if value is not None:
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            try:
+                return max(0.0, parsedate_to_datetime(str(value)).timestamp() - now)
+            except (TypeError, ValueError):
+                return None
+
+    for key in ('x-ratelimit-reset-after', 'x-ratelimit-reset', 'x-rate-limit-reset'):
+        value = lowered.get(key)
+        if value is None:
+            continue
+        try:
+            reset = float(value)
+        except (TypeError, ValueError):
+            continue
+        if reset > 1e12:    # Epoch milliseconds
+            return max(0.0, reset / 1000 - now)
+        if reset > 1e9:     # Epoch seconds
+            return max(0.0, reset - now)
+        return max(0.0, reset)
+    return None
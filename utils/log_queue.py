@@ -0,0 +1,201 @@
+# utils/log_queue.py
+"""Non-blocking logging backend: records are queued on the caller and written by a listener thread."""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+# Argument types that cannot change between the log call and formatting in the writer thread
+_IMMUTABLE_ARGS = (str, int, float, bool, bytes, Decimal, type(None))
+
+
+class LogSampler(logging.Filter):
+    """
+    Rate-limits repetitive records per call site.
+
+    Each log statement (source file and line) gets a token bucket refilled
+    at the rate configured for its logger (longest matching name prefix
+    wins). Records over the rate are dropped and counted; the next record
+    that passes from the same statement carries the number it stands for.
+    Warnings and errors are never sampled.
+    """
+
+    def __init__(self, rates: Dict[str, float], default_rate: float = 0.0, min_level: int = logging.WARNING):
+        super().__init__()
+        self.rates = sorted(rates.items(), key=lambda item: -len(item[0]))
+        self.default_rate = default_rate
+        self.min_level = min_level
+        self._logger_rates: Dict[str, float] = {}
+        self._buckets: Dict[Tuple[str, int], List[float]] = {}  # [tokens, last refill, suppressed]
+        self.suppressed = 0
+
+    def rate_for(self, name: str) -> float:
+        rate = self._logger_rates.get(name)
+        if rate is None:
+            rate = self.default_rate
+            for prefix, prefix_rate in self.rates:
+                if name == prefix or name.startswith(prefix + '.'):
+                    rate = prefix_rate
+                    break
+            self._logger_rates[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.min_level:
+            return True
+        rate = self.rate_for(record.name)
+        if rate <= 0:
+            return True
+
+        key = (record.pathname, record.lineno)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [rate, record.created, 0]
+        tokens = min(rate, bucket[0] + (record.created - bucket[1]) * rate)
+        bucket[1] = record.created
+        if tokens < 1:
+            bucket[0] = tokens
+            bucket[2] += 1
+            self.suppressed += 1
+            return False
+
+        bucket[0] = tokens - 1
+        if bucket[2]:
+            record.msg = f"{record.msg} [+{int(bucket[2])} similar suppressed]"
+            bucket[2] = 0
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks and defers formatting to the writer thread.
+
+    The stock QueueHandler formats every record on the calling thread so it
+    can be pickled; records here stay in-process, so the message is only
+    rendered early when its arguments could change before the writer gets
+    to it. A full queue drops the record instead of blocking the event loop.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if args and not (isinstance(args, tuple) and all(isinstance(arg, _IMMUTABLE_ARGS) for arg in args)):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for room: the stock put_nowait fails on a full queue and stop() would lose the drain
+        self.queue.put(self._sentinel)
+
+
+# Loggers switched to queue logging: name -> (logger, queue handler, listener)
+_installed: Dict[str, Tuple[logging.Logger, NonBlockingQueueHandler, _QueueListener]] = {}
+_lock = threading.Lock()
+
+
+def install_queue_logging(logger: logging.Logger, handlers: List[logging.Handler],
+                          sampler: Optional[LogSampler] = None,
+                          maxsize: int = 10000) -> NonBlockingQueueHandler:
+    """
+    Route a logger's output through a queue to `handlers` on a writer thread.
+
+    Replaces the logger's current handlers (and any queue set up earlier for
+    the same logger, which is drained first). Handler levels are respected
+    by the listener.
+    """
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=maxsize))
+    if sampler is not None:
+        queue_handler.addFilter(sampler)
+    listener = _QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+
+    with _lock:
+        previous = _installed.pop(logger.name, None)
+        if previous is not None:
+            previous[2].stop()
+            for handler in previous[2].handlers:
+                if handler not in handlers:
+                    handler.close()
+        logger.handlers.clear()
+        logger.addHandler(queue_handler)
+        listener.start()
+        _installed[logger.name] = (logger, queue_handler, listener)
+    return queue_handler
+
+
+def remove_queue_logging(logger: logging.Logger):
+    """Drain a logger's queue, stop its writer thread and attach its handlers directly again."""
+    with _lock:
+        installed = _installed.pop(logger.name, None)
+    if installed is None:
+        return
+    _, queue_handler, listener = installed
+    listener.stop()
+    logger.removeHandler(queue_handler)
+    for handler in listener.handlers:
+        logger.addHandler(handler)
+
+
+def stop_queue_logging():
+    """Write out everything queued and stop all writer threads (also runs at exit)."""
+    with _lock:
+        loggers = [logger for logger, _, _ in _installed.values()]
+    for logger in loggers:
+        remove_queue_logging(logger)
+
+
+def get_queue_logging_stats() -> Dict[str, Dict[str, int]]:
+    """Queue depth and drop/suppression counts per queue-logged logger."""
+    with _lock:
+        installed = list(_installed.items())
+    stats = {}
+    for name, (_, queue_handler, _) in installed:
+        suppressed = sum(f.suppressed for f in queue_handler.filters if isinstance(f, LogSampler))
+        stats[name] = {
+            'queued': queue_handler.queue.qsize(),
+            'dropped': queue_handler.dropped,
+            'suppressed': suppressed,
+        }
+    return stats
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """Parse "scanner=20,api.market_data=5" into {logger prefix: records per second per call site}."""
+    rates = {}
+    for item in spec.split(','):
+        if '=' in item:
+            name, rate = item.split('=', 1)
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+def _restart_after_fork():
+    # Writer threads do not survive fork; give the child fresh queues and threads
+    global _lock
+    _lock = threading.Lock()
+    for name, (logger, queue_handler, listener) in list(_installed.items()):
+        queue_handler.queue = queue.Queue(maxsize=queue_handler.queue.maxsize)
+        listener = _QueueListener(queue_handler.queue, *listener.handlers, respect_handler_level=True)
+        listener.start()
+        _installed[name] = (logger, queue_handler, listener)
+
+
+atexit.register(stop_queue_logging)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
@@ -5,11 +5,19 @@ import logging
 import logging.handlers
 import json
 import traceback
-from datetime import datetime
-from typing import Dict, Any, Optional
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 
 from config.settings import Settings
+from utils.log_queue import install_queue_logging
+
+# LogRecord attributes that are not user-supplied extra fields
+_RECORD_ATTRIBUTES = frozenset({
+    'name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 'filename', 'module', 'exc_info',
+    'exc_text', 'stack_info', 'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
+    'thread', 'threadName', 'processName', 'process', 'getMessage', 'message', 'taskName',
+})
 
 
 class StructuredFormatter(logging.Formatter):
@@ -17,9 +25,9 @@ class StructuredFormatter(logging.Formatter):
     
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as structured data."""
-        # Base log structure
+        # Base log structure (time of the log call: formatting may happen later on the writer thread)
         log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).replace(tzinfo=None).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -38,11 +46,7 @@ class StructuredFormatter(logging.Formatter):
         
         # Add extra fields from record
         for key, value in record.__dict__.items():
-            if key not in {'name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 
-                          'filename', 'module', 'exc_info', 'exc_text', 'stack_info',
-                          'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
-                          'thread', 'threadName', 'processName', 'process', 'getMessage',
-                          'message'}:
+            if key not in _RECORD_ATTRIBUTES:
                 log_data[key] = value
         
         return json.dumps(log_data, default=str)
@@ -77,8 +81,7 @@ class TradingLogger:
         error_handler.setFormatter(StructuredFormatter())
         error_handler.setLevel(logging.ERROR)
         
-        self.logger.addHandler(trading_handler)
-        self.logger.addHandler(error_handler)
+        _attach_handlers(self.logger, [trading_handler, error_handler])
     
     def trade_opened(self, symbol: str, side: str, quantity: float, price: float, 
                     trade_id: str, reason: str = None, **kwargs):
@@ -190,7 +193,7 @@ class PerformanceLogger:
         perf_handler.setFormatter(StructuredFormatter())
         perf_handler.setLevel(logging.INFO)
         
-        self.logger.addHandler(perf_handler)
+        _attach_handlers(self.logger, [perf_handler])
     
     def execution_time(self, operation: str, duration: float, details: dict = None):
         """Log operation execution time."""
@@ -234,6 +237,15 @@ class PerformanceLogger:
         )
 
 
+def _attach_handlers(logger: logging.Logger, handlers: List[logging.Handler]):
+    """Attach file handlers, behind the log queue unless LOG_QUEUE_ENABLED is off."""
+    if Settings.LOG_QUEUE_ENABLED:
+        install_queue_logging(logger, handlers, maxsize=Settings.LOG_QUEUE_SIZE)
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
+
+
 def get_logger(name: str, logger_type: str = "standard") -> logging.Logger:
     """Get appropriate logger instance."""
     if logger_type == "trading":
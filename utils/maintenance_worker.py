@@ -16,6 +16,7 @@ sys.path.insert(0, str(project_root))
 from utils.logger import get_logger
 from utils.backup import create_database_backup
 from utils.cleanup_logs import cleanup_log_files, cleanup_temp_files
+from database.retention import run_retention
 
 logger = get_logger(__name__)
 
@@ -32,6 +33,7 @@ class MaintenanceWorker:
             'daily_backup': time(2, 0),      # 2:00 AM UTC
             'log_cleanup': time(3, 0),       # 3:00 AM UTC (daily)
             'temp_cleanup': time(1, 0),      # 1:00 AM UTC (daily)
+            'data_retention': time(4, 0),    # 4:00 AM UTC (daily)
         }
         
         # Track last execution
@@ -117,6 +119,8 @@ class MaintenanceWorker:
             await self._run_log_cleanup()
         elif task_name == 'temp_cleanup':
             await self._run_temp_cleanup()
+        elif task_name == 'data_retention':
+            await self._run_data_retention()
         else:
             logger.warning(f"Unknown task: {task_name}")
     
@@ -150,6 +154,17 @@ class MaintenanceWorker:
             logger.error(f"Temp cleanup task error: {e}")
             raise
     
+    async def _run_data_retention(self):
+        """Drop expired time partitions and roll up old indicators."""
+        try:
+            # Run retention in executor to avoid blocking
+            loop = asyncio.get_event_loop()
+            report = await loop.run_in_executor(None, run_retention)
+            logger.info(f"🧹 Data retention finished: {report}")
+        except Exception as e:
+            logger.error(f"Data retention task error: {e}")
+            raise
+    
     async def get_status(self) -> dict:
         """Get maintenance worker status."""
         return {
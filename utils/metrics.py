@@ -0,0 +1,158 @@
+# utils/metrics.py
+"""Prometheus metrics for API latency, caches, rate limiting, database and analysis cycles."""
+
+import time
+from contextlib import contextmanager
+from typing import Callable, Tuple
+
+try:
+    from prometheus_client import (
+        CollectorRegistry, Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _NoopMetric:
+    """Stand-in used when prometheus_client is not installed."""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, *args, **kwargs):
+        pass
+
+    def inc(self, *args, **kwargs):
+        pass
+
+    def set(self, *args, **kwargs):
+        pass
+
+    def set_function(self, *args, **kwargs):
+        pass
+
+
+# Latency buckets tuned for exchange REST calls and local work (5ms .. 30s)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+if PROMETHEUS_AVAILABLE:
+    REGISTRY = CollectorRegistry(auto_describe=True)
+
+    API_REQUEST_DURATION = Histogram(
+        'bingx_api_request_duration_seconds', 'BingX API call latency per endpoint',
+        ['endpoint', 'status'], buckets=LATENCY_BUCKETS, registry=REGISTRY
+    )
+    API_RETRIES = Counter(
+        'bingx_api_retries_total', 'BingX API call retries', ['endpoint', 'reason'], registry=REGISTRY
+    )
+    API_RATE_LIMITED = Counter(
+        'bingx_api_rate_limited_total', 'BingX API 429 / rate limit responses', ['endpoint'], registry=REGISTRY
+    )
+    CIRCUIT_BREAKER_OPEN = Gauge(
+        'bingx_circuit_breaker_open', 'Circuit breaker state (1 = open)', ['breaker'], registry=REGISTRY
+    )
+    CACHE_REQUESTS = Counter(
+        'cache_requests_total', 'Cache lookups by result', ['cache', 'result'], registry=REGISTRY
+    )
+    CACHE_SIZE = Gauge(
+        'cache_entries', 'Number of cached entries', ['cache'], registry=REGISTRY
+    )
+    RATE_LIMITER_WAIT = Histogram(
+        'rate_limiter_wait_seconds', 'Time spent waiting on rate limiters',
+        ['limiter', 'category'], buckets=LATENCY_BUCKETS, registry=REGISTRY
+    )
+    DB_QUERY_DURATION = Histogram(
+        'db_query_duration_seconds', 'Database statement execution time',
+        ['operation'], buckets=LATENCY_BUCKETS, registry=REGISTRY
+    )
+    ANALYSIS_CYCLE_DURATION = Histogram(
+        'analysis_cycle_duration_seconds', 'Duration of analysis / scan cycles',
+        ['worker'], buckets=LATENCY_BUCKETS + (60.0, 120.0, 300.0), registry=REGISTRY
+    )
+    QUEUE_DEPTH = Gauge(
+        'queue_depth', 'Items waiting in internal queues', ['queue'], registry=REGISTRY
+    )
+else:
+    REGISTRY = None
+    API_REQUEST_DURATION = API_RETRIES = API_RATE_LIMITED = CIRCUIT_BREAKER_OPEN = _NoopMetric()
+    CACHE_REQUESTS = CACHE_SIZE = RATE_LIMITER_WAIT = DB_QUERY_DURATION = _NoopMetric()
+    ANALYSIS_CYCLE_DURATION = QUEUE_DEPTH = _NoopMetric()
+
+
+def observe_api_request(endpoint: str, duration: float, status: str = 'success'):
+    """Record latency of a single BingX API call."""
+    API_REQUEST_DURATION.labels(endpoint, status).observe(duration)
+
+
+def record_api_retry(endpoint: str, reason: str):
+    """Record a retried BingX API call; 429s are also counted separately."""
+    API_RETRIES.labels(endpoint, reason).inc()
+
+
+def record_rate_limited(endpoint: str):
+    """Record a rate limit (HTTP 429) response."""
+    API_RATE_LIMITED.labels(endpoint).inc()
+
+
+def record_cache_access(cache: str, hit: bool):
+    """Record a cache hit or miss."""
+    CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def observe_rate_limiter_wait(limiter: str, category: str, wait_seconds: float):
+    """Record time spent sleeping in a rate limiter."""
+    RATE_LIMITER_WAIT.labels(limiter, category).observe(wait_seconds)
+
+
+def observe_cycle(worker: str, duration: float):
+    """Record the duration of an analysis or scan cycle."""
+    ANALYSIS_CYCLE_DURATION.labels(worker).observe(duration)
+
+
+def track_gauge(gauge, label: str, func: Callable[[], float]):
+    """Bind a gauge to a callable evaluated only when /metrics is scraped."""
+    gauge.labels(label).set_function(func)
+
+
+@contextmanager
+def time_cycle(worker: str):
+    """Context manager timing a block into the analysis cycle histogram."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_cycle(worker, time.perf_counter() - start)
+
+
+def install_db_metrics(engine):
+    """Attach SQLAlchemy cursor events recording statement execution time."""
+    if not PROMETHEUS_AVAILABLE or engine is None:
+        return
+
+    from sqlalchemy import event
+
+    if getattr(engine, '_metrics_installed', False):
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info['_query_start'] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info.pop('_query_start', None)
+        if start is None:
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement else 'UNKNOWN'
+        DB_QUERY_DURATION.labels(operation).observe(time.perf_counter() - start)
+
+    engine._metrics_installed = True
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Render all metrics in Prometheus text exposition format."""
+    if not PROMETHEUS_AVAILABLE:
+        return b"# prometheus_client not installed\n", CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -9,6 +9,7 @@ from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
 from contextlib import asynccontextmanager
 from utils.logger import get_logger
+from utils import metrics
 
 logger = get_logger(__name__)
 
@@ -120,6 +121,7 @@ class IntelligentRateLimiter:
         wait_time = self._calculate_wait_time(category)
         
         if wait_time > 0.005:  # Only sleep if meaningful delay needed (reduced threshold)
+            metrics.observe_rate_limiter_wait('intelligent', category, wait_time)
             await asyncio.sleep(wait_time)
         
         # Record this request
@@ -0,0 +1,282 @@
+# utils/shared_cache.py
+"""Shared (L2) cache backends for SmartCache: Redis, or an in-memory fake for tests."""
+
+import json
+import struct
+import threading
+import time
+import uuid
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.logger import get_logger
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+KEY_PREFIX = 'bingx:cache:'
+INVALIDATION_CHANNEL = 'bingx:cache:invalidate'
+
+# Values larger than this are zlib-compressed before they go to the shared tier
+COMPRESS_MIN_BYTES = 512
+
+_HEADER = struct.Struct('>Bd')  # flags, absolute expiry (epoch seconds)
+_FLAG_ZLIB = 1
+_TAGS = ('$d', '$t', '$date', '$s', '$tu', '$m')
+
+
+class SharedCacheError(Exception):
+    """Exception for shared cache errors."""
+    pass
+
+
+def _pack(value: Any) -> Any:
+    """Convert a value to JSON-native types, tagging the types JSON would lose."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, dict):
+        packed = {}
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise TypeError(f"non-string dict key {key!r}")
+            packed[key] = _pack(item)
+        if len(packed) == 1 and next(iter(packed)) in _TAGS:
+            return {'$m': list(packed.items())}  # A real dict that looks like a tag
+        return packed
+    if isinstance(value, list):
+        return [_pack(item) for item in value]
+    if isinstance(value, tuple):
+        return {'$tu': [_pack(item) for item in value]}
+    if isinstance(value, Decimal):
+        return {'$d': str(value)}
+    if isinstance(value, datetime):
+        return {'$t': value.isoformat()}
+    if isinstance(value, date):
+        return {'$date': value.isoformat()}
+    if isinstance(value, (set, frozenset)):
+        return {'$s': [_pack(item) for item in value]}
+    raise TypeError(f"unsupported type {type(value).__name__}")
+
+
+def _unpack_tag(obj: Dict[str, Any]) -> Any:
+    if len(obj) != 1:
+        return obj
+    tag, payload = next(iter(obj.items()))
+    if tag == '$d':
+        return Decimal(payload)
+    if tag == '$t':
+        return datetime.fromisoformat(payload)
+    if tag == '$date':
+        return date.fromisoformat(payload)
+    if tag == '$s':
+        return set(payload)
+    if tag == '$tu':
+        return tuple(payload)
+    if tag == '$m':
+        return dict(payload)
+    return obj
+
+
+def encode_cache_value(value: Any, expires_at: float) -> Optional[bytes]:
+    """
+    Serialize a cache value with its absolute expiry.
+
+    The payload is compact JSON (zlib-compressed above COMPRESS_MIN_BYTES)
+    with Decimal, datetime, date, set and tuple values tagged so they come
+    back as the same types. Returns None for values that cannot be encoded
+    (DataFrames, arbitrary objects, non-string dict keys); those stay in the
+    local tier only. Pickle is deliberately not used: anything that can write
+    to the shared store must not be able to run code in our processes.
+    """
+    try:
+        payload = json.dumps(_pack(value), separators=(',', ':'), allow_nan=True).encode()
+    except (TypeError, ValueError):
+        return None
+    flags = 0
+    if len(payload) >= COMPRESS_MIN_BYTES:
+        payload = zlib.compress(payload, 1)
+        flags |= _FLAG_ZLIB
+    return _HEADER.pack(flags, expires_at) + payload
+
+
+def decode_cache_value(raw: bytes) -> Tuple[Any, float]:
+    """Inverse of encode_cache_value; returns (value, expires_at)."""
+    flags, expires_at = _HEADER.unpack_from(raw)
+    payload = raw[_HEADER.size:]
+    if flags & _FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    return json.loads(payload, object_hook=_unpack_tag), expires_at
+
+
+class CacheBackend:
+    """
+    Interface of a shared cache tier.
+
+    Keys are plain strings (the backend adds its own namespace), values are
+    bytes and TTLs are milliseconds. Invalidation messages are strings
+    delivered to every subscriber of the backend's channel, including other
+    processes.
+    """
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl_ms: int):
+        raise NotImplementedError
+
+    def delete(self, keys: Iterable[str]) -> int:
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix: str) -> int:
+        raise NotImplementedError
+
+    def publish(self, message: str):
+        raise NotImplementedError
+
+    def subscribe(self, callback: Callable[[str], None]):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class RedisCacheBackend(CacheBackend):
+    """Shared tier on a Redis server; invalidations use Redis pub/sub."""
+
+    def __init__(self, client, namespace: str = KEY_PREFIX, channel: str = INVALIDATION_CHANNEL):
+        self.client = client
+        self.namespace = namespace
+        self.channel = channel
+        self._pubsub = None
+        self._pubsub_thread = None
+
+    @classmethod
+    def from_url(cls, url: str, timeout: float = 0.25, **kwargs) -> 'RedisCacheBackend':
+        """Connect to Redis; raises SharedCacheError if redis-py is missing or the server is down."""
+        if not REDIS_AVAILABLE:
+            raise SharedCacheError("redis package not installed")
+        client = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        try:
+            client.ping()
+        except redis.RedisError as e:
+            raise SharedCacheError(f"Redis not reachable at {url}: {e}")
+        return cls(client, **kwargs)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.namespace + key)
+
+    def set(self, key: str, value: bytes, ttl_ms: int):
+        self.client.set(self.namespace + key, value, px=max(1, ttl_ms))
+
+    def delete(self, keys: Iterable[str]) -> int:
+        names = [self.namespace + key for key in keys]
+        return self.client.delete(*names) if names else 0
+
+    def delete_prefix(self, prefix: str) -> int:
+        deleted = 0
+        batch = []
+        for name in self.client.scan_iter(match=self.namespace + prefix + '*', count=500):
+            batch.append(name)
+            if len(batch) >= 500:
+                deleted += self.client.delete(*batch)
+                batch = []
+        if batch:
+            deleted += self.client.delete(*batch)
+        return deleted
+
+    def publish(self, message: str):
+        self.client.publish(self.channel, message)
+
+    def subscribe(self, callback: Callable[[str], None]):
+        def handler(message):
+            data = message.get('data')
+            callback(data.decode() if isinstance(data, bytes) else data)
+
+        self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{self.channel: handler})
+        self._pubsub_thread = self._pubsub.run_in_thread(sleep_time=0.2, daemon=True)
+
+    def close(self):
+        if self._pubsub_thread is not None:
+            self._pubsub_thread.stop()
+            self._pubsub_thread = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+        self.client.close()
+
+
+class InMemoryCacheServer:
+    """Stand-in for a Redis server shared by several InMemoryCacheBackend clients."""
+
+    def __init__(self):
+        self.data: Dict[str, Tuple[bytes, float]] = {}
+        self.subscribers: List[Callable[[str], None]] = []
+        self.lock = threading.Lock()
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Fake shared tier with Redis semantics (PX expiry, prefix delete, pub/sub).
+
+    Backends created on the same InMemoryCacheServer behave like processes
+    connected to one Redis server; messages are delivered synchronously.
+    """
+
+    def __init__(self, server: Optional[InMemoryCacheServer] = None):
+        self.server = server or InMemoryCacheServer()
+        self._callback: Optional[Callable[[str], None]] = None
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self.server.lock:
+            item = self.server.data.get(key)
+            if item is None:
+                return None
+            if time.monotonic() >= item[1]:
+                del self.server.data[key]
+                return None
+            return item[0]
+
+    def set(self, key: str, value: bytes, ttl_ms: int):
+        with self.server.lock:
+            self.server.data[key] = (value, time.monotonic() + max(1, ttl_ms) / 1000)
+
+    def delete(self, keys: Iterable[str]) -> int:
+        with self.server.lock:
+            return sum(self.server.data.pop(key, None) is not None for key in keys)
+
+    def delete_prefix(self, prefix: str) -> int:
+        with self.server.lock:
+            doomed = [key for key in self.server.data if key.startswith(prefix)]
+            for key in doomed:
+                del self.server.data[key]
+            return len(doomed)
+
+    def publish(self, message: str):
+        with self.server.lock:
+            subscribers = list(self.server.subscribers)
+        for callback in subscribers:
+            callback(message)
+
+    def subscribe(self, callback: Callable[[str], None]):
+        self._callback = callback
+        with self.server.lock:
+            self.server.subscribers.append(callback)
+
+    def close(self):
+        if self._callback is not None:
+            with self.server.lock:
+                self.server.subscribers.remove(self._callback)
+            self._callback = None
+
+
+def new_origin_id() -> str:
+    """Identifier that lets a cache ignore its own invalidation messages."""
+    return uuid.uuid4().hex[:12]
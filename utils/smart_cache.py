@@ -6,7 +6,12 @@ import time
 from typing import Dict, Any, Optional, Callable, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from config.settings import Settings
 from utils.logger import get_logger
+from utils import metrics
+from utils.shared_cache import (
+    CacheBackend, RedisCacheBackend, SharedCacheError, decode_cache_value, encode_cache_value, new_origin_id
+)
 
 logger = get_logger(__name__)
 
@@ -30,18 +35,37 @@ class SmartCache:
     - LRU eviction when memory limit reached
     - Category-based cache policies
     - Performance metrics
+    - Optional shared tier (L2, e.g. Redis) behind the in-process dict (L1):
+      local misses are served from the shared tier with the remaining TTL,
+      sets are written through, and sets/invalidations are broadcast so other
+      processes drop their stale local copies
     """
     
-    def __init__(self, max_size: int = 10000):
+    # Shared tier is skipped for this long after an error
+    SHARED_RETRY_SECONDS = 30
+    
+    def __init__(self, max_size: int = 10000, shared: Optional[CacheBackend] = None):
         self.cache: Dict[str, CacheEntry] = {}
         self.max_size = max_size
         self.stats = {
             'hits': 0,
             'misses': 0,
             'evictions': 0,
-            'total_requests': 0
+            'total_requests': 0,
+            'shared_hits': 0,
+            'shared_misses': 0,
+            'shared_errors': 0,
+            'shared_skipped': 0,  # Values the shared tier cannot encode (kept local)
+            'remote_invalidations': 0,
         }
         
+        # Shared tier
+        self.shared: Optional[CacheBackend] = None
+        self._origin = new_origin_id()
+        self._shared_retry_at = 0.0
+        if shared is not None:
+            self.attach_shared(shared)
+        
         # Performance-optimized cache policies with intelligent TTL
         self.policies = {
             'market_summary': {'ttl': 30, 'priority': 'high'},     # 30s - high frequency data
@@ -57,6 +81,7 @@ class SmartCache:
         # Performance monitoring
         self._last_cleanup = time.time()
         self._cleanup_interval = 300  # Cleanup every 5 minutes
+        metrics.track_gauge(metrics.CACHE_SIZE, 'smart_cache', lambda: len(self.cache))
     
     def _make_key(self, category: str, identifier: str, **kwargs) -> str:
         """Generate cache key from parameters with optimized string operations."""
@@ -84,7 +109,7 @@ class SmartCache:
         # Use dict comprehension for single-pass cleanup (more efficient than building list then deleting)
         original_size = len(self.cache)
         self.cache = {
-            key: entry for key, entry in self.cache.items()
+            key: entry for key, entry in list(self.cache.items())
             if current_time <= entry.expires_at
         }
         
@@ -105,7 +130,7 @@ class SmartCache:
         
         for i in range(min(count, len(sorted_entries))):
             key = sorted_entries[i][0]
-            del self.cache[key]
+            self.cache.pop(key, None)
             self.stats['evictions'] += 1
     
     def _ensure_space(self):
@@ -127,22 +152,24 @@ class SmartCache:
         self.stats['total_requests'] += 1
         key = self._make_key(category, identifier, **kwargs)
         
-        if key not in self.cache:
+        entry = self.cache.get(key)
+        if entry is None:
             self.stats['misses'] += 1
-            return None
-        
-        entry = self.cache[key]
+            metrics.record_cache_access('smart_cache', False)
+            return self._get_shared(key) if self.shared else None
         
         # Check expiration
         if self._is_expired(entry):
-            del self.cache[key]
+            self.cache.pop(key, None)
             self.stats['misses'] += 1
-            return None
+            metrics.record_cache_access('smart_cache', False)
+            return self._get_shared(key) if self.shared else None
         
         # Update access statistics
         entry.access_count += 1
         entry.last_access = time.time()
         self.stats['hits'] += 1
+        metrics.record_cache_access('smart_cache', True)
         
         logger.debug(f"Cache HIT: {key}")
         return entry.data
@@ -155,21 +182,25 @@ class SmartCache:
         policy = self.policies.get(category, {'ttl': 60})
         ttl = policy['ttl']
         
+        current_time = time.time()
+        self._store(key, data, current_time, current_time + ttl)
+        logger.debug(f"Cache SET: {key} (TTL: {ttl}s)")
+        
+        if self.shared:
+            self._set_shared(key, data, current_time + ttl)
+    
+    def _store(self, key: str, data: Any, current_time: float, expires_at: float):
+        """Put an entry in the local tier."""
         # Ensure we have space
         self._ensure_space()
         
-        # Create cache entry
-        current_time = time.time()
-        entry = CacheEntry(
+        self.cache[key] = CacheEntry(
             data=data,
             created_at=current_time,
-            expires_at=current_time + ttl,
+            expires_at=expires_at,
             access_count=1,
             last_access=current_time
         )
-        
-        self.cache[key] = entry
-        logger.debug(f"Cache SET: {key} (TTL: {ttl}s)")
     
     async def get_or_fetch(self, category: str, identifier: str, 
                           fetch_func: Callable, **kwargs) -> Any:
@@ -207,10 +238,89 @@ class SmartCache:
             keys_to_remove = [key] if key in self.cache else []
         
         for key in keys_to_remove:
-            del self.cache[key]
+            self.cache.pop(key, None)
             
         if keys_to_remove:
             logger.debug(f"Invalidated {len(keys_to_remove)} cache entries for {category}")
+        
+        if self._shared_available():
+            try:
+                if identifier is None:
+                    self.shared.delete_prefix(f"{category}:")
+                    self.shared.publish(f"{self._origin}|p|{category}:")
+                else:
+                    key = self._make_key(category, identifier, **kwargs)
+                    self.shared.delete([key])
+                    self.shared.publish(f"{self._origin}|k|{key}")
+            except Exception as e:
+                self._shared_failed(e)
+    
+    def attach_shared(self, backend: CacheBackend):
+        """Use backend as the shared tier and listen for other processes' invalidations."""
+        backend.subscribe(self._on_invalidation)
+        self.shared = backend
+    
+    def _shared_available(self) -> bool:
+        return self.shared is not None and time.time() >= self._shared_retry_at
+    
+    def _shared_failed(self, error: Exception):
+        self.stats['shared_errors'] += 1
+        self._shared_retry_at = time.time() + self.SHARED_RETRY_SECONDS
+        logger.warning(f"Shared cache unavailable, using local cache only for "
+                       f"{self.SHARED_RETRY_SECONDS}s: {error}")
+    
+    def _get_shared(self, key: str) -> Optional[Any]:
+        """Look a key up in the shared tier and keep it locally until the shared expiry."""
+        if not self._shared_available():
+            return None
+        try:
+            raw = self.shared.get(key)
+            if raw is not None:
+                data, expires_at = decode_cache_value(raw)
+        except Exception as e:
+            self._shared_failed(e)
+            return None
+        
+        current_time = time.time()
+        if raw is None or expires_at <= current_time:
+            self.stats['shared_misses'] += 1
+            metrics.record_cache_access('smart_cache_shared', False)
+            return None
+        
+        self._store(key, data, current_time, expires_at)
+        self.stats['shared_hits'] += 1
+        metrics.record_cache_access('smart_cache_shared', True)
+        logger.debug(f"Shared cache HIT: {key}")
+        return data
+    
+    def _set_shared(self, key: str, data: Any, expires_at: float):
+        """Write through to the shared tier and tell other processes to drop their copy."""
+        if not self._shared_available():
+            return
+        raw = encode_cache_value(data, expires_at)
+        if raw is None:
+            self.stats['shared_skipped'] += 1
+            return
+        try:
+            self.shared.set(key, raw, int((expires_at - time.time()) * 1000))
+            self.shared.publish(f"{self._origin}|k|{key}")
+        except Exception as e:
+            self._shared_failed(e)
+    
+    def _on_invalidation(self, message: str):
+        """Drop local entries another process replaced or invalidated (runs on the subscriber thread)."""
+        try:
+            origin, kind, target = message.split('|', 2)
+        except ValueError:
+            return
+        if origin == self._origin:
+            return
+        self.stats['remote_invalidations'] += 1
+        if kind == 'k':
+            self.cache.pop(target, None)
+        else:
+            for key in [key for key in list(self.cache) if key.startswith(target)]:
+                self.cache.pop(key, None)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache performance statistics."""
@@ -226,12 +336,24 @@ class SmartCache:
             'evictions': self.stats['evictions'],
             'total_requests': total_requests,
             'categories': list(self.policies.keys()),
+            'shared_tier': type(self.shared).__name__ if self.shared else None,
+            'shared_hits': self.stats['shared_hits'],
+            'shared_misses': self.stats['shared_misses'],
+            'shared_errors': self.stats['shared_errors'],
+            'shared_skipped': self.stats['shared_skipped'],
+            'remote_invalidations': self.stats['remote_invalidations'],
         }
     
     def clear(self):
-        """Clear all cache entries."""
+        """Clear all local cache entries (the shared tier expires on its own)."""
         self.cache.clear()
         logger.info("Cache cleared")
+    
+    def close(self):
+        """Disconnect from the shared tier."""
+        shared, self.shared = self.shared, None
+        if shared is not None:
+            shared.close()
 
 
 # Global cache instance
@@ -242,10 +364,23 @@ def get_smart_cache() -> SmartCache:
     """Get the global smart cache instance."""
     global _smart_cache
     if _smart_cache is None:
-        _smart_cache = SmartCache()
+        _smart_cache = SmartCache(shared=_connect_shared_tier())
     return _smart_cache
 
 
+def _connect_shared_tier() -> Optional[CacheBackend]:
+    """Redis shared tier when REDIS_ENABLED, otherwise (or if unreachable) None."""
+    if not Settings.REDIS_ENABLED:
+        return None
+    try:
+        backend = RedisCacheBackend.from_url(Settings.REDIS_URL)
+    except SharedCacheError as e:
+        logger.warning(f"Shared cache tier disabled: {e}")
+        return None
+    logger.info("🔗 Shared cache tier connected (Redis)")
+    return backend
+
+
 # Decorator for automatic caching
 def cached(category: str, identifier_key: str = None, ttl: int = None):
     """Decorator to automatically cache function results."""
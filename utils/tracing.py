@@ -0,0 +1,358 @@
+# utils/tracing.py
+"""Lightweight in-process tracing: contextvar spans, sampling, ring buffer and OTLP/JSON file export."""
+
+import asyncio
+import functools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = 'ok'
+    error: Optional[str] = None
+    sampled: bool = True
+
+    def set_attribute(self, key: str, value: Any):
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_ns': self.start_ns,
+            'duration_ms': self.duration_ms,
+            'attributes': self.attributes,
+            'status': self.status,
+            'error': self.error,
+        }
+
+
+class _NonRecordingSpan:
+    """Span returned when a trace is not sampled; all operations are no-ops."""
+    sampled = False
+    trace_id = None
+    span_id = None
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+
+NON_RECORDING_SPAN = _NonRecordingSpan()
+
+_current_span: ContextVar[Optional[Any]] = ContextVar('current_span', default=None)
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class RingBufferExporter:
+    """Keeps the most recent finished spans in memory."""
+
+    def __init__(self, max_spans: int = 2048):
+        self._spans: deque = deque(maxlen=max_spans)
+
+    def export(self, span: Span):
+        self._spans.append(span)
+
+    def get_spans(self, name: Optional[str] = None, limit: Optional[int] = None) -> List[Span]:
+        """Get finished spans, newest last."""
+        spans = [s for s in self._spans if name is None or s.name == name]
+        return spans[-limit:] if limit else spans
+
+    def latency_percentiles(self, name: str) -> Dict[str, Any]:
+        """Get p50/p95/p99 latency (ms) for spans with the given name."""
+        durations = sorted(s.duration_ms for s in self._spans if s.name == name)
+        if not durations:
+            return {'count': 0, 'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'max_ms': None}
+
+        def pct(p: float) -> float:
+            return durations[min(len(durations) - 1, int(p * len(durations)))]
+
+        return {
+            'count': len(durations),
+            'p50_ms': round(pct(0.50), 3),
+            'p95_ms': round(pct(0.95), 3),
+            'p99_ms': round(pct(0.99), 3),
+            'max_ms': round(durations[-1], 3),
+        }
+
+    def clear(self):
+        self._spans.clear()
+
+
+class OTLPJsonFileExporter:
+    """Appends spans to a file as OTLP/JSON `resourceSpans` documents, one per line."""
+
+    def __init__(self, path: str, service_name: str = 'bingx-trading-bot', batch_size: int = 100):
+        self.path = path
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self._pending: List[Span] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _attribute(key: str, value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {'key': key, 'value': {'boolValue': value}}
+        if isinstance(value, int):
+            return {'key': key, 'value': {'intValue': str(value)}}
+        if isinstance(value, float):
+            return {'key': key, 'value': {'doubleValue': value}}
+        return {'key': key, 'value': {'stringValue': str(value)}}
+
+    def _to_otlp(self, span: Span) -> Dict[str, Any]:
+        return {
+            'traceId': span.trace_id,
+            'spanId': span.span_id,
+            'parentSpanId': span.parent_id or '',
+            'name': span.name,
+            'kind': 1,  # SPAN_KIND_INTERNAL
+            'startTimeUnixNano': str(span.start_ns),
+            'endTimeUnixNano': str(span.end_ns),
+            'attributes': [self._attribute(k, v) for k, v in span.attributes.items()],
+            'status': {'code': 2, 'message': span.error or ''} if span.status == 'error' else {'code': 1},
+        }
+
+    def export(self, span: Span):
+        with self._lock:
+            self._pending.append(span)
+            if len(self._pending) < self.batch_size:
+                return
+            batch, self._pending = self._pending, []
+        self._write(batch)
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._write(batch)
+
+    def _write(self, spans: List[Span]):
+        document = {
+            'resourceSpans': [{
+                'resource': {'attributes': [self._attribute('service.name', self.service_name)]},
+                'scopeSpans': [{
+                    'scope': {'name': 'utils.tracing'},
+                    'spans': [self._to_otlp(span) for span in spans],
+                }],
+            }]
+        }
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(document) + '\n')
+        except OSError:
+            # Tracing must never break the hot path
+            pass
+
+
+class Tracer:
+    """
+    Creates spans and exports finished, sampled spans.
+
+    The sampling decision is made once per trace at the root span; children of an
+    unsampled root get a no-op span, so untraced requests cost one random() call.
+    """
+
+    def __init__(self, sample_rate: float = 0.01, buffer_size: int = 2048,
+                 otlp_file: Optional[str] = None, enabled: bool = True):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.ring_buffer = RingBufferExporter(buffer_size)
+        self.exporters: List[Any] = [self.ring_buffer]
+        if otlp_file:
+            self.exporters.append(OTLPJsonFileExporter(otlp_file))
+
+        self.stats = {
+            'traces_started': 0,
+            'traces_sampled': 0,
+            'spans_exported': 0,
+        }
+
+    def _start(self, name: str, attributes: Dict[str, Any], root: bool, always_sample: bool):
+        parent = _current_span.get()
+
+        if parent is not None and (parent.sampled or not always_sample):
+            if not parent.sampled:
+                return NON_RECORDING_SPAN
+            return Span(name=name, trace_id=parent.trace_id, span_id=_new_id(64),
+                        parent_id=parent.span_id, attributes=attributes)
+
+        if parent is None and not root:
+            return None
+
+        self.stats['traces_started'] += 1
+        if not always_sample and random.random() >= self.sample_rate:
+            return NON_RECORDING_SPAN
+
+        self.stats['traces_sampled'] += 1
+        return Span(name=name, trace_id=_new_id(128), span_id=_new_id(64), attributes=attributes)
+
+    def _finish(self, span: Span, error: Optional[BaseException] = None):
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.status = 'error'
+            span.error = f"{type(error).__name__}: {error}"
+        for exporter in self.exporters:
+            exporter.export(span)
+        self.stats['spans_exported'] += 1
+
+    @contextmanager
+    def span(self, name: str, root: bool = True, always_sample: bool = False, **attributes):
+        """
+        Context manager creating a span as a child of the current span.
+
+        Args:
+            name: Span name, e.g. 'bingx.request'
+            root: Start a new (sampled) trace when there is no active span
+            always_sample: Bypass sampling when starting a new trace
+        """
+        if not self.enabled:
+            yield NON_RECORDING_SPAN
+            return
+
+        span = self._start(name, attributes, root, always_sample)
+        if span is None:
+            yield NON_RECORDING_SPAN
+            return
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            if span.sampled:
+                self._finish(span, e)
+            raise
+        else:
+            if span.sampled:
+                self._finish(span)
+        finally:
+            _current_span.reset(token)
+
+    def flush(self):
+        """Flush buffered exporters."""
+        for exporter in self.exporters:
+            if hasattr(exporter, 'flush'):
+                exporter.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tracer statistics and latency percentiles per span name."""
+        names = sorted({s.name for s in self.ring_buffer.get_spans()})
+        return {
+            'enabled': self.enabled,
+            'sample_rate': self.sample_rate,
+            **self.stats,
+            'latency': {name: self.ring_buffer.latency_percentiles(name) for name in names},
+        }
+
+
+# Global tracer instance
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Get or create global tracer instance."""
+    global _tracer
+    if _tracer is None:
+        from config.settings import Settings
+        _tracer = Tracer(
+            sample_rate=Settings.TRACING_SAMPLE_RATE,
+            buffer_size=Settings.TRACING_BUFFER_SIZE,
+            otlp_file=Settings.TRACING_OTLP_FILE or None,
+            enabled=Settings.TRACING_ENABLED,
+        )
+    return _tracer
+
+
+def span(name: str, root: bool = True, always_sample: bool = False, **attributes):
+    """Create a span on the global tracer."""
+    return get_tracer().span(name, root=root, always_sample=always_sample, **attributes)
+
+
+def current_span():
+    """Get the active span (a no-op span when nothing is being traced)."""
+    return _current_span.get() or NON_RECORDING_SPAN
+
+
+def traced(name: Optional[str] = None, root: bool = True, always_sample: bool = False):
+    """Decorator wrapping a sync or async function in a span."""
+    def decorator(func: Callable):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name, root=root, always_sample=always_sample):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, root=root, always_sample=always_sample):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def install_db_tracing(engine):
+    """Record each SQL statement as a child span of the active sampled span."""
+    from sqlalchemy import event
+
+    if getattr(engine, '_tracing_installed', False):
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        parent = _current_span.get()
+        if parent is None or not parent.sampled:
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement else 'UNKNOWN'
+        conn.info['_trace_span'] = Span(
+            name=f"db.{operation.lower()}", trace_id=parent.trace_id, span_id=_new_id(64),
+            parent_id=parent.span_id, attributes={'db.statement': statement[:200]}
+        )
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        db_span = conn.info.pop('_trace_span', None)
+        if db_span is not None:
+            get_tracer()._finish(db_span)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        db_span = conn.info.pop('_trace_span', None) if conn is not None else None
+        if db_span is not None:
+            get_tracer()._finish(db_span, exception_context.original_exception)
+
+    engine._tracing_installed = True